@@ -26,6 +26,7 @@ FS_DIR = f'{Path.home()}/.{APPNAME}'  # 文件系统目录
 
 RUNS_DIR = f'{REPO_ROOT}/runs'  # 运行目录
 FILE_DIR = f'{FS_DIR}/files'   # 文件目录
+CACHE_DIR = f'{FS_DIR}/cache'  # 缓存目录
 # CONFIG_DIR = f'{FS_DIR}/configs'  # 配置目录
 CONFIG_DIR = f'{REPO_ROOT}/besiii/configs'  # 配置目录
 
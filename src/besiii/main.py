@@ -1,4 +1,4 @@
-from besiii.modules.tools.navigator_tool import inspire_search, arxiv_search, docDB_search, web_searching
+from besiii.modules.tools.navigator_tool import inspire_search_async, arxiv_search_async, docDB_search_async, web_searching_async
 from drsai import (
     AssistantAgent, UserProxyAgent, 
     SelectorGroupChat,
@@ -40,7 +40,7 @@ class DRSAI_BESIII:
         agent02 = AssistantAgent(
             name="Navigator",
             model_client=self.model_client,
-            tools=[inspire_search, arxiv_search, docDB_search, web_searching],
+            tools=[inspire_search_async, arxiv_search_async, docDB_search_async, web_searching_async], # async tools do not block the event loop
             system_message="You can search the arxiv paper, website, or any other database by web search or API.",
             description="An navigator who can search for data from databases like arxiv.",
             reflect_on_tool_use=False,
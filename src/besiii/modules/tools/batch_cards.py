@@ -0,0 +1,117 @@
+# Batch generation of analysis cards for many decay channels
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from besiii.modules.tools.mapping_json import (
+    build_JobOptionsCard,
+    create_AlgorithmCard,
+    create_DrawCard,
+    create_FoMCard,
+    create_TMVACard,
+)
+from besiii.modules.tools.tools_algorithm import get_particle_index
+
+# 卡片类型及其生成顺序，与逐个调用工具时的顺序一致
+CARD_TYPES = ("algorithm", "joboptions", "draw", "fom", "tmva")
+
+# 不带参数打印的生成函数（create_*Card 被 print_args 装饰）
+_BUILDERS: Dict[str, Callable[..., str]] = {
+    "algorithm": create_AlgorithmCard.__wrapped__,
+    "joboptions": build_JobOptionsCard,
+    "draw": create_DrawCard.__wrapped__,
+    "fom": create_FoMCard.__wrapped__,
+    "tmva": create_TMVACard.__wrapped__,
+}
+
+# 任务数少于该值时在当前进程中生成，避免启动进程池的开销
+MIN_TASKS_FOR_POOL = 16
+
+
+def _build_card(task: Tuple[str, Dict[str, Any]]) -> str:
+    card_type, kwargs = task
+    return _BUILDERS[card_type](**kwargs)
+
+
+def _init_worker() -> None:
+    # forkserver启动的进程不继承主进程的状态，在此加载一次粒子索引
+    get_particle_index()
+
+
+def _make_tasks(
+    specs: Sequence[Mapping[str, Mapping[str, Any]]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    展开为 (卡片类型, 参数) 列表。作业控制卡的随机数种子与时间戳在此按顺序确定，
+    与逐个调用 create_JobOptionsCard 时的随机数序列相同，且各进程不会得到相同的种子。
+    """
+    tasks = []
+    for spec in specs:
+        unknown = set(spec) - set(CARD_TYPES)
+        if unknown:
+            raise ValueError(
+                f"Unknown card types: {sorted(unknown)}. Expected some of {CARD_TYPES}"
+            )
+        for card_type in CARD_TYPES:
+            if card_type not in spec:
+                continue
+            kwargs = dict(spec[card_type])
+            if card_type == "joboptions":
+                kwargs["Random_Seed"] = random.randint(1, 99999)
+                kwargs["rec_Random_Seed"] = random.randint(1, 99999)
+                kwargs["timestamp"] = datetime.now().strftime("%Y%m%d_%H%M%S")
+            tasks.append((card_type, kwargs))
+    return tasks
+
+
+def generate_cards(
+    specs: Sequence[Mapping[str, Mapping[str, Any]]],
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, str]]:
+    """
+    批量生成多个衰变道的分析卡片。
+
+    每个衰变道的 spec 是卡片类型到工具参数的映射，卡片类型为 "algorithm"、"joboptions"、
+    "draw"、"fom"、"tmva" 中的若干个，参数与 create_AlgorithmCard、create_JobOptionsCard、
+    create_DrawCard、create_FoMCard、create_TMVACard 相同。例如：
+        {"algorithm": {"AlgorithmName": "PipiJpsi", "DecayChain": "psi(4260) -> pi+ pi- [J/psi -> mu+ mu-]", "Ecms_value": 4.26},
+         "joboptions": {...}}
+
+    卡片在进程池中生成，各进程共享粒子索引，相同的（子）衰变链只解析一次。输出与按
+    spec 顺序逐个调用对应工具的结果完全相同。
+
+    Args:
+        specs: 各衰变道的卡片参数。
+        max_workers: 进程数，默认为CPU核数。为1时在当前进程中生成。
+
+    Returns:
+        List[Dict[str, str]]: 与 specs 一一对应，卡片类型到卡片内容的映射。
+    """
+    tasks = _make_tasks(specs)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1 or len(tasks) < MIN_TASKS_FOR_POOL:
+        outputs = [_build_card(task) for task in tasks]
+    else:
+        # 调用方（如异步服务）可能已启动线程，fork会复制其中持有的锁，故使用forkserver
+        chunksize = max(1, len(tasks) // (max_workers * 4))
+        mp_context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=mp_context, initializer=_init_worker
+        ) as executor:
+            outputs = list(executor.map(_build_card, tasks, chunksize=chunksize))
+
+    results: List[Dict[str, str]] = []
+    outputs_iter = iter(outputs)
+    for spec in specs:
+        results.append(
+            {
+                card_type: next(outputs_iter)
+                for card_type in CARD_TYPES
+                if card_type in spec
+            }
+        )
+    return results
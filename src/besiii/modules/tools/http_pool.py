@@ -0,0 +1,140 @@
+# Shared async HTTP clients with per-host rate limiting, used by the navigator tools
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from http.cookiejar import CookieJar
+from typing import Any, Coroutine, Dict, Mapping, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    令牌桶限速：平均每秒 rate 个请求，空闲后最多连续发出 capacity 个请求。
+    令牌不足时预约下一个令牌并异步等待，不阻塞事件循环；可在多个线程和事件循环间共享。
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """取走一个令牌，返回可以使用它之前需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HTTPClientPool:
+    """
+    进程内共享的 httpx.AsyncClient 连接池，每个事件循环一个客户端（httpx 的连接不能跨事件循环使用），
+    所有客户端共享 cookie 和按主机的令牌桶限速。
+
+    Args:
+        rate_limits: 主机名到 (每秒请求数, 突发请求数) 的映射。
+        default_rate_limit: 未列出的主机的限速。
+        headers: 每个请求附带的请求头。
+        timeout: 请求超时秒数。
+        max_connections: 每个客户端的最大连接数。
+        cookies: 共享的 cookie，默认新建。
+    """
+
+    def __init__(
+        self,
+        rate_limits: Optional[Mapping[str, Tuple[float, int]]] = None,
+        default_rate_limit: Tuple[float, int] = (2.0, 4),
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        cookies: Optional[CookieJar] = None,
+    ):
+        self.rate_limits = dict(rate_limits or {})
+        self.default_rate_limit = default_rate_limit
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.cookies = cookies if cookies is not None else CookieJar()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def client(self) -> httpx.AsyncClient:
+        """返回当前事件循环的客户端，不存在时创建"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    headers=self.headers,
+                    # 传入 CookieJar 本身，各客户端共享同一份 cookie
+                    cookies=self.cookies,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=self.max_connections),
+                    follow_redirects=True,
+                )
+                self._clients[loop] = client
+            return client
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    *self.rate_limits.get(host, self.default_rate_limit)
+                )
+                self._buckets[host] = bucket
+            return bucket
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        await self.bucket(urlsplit(url).hostname or "").acquire()
+        return await self.client().request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环的客户端"""
+        with self._lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    在后台线程的常驻事件循环中运行协程并等待结果，供同步接口使用。
+    常驻事件循环使同步调用之间也能复用连接池。
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="besiii-http", daemon=True
+            ).start()
+    future: Future[T] = asyncio.run_coroutine_threadsafe(coro, _loop)
+    return future.result()
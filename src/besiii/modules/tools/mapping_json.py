@@ -4,9 +4,11 @@ from typing_extensions import Annotated
 import json
 import random
 import math
+from datetime import datetime
 
 from besiii.utils import str_utils
 from besiii.modules.tools.tools_algorithm import *
+from besiii.modules.tools.tools_algorithm import count_final_state
 
 AlgorithmName_share = None
 
@@ -151,21 +153,50 @@ def create_JobOptionsCard(
 ) -> str:
     """A specialized tool for generating joboption scripts/cards tailored to the BESIII high-energy physics experiment. 
     PS: BOSS作业控制脚本是利用BESIII实验离线软件框架进行数据分析的参数设置文件，用户将需求按格式写入这些脚本，再利用BOSS程序运行，可以产生对应的探测器模拟信号，track(径迹)或cluster(光子簇团)级别的物理信息，以及用户联合多探测器信息鉴别得到的粒子以及他们组成的中间态粒子的物理信息。"""
-    ## 可以通过计算得到的参数
+    ## 随机数种子与时间戳
     Random_Seed = random.randint(1, 99999)
     rec_Random_Seed = random.randint(1, 99999)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return build_JobOptionsCard(
+        AlgorithmName, DecayChain, Decay_type, DecayCard_Path, Run_Id, Energy, Threshold_Cut, is_res,
+        Radiative_Correction, Tag_FSR, Log_Level, Rec_Type, Opt_ISR, Event_Num, Data_Path, Inmc_Path, submit_exmc,
+        Random_Seed=Random_Seed, rec_Random_Seed=rec_Random_Seed, timestamp=timestamp,
+    )
+
+def build_JobOptionsCard(
+    AlgorithmName: str,
+    DecayChain: str,
+    Decay_type: str,
+    DecayCard_Path: str,
+    Run_Id: str,
+    Energy: float,
+    Threshold_Cut: float = 0.1,
+    is_res: str = "xyz",
+    Radiative_Correction: bool = True,
+    Tag_FSR: int = True,
+    Log_Level: int = 2,
+    Rec_Type: str = "Dst",
+    Opt_ISR: Optional[float] = None,
+    Event_Num: int = 10,
+    Data_Path: Optional[str] = None,
+    Inmc_Path: Optional[str] = None,
+    submit_exmc: bool = False,
+    *,
+    Random_Seed: int,
+    rec_Random_Seed: int,
+    timestamp: str,
+) -> str:
+    """
+    根据给定的随机数种子和时间戳生成作业控制卡，参数含义同create_JobOptionsCard。
+    相同的参数总是生成相同的输出，批量生成时在主进程中确定种子与时间戳。
+    """
+    ## 可以通过计算得到的参数
     Energy_Spread = calculate_BeamEnergySpread(Energy, 5)
     Log_Level = 5
     try:
-        my_particle_list = get_particles_from_decay_chain(DecayChain)
-        charged_children, neutral_children, intermediate_states = get_final_state(my_particle_list)
+        num_charged_children, _, _ = count_final_state(DecayChain)
     except Exception as e:  # 捕获异常对象 e
         print("Error: Decay chain is not valid. Error message:", e)
-    
-    # ====== 时间戳生成 ======
-    from datetime import datetime
-    now = datetime.now()
-    timestamp = now.strftime("%Y%m%d_%H%M%S")
 
     # ====== 处理 Run_Id 格式 ======
     def extract_first_number(run_id: str) -> int:
@@ -187,8 +218,8 @@ def create_JobOptionsCard(
     if is_res in ["jpsi", "psip", "psipp"]:
         Skim_Option = {
             "IsSkim": True,
-            "Num_Tracks_Min": len(charged_children),
-            "Num_Tracks_Max": len(charged_children) + 1
+            "Num_Tracks_Min": num_charged_children,
+            "Num_Tracks_Max": num_charged_children + 1
         }
     else:
         Skim_Option = {}
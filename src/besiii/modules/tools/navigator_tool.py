@@ -1,18 +1,15 @@
 import  sys
 import os
-from typing import List, Dict, Tuple, Optional, Any, Literal
+import asyncio
+from functools import wraps
+from typing import List, Dict, Tuple, Optional, Any, Literal, Callable, Coroutine
 from typing_extensions import Annotated
-import requests
 from bs4 import BeautifulSoup
-import mechanize
-import urllib.error
-import http.cookiejar as cookielib
-import urllib.request
+import httpx
 # import feedparser
-from urllib.parse import quote
+from urllib.parse import quote, urljoin
+import xml.etree.ElementTree as ElementTree
 import json
-import arxiv
-import time
 import re
 import base64
 
@@ -20,6 +17,8 @@ from besiii.configs import CONST
 from besiii.utils import str_utils
 from besiii.utils.pdf_parser import pdf_parser_by_mineru
 from besiii.utils import Logger
+from besiii.modules.tools.http_pool import HTTPClientPool, run_sync
+from besiii.modules.tools.search_cache import SearchCache, normalize_arxiv_id
 
 logger = Logger.get_logger("tool_calls_register.py")
 
@@ -33,6 +32,27 @@ api_key_serpapi = os.environ.get("SERPAPI_API_KEY", None) or "389a1c2fa8394ede00
 DOCDB_ACCOUNT = os.environ.get("DOCDB_ACCOUNT", None) or "zhangbolun@ihep.ac.cn"
 DOCDB_PASSWORD = os.environ.get("DOCDB_PASSWORD", None) or "Zhang808515"
 
+## 检索服务地址
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+INSPIRE_API_URL = "https://inspirehep.net/api"
+DOCDB_SEARCH_URL = "https://docbes3.ihep.ac.cn/cgi-bin/DocDB/Search?"
+SERPAPI_URL = "https://serpapi.com/search.json"
+
+## 各主机的限速：(每秒请求数, 突发请求数)，取代每次检索后固定等待3秒
+RATE_LIMITS = {
+    "export.arxiv.org": (1 / 3, 1), # arXiv API要求每3秒最多一个请求
+    "arxiv.org": (1.0, 4),
+    "inspirehep.net": (3.0, 15), # INSPIRE API允许每5秒15个请求
+    "docbes3.ihep.ac.cn": (2.0, 4),
+    "serpapi.com": (5.0, 5),
+}
+
+## 所有检索共享的连接池
+http_pool = HTTPClientPool(RATE_LIMITS)
+
+## 检索结果缓存，各检索工具先查缓存，一天内重复的检索不再请求外部服务
+search_cache = SearchCache(f"{CONST.CACHE_DIR}/search_cache.sqlite3", query_ttl=24 * 3600, record_ttl=30 * 24 * 3600)
+
 
 #########################################################################################################
 ## 文章检索结果输出格式化定义及其他工具
@@ -82,7 +102,7 @@ def articleInfos_to_string(source: str, article_infos: Dict[str, str], url: str
         
         output = "Here are the articles found in " + source + ":\n\n" + output
     
-    output = str_utils.mathml2latex(output)
+    # output = str_utils.mathml2latex(output) # mathml2latex 在 str_utils 中已停用
     return output
 
 def query_formatting(query: str) -> str:
@@ -106,40 +126,112 @@ def query_formatting(query: str) -> str:
 
     return ' '.join(result)
 
-def docDB_request(url: str = "") -> str:
+class DocDBSession:
+    """
+    登录后的DocDB会话。登录状态保存在连接池共享的cookie中，之后的请求直接使用，
+    只在返回登录页（首次访问或会话过期）时重新登录。
+    """
+    USER_AGENT = 'Mozilla/5.0 (X11; U; Linux i686; en-US; rv:1.9.0.1) Gecko/2008071615 Fedora/3.0.1-1.fc9 Firefox/3.0.1'
+
+    def __init__(self, pool: HTTPClientPool, account: str, password: str):
+        self.pool = pool
+        self.account = account
+        self.password = password
+
+    async def get(self, url: str) -> str:
+        response = await self._request("GET", url)
+        if self._is_login_page(response):
+            response = await self._login(response)
+        return response.text
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        response = await self.pool.request(method, url, headers={"User-Agent": self.USER_AGENT}, timeout=10, **kwargs) # 增加超时设置
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _is_login_page(response: httpx.Response) -> bool:
+        return 'name="j_username"' in response.text
+
+    async def _login(self, response: httpx.Response) -> httpx.Response:
+        # 提交用户名密码，再提交单点登录返回的自动跳转表单，最终跳转回请求的页面
+        response = await self._submit_form(response, {"j_username": self.account, "j_password": self.password})
+        if self._is_login_page(response):
+            raise PermissionError("DocDB login failed, please check DOCDB_ACCOUNT and DOCDB_PASSWORD.")
+        return await self._submit_form(response, {})
+
+    async def _submit_form(self, response: httpx.Response, fields: Dict[str, str]) -> httpx.Response:
+        """提交页面中的第一个表单，与浏览器点击第一个提交按钮相同"""
+        form = BeautifulSoup(response.text, 'html.parser').find('form')
+        if form is None:
+            raise RuntimeError(f"No form found in DocDB login page {response.url}")
+        data = {}
+        submitted = False
+        for control in form.find_all(['input', 'button', 'select', 'textarea']):
+            name = control.get('name')
+            control_type = (control.get('type') or '').lower()
+            if not name or control_type in ('reset', 'image', 'file'):
+                continue
+            if control_type in ('submit', 'button') or control.name == 'button':
+                if submitted or control_type == 'button':
+                    continue
+                submitted = True
+            if control_type in ('checkbox', 'radio') and not control.has_attr('checked'):
+                continue
+            data[name] = control.get('value', '')
+        data.update(fields)
+        action = urljoin(str(response.url), form.get('action') or '')
+        if (form.get('method') or 'get').lower() == 'post':
+            return await self._request("POST", action, data=data)
+        return await self._request("GET", action, params=data)
+
+docdb_session = DocDBSession(http_pool, DOCDB_ACCOUNT, DOCDB_PASSWORD)
+
+async def docDB_request_async(url: str = "") -> str:
     if not url:
         return "No url provided to request DocDB."
     # url = "https://docbes3.ihep.ac.cn/cgi-bin/DocDB/ShowDocument?docid=1458"
     # url = "https://docbes3.ihep.ac.cn/cgi-bin/DocDB/Search?&titlesearch=3770+reconstruction&titlesearchmode=allsub&outformat=xml"
     # url = "view-source:https://docbes3.ihep.ac.cn/cgi-bin/DocDB/ShowDocument?docid=1515&version=1"
-    
-    cj = cookielib.CookieJar()
-    br = mechanize.Browser()
-    br.set_handle_robots(False)
-    br.set_cookiejar(cj)
-
-    br.set_handle_equiv(True)
-    br.set_handle_gzip(True)
-    br.set_handle_redirect(True)
-    br.set_handle_refresh(False)
-    br.set_handle_referer(True)
-    br.set_handle_robots(False)
-
-    br.set_handle_refresh(mechanize._http.HTTPRefreshProcessor(), max_time=1)
-    br.addheaders = [('User-agent', 'Mozilla/5.0 (X11; U; Linux i686; en-US; rv:1.9.0.1) Gecko/2008071615 Fedora/3.0.1-1.fc9 Firefox/3.0.1')]
-
-    br.open(url, timeout=10)  # 增加超时设置
-
-    br.select_form(nr=0)
-    br.form['j_username'] = DOCDB_ACCOUNT
-    br.form['j_password'] = DOCDB_PASSWORD
-    br.submit()
-    br.select_form(nr=0)
-    br.submit()
-
-    response = br.response().read()
-    # print(response)
-    return response
+    return await docdb_session.get(url)
+
+def docDB_request(url: str = "") -> str:
+    return run_sync(docDB_request_async(url))
+
+def parse_arxiv_feed(feed: str) -> List[Dict[str, Any]]:
+    """解析arXiv API返回的Atom feed"""
+    ns = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+    papers = []
+    for entry in ElementTree.fromstring(feed).findall("atom:entry", ns):
+        pdf_urls = [link.get("href") for link in entry.findall("atom:link", ns) if link.get("title") == "pdf"]
+        arxiv_id = normalize_arxiv_id(entry.findtext("atom:id", "", ns) or (pdf_urls[0] if pdf_urls else ""))
+        papers.append({
+            "arxiv_id": arxiv_id,
+            "doi": entry.findtext("arxiv:doi", "", ns),
+            "title": re.sub(r"\s+", " ", entry.findtext("atom:title", "", ns)),
+            "authors": [author.findtext("atom:name", "", ns) for author in entry.findall("atom:author", ns)],
+            "published_date": entry.findtext("atom:published", "", ns)[:10],
+            "pdf_url": pdf_urls[0] if pdf_urls else "",
+            "abstract": entry.findtext("atom:summary", "", ns).strip(),
+        })
+    return papers
+
+async def download_file(url: str, path: str) -> bool:
+    """下载文件，成功时返回True"""
+    response = await http_pool.get(url)
+    if response.status_code != 200:
+        return False
+    await asyncio.to_thread(Path(path).write_bytes, response.content)
+    return True
+
+def sync_tool(async_func: Callable[..., Coroutine[Any, Any, str]], name: str) -> Callable[..., str]:
+    """异步检索函数的同步版本，参数与文档相同，在后台事件循环中运行"""
+    @wraps(async_func)
+    def wrapper(*args, **kwargs) -> str:
+        return run_sync(async_func(*args, **kwargs))
+    wrapper.__name__ = name
+    wrapper.__qualname__ = name
+    return wrapper
 
 #########################################################################################################
 
@@ -169,11 +261,9 @@ query_prompt = """
         - **Output**: "discovery AND (psi(3770) OR 3770 OR psi3770)"
     """
 
-TIME_SLEEP = 3 
-
 
 @str_utils.print_args
-def arxiv_search(
+async def arxiv_search_async(
     query: Annotated[str, query_prompt], # must be the first parameter, otherwise error. PS: if you wanna requried parameters, do not use default value!
     category: Annotated[Literal["astro-ph", "cond-mat", "gr-qc", "hep-ex", "hep-lat", "hep-ph", "hep-th", "math-ph", "nlin", "nucl-ex", "nucl-th", "physics", "quant-ph", "cs", "econ", "eess", "math", "q-bio", "q-fin", "stat"], "The article's category. "] = "",
     metadata: Annotated[Literal["ti", "au", "abs", "id", "co", "all"], f"The search scope. 'ti' for titles, 'au' for authors, 'abs' for abstracts, 'id' for arXiv identifiers, 'co' for comments, and 'all' to search across all categories by default."] = "all",
@@ -186,40 +276,47 @@ def arxiv_search(
     Search for articles in arXiv. This is the preferred choice for searching papers.
     """
 
-    client = arxiv.Client()
-    
     ## 构建query字符串
     query_pro = str_utils.add_prefix(query, metadata + ":") # arxiv use "ti:keywords"
     query_pro = query_formatting(query_pro) # 格式化query字符串
     query_pro = query_pro.replace("*", "").replace("{", "").replace("}", "") # arxiv API检索不支持通配符和花括号，单词的括号也会影响结果
     
-    ## 检索
-    search = arxiv.Search(
-        query = query_pro,
-        max_results = max_results, # seems bug here, always =100 in query url
-        sort_by = arxiv.SortCriterion.SubmittedDate, # "Relevance", "LastUpdatedDate", "SubmittedDate" ### ???用SubmittedDate或LastUpdatedDate时复杂逻辑式直接什么也搜不到，例如all:Zc3900 OR all:3900 OR all:Z_c(3900) OR all:Z(3900) OR (all:Z_c) #NOTE 不是搜索不到，而是单词括号内外的内容会当做单独的东西去搜索。比如Z(3900)，他实际会按照Z OR 3900去搜，导致匹配大量无关文章
-        sort_order = arxiv.SortOrder.Descending, # "Ascending" or "Descending"
-        # id_list=[], # no need to use: search_by_id = arxiv.Search(id_list=["1605.08386v1"]),
-    )
+    ## 检索，先查缓存
+    papers = await asyncio.to_thread(search_cache.get_articles, "arxiv", query_pro, max_results)
+    if papers is None:
+        response = await http_pool.get(ARXIV_API_URL, params={
+            "search_query": query_pro,
+            "id_list": "",
+            "sortBy": "submittedDate", # "relevance", "lastUpdatedDate", "submittedDate" ### ???用SubmittedDate或LastUpdatedDate时复杂逻辑式直接什么也搜不到，例如all:Zc3900 OR all:3900 OR all:Z_c(3900) OR all:Z(3900) OR (all:Z_c) #NOTE 不是搜索不到，而是单词括号内外的内容会当做单独的东西去搜索。比如Z(3900)，他实际会按照Z OR 3900去搜，导致匹配大量无关文章
+            "sortOrder": "descending", # "ascending" or "descending"
+            "start": 0,
+            "max_results": max_results,
+        })
+        response.raise_for_status()
+        records = [
+            dict(id=f"arxiv:{paper['arxiv_id']}", arxiv_id=paper["arxiv_id"], doi=paper["doi"], title=paper["title"],
+                 authors=paper["authors"], published_date=paper["published_date"], url=paper["pdf_url"], abstract=paper["abstract"])
+            for paper in parse_arxiv_feed(response.text)[:max_results]
+        ]
+        papers = await asyncio.to_thread(search_cache.put_articles, "arxiv", query_pro, records, max_results)
 
     ## 处理结果
     article_infos = {}
-    for i, paper in enumerate(client.results(search)):          
-        title = paper.title
-        authors = [author.name for author in paper.authors]
-        published_date = paper._raw.published[:10]
-        #article_url = paper.entry_id
-        article_url = paper.pdf_url
-        abstract = paper.summary
+    for i, paper in enumerate(papers):
+        title = paper["title"]
+        authors = paper["authors"]
+        published_date = paper["published_date"]
+        article_url = paper["url"]
+        abstract = paper["abstract"]
 
         ## 下载与解析pdf
         params = {}
         if is_content_needed:
-            paper.download_pdf(dirpath=f"{CONST.FILE_DIR}", filename=f"{article_url.split('/')[-1]}.pdf")
-            #paper.download_source(dirpath=f"{CONST.FILE_DIR}", filename=f"{paper.id}.tar.gz") # 源代码
-            pdf_content = pdf_parser_by_mineru(
-                path=f"{CONST.FILE_DIR}/{article_url.split('/')[-1]}.pdf")
-            params["full_text"] = pdf_content
+            pdf_path = f"{CONST.FILE_DIR}/{article_url.split('/')[-1]}.pdf"
+            if await download_file(article_url, pdf_path):
+                params["full_text"] = await asyncio.to_thread(pdf_parser_by_mineru, path=pdf_path)
+            else:
+                print("Failed to download PDF file from arXiv.")
         
         article_info = article_output_formatting(title=title, authors=authors, published_date=published_date, url=article_url, abstract=abstract, **params)
         article_infos[i] = article_info
@@ -227,12 +324,12 @@ def arxiv_search(
     
     ## 输出结果
     output = articleInfos_to_string(source="arXiv", article_infos=article_infos, url=query_pro)
-
-    time.sleep(TIME_SLEEP) # 延迟3秒，避免频繁访问服务器
     return output
 
+arxiv_search = sync_tool(arxiv_search_async, "arxiv_search")
+
 @str_utils.print_args
-def inspire_search(
+async def inspire_search_async(
     query: Annotated[str, query_prompt], # must be the first parameter, otherwise error
     record_type: Annotated[Literal['literature', 'authors', 'institutions', 'conferences', 'seminars', 'journals', 'jobs', 'experiments', 'data'], "The record type."] = "literature",
     author_names: Annotated[List[str], f"The author names."] = None,
@@ -325,76 +422,84 @@ def inspire_search(
     # num_docDB = 0
     # num_total = 0
     
-    ## search in inspire
-    url = f"https://inspirehep.net/api/{record_type}?{query_string}"
+    ## search in inspire, 先查缓存
+    url = f"{INSPIRE_API_URL}/{record_type}?{query_string}"
     print("\033[93m"+url+"\033[0m")
-    #encoded_url = quote(url)
-    response = requests.get(url)
-    if response.status_code == 200:
-        hits = response.json().get("hits", {})
-        if hits:
-            num_inspire = hits["total"]
-            for i, entry in enumerate(hits["hits"]):
-            #for i, entry in enumerate(response.json()["hits"]):
-                if i > max_results - 1:
-                    break
-                # for j, entry2 in enumerate(entry):
-                # #for j, entry2 in enumerate(entry["metadata"]):
-                #     print(j, entry2)
-                ## extract infos
-                title = entry.get("metadata", {}).get("titles", [{}])[0].get("title", "Unknown")
-                authors = entry.get("metadata", {}).get("authors", [])
-                author_name_list = []
-                for author in authors:
-                    #full_name = author.get("full_name", "Unknown")
-                    first_name = author.get("first_name", "Unknown")
-                    last_name = author.get("last_name", "Unknown")
-                    author_name_list.append(f"{first_name} {last_name}")
-                    
-                # first_author = entry.get("metadata", {}).get("first_author", {}).get("full_name", "Unknown")
-                # if not first_author:
-                #     first_author = entry.get("metadata", {}).get("authors", [{}])[0].get("full_name", "Unknown")
-                published_date = entry.get("created", "")[:10]
-                article_url = entry.get("metadata", {}).get("documents", [{}])[0].get("url", "Unknown")
-                abstract = entry.get("metadata", {}).get("abstracts", [{}])[0].get("value", "Unknown")
-                arxiv_id = entry.get("metadata", {}).get("arxiv_eprints", [{}])[0].get("value", "Unknown")
-                if article_url == "Unknown" and arxiv_id != "Unknown":
-                    article_url = f"https://arxiv.org/pdf/{arxiv_id}"
-                
-                ## 下载
-                params = {}
-                if is_content_needed:
-                    if article_url != "Unknown":
-                        # paper = next(arxiv.Client().results(arxiv.Search(id_list=[arxiv_id])))
-                        # paper.download_pdf(dirpath=f"{CONST.FILE_DIR}", filename=f"{paper.id}.pdf")
-                        # paper.download_source(dirpath=f"{CONST.FILE_DIR}", filename=f"{paper.id}.tar.gz") # 源代码
-                        response = requests.get(article_url)
-                        if response.status_code == 200:
-                            arxiv_id_save = arxiv_id.split("/")[-1]
-                            with open(f"{CONST.FILE_DIR}/{arxiv_id_save}.pdf", "wb") as file:
-                                file.write(response.content)
-                            
-                            pdf_content = pdf_parser_by_mineru(
-                                path=f"{CONST.FILE_DIR}/{article_url.split('/')[-1]}.pdf")
-                            params["full_text"] = pdf_content
-                        else:
-                            print("Failed to download PDF file from inspire.")
-                    else:
-                        print("No PDF link found in INSPIRE.")
-        
-                article_info = article_output_formatting(title=title, authors=author_name_list, published_date=published_date, url=article_url, abstract=abstract, **params)
-                article_infos[i] = article_info
-    else:
-        print("Failed to connect to INSPIRE.")
+    cache_query = f"{record_type}?{query_string}"
+    papers = await asyncio.to_thread(search_cache.get_articles, "inspire", cache_query, max_results)
+    if papers is None and (Eprint or doi) and not (texkey or report_number or record_id):
+        ## 按arXiv号或DOI检索时，其他来源已检索到的同一篇文章直接使用
+        paper = await asyncio.to_thread(search_cache.get_article, arxiv_id=Eprint, doi=doi)
+        papers = [paper] if paper and max_results > 0 else None
+    if papers is None:
+        #encoded_url = quote(url)
+        response = await http_pool.get(url)
+        if response.status_code == 200:
+            records = []
+            hits = response.json().get("hits", {})
+            if hits:
+                num_inspire = hits["total"]
+                for i, entry in enumerate(hits["hits"]):
+                #for i, entry in enumerate(response.json()["hits"]):
+                    if i > max_results - 1:
+                        break
+                    ## extract infos
+                    metadata_inspire = entry.get("metadata", {})
+                    title = metadata_inspire.get("titles", [{}])[0].get("title", "Unknown")
+                    authors = metadata_inspire.get("authors", [])
+                    author_name_list = []
+                    for author in authors:
+                        #full_name = author.get("full_name", "Unknown")
+                        first_name = author.get("first_name", "Unknown")
+                        last_name = author.get("last_name", "Unknown")
+                        author_name_list.append(f"{first_name} {last_name}")
+
+                    # first_author = entry.get("metadata", {}).get("first_author", {}).get("full_name", "Unknown")
+                    # if not first_author:
+                    #     first_author = entry.get("metadata", {}).get("authors", [{}])[0].get("full_name", "Unknown")
+                    published_date = entry.get("created", "")[:10]
+                    article_url = metadata_inspire.get("documents", [{}])[0].get("url", "Unknown")
+                    abstract = metadata_inspire.get("abstracts", [{}])[0].get("value", "Unknown")
+                    arxiv_id = metadata_inspire.get("arxiv_eprints", [{}])[0].get("value", "")
+                    if article_url == "Unknown" and arxiv_id:
+                        article_url = f"https://arxiv.org/pdf/{arxiv_id}"
+                    records.append(dict(
+                        id=f"inspire:{record_type}/{metadata_inspire.get('control_number', title)}",
+                        arxiv_id=arxiv_id, doi=metadata_inspire.get("dois", [{}])[0].get("value", ""), title=title,
+                        authors=author_name_list, published_date=published_date, url=article_url, abstract=abstract))
+            papers = await asyncio.to_thread(search_cache.put_articles, "inspire", cache_query, records, max_results)
+        else:
+            papers = []
+            print("Failed to connect to INSPIRE.")
+
+    for i, paper in enumerate(papers):
+        article_url = paper["url"]
+
+        ## 下载
+        params = {}
+        if is_content_needed:
+            if article_url != "Unknown":
+                arxiv_id_save = (paper.get("arxiv_id") or article_url).split("/")[-1]
+                if await download_file(article_url, f"{CONST.FILE_DIR}/{arxiv_id_save}.pdf"):
+                    pdf_content = await asyncio.to_thread(
+                        pdf_parser_by_mineru, path=f"{CONST.FILE_DIR}/{article_url.split('/')[-1]}.pdf")
+                    params["full_text"] = pdf_content
+                else:
+                    print("Failed to download PDF file from inspire.")
+            else:
+                print("No PDF link found in INSPIRE.")
+
+        article_info = article_output_formatting(**paper, **params)
+        article_infos[i] = article_info
     
     ## 输出结果
     output = articleInfos_to_string(source="INSPIRE", article_infos=article_infos, url=url)
-    
-    time.sleep(TIME_SLEEP) # 延迟3秒，避免频繁访问服务器
     return output
 
+inspire_search = sync_tool(inspire_search_async, "inspire_search")
+
 @str_utils.print_args
-def docDB_search(
+async def docDB_search_async(
     query: Annotated[str, query_prompt], # must be the first parameter, otherwise error
     metadata: Annotated[Literal["ti", "au", "abs", "id", "co", "all"], f"The search scope. 'ti' for titles, 'au' for authors, 'abs' for abstracts, 'id' for arXiv identifiers, 'co' for comments, and 'all' to search across all categories by default."] = "all",
     max_results: Annotated[int, "The number of articles the user would like to search for."] = 3,
@@ -405,7 +510,7 @@ def docDB_search(
     Search for articles in DocDB, the internal database of BESIII. This function does not return papers related to BESIII itself, but only returns physical analysis articles produced by the BESIII collaboration.
     """
     try:
-        base_url_docDB = "https://docbes3.ihep.ac.cn/cgi-bin/DocDB/Search?"
+        base_url_docDB = DOCDB_SEARCH_URL
         category_map = {
             "ti": "title",
             "abs": "abstract",
@@ -414,47 +519,62 @@ def docDB_search(
         }
         query_pro = query_formatting(query) # 格式化query字符串
         url = base_url_docDB + f"titlesearchmode=allsub&titlesearch={query_pro}"
-        response_docDB = docDB_request(url)
-        soup = BeautifulSoup(response_docDB, 'html.parser')
 
-        article_infos = {}
-        for i, article in enumerate(soup.find('table', class_='Alternating DocumentList').find_all('tr')):
-            docid_link = article.find('td', class_='Docid')
-            if docid_link and docid_link.a:
-                article_url = docid_link.a['href']
-                docid = docid_link.a.get_text(strip=True)
-                
-                title_tag = article.find('td', class_='Title')
-                title = title_tag.a.get_text(strip=True) if title_tag and title_tag.a else None
-                
-                author_tags = article.find('td', class_='Author')
-                authors = [author.get_text(strip=True) for author in author_tags.find_all('a')] if author_tags else []
-                
-                updated_tag = article.find('td', class_='Updated')
-                published_date = updated_tag.get_text(strip=True) if updated_tag else None
-
-                ## get abstract from the article_url
-                child_response_docDB = docDB_request(article_url)
+        ## 先查缓存
+        articles = await asyncio.to_thread(search_cache.get_articles, "docdb", url, max_results)
+        if articles is None:
+            response_docDB = await docDB_request_async(url)
+            soup = BeautifulSoup(response_docDB, 'html.parser')
+
+            async def get_abstract(article_url: str) -> str:
+                child_response_docDB = await docDB_request_async(article_url)
                 soup2 = BeautifulSoup(child_response_docDB, 'html.parser')
-                abstract = soup2.find(text=lambda text: text and "Abstract" in text).find_next().text
+                return soup2.find(string=lambda text: text and "Abstract" in text).find_next().text
+
+            articles = []
+            for article in soup.find('table', class_='Alternating DocumentList').find_all('tr'):
+                if len(articles) >= max_results:
+                    break
+                docid_link = article.find('td', class_='Docid')
+                if docid_link and docid_link.a:
+                    article_url = docid_link.a['href']
+                    docid = docid_link.a.get_text(strip=True)
+
+                    title_tag = article.find('td', class_='Title')
+                    title = title_tag.a.get_text(strip=True) if title_tag and title_tag.a else None
 
-                article_info = article_output_formatting(title=title, authors=authors, published_date=published_date, url=article_url, abstract=abstract)
-                article_infos[i] = article_info
-            
-            if i > max_results - 1:
-                break
+                    author_tags = article.find('td', class_='Author')
+                    authors = [author.get_text(strip=True) for author in author_tags.find_all('a')] if author_tags else []
+
+                    updated_tag = article.find('td', class_='Updated')
+                    published_date = updated_tag.get_text(strip=True) if updated_tag else None
+
+                    articles.append(dict(id=f"docdb:{docid}", title=title, authors=authors, published_date=published_date, url=article_url))
+
+            ## get abstracts from the article_urls, requested concurrently within the rate limit;
+            ## 之前检索中已获取过摘要的文章不再请求
+            cached = await asyncio.to_thread(lambda: [search_cache.get_article(article["id"]) for article in articles])
+            missing = [article for article, record in zip(articles, cached) if not (record and record.get("abstract"))]
+            abstracts = await asyncio.gather(*(get_abstract(article["url"]) for article in missing))
+            for article, abstract in zip(missing, abstracts):
+                article["abstract"] = abstract
+            articles = await asyncio.to_thread(search_cache.put_articles, "docdb", url, articles, max_results)
+
+        article_infos = {}
+        for i, article in enumerate(articles):
+            article_infos[i] = article_output_formatting(**article)
 
         ## 输出结果
         output = articleInfos_to_string(source="DocDB", article_infos=article_infos, url=url)
-        
-        time.sleep(TIME_SLEEP) # 延迟3秒，避免频繁访问服务器
         return output
     except Exception as e:
         logger.error(f"Error: {e}")
         return f"Error in web_searching of {this_filename} for " + str(e)
+
+docDB_search = sync_tool(docDB_search_async, "docDB_search")
     
 @str_utils.print_args
-def web_searching(
+async def web_searching_async(
     query: Annotated[str, "Questions or keywords that need to be searched"],
     engine: Annotated[Literal["google", "bing", "baidu"], "The search engine to use."] = "google",
     # **kwargs: Annotated[Any, "Additional keywords to be passed to the function."], # so many similar search functions, the parameters may be confusing for LLM.
@@ -463,11 +583,17 @@ def web_searching(
     engine=engine.lower()
 
     try:
-        base_url = "https://serpapi.com/search.json"
+        base_url = SERPAPI_URL
         url = f"{base_url}?engine={engine}&q={query}&api_key={api_key_serpapi}"
-        response = requests.get(url)
-        results = response.json()
-        organic_results = results.get("organic_results", [])
+
+        ## 先查缓存
+        organic_results = await asyncio.to_thread(search_cache.get_query, f"web:{engine}", query)
+        if organic_results is None:
+            response = await http_pool.get(url)
+            results = response.json()
+            organic_results = results.get("organic_results", [])
+            if response.status_code == 200 and "error" not in results:
+                await asyncio.to_thread(search_cache.put_query, f"web:{engine}", query, organic_results)
         
         output = ""
         for r in organic_results:
@@ -483,8 +609,9 @@ def web_searching(
         else:
             output = "No results found from " + engine + "."
         
-        time.sleep(3) # 延迟3秒，避免频繁访问服务器
         return output
     except Exception as e:
         logger.error(f"Error: {e}")
-        return f"Error in web_searching of {this_filename} for " + str(e)
\ No newline at end of file
+        return f"Error in web_searching of {this_filename} for " + str(e)
+
+web_searching = sync_tool(web_searching_async, "web_searching")
@@ -0,0 +1,272 @@
+# Persistent cache of literature search results, shared by the navigator tools
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    max_results INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (source, query)
+);
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    key TEXT NOT NULL
+);
+"""
+
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def normalize_query(query: str) -> str:
+    """合并空白并转为小写（逻辑符号 AND/OR/NOT 保持大写），使写法略有不同的同一检索命中同一缓存"""
+    return " ".join(
+        token if token in _OPERATORS else token.lower() for token in query.split()
+    )
+
+
+def normalize_arxiv_id(arxiv_id: str) -> str:
+    """'arXiv:2405.00001v2'、'http://arxiv.org/abs/2405.00001v2' 均规范为 '2405.00001'"""
+    arxiv_id = arxiv_id.strip()
+    arxiv_id = re.sub(
+        r"^(https?://(export\.)?arxiv\.org/(abs|pdf)/|arxiv:)",
+        "",
+        arxiv_id,
+        flags=re.IGNORECASE,
+    )
+    arxiv_id = re.sub(r"\.pdf$", "", arxiv_id)
+    return re.sub(r"v\d+$", "", arxiv_id)
+
+
+def normalize_doi(doi: str) -> str:
+    """'https://doi.org/10.1103/X'、'doi:10.1103/X' 均规范为 '10.1103/x'"""
+    doi = doi.strip().lower()
+    return re.sub(r"^(https?://(dx\.)?doi\.org/|doi:)", "", doi)
+
+
+def record_aliases(record: Dict[str, Any]) -> List[str]:
+    """记录的所有标识：来源内的 id，以及跨来源去重用的 arXiv 号和 DOI"""
+    aliases = [record["id"]]
+    if record.get("arxiv_id"):
+        aliases.append(f"arxiv:{normalize_arxiv_id(record['arxiv_id'])}")
+    if record.get("doi"):
+        aliases.append(f"doi:{normalize_doi(record['doi'])}")
+    return aliases
+
+
+class SearchCache:
+    """
+    基于SQLite的检索结果缓存，保存两类数据：
+    - 检索：(来源, 规范化的检索式) 到结果列表的映射，在 query_ttl 秒内有效；
+    - 文章记录：文章元数据，在 record_ttl 秒内有效。arXiv号或DOI相同的记录视为同一篇文章，
+      不论来自arXiv、INSPIRE还是DocDB只保存一份，先保存的字段优先，后来的记录只补充缺少的字段。
+
+    数据库在第一次使用时打开，可在多个线程和事件循环间共享。
+
+    Args:
+        path: 数据库文件路径，为 ":memory:" 时只保存在内存中。
+        query_ttl: 检索结果的有效期（秒）。
+        record_ttl: 文章记录的有效期（秒）。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        query_ttl: float = 24 * 3600,
+        record_ttl: float = 30 * 24 * 3600,
+    ):
+        self.path = path
+        self.query_ttl = query_ttl
+        self.record_ttl = record_ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._purge()
+        return self._conn
+
+    def _purge(self) -> None:
+        """删除过期的检索和记录"""
+        now = time.time()
+        assert self._conn is not None
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM queries WHERE created < ?", (now - self.query_ttl,)
+            )
+            self._conn.execute(
+                "DELETE FROM records WHERE created < ?", (now - self.record_ttl,)
+            )
+            self._conn.execute(
+                "DELETE FROM aliases WHERE key NOT IN (SELECT key FROM records)"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM queries")
+                conn.execute("DELETE FROM records")
+                conn.execute("DELETE FROM aliases")
+
+    ## 检索结果
+    def get_query(
+        self, source: str, query: str, max_results: int = 0
+    ) -> Optional[List[Any]]:
+        """
+        返回缓存的检索结果，没有或已过期时返回None。
+        以更多的 max_results 检索过的结果也可用于较少的 max_results；结果数少于当时请求的数目时，
+        说明已是全部结果，可用于任意 max_results。
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT max_results, results, created FROM queries WHERE source = ? AND query = ?",
+                    (source, normalize_query(query)),
+                )
+                .fetchone()
+            )
+        if row is None or time.time() - row[2] > self.query_ttl:
+            return None
+        cached_max, results = row[0], json.loads(row[1])
+        if cached_max < max_results and len(results) >= cached_max:
+            return None
+        return results[:max_results] if max_results else results
+
+    def put_query(
+        self, source: str, query: str, results: List[Any], max_results: int = 0
+    ) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?)",
+                    (
+                        source,
+                        normalize_query(query),
+                        max_results,
+                        json.dumps(results),
+                        time.time(),
+                    ),
+                )
+
+    ## 文章记录
+    def _lookup(
+        self, conn: sqlite3.Connection, aliases: Iterable[str]
+    ) -> Optional[tuple]:
+        for alias in aliases:
+            row = conn.execute(
+                "SELECT records.key, records.data, records.created FROM aliases "
+                "JOIN records ON records.key = aliases.key WHERE alias = ?",
+                (alias,),
+            ).fetchone()
+            if row is not None and time.time() - row[2] <= self.record_ttl:
+                return row
+        return None
+
+    def get_article(
+        self, key: str = "", arxiv_id: str = "", doi: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """按来源内的 id、arXiv号或DOI查找文章记录"""
+        aliases = record_aliases({"id": key, "arxiv_id": arxiv_id, "doi": doi})
+        with self._lock:
+            row = self._lookup(self._connect(), aliases if key else aliases[1:])
+        return json.loads(row[1]) if row is not None else None
+
+    def _put_article(
+        self, conn: sqlite3.Connection, record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        aliases = record_aliases(record)
+        row = self._lookup(conn, aliases)
+        if row is None:
+            key, created, merged = record["id"], time.time(), dict(record)
+        else:
+            key, created, merged = row[0], row[2], json.loads(row[1])
+            for field, value in record.items():
+                if value and not merged.get(field):
+                    merged[field] = value
+        conn.execute(
+            "INSERT OR REPLACE INTO records VALUES (?, ?, ?)",
+            (key, json.dumps(merged), created),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO aliases VALUES (?, ?)",
+            [(alias, key) for alias in aliases],
+        )
+        return merged
+
+    def put_article(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """保存文章记录（须有 "id" 字段），与已有的同一篇文章合并，返回合并后的记录"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return self._put_article(conn, record)
+
+    def get_articles(
+        self, source: str, query: str, max_results: int = 0
+    ) -> Optional[List[Dict[str, Any]]]:
+        """返回缓存的检索结果对应的文章记录，检索或其中任一记录不在缓存中时返回None"""
+        keys = self.get_query(source, query, max_results)
+        if keys is None:
+            return None
+        records = [self.get_article(key) for key in keys]
+        if any(record is None for record in records):
+            return None
+        return records
+
+    def put_articles(
+        self,
+        source: str,
+        query: str,
+        records: List[Dict[str, Any]],
+        max_results: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        保存检索结果及其文章记录，返回合并后的记录。同一篇文章在结果中重复出现时只保留第一次。
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                merged, keys = [], []
+                for record in records:
+                    article = self._put_article(conn, record)
+                    if article["id"] not in keys:
+                        keys.append(article["id"])
+                        merged.append(article)
+                conn.execute(
+                    "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?, ?)",
+                    (
+                        source,
+                        normalize_query(query),
+                        max_results,
+                        json.dumps(keys),
+                        time.time(),
+                    ),
+                )
+        return merged
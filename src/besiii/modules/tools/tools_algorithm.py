@@ -1,8 +1,11 @@
 # Tools to process the analysis algorithm
 import re, sys, os, json
 from typing import *
+from typing import Mapping, NamedTuple, Optional, Tuple
 from dotmap import DotMap
 import textwrap
+from functools import lru_cache
+from types import MappingProxyType
 
 from pathlib import Path
 here = Path(__file__).parent
@@ -24,7 +27,108 @@ RECVARS_INTERMEDIATE_STATES = {
     "Mass": 1, # mass
 }
 
+class ParticleData(NamedTuple):
+    """粒子数据库中的一条记录，质量与宽度单位已换算为GeV"""
+    mass: float
+    mass_err: float
+    width: float
+    width_err: float
+    long_lifetime: bool
+    mcid: int
+    charge: int
+    quantum_C: str
+    quantum_G: str
+    quantum_I: str
+    quantum_J: str
+    quantum_P: str
+    programmatic_name: str
+    latex_name: str
+    evtgen_name: str
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> "ParticleData":
+        return cls(
+            mass=entry['mass'] / 1000, # MeV/c^2 -> GeV/c^2
+            mass_err=entry['mass_error'] / 1000,
+            width=entry['width'] / 1000, # MeV -> GeV
+            width_err=entry['width_error'] / 1000,
+            long_lifetime=entry['long_lifetime'], # bool
+            mcid=entry['mcid'],
+            charge=entry['charge'],
+            quantum_C=entry['quantum_C'],
+            quantum_G=entry['quantum_G'],
+            quantum_I=entry['quantum_I'],
+            quantum_J=entry['quantum_J'],
+            quantum_P=entry['quantum_P'],
+            programmatic_name=entry['programmatic_name'],
+            latex_name=entry['latex_name'],
+            evtgen_name=entry['evtgen_name'],
+        )
+
+class ParticleIndex:
+    """
+    粒子数据库的只读内存索引，可按 name、mcid、programmatic_name 查询。
+    mcid 重复时（如 100443）返回数据库中靠前的粒子。
+    """
+    __slots__ = ("database", "_by_name", "_by_mcid", "_by_programmatic_name")
+
+    def __init__(self, database: dict):
+        self.database = MappingProxyType(database)
+        by_name = {}
+        by_mcid = {}
+        by_programmatic_name = {}
+        for name, entry in database.items():
+            data = ParticleData.from_entry(entry)
+            by_name[name] = (name, data)
+            by_mcid.setdefault(data.mcid, (name, data))
+            by_programmatic_name.setdefault(data.programmatic_name, (name, data))
+        self._by_name = MappingProxyType(by_name)
+        self._by_mcid = MappingProxyType(by_mcid)
+        self._by_programmatic_name = MappingProxyType(by_programmatic_name)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ParticleIndex":
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get(self, name: str) -> Optional[ParticleData]:
+        """按粒子名称查询，不存在时返回None"""
+        found = self._by_name.get(name)
+        return found[1] if found is not None else None
+
+    def name_from_mcid(self, mcid: int) -> Optional[str]:
+        """按 mcid 查询粒子名称，不存在时返回None"""
+        found = self._by_mcid.get(mcid)
+        return found[0] if found is not None else None
+
+    def name_from_programmatic_name(self, programmatic_name: str) -> Optional[str]:
+        """按 programmatic_name 查询粒子名称，不存在时返回None"""
+        found = self._by_programmatic_name.get(programmatic_name)
+        return found[0] if found is not None else None
+
+_particle_index: Optional[ParticleIndex] = None
+
+def get_particle_index() -> ParticleIndex:
+    """返回进程内共享的粒子索引，首次调用时读取 Particle_bes3.json"""
+    global _particle_index
+    if _particle_index is None:
+        _particle_index = ParticleIndex.from_file(here / "Particle_bes3.json")
+    return _particle_index
+
+def _particle_data_property(field: str) -> property:
+    def fget(self):
+        return getattr(self._data, field)
+    return property(fget)
+
 class Particle:
+    __slots__ = ("name", "mother", "children", "id", "is_reconstructed", "_data")
+
     def __init__(self, name: str, mother=None, children=None, id: int=0):
         
         # Decay chain variables
@@ -40,38 +144,34 @@ class Particle:
             raise ValueError(f"Particle {name} not found in database")
 
 
-    def load_database(self) -> json:
-        # Load particle database
-        with open(f"{here}/Particle_bes3.json", "r") as f:
-            particle_database = json.load(f)
-        return particle_database
+    def load_database(self) -> Mapping[str, dict]:
+        # Particle database, loaded once per process
+        return get_particle_index().database
         
     def get_particle_by_name(self, name: str) -> bool:
-        dt = self.load_database()
-
-        if name in dt.keys():
-            self.mass = dt[name]['mass'] / 1000 # MeV/c^2 -> GeV/c^2
-            self.mass_err = dt[name]['mass_error'] / 1000
-            self.width = dt[name]['width'] / 1000 # MeV -> GeV
-            self.width_err = dt[name]['width_error'] / 1000
-            self.long_lifetime = dt[name]['long_lifetime'] # bool
-
-            self.mcid = dt[name]['mcid']
-            self.charge = dt[name]['charge']
-            self.quantum_C = dt[name]['quantum_C']
-            self.quantum_G = dt[name]['quantum_G']
-            self.quantum_I = dt[name]['quantum_I']
-            self.quantum_J = dt[name]['quantum_J']
-            self.quantum_P = dt[name]['quantum_P']
-
-            self.programmatic_name = dt[name]['programmatic_name']
-            self.latex_name = dt[name]['latex_name']
-            self.evtgen_name = dt[name]['evtgen_name']
-
-            return True
-        else:
+        data = get_particle_index().get(name)
+        if data is None:
             return False
-        
+        self._data = data
+        return True
+
+    # PDG variables, read from the particle index
+    mass = _particle_data_property("mass")
+    mass_err = _particle_data_property("mass_err")
+    width = _particle_data_property("width")
+    width_err = _particle_data_property("width_err")
+    long_lifetime = _particle_data_property("long_lifetime")
+    mcid = _particle_data_property("mcid")
+    charge = _particle_data_property("charge")
+    quantum_C = _particle_data_property("quantum_C")
+    quantum_G = _particle_data_property("quantum_G")
+    quantum_I = _particle_data_property("quantum_I")
+    quantum_J = _particle_data_property("quantum_J")
+    quantum_P = _particle_data_property("quantum_P")
+    programmatic_name = _particle_data_property("programmatic_name")
+    latex_name = _particle_data_property("latex_name")
+    evtgen_name = _particle_data_property("evtgen_name")
+
 class CustomDotMap(DotMap):
     def __getattr__(self, key):
         # 如果属性不存在，返回 None
@@ -92,6 +192,12 @@ def extract_elements(decay_chain) -> Tuple[str, List[str], List[str]]:
     Input: R -> [A -> B C] D
     Output: 'R', ['A -> B C'], ['D']
     """
+    mother_particle, intermediate_states, stable_particles = _extract_elements(decay_chain)
+    return mother_particle, list(intermediate_states), list(stable_particles)
+
+@lru_cache(maxsize=4096)
+def _extract_elements(decay_chain: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    """extract_elements的缓存版本，相同的（子）衰变链只解析一次"""
     mother_particle = ""
     intermediate_states = []
     stable_particles = []
@@ -130,7 +236,7 @@ def extract_elements(decay_chain) -> Tuple[str, List[str], List[str]]:
     ## 处理非中括号内的元素
     stable_particles = re.findall(r'(\S+)', non_res)
 
-    return mother_particle, intermediate_states, stable_particles
+    return mother_particle, tuple(intermediate_states), tuple(stable_particles)
 
 def handle_indentation(string: str, num_spaces: int = 4) -> str:
     """
@@ -201,6 +307,14 @@ def get_final_state(particle_list: List) -> Tuple[List, List]:
 
     return charged_children, neutral_children, intermediate_states
 
+@lru_cache(maxsize=1024)
+def count_final_state(decay_chain: str) -> Tuple[int, int, int]:
+    """
+    统计衰变链中带电末态粒子、中性末态粒子和中间态的数目，相同的衰变链只计算一次
+    """
+    charged_children, neutral_children, intermediate_states = get_final_state(get_particles_from_decay_chain(decay_chain))
+    return len(charged_children), len(neutral_children), len(intermediate_states)
+
 def get_final_state_VarNames(charged_particle_list: List[Particle], neutral_particle_list: List[Particle], intermediate_state_list: List[Particle]) -> Tuple[List, List, List]:
     """
     生成末态粒子的变量名，以粒子名+编号的方式命名
@@ -460,14 +574,20 @@ def generate_nested_condition(particle) -> str:
     """
     生成嵌套的条件语句，循环检查其母粒子mcid以精确定位目标粒子
     """
-    condition = f"(*iter_mc)->particleProperty()=={particle.mcid} && "
+    mcids = [particle.mcid]
     current_particle = particle.mother
-    mother_count = 0
     while current_particle is not None:
-        # 构建嵌套的母粒子条件
-        condition += f"((*iter_mc)->mother())" + "".join([".mother()" for _ in range(mother_count)]) + f".particleProperty()=={current_particle.mcid} && "
+        mcids.append(current_particle.mcid)
         current_particle = current_particle.mother
-        mother_count += 1
+    return _nested_condition(tuple(mcids))
+
+@lru_cache(maxsize=4096)
+def _nested_condition(mcids: Tuple[int, ...]) -> str:
+    """按粒子及其各级母粒子的mcid生成条件语句，相同的衰变路径只生成一次"""
+    condition = f"(*iter_mc)->particleProperty()=={mcids[0]} && "
+    for mother_count, mcid in enumerate(mcids[1:]):
+        # 构建嵌套的母粒子条件
+        condition += f"((*iter_mc)->mother())" + "".join([".mother()" for _ in range(mother_count)]) + f".particleProperty()=={mcid} && "
     return condition[:-4]  # 去除最后多余的 " && "
 
 def generate_PID_condition(particle_list: List[Particle]) -> str:
@@ -1,5 +1,6 @@
 from typing import List, Dict, Union, Callable, Any, Optional
 from functools import wraps
+import inspect
 import json
 import re
 import lxml.etree as ET
@@ -300,8 +301,7 @@ def add_prefix(query, prefix=""):
 #     return query
 
 def print_args(func):
-    @wraps(func)
-    def wrapper(*args, **kwargs):
+    def _print_args(args, kwargs):
         # 获取函数参数的名称和默认值
         arg_info = func.__code__.co_varnames[:func.__code__.co_argcount]
         
@@ -318,6 +318,18 @@ def print_args(func):
             actual_args[key] = kwargs[key]
 
         print("\033[92m" + f"Arguments passed to {func.__name__}: {actual_args}" + "\033[0m")
+
+    # 异步函数需要异步的包装，否则调用方无法识别其为协程函数
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            _print_args(args, kwargs)
+            return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        _print_args(args, kwargs)
         rst = func(*args, **kwargs)
         return rst
     return wrapper
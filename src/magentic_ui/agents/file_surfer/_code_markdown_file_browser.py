@@ -1,13 +1,16 @@
+import asyncio
 import io
+import json
 import re
 import time
 from pathlib import Path
 from mimetypes import guess_type
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from autogen_core.code_executor import CodeExecutor, CodeBlock
 from autogen_core import CancellationToken
+from loguru import logger
 
-from markitdown import FileConversionException, MarkItDown, UnsupportedFormatException
+from markitdown import MarkItDown
 from ._browser_code_helpers import (
     get_path_validation_code,
     get_is_dir_check_code,
@@ -15,6 +18,9 @@ from ._browser_code_helpers import (
     get_directory_listing_code,
     get_find_files_code,
 )
+from ._file_service import FileServiceClient, FileServiceUnavailableError
+from ._paged_document import PagedDocument, ViewportSearch
+from ...tools.document_cache import ConvertedDocumentCache
 
 
 class CodeExecutorMarkdownFileBrowser:
@@ -24,6 +30,11 @@ class CodeExecutorMarkdownFileBrowser:
     This class provides functionality to browse files and directories, converting their contents
     to Markdown for display. It supports pagination, file searching, and navigation through
     directory structures.
+
+    File operations are served by a long-lived file service in the code executor, so that
+    opening a path is a single round trip to a warm converter. If the service cannot run,
+    each operation falls back to a one-off script. With a document cache, files whose
+    content was converted before are not converted again.
     """
 
     def __init__(
@@ -31,6 +42,9 @@ class CodeExecutorMarkdownFileBrowser:
         code_executor: CodeExecutor,
         viewport_size: int = 1024 * 8,
         save_converted_files: bool = False,
+        use_file_service: bool = True,
+        direct_read_size: int = 8 * 1024 * 1024,
+        document_cache: Optional[ConvertedDocumentCache] = None,
     ):
         """
         Initialize a new CodeExecutorMarkdownFileBrowser.
@@ -39,21 +53,28 @@ class CodeExecutorMarkdownFileBrowser:
             code_executor (CodeExecutor): The CodeExecutor instance to use for file operations
             viewport_size (int, optional): Maximum number of characters to display per page. Pages are adjusted dynamically to avoid cutting off words. Default: 8192.
             save_converted_files (bool, optional): If True, converted files are saved in a subdirectory named "converted_files" in the code executor's working directory. Default: False.
+            use_file_service (bool, optional): If True, run file operations in a long-lived file service in the code executor. Default: True.
+            direct_read_size (int, optional): Plain text files of at least this many bytes are paged straight from the file instead of converted, when the file service's working directory is visible from this process. Default: 8 MiB.
+            document_cache (ConvertedDocumentCache, optional): Cache of converted files, consulted by content hash before converting a file with the file service. Default: None (no cache)
         """
         self.viewport_size = viewport_size  # Applies only to the standard uri types
         self.history: List[Tuple[str, float]] = list()
         self.page_title: Optional[str] = None
         self.save_converted_files: bool = save_converted_files
         self.viewport_current_page = 0
-        self.viewport_pages: List[Tuple[int, int]] = list()
         self.image_path: Optional[str] = None
         self._markdown_converter = MarkItDown()
-        self._page_content: str = ""
+        self._document = PagedDocument("", viewport_size)
         self._find_on_page_query: Union[str, None] = None
+        self._search: Optional[ViewportSearch] = None
         self._find_on_page_last_result: Union[int, None] = (
             None  # Location of the last result
         )
         self._code_executor = code_executor
+        self._file_service = FileServiceClient(code_executor)
+        self._use_file_service = use_file_service
+        self._direct_read_size = direct_read_size
+        self._document_cache = document_cache
         self.did_lazy_init = False
 
     async def lazy_init(self) -> None:
@@ -61,9 +82,24 @@ class CodeExecutorMarkdownFileBrowser:
         Perform lazy initialization for the file browser.
         """
         if not self.did_lazy_init:
+            if self._use_file_service:
+                try:
+                    await self._file_service.start()
+                except FileServiceUnavailableError as e:
+                    logger.warning(
+                        f"File service unavailable, running one-off scripts: {e}"
+                    )
+                    self._use_file_service = False
             await self.set_path(".")
             self.did_lazy_init = True
 
+    async def close(self) -> None:
+        """
+        Stop the file service, if it is running, and release the open document.
+        """
+        self._document.close()
+        await self._file_service.stop()
+
     @property
     def path(self) -> str:
         """Return the path of the current page."""
@@ -95,13 +131,47 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             str: The text content for the current page of the viewport.
         """
-        bounds = self.viewport_pages[self.viewport_current_page]
-        return self.page_content[bounds[0] : bounds[1]]
+        return self._document.page(self.viewport_current_page)
+
+    @property
+    def viewport_pages(self) -> Sequence[Tuple[int, int]]:
+        """The (start, end) bounds of the viewport pages, split as they are needed."""
+        return self._document
+
+    @property
+    def viewport_page_count(self) -> Tuple[int, bool]:
+        """
+        The number of viewport pages, without splitting pages that were not read yet.
+
+        Returns:
+            Tuple[int, bool]: The number of pages, and whether it is exact rather than estimated.
+        """
+        return self._document.estimated_len(), self._document.complete
 
     @property
     def page_content(self) -> str:
         """Return the full contents of the current page."""
-        return self._page_content
+        return self._document.text
+
+    def _has_page(self, index: int) -> bool:
+        try:
+            self._document[index]
+        except IndexError:
+            return False
+        return True
+
+    def _set_document(self, document: PagedDocument) -> None:
+        """
+        Replace the current document, resetting the search state.
+
+        Args:
+            document (PagedDocument): The document to display.
+        """
+        self._document.close()
+        self._document = document
+        self._search = None
+        if not self._has_page(self.viewport_current_page):
+            self.viewport_current_page = len(self._document) - 1
 
     def _set_page_content(self, content: str, split_pages: bool = True) -> None:
         """
@@ -111,21 +181,12 @@ class CodeExecutorMarkdownFileBrowser:
             content (str): The full content to display on the page.
             split_pages (bool, optional): Whether to split the content into pages based on the viewport size. Default: True
         """
-        self._page_content = content
-
-        if split_pages:
-            self._split_pages()
-        else:
-            self.viewport_pages = [(0, len(self._page_content))]
-
-        if self.viewport_current_page >= len(self.viewport_pages):
-            self.viewport_current_page = len(self.viewport_pages) - 1
+        self._set_document(PagedDocument(content, self.viewport_size, split_pages))
 
     def page_down(self) -> None:
         """Move the viewport down one page, if possible."""
-        self.viewport_current_page = min(
-            self.viewport_current_page + 1, len(self.viewport_pages) - 1
-        )
+        if self._has_page(self.viewport_current_page + 1):
+            self.viewport_current_page += 1
 
     def page_up(self) -> None:
         """Move the viewport up one page, if possible."""
@@ -172,7 +233,7 @@ class CodeExecutorMarkdownFileBrowser:
             starting_viewport = 0
         else:
             starting_viewport += 1
-            if starting_viewport >= len(self.viewport_pages):
+            if not self._has_page(starting_viewport):
                 starting_viewport = 0
 
         viewport_match = self._find_next_viewport(
@@ -205,20 +266,11 @@ class CodeExecutorMarkdownFileBrowser:
         if nquery.strip() == "":
             return None
 
-        idxs: List[int] = list()
-        idxs.extend(range(starting_viewport, len(self.viewport_pages)))
-        idxs.extend(range(0, starting_viewport))
-
-        for i in idxs:
-            bounds = self.viewport_pages[i]
-            content = self.page_content[bounds[0] : bounds[1]]
-
-            # TODO: Remove markdown links and images
-            ncontent = " " + (" ".join(re.split(r"\W+", content))).strip().lower() + " "
-            if re.search(nquery, ncontent):
-                return i
-
-        return None
+        # Pages already searched for the same query are not searched again
+        # TODO: Remove markdown links and images
+        if self._search is None or self._search.pattern != nquery:
+            self._search = ViewportSearch(self._document, nquery)
+        return self._search.next_match(starting_viewport)
 
     async def open_path(self, path: str) -> str:
         """
@@ -231,25 +283,32 @@ class CodeExecutorMarkdownFileBrowser:
         await self.set_path(path)
         return self.viewport
 
-    def _split_pages(self) -> None:
-        """Split the page contents into pages that are approximately the viewport size. Small deviations are permitted to ensure words are not broken."""
-        # Handle empty pages
-        if len(self._page_content) == 0:
-            self.viewport_pages = [(0, 0)]
-            return
-
-        # Break the viewport into pages
-        self.viewport_pages = []
-        start_idx = 0
-        while start_idx < len(self._page_content):
-            end_idx = min(start_idx + self.viewport_size, len(self._page_content))
-            # Adjust to end on a space
-            while end_idx < len(self._page_content) and self._page_content[
-                end_idx - 1
-            ] not in [" ", "\t", "\r", "\n"]:
-                end_idx += 1
-            self.viewport_pages.append((start_idx, end_idx))
-            start_idx = end_idx
+    async def _service_request(self, op: str, **args: Any) -> Optional[Dict[str, Any]]:
+        """
+        Send a request to the file service.
+
+        Args:
+            op (str): The file service operation.
+            **args: The operation's arguments.
+
+        Returns:
+            Dict[str, Any] | None: The response, or None if the service is not available, in which case one-off scripts are used instead.
+        """
+        if not self._use_file_service:
+            return None
+        try:
+            return await self._file_service.request(op, **args)
+        except FileServiceUnavailableError as e:
+            logger.warning(f"File service unavailable, running one-off scripts: {e}")
+            self._use_file_service = False
+            return None
+
+    async def _execute_code(self, code: str) -> str:
+        result = await self._code_executor.execute_code_blocks(
+            [CodeBlock(code=code, language="python")],
+            cancellation_token=CancellationToken(),
+        )
+        return result.output
 
     async def _validate_path(self, path: str) -> bool:
         """
@@ -259,12 +318,56 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             bool: True if the path exists, False otherwise.
         """
-        code = get_path_validation_code(path)
-        result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
-            cancellation_token=CancellationToken(),
+        response = await self._service_request("validate", path=path)
+        if response is not None and "error" not in response:
+            return bool(response["exists"])
+        output = await self._execute_code(get_path_validation_code(path))
+        return output.strip().lower() == "true"
+
+    async def _open_path_with_scripts(self, path: str, convert: bool) -> Dict[str, Any]:
+        """
+        Validate, stat and list or convert a path with one script per step, like the file service's "open" request.
+        Args:
+            path (str): The path to open.
+            convert (bool): Whether to convert a file to Markdown.
+        Returns:
+            Dict[str, Any]: The same response as the file service's "open" request.
+        """
+        if not await self._validate_path(path):
+            return {"exists": False}
+        output = await self._execute_code(get_is_dir_check_code(path))
+        is_dir = output.strip().lower() == "true"
+        if is_dir:
+            return {
+                "exists": True,
+                "is_dir": True,
+                "listing": await self._fetch_local_dir(path),
+            }
+        if not convert:
+            return {"exists": True, "is_dir": False}
+
+        # Parse the output to get title and content
+        output_lines = (await self._execute_code(get_file_conversion_code(path))).split(
+            "\n"
+        )
+        title_line = next(
+            (line for line in output_lines if line.startswith("TITLE:")), None
         )
-        return result.output.strip().lower() == "true"
+        content_start = next(
+            (i for i, line in enumerate(output_lines) if line.startswith("CONTENT:")),
+            None,
+        )
+        if title_line is None or content_start is None:
+            return {
+                "error": "FileConversionException",
+                "message": "\n".join(output_lines),
+            }
+        return {
+            "exists": True,
+            "is_dir": False,
+            "title": title_line[6:],
+            "content": "\n".join(output_lines[content_start:])[8:],
+        }
 
     async def _open_path(
         self,
@@ -275,84 +378,130 @@ class CodeExecutorMarkdownFileBrowser:
         Args:
             path (str): The path to the file to open.
         """
-        if not await self._validate_path(path):
+        mime_type, _ = guess_type(path)
+        is_image = bool(mime_type and mime_type.startswith("image/"))
+        # Validation, the directory check and the conversion are a single request;
+        # with a cache the file is only hashed, and converted on a cache miss
+        use_cache = self._document_cache is not None
+        response = await self._service_request(
+            "open",
+            path=path,
+            convert=not is_image,
+            direct_read_size=self._direct_read_size,
+            digest=use_cache,
+        )
+        document: Optional[PagedDocument] = None
+        if response is not None and "text_file" in response:
+            document = self._open_text_file(response["text_file"], response["size"])
+            if document is None:
+                response = await self._service_request(
+                    "open", path=path, digest=use_cache
+                )
+        if response is not None and "sha256" in response:
+            response = await self._convert_with_cache(path, response)
+        if response is None:
+            response = await self._open_path_with_scripts(path, convert=not is_image)
+
+        error = response.get("error")
+        if error == "FileNotFoundError" or (error is None and not response["exists"]):
             self.page_title = "FileNotFoundError"
             self._set_page_content(f"# FileNotFoundError\n\nFile not found: {path}")
+        elif error == "UnsupportedFormatException":
+            self.page_title = "UnsupportedFormatException"
+            self._set_page_content(
+                f"# UnsupportedFormatException\n\nCannot preview '{path}' as Markdown."
+            )
+        elif error is not None:
+            self.page_title = "FileConversionException."
+            self._set_page_content(
+                f"# FileConversionException\n\nError converting '{path}' to Markdown."
+            )
+        elif response["is_dir"]:
+            res = self._markdown_converter.convert_stream(
+                io.BytesIO(response["listing"].encode("utf-8")),
+                file_extension=".txt",
+            )
+            self.page_title = res.title
+            self._set_page_content(res.text_content, split_pages=False)
+        elif is_image:
+            self.page_title = Path(path).name
+            self._set_page_content("")
+            work_dir = getattr(self._code_executor, "work_dir", ".")
+            self.image_path = str((Path(work_dir) / path).resolve())
+        elif document is not None:
+            self.page_title = None
+            self._set_document(document)
         else:
-            try:
-                code = get_is_dir_check_code(path)
-                result = await self._code_executor.execute_code_blocks(
-                    [CodeBlock(code=code, language="python")],
-                    cancellation_token=CancellationToken(),
-                )
-                is_dir = result.output.strip().lower() == "true"
-                mime_type, _ = guess_type(path)
-
-                if is_dir:
-                    dir_content = await self._fetch_local_dir(path)
-                    res = self._markdown_converter.convert_stream(
-                        io.BytesIO(dir_content.encode("utf-8")),
-                        file_extension=".txt",
-                    )
-                    self.page_title = res.title
-                    self._set_page_content(res.text_content, split_pages=False)
-                elif mime_type and mime_type.startswith("image/"):
-                    self.page_title = Path(path).name
-                    self._set_page_content("")
+            self.page_title = response["title"] or None
+            markdown_content = response["content"]
+            self._set_page_content(markdown_content)
+
+            # Save as .converted.md regardless of original extension
+            if self.save_converted_files:
+                try:
                     work_dir = getattr(self._code_executor, "work_dir", ".")
-                    self.image_path = str((Path(work_dir) / path).resolve())
-                else:
-                    # Read and convert file content using code executor
-                    convert_code = get_file_conversion_code(path)
-                    result = await self._code_executor.execute_code_blocks(
-                        [CodeBlock(code=convert_code, language="python")],
-                        cancellation_token=CancellationToken(),
-                    )
+                    converted_dir = Path(work_dir) / "converted_files"
+                    converted_dir.mkdir(
+                        parents=True, exist_ok=True
+                    )  # Create if it doesn't exist
+                    original_path = (Path(work_dir) / path).resolve()
+                    md_filename = original_path.stem + ".converted.md"
+                    md_path = converted_dir / md_filename
+                    md_path.write_text(markdown_content)
+                except Exception as e:
+                    print(f"Warning: Failed to save markdown file for {path}: {e}")
+
+    async def _convert_with_cache(
+        self, path: str, response: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Complete an "open" response with the file's markdown, from the cache or by converting it.
 
-                    # Parse the output to get title and content
-                    output_lines = result.output.split("\n")
-                    title_line = next(
-                        line for line in output_lines if line.startswith("TITLE:")
-                    )
-                    content_start = next(
-                        i
-                        for i, line in enumerate(output_lines)
-                        if line.startswith("CONTENT:")
-                    )
+        Args:
+            path (str): The path of the file.
+            response (Dict[str, Any]): The "open" response holding the file's digest.
 
-                    self.page_title = title_line[6:] or None
-                    markdown_content = "\n".join(output_lines[content_start:])[8:]
-                    self._set_page_content(markdown_content)
-
-                    # Save as .converted.md regardless of original extension
-                    if self.save_converted_files:
-                        try:
-                            work_dir = getattr(self._code_executor, "work_dir", ".")
-                            converted_dir = Path(work_dir) / "converted_files"
-                            converted_dir.mkdir(
-                                parents=True, exist_ok=True
-                            )  # Create if it doesn't exist
-                            original_path = (Path(work_dir) / path).resolve()
-                            md_filename = original_path.stem + ".converted.md"
-                            md_path = converted_dir / md_filename
-                            md_path.write_text(markdown_content)
-                        except Exception as e:
-                            print(
-                                f"Warning: Failed to save markdown file for {path}: {e}"
-                            )
-            except UnsupportedFormatException:
-                self.page_title = "UnsupportedFormatException"
-                self._set_page_content(
-                    f"# UnsupportedFormatException\n\nCannot preview '{path}' as Markdown."
-                )
-            except FileConversionException:
-                self.page_title = "FileConversionException."
-                self._set_page_content(
-                    f"# FileConversionException\n\nError converting '{path}' to Markdown."
-                )
-            except FileNotFoundError:
-                self.page_title = "FileNotFoundError"
-                self._set_page_content(f"# FileNotFoundError\n\nFile not found: {path}")
+        Returns:
+            Dict[str, Any] | None: The response with the file's title and content, or None if the file service became unavailable.
+        """
+        assert self._document_cache is not None
+        digest = response["sha256"]
+        cached = await asyncio.to_thread(self._document_cache.get, digest)
+        if cached is not None:
+            return {**response, "title": cached.title or "", "content": cached.text}
+
+        converted = await self._service_request("convert", path=path)
+        if converted is None or "error" in converted:
+            return converted
+        await asyncio.to_thread(
+            self._document_cache.put,
+            digest,
+            converted["title"],
+            converted["content"],
+        )
+        return {**response, **converted}
+
+    def _open_text_file(self, parts: List[str], size: int) -> Optional[PagedDocument]:
+        """
+        Open a large text file reported by the file service for paging, if it is visible from this process.
+
+        Args:
+            parts (List[str]): The components of the file's path relative to the service's working directory.
+            size (int): The file size seen by the service.
+
+        Returns:
+            PagedDocument | None: The document, or None if the file cannot be opened and must be converted instead.
+        """
+        host_path = self._file_service.host_path(parts)
+        if host_path is None:
+            return None
+        try:
+            if host_path.stat().st_size != size:
+                return None
+            return PagedDocument.from_file(host_path, self.viewport_size)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not open {host_path}: {e}")
+            return None
 
     async def _fetch_local_dir(self, local_path: str) -> str:
         """
@@ -364,12 +513,10 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             str: A string containing a Markdown-formatted table with columns for name, size, and modification date of directory entries.
         """
-        code = get_directory_listing_code(local_path)
-        result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
-            cancellation_token=CancellationToken(),
-        )
-        return result.output
+        response = await self._service_request("list", path=local_path)
+        if response is not None and "error" not in response:
+            return response["listing"]
+        return await self._execute_code(get_directory_listing_code(local_path))
 
     async def find_files(self, query: str) -> str:
         """
@@ -382,9 +529,7 @@ class CodeExecutorMarkdownFileBrowser:
         Returns:
             str: Markdown formatted string with search results
         """
-        code = get_find_files_code(query)
-        result = await self._code_executor.execute_code_blocks(
-            [CodeBlock(code=code, language="python")],
-            cancellation_token=CancellationToken(),
-        )
-        return result.output
+        response = await self._service_request("find", query=query)
+        if response is not None and "error" not in response:
+            return json.dumps(response)
+        return await self._execute_code(get_find_files_code(query))
@@ -0,0 +1,274 @@
+import asyncio
+import inspect
+import json
+import socket
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock, CodeExecutor
+from loguru import logger
+
+from . import _file_service_script
+from ._file_service_script import SERVICE_DIR
+
+SOCKET_PATH = f"{SERVICE_DIR}/service.sock"
+SCRIPT_PATH = f"{SERVICE_DIR}/service.py"
+LOG_PATH = f"{SERVICE_DIR}/service.log"
+
+# Longest socket path accepted by every platform's sockaddr_un
+_MAX_SOCKET_PATH = 100
+
+_CLIENT_FUNCTION = """
+import json
+import socket
+
+def request(payload):
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect({socket_path!r})
+        conn.sendall(json.dumps(payload).encode("utf-8") + b"\\n")
+        chunks = []
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return json.loads(b"".join(chunks))
+    finally:
+        conn.close()
+"""
+
+_START_CODE = """
+import os
+import subprocess
+import sys
+import time
+{client}
+def ping():
+    try:
+        return request({{"op": "ping"}}).get("ok", False)
+    except (OSError, ValueError):
+        return False
+
+if not ping():
+    os.makedirs({service_dir!r}, exist_ok=True)
+    with open({script_path!r}, "w") as f:
+        f.write({source!r})
+    with open({log_path!r}, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, {script_path!r}, {socket_path!r}, "--idle-timeout", {idle_timeout!r}],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.time() + {startup_timeout!r}
+    while not ping() and time.time() < deadline:
+        time.sleep(0.05)
+print("ready" if ping() else "failed")
+"""
+
+_REQUEST_CODE = """
+{client}
+try:
+    print(json.dumps(request({payload!r})))
+except OSError as e:
+    print(json.dumps({{"unavailable": str(e)}}))
+"""
+
+
+class FileServiceUnavailableError(RuntimeError):
+    """Raised when the file service cannot be started or reached"""
+
+
+class FileServiceClient:
+    """
+    Client of the long-lived file service that FileSurfer runs in its code executor.
+
+    The service keeps one interpreter with a warm MarkItDown converter and answers
+    validate, stat, list, convert, find and open requests. When the executor's working
+    directory is visible from this process (a local executor, or a Docker bind mount),
+    requests go straight to the service socket; otherwise each request is relayed by a
+    small client script run in the executor, which is still one round trip without
+    re-importing the converter.
+
+    Args:
+        code_executor (CodeExecutor): The code executor to run the service in
+        startup_timeout (float, optional): Seconds to wait for the service to start. Default: 30
+        idle_timeout (float, optional): Seconds without requests after which the service exits. Default: 1800
+    """
+
+    def __init__(
+        self,
+        code_executor: CodeExecutor,
+        startup_timeout: float = 30.0,
+        idle_timeout: float = 1800.0,
+    ) -> None:
+        self._code_executor = code_executor
+        self._startup_timeout = startup_timeout
+        self._idle_timeout = idle_timeout
+        self._socket_path: Optional[Path] = None
+        self._started = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Whether the service was started."""
+        return self._started
+
+    @property
+    def direct(self) -> bool:
+        """Whether requests are sent straight to the service socket."""
+        return self._socket_path is not None
+
+    def _host_socket_paths(self) -> List[Path]:
+        """Candidate paths of the service socket as seen from this process"""
+        if not hasattr(socket, "AF_UNIX"):
+            return []
+        paths: List[Path] = []
+        for attr in ("bind_dir", "work_dir"):
+            directory = getattr(self._code_executor, attr, None)
+            if directory is None:
+                continue
+            path = Path(directory) / SOCKET_PATH
+            if len(str(path)) < _MAX_SOCKET_PATH and path not in paths:
+                paths.append(path)
+        return paths
+
+    async def _execute(self, code: str) -> str:
+        result = await self._code_executor.execute_code_blocks(
+            [CodeBlock(code=code, language="python")],
+            cancellation_token=CancellationToken(),
+        )
+        return result.output
+
+    async def _request_direct(
+        self, socket_path: Path, payload: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        reader, writer = await asyncio.open_unix_connection(str(socket_path))
+        try:
+            writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+            await writer.drain()
+            return json.loads(await reader.read())
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def _request_via_executor(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        output = await self._execute(
+            _REQUEST_CODE.format(
+                client=_CLIENT_FUNCTION.format(socket_path=SOCKET_PATH),
+                payload=payload,
+            )
+        )
+        try:
+            response = json.loads(output)
+        except ValueError as e:
+            raise OSError(f"Invalid file service response: {output[:200]}") from e
+        if "unavailable" in response:
+            raise OSError(response["unavailable"])
+        return response
+
+    async def _send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self._socket_path is not None:
+            return await self._request_direct(self._socket_path, payload)
+        return await self._request_via_executor(payload)
+
+    async def start(self) -> None:
+        """
+        Start the service in the code executor, or reuse the one already running.
+
+        Raises:
+            FileServiceUnavailableError: If the service did not start.
+        """
+        async with self._lock:
+            await self._start()
+
+    async def _start(self) -> None:
+        source = inspect.getsource(_file_service_script)
+        output = await self._execute(
+            _START_CODE.format(
+                client=_CLIENT_FUNCTION.format(socket_path=SOCKET_PATH),
+                service_dir=SERVICE_DIR,
+                script_path=SCRIPT_PATH,
+                socket_path=SOCKET_PATH,
+                log_path=LOG_PATH,
+                source=source,
+                idle_timeout=str(self._idle_timeout),
+                startup_timeout=self._startup_timeout,
+            )
+        )
+        if output.strip() != "ready":
+            raise FileServiceUnavailableError(
+                f"File service did not start: {output.strip()[-500:]}"
+            )
+        self._started = True
+
+        self._socket_path = None
+        for path in self._host_socket_paths():
+            try:
+                response = await self._request_direct(path, {"op": "ping"})
+            except (OSError, ValueError):
+                continue
+            if response.get("ok"):
+                self._socket_path = path
+                break
+        logger.debug(
+            f"File service started ({'direct' if self.direct else 'via executor'})"
+        )
+
+    async def request(self, op: str, **args: Any) -> Dict[str, Any]:
+        """
+        Send one request to the service, restarting the service once if it is gone.
+
+        Args:
+            op (str): The operation: "validate", "stat", "list", "convert", "find" or "open".
+            **args: The operation's arguments.
+
+        Returns:
+            Dict[str, Any]: The response. Failed operations have an "error" key holding the exception type name and a "message" key.
+
+        Raises:
+            FileServiceUnavailableError: If the service cannot be reached.
+        """
+        payload = {"op": op, **args}
+        async with self._lock:
+            if not self._started:
+                await self._start()
+            try:
+                return await self._send(payload)
+            except (OSError, ValueError) as e:
+                # The service may have exited after being idle; start it again
+                logger.debug(f"File service request failed, restarting: {e}")
+            await self._start()
+            try:
+                return await self._send(payload)
+            except (OSError, ValueError) as e:
+                raise FileServiceUnavailableError(str(e)) from e
+
+    def host_path(self, parts: List[str]) -> Optional[Path]:
+        """
+        Return the path, as seen from this process, of a file in the service's working directory.
+
+        Args:
+            parts (List[str]): The components of the file's path relative to the working directory.
+
+        Returns:
+            Path | None: The path, or None if requests are relayed through the executor and its files are not visible.
+        """
+        if self._socket_path is None:
+            return None
+        return self._socket_path.parent.parent.joinpath(*parts)
+
+    async def stop(self) -> None:
+        """Ask the service to exit, if it was started."""
+        async with self._lock:
+            if not self._started:
+                return
+            self._started = False
+            try:
+                await self._send({"op": "shutdown"})
+            except Exception as e:
+                logger.debug(f"Could not stop the file service: {e}")
+            self._socket_path = None
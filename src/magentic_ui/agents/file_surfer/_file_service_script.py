@@ -0,0 +1,401 @@
+"""
+File service run inside the code executor on behalf of FileSurfer.
+
+One long-lived interpreter, with MarkItDown imported once at startup, answers the
+browser's file operations over a Unix socket. Each connection carries one request
+and one response, both a single line of JSON.
+
+This module only depends on the standard library (and MarkItDown, which the executor
+image provides): its source is copied into the executor and run there as a script.
+
+Usage:
+    python service.py <socket_path> [--idle-timeout SECONDS]
+"""
+
+import argparse
+import datetime
+import hashlib
+import heapq
+import json
+import os
+import socket
+import time
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# Directory of the service files, relative to the executor's working directory.
+# The backend leaves it out of generated files (IGNORE_FILES in backend/utils/utils.py)
+SERVICE_DIR = ".file_service"
+SKIP_DIRS = ["node_modules", ".git", "__pycache__", SERVICE_DIR]
+
+# Plain text files that the browser may read directly instead of converting
+PLAIN_TEXT_EXTENSIONS = {".txt", ".text", ".log", ".out", ".err"}
+
+FIND_THRESHOLD = 0.2
+FIND_MAX_RESULTS = 20
+# Number of names sharing the most trigrams with the query that are scored exactly
+FIND_CANDIDATES = 500
+# Directories modified this recently are listed again on the next refresh, since a
+# change within the same mtime tick would not show in their mtime
+MTIME_SETTLE_SECONDS = 2.0
+
+
+def _trigrams(name: str) -> Set[str]:
+    return {name[i : i + 3] for i in range(len(name) - 2)}
+
+
+class FileIndex:
+    """
+    Index of the file names under a directory, answering fuzzy name queries.
+
+    The index keeps every directory's mtime and lists again only the directories whose
+    mtime changed, so refreshing it before a query costs one stat per directory. Queries
+    score the names sharing the most trigrams with the query using the same
+    `SequenceMatcher` ratio as a full scan, and fall back to a pruned full scan when the
+    query is too short or shares trigrams with too few names.
+
+    The ranking is approximate: when more than `FIND_CANDIDATES` names share trigrams
+    with the query and at least `max_results` of those candidates match, names outside
+    the candidates are never scored. A name sharing few trigrams with the query but with
+    a higher `SequenceMatcher` ratio can then be missing from the results. An exact
+    scan costs 10-30 times more on large workspaces.
+    """
+
+    def __init__(self, root: str = ".") -> None:
+        self._root = root
+        # Relative directory path -> (mtime_ns, listed at, file names, subdirectory names)
+        self._dirs: Dict[str, Tuple[int, float, Set[str], Set[str]]] = {}
+        self._ids: Dict[str, int] = {}
+        self._paths: Dict[int, Tuple[str, str]] = {}  # id -> (path, lowercase name)
+        self._trigram_ids: Dict[str, Set[int]] = defaultdict(set)
+        self._name_ids: Dict[str, Set[int]] = defaultdict(set)
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def _add(self, path: str, name: str) -> None:
+        file_id = self._next_id
+        self._next_id += 1
+        name = name.lower()
+        self._ids[path] = file_id
+        self._paths[file_id] = (path, name)
+        self._name_ids[name].add(file_id)
+        for gram in _trigrams(name):
+            self._trigram_ids[gram].add(file_id)
+
+    def _remove(self, path: str) -> None:
+        file_id = self._ids.pop(path)
+        _, name = self._paths.pop(file_id)
+        self._name_ids[name].discard(file_id)
+        if not self._name_ids[name]:
+            del self._name_ids[name]
+        for gram in _trigrams(name):
+            self._trigram_ids[gram].discard(file_id)
+            if not self._trigram_ids[gram]:
+                del self._trigram_ids[gram]
+
+    def _remove_dir(self, directory: str) -> None:
+        _, _, files, _ = self._dirs.pop(directory)
+        for name in files:
+            self._remove(os.path.join(directory, name) if directory else name)
+
+    def refresh(self) -> None:
+        """Bring the index up to date, listing only the directories that changed"""
+        seen: Set[str] = set()
+        pending = [""]
+        while pending:
+            directory = pending.pop()
+            full_path = os.path.join(self._root, directory)
+            try:
+                mtime = os.stat(full_path).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(directory)
+            cached = self._dirs.get(directory)
+            if cached is not None and cached[0] == mtime:
+                _, listed_at, files, subdirs = cached
+                if listed_at - mtime / 1e9 >= MTIME_SETTLE_SECONDS:
+                    pending.extend(subdirs)
+                    continue
+
+            listed_at = time.time()
+            files, subdirs = set(), set()
+            try:
+                with os.scandir(full_path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            continue
+                        if not is_dir:
+                            files.add(entry.name)
+                        elif entry.name not in SKIP_DIRS and not entry.is_symlink():
+                            subdirs.add(os.path.join(directory, entry.name))
+            except OSError:
+                seen.discard(directory)
+                continue
+
+            old_files = cached[2] if cached is not None else set()
+            for name in old_files - files:
+                self._remove(os.path.join(directory, name) if directory else name)
+            for name in files - old_files:
+                self._add(os.path.join(directory, name) if directory else name, name)
+            self._dirs[directory] = (mtime, listed_at, files, subdirs)
+            pending.extend(subdirs)
+
+        for directory in set(self._dirs) - seen:
+            self._remove_dir(directory)
+
+    def _scored(
+        self, query: str, ids: Iterable[int], threshold: float
+    ) -> List[Tuple[float, str]]:
+        scored: List[Tuple[float, str]] = []
+        for file_id in ids:
+            path, name = self._paths[file_id]
+            matcher = SequenceMatcher(None, query, name)
+            if (
+                matcher.real_quick_ratio() > threshold
+                and matcher.quick_ratio() > threshold
+            ):
+                score = matcher.ratio()
+                if score > threshold:
+                    scored.append((score, path))
+        return scored
+
+    def search(
+        self,
+        query: str,
+        threshold: float = FIND_THRESHOLD,
+        max_results: int = FIND_MAX_RESULTS,
+    ) -> Dict[str, Any]:
+        """
+        Find the files whose names best match the query, like a `SequenceMatcher` scan.
+        The ranking is approximate when the trigram candidates were truncated (see `FileIndex`).
+
+        Args:
+            query (str): The file name to look for, matched case-insensitively.
+            threshold (float, optional): Minimum similarity of a match. Default: 0.2
+            max_results (int, optional): Maximum number of matches. Default: 20
+
+        Returns:
+            Dict[str, Any]: "matches", a list of (path, score) pairs sorted by decreasing score, and "perfect_match", the path of a file named exactly like the query or None.
+        """
+        query = query.lower()
+        exact_ids = self._name_ids.get(query, set())
+        scores: Dict[str, float] = {self._paths[i][0]: 1.0 for i in exact_ids}
+
+        shared: Counter[int] = Counter()
+        for gram in _trigrams(query):
+            shared.update(self._trigram_ids.get(gram, ()))
+        candidates = [i for i, _ in shared.most_common(FIND_CANDIDATES)]
+        for score, path in self._scored(query, candidates, threshold):
+            scores.setdefault(path, score)
+
+        if len(scores) < max_results:
+            # Too few names share trigrams with the query: score every name
+            for score, path in self._scored(query, self._paths, threshold):
+                scores.setdefault(path, score)
+
+        matches = heapq.nsmallest(
+            max_results, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+        perfect_match = min(self._paths[i][0] for i in exact_ids) if exact_ids else None
+        return {"matches": matches, "perfect_match": perfect_match}
+
+
+class FileService:
+    """Implements the file operations served over the socket"""
+
+    def __init__(self) -> None:
+        from markitdown import MarkItDown
+
+        self._converter = MarkItDown()
+        self._index = FileIndex()
+        # (absolute path, size, mtime_ns) -> SHA-256 of the file content
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+
+    def validate(self, path: str) -> Dict[str, Any]:
+        return {"exists": path == "." or os.path.exists(path)}
+
+    def stat(self, path: str) -> Dict[str, Any]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return {"exists": False}
+        return {
+            "exists": True,
+            "is_dir": os.path.isdir(path),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+        }
+
+    def list(self, path: str) -> Dict[str, Any]:
+        listing = """
+| Name | Size | Date Modified |
+| ---- | ---- | ------------- |
+| .. (parent directory) | | |
+"""
+        for entry in os.listdir(path):
+            if entry == SERVICE_DIR:
+                continue
+            size = ""
+            full_path = os.path.join(path, entry)
+
+            mtime = ""
+            try:
+                mtime = datetime.datetime.fromtimestamp(
+                    os.path.getmtime(full_path)
+                ).strftime("%Y-%m-%d %H:%M")
+            except Exception as e:
+                mtime = f"N/A: {type(e).__name__}"
+
+            if os.path.isdir(full_path):
+                entry = entry + os.path.sep
+            else:
+                try:
+                    size = str(os.path.getsize(full_path))
+                except Exception as e:
+                    size = f"N/A: {type(e).__name__}"
+
+            listing += f"| {entry} | {size} | {mtime} |\n"
+        return {"listing": listing}
+
+    def convert(self, path: str) -> Dict[str, Any]:
+        result = self._converter.convert_local(path)
+        return {"title": result.title or "", "content": result.text_content}
+
+    def digest(self, path: str) -> Dict[str, Any]:
+        """Hash a file, reusing the hash while its size and mtime are unchanged"""
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        sha256 = self._digests.get(key)
+        if sha256 is None:
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(chunk)
+            sha256 = self._digests[key] = sha.hexdigest()
+        return {"sha256": sha256, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def find(self, query: str) -> Dict[str, Any]:
+        self._index.refresh()
+        return self._index.search(query)
+
+    def open(
+        self,
+        path: str,
+        convert: bool = True,
+        direct_read_size: Optional[int] = None,
+        digest: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Validate, stat and then list or convert a path in a single request.
+
+        Plain text files of at least `direct_read_size` bytes inside the working directory are
+        not converted; the response has their "text_file" path parts and "size" instead.
+        With `digest`, files are not converted either: the response has their digest so
+        that the caller can look for a cached conversion before asking for one.
+        """
+        if not self.validate(path)["exists"]:
+            return {"exists": False}
+        is_dir = path == "." or os.path.isdir(path)
+        result: Dict[str, Any] = {"exists": True, "is_dir": is_dir}
+        if is_dir:
+            result.update(self.list(path))
+        elif convert:
+            size = os.path.getsize(path)
+            relative_path = os.path.relpath(os.path.abspath(path))
+            if (
+                direct_read_size is not None
+                and size >= direct_read_size
+                and os.path.splitext(path)[1].lower() in PLAIN_TEXT_EXTENSIONS
+                and not relative_path.startswith(os.pardir)
+            ):
+                result.update({"text_file": relative_path.split(os.sep), "size": size})
+            elif digest:
+                result.update(self.digest(path))
+            else:
+                result.update(self.convert(path))
+        return result
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request, reporting any exception by its type name"""
+        operations: Dict[str, Callable[..., Dict[str, Any]]] = {
+            "validate": self.validate,
+            "stat": self.stat,
+            "list": self.list,
+            "convert": self.convert,
+            "digest": self.digest,
+            "find": self.find,
+            "open": self.open,
+        }
+        args = dict(request)
+        op = args.pop("op", None)
+        if op in ("ping", "shutdown"):
+            return {"ok": True, "pid": os.getpid()}
+        if op not in operations:
+            return {"error": "ValueError", "message": f"Unknown operation: {op}"}
+        try:
+            return operations[op](**args)
+        except Exception as e:
+            return {"error": type(e).__name__, "message": str(e)}
+
+
+def _read_line(conn: socket.socket) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+def serve(socket_path: str, idle_timeout: float) -> None:
+    service = FileService()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(8)
+    server.settimeout(idle_timeout)
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                return
+            with conn:
+                conn.settimeout(None)
+                try:
+                    request = json.loads(_read_line(conn))
+                except ValueError as e:
+                    response = {"error": "ValueError", "message": str(e)}
+                    request = {}
+                else:
+                    response = service.handle(request)
+                try:
+                    conn.sendall(json.dumps(response).encode("utf-8") + b"\n")
+                except OSError:
+                    pass
+                if request.get("op") == "shutdown":
+                    return
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("socket_path")
+    parser.add_argument("--idle-timeout", type=float, default=1800.0)
+    args = parser.parse_args()
+    serve(args.socket_path, args.idle_timeout)
@@ -43,6 +43,7 @@ from ._code_markdown_file_browser import CodeExecutorMarkdownFileBrowser
 from ...approval_guard import BaseApprovalGuard
 from ...guarded_action import GuardedAction, ApprovalDeniedError
 from ...utils import thread_to_context
+from ...tools.document_cache import get_converted_document_cache
 import uuid
 
 
@@ -161,6 +162,7 @@ class FileSurfer(BaseChatAgent, Component[FileSurferConfig]):
             self._code_executor,
             viewport_size=1024 * 5,
             save_converted_files=save_converted_files,
+            document_cache=get_converted_document_cache(),
         )
         self.did_lazy_init = False
         self.is_paused = False
@@ -584,16 +586,17 @@ class FileSurfer(BaseChatAgent, Component[FileSurferConfig]):
             header += f" Title {self._browser.page_title}\n"
 
         current_page = self._browser.viewport_current_page
-        total_pages = len(self._browser.viewport_pages)
-        header += (
-            f" Viewport position: Showing page {current_page+1} of {total_pages}.\n"
-        )
+        # Counting the pages exactly would split the whole document
+        total_pages, exact = self._browser.viewport_page_count
+        total = f"{total_pages}" if exact else f"about {total_pages}"
+        header += f" Viewport position: Showing page {current_page+1} of {total}.\n"
 
         return (header, self._browser.viewport)
 
     async def close(self) -> None:
         """Close the FileSurfer agent."""
         logger.info("Closing FileSurfer...")
+        await self._browser.close()
         if hasattr(self, "_code_executor"):
             await self._code_executor.stop()
         await self._model_client.close()
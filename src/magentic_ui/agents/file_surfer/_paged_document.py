@@ -0,0 +1,285 @@
+import re
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+_WHITESPACE = re.compile(r"[ \t\r\n]")
+_WHITESPACE_BYTES = re.compile(rb"[ \t\r\n]")
+
+# Bytes read at a time while looking for the end of a page in a file
+_SEARCH_CHUNK = 64 * 1024
+
+
+class _FileSource:
+    """
+    An open text file read by byte ranges.
+
+    The length is fixed when the file is opened. Reads past the current end of the
+    file, e.g. after the file was truncated, return fewer bytes instead of failing.
+
+    Args:
+        file (BinaryIO): The file, opened for reading in binary mode.
+        length (int): The file size when it was opened.
+    """
+
+    def __init__(self, file: BinaryIO, length: int) -> None:
+        self._file = file
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, start: int, end: int) -> bytes:
+        self._file.seek(start)
+        chunks: List[bytes] = []
+        remaining = end - start
+        while remaining > 0:
+            chunk = self._file.read(remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    def search(self, pattern: "re.Pattern[bytes]", pos: int) -> Optional[int]:
+        """Return the end offset of the first match of a one-byte pattern at or after pos."""
+        while pos < self._length:
+            chunk = self.read(pos, min(pos + _SEARCH_CHUNK, self._length))
+            match = pattern.search(chunk)
+            if match:
+                return pos + match.end()
+            if len(chunk) < _SEARCH_CHUNK:
+                return None
+            pos += len(chunk)
+        return None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class PagedDocument(Sequence[Tuple[int, int]]):
+    """
+    A document split into viewport pages on demand.
+
+    The document is a sequence of the (start, end) bounds of its pages. Pages are about
+    `viewport_size` long and end on whitespace; each boundary is found when the page is
+    first needed, by searching for the next whitespace after `viewport_size` characters,
+    so reaching a page costs time proportional to the pages before it and not to the
+    number of characters. Large text files can be read in place with `from_file`, in
+    which case bounds are byte offsets and only the pages that are read are loaded and
+    decoded.
+
+    Args:
+        source (str | bytes): The document text, or its UTF-8 encoded bytes.
+        viewport_size (int): Approximate length of a page.
+        split_pages (bool, optional): Whether to split the document into pages. Default: True
+    """
+
+    def __init__(
+        self,
+        source: Union[str, bytes, _FileSource],
+        viewport_size: int,
+        split_pages: bool = True,
+    ) -> None:
+        self._source = source
+        self._viewport_size = viewport_size
+        self._length = len(source)
+        self._whitespace = _WHITESPACE if isinstance(source, str) else _WHITESPACE_BYTES
+        self._bounds: List[Tuple[int, int]] = []
+        self._complete = False
+        if self._length == 0 or not split_pages:
+            self._bounds = [(0, self._length)]
+            self._complete = True
+
+    @classmethod
+    def from_file(cls, path: Path, viewport_size: int) -> "PagedDocument":
+        """
+        Open a UTF-8 text file, reading its pages from the file as they are needed.
+
+        Pages are read with ordinary file reads rather than a memory map, so a file that
+        is truncated or rewritten while it is open (e.g. a log a job is still writing)
+        yields short or changed pages instead of crashing the process.
+
+        Args:
+            path (Path): The text file.
+            viewport_size (int): Approximate length of a page, in bytes.
+
+        Returns:
+            PagedDocument: The document, reading pages from the open file.
+        """
+        f = open(path, "rb")
+        length = f.seek(0, 2)
+        if length == 0:
+            f.close()
+            return cls(b"", viewport_size)
+        return cls(_FileSource(f, length), viewport_size)
+
+    def _split_next(self) -> None:
+        start = self._bounds[-1][1] if self._bounds else 0
+        end = min(start + self._viewport_size, self._length)
+        # Adjust to end on a space
+        if end < self._length:
+            if isinstance(self._source, _FileSource):
+                found = self._source.search(_WHITESPACE_BYTES, end - 1)
+            else:
+                match = self._whitespace.search(self._source, end - 1)  # type: ignore
+                found = match.end() if match else None
+            end = found if found is not None else self._length
+        self._bounds.append((start, end))
+        if end >= self._length:
+            self._complete = True
+
+    def _ensure(self, index: int) -> None:
+        while not self._complete and len(self._bounds) <= index:
+            self._split_next()
+
+    def __len__(self) -> int:
+        self._ensure(self._length)
+        return len(self._bounds)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every page boundary has been found."""
+        return self._complete
+
+    def estimated_len(self) -> int:
+        """
+        Return the number of pages without splitting the rest of the document.
+
+        Returns:
+            int: The exact number of pages once the document is split completely, otherwise the pages split so far plus the remaining length divided by their average length.
+        """
+        if self._complete:
+            return len(self._bounds)
+        if not self._bounds:
+            return -(-self._length // self._viewport_size)
+        split = self._bounds[-1][1]
+        average = split / len(self._bounds)
+        return len(self._bounds) + max(1, round((self._length - split) / average))
+
+    @overload
+    def __getitem__(self, index: int) -> Tuple[int, int]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Tuple[int, int]]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Tuple[int, int], Sequence[Tuple[int, int]]]:
+        if isinstance(index, slice) or index < 0:
+            self._ensure(self._length)
+            return self._bounds[index]
+        self._ensure(index)
+        return self._bounds[index]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        i = 0
+        while True:
+            self._ensure(i)
+            if i >= len(self._bounds):
+                return
+            yield self._bounds[i]
+            i += 1
+
+    def page(self, index: int) -> str:
+        """
+        Return the text of a page.
+
+        Args:
+            index (int): The page index.
+
+        Returns:
+            str: The page text.
+        """
+        start, end = self[index]
+        return self._text(start, end)
+
+    def _text(self, start: int, end: int) -> str:
+        if isinstance(self._source, _FileSource):
+            chunk: Union[str, bytes] = self._source.read(start, end)
+        else:
+            chunk = self._source[start:end]
+        if isinstance(chunk, str):
+            return chunk
+        return chunk.decode("utf-8", errors="replace")
+
+    @property
+    def text(self) -> str:
+        """The full text of the document."""
+        return self._text(0, self._length)
+
+    def close(self) -> None:
+        """Close the file the pages are read from, if any."""
+        if isinstance(self._source, _FileSource):
+            self._source.close()
+
+
+class ViewportSearch:
+    """
+    Remembers which pages of a document match a find-on-page query.
+
+    Each page is normalized and searched at most once per query, so repeated
+    find_next calls only read pages that were never searched before.
+
+    Args:
+        document (PagedDocument): The document to search.
+        pattern (str): The regular expression matched against normalized page text.
+    """
+
+    def __init__(self, document: PagedDocument, pattern: str) -> None:
+        self.document = document
+        self.pattern = pattern
+        self._regex = re.compile(pattern)
+        self._matches: Dict[int, bool] = {}
+
+    def matches(self, index: int) -> bool:
+        """
+        Return whether a page matches the query.
+
+        Args:
+            index (int): The page index.
+
+        Returns:
+            bool: True if the normalized page text matches.
+        """
+        found = self._matches.get(index)
+        if found is None:
+            content = self.document.page(index)
+            ncontent = " " + (" ".join(re.split(r"\W+", content))).strip().lower() + " "
+            found = self._regex.search(ncontent) is not None
+            self._matches[index] = found
+        return found
+
+    def next_match(self, starting_viewport: int) -> Optional[int]:
+        """
+        Find the first matching page from a starting page, looping when reaching the end.
+
+        Args:
+            starting_viewport (int): The page to start from.
+
+        Returns:
+            int | None: The index of the matching page, or None if no page matches.
+        """
+        # Pages after the starting page are split only as far as the search goes
+        i = starting_viewport
+        while True:
+            try:
+                self.document[i]
+            except IndexError:
+                break
+            if self.matches(i):
+                return i
+            i += 1
+        for i in range(0, starting_viewport):
+            if self.matches(i):
+                return i
+        return None
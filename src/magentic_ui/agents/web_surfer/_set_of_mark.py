@@ -1,6 +1,9 @@
+import functools
 import io
-from typing import BinaryIO, Dict, List, Tuple, cast
+from typing import BinaryIO, Dict, List, Optional, Tuple, cast
 
+import numpy as np
+from numpy.typing import NDArray
 from PIL import Image, ImageDraw, ImageFont
 
 from ...tools.playwright.types import DOMRectangle, InteractiveRegion
@@ -17,6 +20,7 @@ def add_set_of_mark(
     screenshot: bytes | Image.Image | io.BufferedIOBase,
     ROIs: Dict[str, InteractiveRegion],
     use_sequential_ids: bool = False,
+    draw_size: Optional[Tuple[int, int]] = None,
 ) -> Tuple[Image.Image, List[str], List[str], List[str], Dict[str, str]]:
     """
     Add numbered markers to a screenshot for each interactive region.
@@ -25,6 +29,7 @@ def add_set_of_mark(
         screenshot (bytes | Image.Image | io.BufferedIOBase): The screenshot image as bytes, PIL Image, or file-like object
         ROIs (Dict[str, InteractiveRegion]): Dictionary mapping element IDs to their interactive regions
         use_sequential_ids (bool): If True, assigns sequential numbers to elements instead of using original IDs
+        draw_size (Tuple[int, int], optional): If set, the screenshot is scaled to this size (e.g. the size sent to the model) and the markers are drawn on the scaled image. Regions are still classified in screenshot coordinates. Default: None
 
     Returns:
         Tuple containing:
@@ -35,23 +40,102 @@ def add_set_of_mark(
         - Dict[str, str]: Mapping of displayed IDs to original element IDs
     """
     if isinstance(screenshot, Image.Image):
-        return _add_set_of_mark(screenshot, ROIs, use_sequential_ids)
+        return _add_set_of_mark(screenshot, ROIs, use_sequential_ids, draw_size)
 
     if isinstance(screenshot, bytes):
         screenshot = io.BytesIO(screenshot)
 
     image = Image.open(cast(BinaryIO, screenshot))
     comp, visible_rects, rects_above, rects_below, id_mapping = _add_set_of_mark(
-        image, ROIs, use_sequential_ids
+        image, ROIs, use_sequential_ids, draw_size
     )
     image.close()
     return comp, visible_rects, rects_above, rects_below, id_mapping
 
 
+def _classify_rects(
+    ROIs: Dict[str, InteractiveRegion], width: int, height: int
+) -> Tuple[List[str], List[str], List[str], List[Tuple[str, DOMRectangle]]]:
+    """
+    Sort the interactive regions into visible, above and below the viewport.
+
+    All rectangles are flattened into arrays and classified by their midpoints at once,
+    instead of per rectangle in Python. An element is listed in each category one of
+    its rectangles falls into, ordered as in `ROIs`. Options and file inputs count as
+    visible regardless of their position.
+
+    Args:
+        ROIs (Dict[str, InteractiveRegion]): Dictionary of interactive regions
+        width (int): Width of the screenshot
+        height (int): Height of the screenshot
+
+    Returns:
+        Tuple containing:
+        - List[str]: Visible element IDs
+        - List[str]: Element IDs above the viewport
+        - List[str]: Element IDs below the viewport
+        - List[Tuple[str, DOMRectangle]]: Rectangles to draw, with their element ID
+    """
+    ids = list(ROIs)
+    rect_elements: List[int] = []
+    rect_list: List[DOMRectangle] = []
+    always_visible = np.zeros(len(ids), dtype=bool)
+    is_option = np.zeros(len(ids), dtype=bool)
+    for i, original_id in enumerate(ids):
+        tag_name = ROIs[original_id].get("tag_name")
+        is_option[i] = tag_name == "option"
+        always_visible[i] = tag_name == "option" or tag_name == "input, type=file"
+        for rect in ROIs[original_id]["rects"]:
+            if rect:
+                rect_elements.append(i)
+                rect_list.append(rect)
+
+    elements = np.asarray(rect_elements, dtype=np.int64)
+    coords = np.asarray(
+        [
+            (rect["left"], rect["top"], rect["right"], rect["bottom"])
+            for rect in rect_list
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    sizes = np.asarray(
+        [rect["width"] * rect["height"] for rect in rect_list], dtype=np.float64
+    )
+    mid_x = (coords[:, 0] + coords[:, 2]) / 2.0
+    mid_y = (coords[:, 1] + coords[:, 3]) / 2.0
+
+    valid = (sizes != 0) & (mid_x >= 0) & (mid_x < width)
+    in_view = valid & (mid_y >= 0) & (mid_y < height)
+    classified = valid & ~always_visible[elements]
+
+    def element_ids(indices: NDArray[np.int64]) -> List[str]:
+        # np.unique sorts, which restores the order of the elements in ROIs
+        return [ids[i] for i in np.unique(indices)]
+
+    visible = np.union1d(
+        elements[classified & in_view], np.flatnonzero(always_visible)
+    ).astype(np.int64)
+    visible_rects = element_ids(visible)
+    rects_above = element_ids(elements[classified & (mid_y < 0)])
+    rects_below = element_ids(elements[classified & (mid_y >= height)])
+
+    to_draw = [
+        (ids[elements[i]], rect_list[i])
+        for i in np.flatnonzero(in_view & ~is_option[elements])
+    ]
+    return visible_rects, rects_above, rects_below, to_draw
+
+
+@functools.lru_cache(maxsize=None)
+def _get_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    return ImageFont.load_default(size)
+
+
 def _add_set_of_mark(
     screenshot: Image.Image,
     ROIs: Dict[str, InteractiveRegion],
     use_sequential_ids: bool = True,
+    draw_size: Optional[Tuple[int, int]] = None,
 ) -> Tuple[Image.Image, List[str], List[str], List[str], Dict[str, str]]:
     """
     Internal implementation for adding markers to the screenshot.
@@ -60,109 +144,101 @@ def _add_set_of_mark(
         screenshot (Image.Image): PIL Image to annotate
         ROIs (Dict[str, InteractiveRegion]): Dictionary of interactive regions
         use_sequential_ids (bool): Whether to use sequential numbers instead of original IDs
+        draw_size (Tuple[int, int], optional): Size to scale the screenshot to before drawing
 
     Returns:
         Same as :func:`add_set_of_mark`
     """
-    visible_rects: List[str] = []
-    rects_above: List[str] = []  # Scroll up to see
-    rects_below: List[str] = []  # Scroll down to see
+    width, height = screenshot.size
+    visible_rects, rects_above, rects_below, to_draw = _classify_rects(
+        ROIs, width, height
+    )
     id_mapping: Dict[str, str] = {}  # Maps new IDs to original IDs
-
-    base = screenshot.convert("RGBA")
-
-    # First pass to identify all rectangles
-    for original_id, roi in ROIs.items():
-        # Handle options separately and add to visible only
-        if roi.get("tag_name") == "option" or roi.get("tag_name") == "input, type=file":
-            if original_id not in visible_rects:
-                visible_rects.append(original_id)
-            continue
-
-        # Check each rectangle for the element
-        for rect in roi["rects"]:
-            if not rect or rect["width"] * rect["height"] == 0:
-                continue
-
-            mid = (
-                (rect["right"] + rect["left"]) / 2.0,
-                (rect["top"] + rect["bottom"]) / 2.0,
-            )
-
-            # Only process if x coordinate is valid
-            if 0 <= mid[0] < base.size[0]:
-                # Add to exactly one list based on y coordinate
-                if mid[1] < 0 and original_id not in rects_above:
-                    rects_above.append(original_id)
-                elif mid[1] >= base.size[1] and original_id not in rects_below:
-                    rects_below.append(original_id)
-                elif 0 <= mid[1] < base.size[1] and original_id not in visible_rects:
-                    visible_rects.append(original_id)
-
-    # Create new sequential IDs for all rectangles
-    next_id = 1
-    original_to_new: Dict[str, str] = {}  # Add reverse mapping
-
-    # Helper function to create new mapped IDs
-    def map_ids(original_ids: List[str]) -> List[str]:
-        nonlocal next_id, original_to_new
-        new_ids: List[str] = []
-        for original_id in original_ids:
-            new_id = str(next_id)
-            id_mapping[new_id] = original_id
-            original_to_new[original_id] = new_id  # Store reverse mapping
-            new_ids.append(new_id)
-            next_id += 1
-        return new_ids
+    original_to_new: Dict[str, str] = {}  # Reverse mapping
 
     if use_sequential_ids:
         # Map IDs in sequence: visible first, then above, then below
-        new_visible_rects = map_ids(visible_rects)
-        new_rects_above = map_ids(rects_above)
-        new_rects_below = map_ids(rects_below)
+        new_ids = [
+            str(i)
+            for i in range(
+                1, len(visible_rects) + len(rects_above) + len(rects_below) + 1
+            )
+        ]
+        for new_id, original_id in zip(
+            new_ids, visible_rects + rects_above + rects_below
+        ):
+            id_mapping[new_id] = original_id
+            original_to_new[original_id] = new_id
+        new_visible_rects = new_ids[: len(visible_rects)]
+        new_rects_above = new_ids[
+            len(visible_rects) : len(visible_rects) + len(rects_above)
+        ]
+        new_rects_below = new_ids[len(visible_rects) + len(rects_above) :]
     else:
         # Use original IDs but still maintain the mapping
         new_visible_rects = visible_rects.copy()
         new_rects_above = rects_above.copy()
         new_rects_below = rects_below.copy()
-        # Create identity mapping for all IDs
-        for id_list in [visible_rects, rects_above, rects_below]:
-            for original_id in id_list:
-                id_mapping[original_id] = original_id
-                original_to_new[original_id] = original_id
-
-    # Drawing code remains the same
-    fnt = ImageFont.load_default(14)
+        for original_id in visible_rects + rects_above + rects_below:
+            id_mapping[original_id] = original_id
+            original_to_new[original_id] = original_id
+
+    # Drawing on the scaled image avoids converting and compositing the full-size one
+    scale_x = scale_y = 1.0
+    if draw_size is not None and draw_size != screenshot.size:
+        scale_x = draw_size[0] / width
+        scale_y = draw_size[1] / height
+        base = screenshot.resize(draw_size).convert("RGBA")
+    else:
+        base = screenshot.convert("RGBA")
+
+    fnt = _get_font(14)
     overlay = Image.new("RGBA", base.size)
     draw = ImageDraw.Draw(overlay)
 
-    # Much simpler and faster lookup using the reverse mapping
-    for original_id, roi in ROIs.items():
-        if roi.get("tag_name") == "option":
-            continue
-
+    for original_id, rect in to_draw:
         new_id = original_to_new.get(original_id)
         if new_id is None:
             continue  # Skip if no mapping found
-
-        for rect in roi["rects"]:
-            if not rect or rect["width"] * rect["height"] == 0:
-                continue
-
-            mid = (
-                (rect["right"] + rect["left"]) / 2.0,
-                (rect["top"] + rect["bottom"]) / 2.0,
-            )
-
-            if 0 <= mid[0] < base.size[0] and 0 <= mid[1] < base.size[1]:
-                _draw_roi(draw, new_id, fnt, rect)
+        if scale_x != 1.0 or scale_y != 1.0:
+            rect = _scale_rect(rect, scale_x, scale_y)
+        _draw_roi(draw, new_id, fnt, rect)
 
     comp = Image.alpha_composite(base, overlay)
     overlay.close()
+    if base is not screenshot:
+        base.close()
 
     return comp, new_visible_rects, new_rects_above, new_rects_below, id_mapping
 
 
+def _scale_rect(rect: DOMRectangle, scale_x: float, scale_y: float) -> DOMRectangle:
+    return DOMRectangle(
+        x=rect["x"] * scale_x,
+        y=rect["y"] * scale_y,
+        width=rect["width"] * scale_x,
+        height=rect["height"] * scale_y,
+        top=rect["top"] * scale_y,
+        right=rect["right"] * scale_x,
+        bottom=rect["bottom"] * scale_y,
+        left=rect["left"] * scale_x,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _render_label(
+    text: str, font: ImageFont.FreeTypeFont | ImageFont.ImageFont
+) -> Image.Image:
+    """
+    Render label text once as a mask. Sequential IDs repeat on every step, so the
+    cache spares the font rasterization, which dominates drawing on busy pages.
+    """
+    left, top, right, bottom = font.getbbox(text, anchor="lt")
+    mask = Image.new("L", (int(right - left), int(bottom - top)))
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font, anchor="lt")
+    return mask
+
+
 def _draw_roi(
     draw: ImageDraw.ImageDraw,
     idx: str | int,  # Fix type hint to allow both string and int indices
@@ -182,28 +258,22 @@ def _draw_roi(
     text_color = (255, 255, 255, 255)  # White text for better contrast
 
     roi = ((rect["left"], rect["top"]), (rect["right"], rect["bottom"]))
+    label = _render_label(str(idx), font)
 
-    # Adjust label position if too close to top of screen
-    label_location = (rect["right"], rect["top"])
-    label_anchor = "rb"
-
-    if label_location[1] <= TOP_NO_LABEL_ZONE:
-        label_location = (rect["right"], rect["bottom"])
-        label_anchor = "rt"
+    # Label sits above the top right corner, or below it if too close to the top of the screen
+    label_left = int(rect["right"]) - label.width
+    if rect["top"] <= TOP_NO_LABEL_ZONE:
+        label_top = int(rect["bottom"])
+    else:
+        label_top = int(rect["top"]) - label.height
 
     draw.rectangle(roi, outline=color, width=2)
 
-    bbox = draw.textbbox(
-        label_location, str(idx), font=font, anchor=label_anchor, align="center"
+    bbox = (
+        label_left - 3,
+        label_top - 3,
+        label_left + label.width + 3,
+        label_top + label.height + 3,
     )
-    bbox = (bbox[0] - 3, bbox[1] - 3, bbox[2] + 3, bbox[3] + 3)
     draw.rectangle(bbox, fill=color)
-
-    draw.text(
-        label_location,
-        str(idx),
-        fill=text_color,
-        font=font,
-        anchor=label_anchor,
-        align="center",
-    )
+    draw.bitmap((label_left, label_top), label, fill=text_color)
@@ -4,6 +4,8 @@ from ...tools.tool_metadata import load_tool, make_approval_prompt
 
 EXPLANATION_TOOL_PROMPT = "Explain to the user the action to be performed and reason for doing so. Phrase as if you are directly talking to the user."
 
+PDF_PAGES_TOOL_PROMPT = 'Only for PDF documents: the page range to read, e.g. "40-45", "7" or "40-" (page 40 to the end). Omit to read from the first page.'
+
 REFINED_GOAL_PROMPT = "1) Summarize all the information observed and actions performed so far and 2) refine the request to be completed"
 
 IRREVERSIBLE_ACTION_PROMPT = make_approval_prompt(
@@ -423,6 +425,10 @@ TOOL_READ_PAGE_AND_ANSWER: ToolSchema = load_tool(
                         "type": "string",
                         "description": "The question to answer. Do not ask any follow up questions or say that you can help with more things.",
                     },
+                    "pages": {
+                        "type": "string",
+                        "description": PDF_PAGES_TOOL_PROMPT,
+                    },
                 },
                 "required": ["explanation", "question"],
             },
@@ -446,6 +452,10 @@ TOOL_SUMMARIZE_PAGE: ToolSchema = load_tool(
                         "type": "string",
                         "description": EXPLANATION_TOOL_PROMPT,
                     },
+                    "pages": {
+                        "type": "string",
+                        "description": PDF_PAGES_TOOL_PROMPT,
+                    },
                 },
                 "required": ["explanation"],
             },
@@ -26,7 +26,6 @@ from loguru import logger
 from urllib.parse import quote_plus
 from pydantic import Field
 import PIL.Image
-import tiktoken
 from autogen_agentchat.agents import BaseChatAgent
 from autogen_agentchat.base import Response
 from autogen_agentchat.messages import (
@@ -58,7 +57,11 @@ from playwright.async_api import (
     Page,
 )
 
-from ...tools.playwright.browser import PlaywrightBrowser, VncDockerPlaywrightBrowser
+from ...tools.playwright.browser import (
+    PlaywrightBrowser,
+    PooledPlaywrightBrowser,
+    VncDockerPlaywrightBrowser,
+)
 
 from ...approval_guard import (
     ApprovalGuardContext,
@@ -100,12 +103,14 @@ from ._tool_definitions import (
 
 from ...tools.tool_metadata import get_tool_metadata, ToolMetadata
 from ...tools.playwright.types import InteractiveRegion
+from ...tools.playwright.utils.pdf_text import parse_page_range
 from ...tools.playwright.playwright_controller import PlaywrightController
 from ...tools.playwright.playwright_state import (
     BrowserState,
     save_browser_state,
     load_browser_state,
 )
+from ...tools.tokenizer import count_tokens, truncate_to_tokens
 from ...tools.url_status_manager import (
     UrlStatusManager,
     UrlStatus,
@@ -297,7 +302,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         # TODO: These are a little bit of a hack so we can get the ports out of the browser object
         self.novnc_port = -1
         self.playwright_port = -1
-        if isinstance(self._browser, VncDockerPlaywrightBrowser):
+        if isinstance(
+            self._browser, (VncDockerPlaywrightBrowser, PooledPlaywrightBrowser)
+        ):
             self.novnc_port = self._browser.novnc_port
             self.playwright_port = self._browser.playwright_port
 
@@ -379,8 +386,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
 
         await self._browser.__aenter__()  # 启动浏览器
         
-
-        if isinstance(self._browser, VncDockerPlaywrightBrowser):
+        if isinstance(
+            self._browser, (VncDockerPlaywrightBrowser, PooledPlaywrightBrowser)
+        ):
             self.novnc_port = self._browser.novnc_port
             self.playwright_port = self._browser.playwright_port
             
@@ -422,6 +430,20 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         await self._set_debug_dir()
         self.did_lazy_init = True
 
+    def attach_browser(self, browser: PlaywrightBrowser) -> None:
+        """Use `browser` instead of the configured one, e.g. a browser leased from a pool.
+
+        Must be called before the browser is initialized.
+        """
+        if self.did_lazy_init:
+            raise RuntimeError("Cannot replace the browser after it was initialized.")
+        self._browser = browser
+        if isinstance(
+            self._browser, (VncDockerPlaywrightBrowser, PooledPlaywrightBrowser)
+        ):
+            self.novnc_port = self._browser.novnc_port
+            self.playwright_port = self._browser.playwright_port
+
     async def pause(self) -> None:
         """Pause the WebSurfer agent."""
         self.is_paused = True
@@ -953,12 +975,31 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         if not self.did_lazy_init:
             await self.lazy_init()
 
+        # Read the page state and the screenshot in one exchange with the browser,
+        # and the tabs information (which touches every page) concurrently
+        tabs_information_str = ""
+        num_tabs = 1
         try:
             assert self._page is not None
-            assert (
-                await self._playwright_controller.get_interactive_rects(self._page)
-                is not None
-            )
+            if not self.single_tab_mode and self._context is not None:
+                snapshot, tabs_info = await asyncio.gather(
+                    self._playwright_controller.snapshot(self._page),
+                    self.get_tabs_info(),
+                    return_exceptions=True,
+                )
+                if isinstance(snapshot, BaseException):
+                    raise snapshot
+                # Another tab failing (e.g. closing while it is read) leaves the current page usable
+                if isinstance(tabs_info, Exception):
+                    self.logger.warning(
+                        f"Failed to read the tabs information: {tabs_info}"
+                    )
+                elif isinstance(tabs_info, BaseException):
+                    raise tabs_info
+                else:
+                    num_tabs, tabs_information_str = tabs_info
+            else:
+                snapshot = await self._playwright_controller.snapshot(self._page)
         except Exception as e:
             # open a new tab and point it to about:blank
             self.logger.error(f"Page is not accessible, creating a new one: {e}")
@@ -966,6 +1007,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             self._page = await self._playwright_controller.create_new_tab(
                 self._context, "about:blank"
             )
+            snapshot = await self._playwright_controller.snapshot(self._page)
+            if not self.single_tab_mode:
+                num_tabs, tabs_information_str = await self.get_tabs_info()
 
         # Clone the messages to give context, removing old screenshots
         history: List[LLMMessage] = []
@@ -984,12 +1028,18 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                 filtered_history.extend(remove_images([msg]))
         history.extend(filtered_history)
 
-        # Ask the page for interactive elements, then prepare the state-of-mark screenshot
-        rects = await self._playwright_controller.get_interactive_rects(self._page)
-        viewport = await self._playwright_controller.get_visual_viewport(self._page)
-        screenshot = await self._playwright_controller.get_screenshot(self._page)
+        # Prepare the state-of-mark screenshot from the page's interactive elements
+        rects = snapshot["rects"]
+        viewport = snapshot["viewport"]
+        screenshot = snapshot["screenshot"]
+        assert screenshot is not None
         som_screenshot, visible_rects, rects_above, rects_below, element_id_mapping = (
-            add_set_of_mark(screenshot, rects, use_sequential_ids=True)
+            add_set_of_mark(
+                screenshot,
+                rects,
+                use_sequential_ids=True,
+                draw_size=(self.MLM_WIDTH, self.MLM_HEIGHT),
+            )
         )
         # element_id_mapping is a mapping of new ids to original ids in the page
         # we need to reverse it to get the original ids from the new ids
@@ -1009,11 +1059,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
                 )
             )
 
-        # Get the tabs information
-        tabs_information_str = ""
-        num_tabs = 1
         if not self.single_tab_mode and self._context is not None:
-            num_tabs, tabs_information_str = await self.get_tabs_info()
             tabs_information_str = f"There are {num_tabs} tabs open. The tabs are as follows:\n{tabs_information_str}"
 
         # What tools are available?
@@ -1046,7 +1092,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         #    tools.append(TOOL_UPLOAD_FILE)
 
         # Focus hint
-        focused = await self._playwright_controller.get_focused_rect_id(self._page)
+        focused = snapshot["focused_id"]
         focused = reverse_element_id_mapping.get(focused, focused)
 
         focused_hint = ""
@@ -1095,7 +1141,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
 
         tool_names = WebSurfer._tools_to_names(tools)
 
-        webpage_text = await self._playwright_controller.get_visible_text(self._page)
+        webpage_text = snapshot["visible_text"]
 
         if not self.json_model_output:
             text_prompt = WEB_SURFER_TOOL_PROMPT.format(
@@ -1126,15 +1172,13 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             ).strip()
 
         if self.is_multimodal:
-            # Scale the screenshot for the MLM, and close the original
-            scaled_som_screenshot = som_screenshot.resize(
-                (self.MLM_WIDTH, self.MLM_HEIGHT)
-            )
+            # The set-of-mark screenshot is already drawn at the MLM size;
+            # scale the plain screenshot and close the original
+            scaled_som_screenshot = som_screenshot
             screenshot_file = PIL.Image.open(io.BytesIO(screenshot))
             scaled_screenshot = screenshot_file.resize(
                 (self.MLM_WIDTH, self.MLM_HEIGHT)
             )
-            som_screenshot.close()
             screenshot_file.close()
 
             # Add the multimodal message and make the request
@@ -1470,7 +1514,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         assert "question" in args
         question: str = args["question"]
         return await self._summarize_page(
-            question=question, cancellation_token=cancellation_token
+            question=question,
+            pages=args.get("pages"),
+            cancellation_token=cancellation_token,
         )
 
     async def _execute_tool_summarize_page(
@@ -1478,7 +1524,9 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         args: Dict[str, Any],
         cancellation_token: Optional[CancellationToken] = None,
     ) -> str:
-        return await self._summarize_page(cancellation_token=cancellation_token)
+        return await self._summarize_page(
+            pages=args.get("pages"), cancellation_token=cancellation_token
+        )
 
     async def _execute_tool_hover(
         self,
@@ -1827,12 +1875,14 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
     async def _summarize_page(
         self,
         question: Optional[str] = None,
+        pages: Optional[str] = None,
         cancellation_token: Optional[CancellationToken] = None,
     ) -> str:
         """Generate a summary of the current page content.
 
         Args:
             question (str, optional): Optional specific question to answer about the page. Default: None
+            pages (str, optional): Page range to read if the page is a PDF, e.g. "40-45". Default: None (from the first page)
             cancellation_token (CancellationToken, optional): Token to cancel the operation. Default: None
 
         Returns:
@@ -1840,10 +1890,13 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         """
         assert self._page is not None
 
-        # Get page content and title
-        page_markdown: str = await self._playwright_controller.get_page_markdown(
-            self._page
-        )
+        page_range: Optional[range] = None
+        if pages:
+            try:
+                page_range = parse_page_range(pages)
+            except ValueError as e:
+                return f"{e}. Use a range such as '40-45', '7' or '40-'."
+
         title: str = await self._page.title() or self._page.url
 
         # Take a screenshot and scale it
@@ -1861,8 +1914,7 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
         prompt = WEB_SURFER_QA_PROMPT(title, question)
 
         # Truncate the page content if needed to fit within token limits
-        tokenizer = tiktoken.encoding_for_model("gpt-4o")
-        prompt_tokens = len(tokenizer.encode(prompt))
+        prompt_tokens = count_tokens(prompt)
         # Reserve tokens for the image (SCREENSHOT_TOKENS) and some buffer for the response
         max_content_tokens = 128000 - self.SCREENSHOT_TOKENS - prompt_tokens - 1000
 
@@ -1870,12 +1922,13 @@ class WebSurfer(BaseChatAgent, Component[WebSurferConfig]):
             # If we don't have enough tokens, just use a minimal prompt
             content = prompt
         else:
-            # Truncate the page content to fit within the token limit
-            content_tokens = tokenizer.encode(page_markdown)
-            if len(content_tokens) > max_content_tokens:
-                truncated_content = tokenizer.decode(
-                    content_tokens[:max_content_tokens]
-                )
+            # Read one token more than fits, so long PDFs are only extracted as far as
+            # needed and truncation can still be detected
+            page_markdown: str = await self._playwright_controller.get_page_markdown(
+                self._page, max_tokens=max_content_tokens + 1, pages=page_range
+            )
+            truncated_content = truncate_to_tokens(page_markdown, max_content_tokens)
+            if len(truncated_content) < len(page_markdown):
                 content = f"Page content (truncated):\n{truncated_content}\n\n{prompt}"
             else:
                 content = f"Page content:\n{page_markdown}\n\n{prompt}"
@@ -1,5 +1,6 @@
-from .db_manager import DatabaseManager
+from .db_manager import DatabaseManager, get_async_engine_uri
 
 __all__ = [
     "DatabaseManager",
+    "get_async_engine_uri",
 ]
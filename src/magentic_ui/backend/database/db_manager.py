@@ -1,21 +1,59 @@
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional, Union, Dict
+from typing import Any, List, Optional, Sequence, Tuple, Union, Dict
 
 from loguru import logger
-from sqlalchemy import exc, inspect, text
+from sqlalchemy import exc, func, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import aliased
 from sqlmodel import Session, SQLModel, and_, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..datamodel import DatabaseModel, Response, Team
+from ..datamodel import DatabaseModel, Message, Response, Run, Team
 from ..teammanager import TeamManager
 from .schema_manager import SchemaManager
 
 
+def get_async_engine_uri(engine_uri: str) -> str:
+    """
+    Map a synchronous database URI to the equivalent asyncio driver URI.
+
+    SQLite URIs use aiosqlite and Postgres URIs use psycopg (v3) in async mode.
+    URIs that already name a driver other than the sync defaults are returned unchanged.
+
+    Args:
+        engine_uri (str): Synchronous database connection URI
+
+    Returns:
+        str: Database URI usable with `create_async_engine`
+    """
+    scheme, sep, rest = engine_uri.partition("://")
+    if not sep:
+        return engine_uri
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite" and scheme != "sqlite+aiosqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgresql", "postgres") and scheme in (
+        "postgresql",
+        "postgres",
+        "postgresql+psycopg2",
+    ):
+        return f"postgresql+psycopg://{rest}"
+    return engine_uri
+
+
 class DatabaseManager:
     _init_lock = threading.Lock()
 
-    def __init__(self, engine_uri: str, base_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        engine_uri: str,
+        base_dir: Optional[Path] = None,
+        async_engine_uri: Optional[str] = None,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+    ):
         """
         Initialize DatabaseManager with database connection settings.
         Does not perform any database operations.
@@ -23,15 +61,40 @@ class DatabaseManager:
         Args:
             engine_uri (str): Database connection URI (e.g. sqlite:///db.sqlite3)
             base_dir (Path, optional): Base directory for migration files. If None, uses current directory. Default: None.
+            async_engine_uri (str, optional): Connection URI for the async engine used by the `a*` methods. If None, it is derived from `engine_uri`. Default: None.
+            pool_size (int, optional): Number of pooled connections kept open by the async engine. Default: 10.
+            max_overflow (int, optional): Extra connections the async engine may open under load. Default: 20.
         """
         connection_args = {"check_same_thread": True} if "sqlite" in engine_uri else {}
 
         self.engine = create_engine(engine_uri, connect_args=connection_args)
+        self.async_engine: AsyncEngine = self._create_async_engine(
+            async_engine_uri or get_async_engine_uri(engine_uri),
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+        )
         self.schema_manager = SchemaManager(
             engine=self.engine,
             base_dir=base_dir,
         )
 
+    @staticmethod
+    def _create_async_engine(
+        async_engine_uri: str, pool_size: int, max_overflow: int
+    ) -> AsyncEngine:
+        """Create the pooled async engine. In-memory SQLite uses a static pool and takes no sizing arguments."""
+        if "sqlite" in async_engine_uri and (
+            ":memory:" in async_engine_uri or async_engine_uri.endswith("://")
+        ):
+            return create_async_engine(async_engine_uri)
+        pool_args: Dict[str, Any] = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+        }
+        if "sqlite" not in async_engine_uri:
+            pool_args["pool_pre_ping"] = True
+        return create_async_engine(async_engine_uri, **pool_args)
+
     def _should_auto_upgrade(self) -> bool:
         """
         Check if auto upgrade should run based on schema differences
@@ -289,6 +352,361 @@ class DatabaseManager:
 
         return Response(message=status_message, status=status, data=None)
 
+    async def aupsert(self, model: DatabaseModel, return_json: bool = True) -> Response:
+        """Create or update an entity without blocking the event loop.
+
+        Async counterpart of `upsert` running on the pooled async engine.
+
+        Args:
+            model (DatabaseModel): The model instance to create or update
+            return_json (bool, optional): If True, returns the model as a dictionary. If False, returns the SQLModel instance. Default: True.
+
+        Returns:
+            Response: Contains status, message and data (either dict or SQLModel based on return_json)
+        """
+        status = True
+        model_class = type(model)
+        existing_model = None
+
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            try:
+                existing_model = (
+                    await session.exec(
+                        select(model_class).where(model_class.id == model.id)
+                    )
+                ).first()
+                if existing_model:
+                    model.updated_at = datetime.now()
+                    for key, value in model.model_dump().items():
+                        setattr(existing_model, key, value)
+                    model = existing_model  # Use the updated existing model
+                    session.add(model)
+                else:
+                    session.add(model)
+                await session.commit()
+                await session.refresh(model)
+            except Exception as e:
+                await session.rollback()
+                logger.error(
+                    "Error while updating/creating "
+                    + str(model_class.__name__)
+                    + ": "
+                    + str(e)
+                )
+                status = False
+
+        return Response(
+            message=(
+                f"{model_class.__name__} Updated Successfully"
+                if existing_model
+                else f"{model_class.__name__} Created Successfully"
+            ),
+            status=status,
+            data=model.model_dump() if return_json else model,
+        )
+
+    async def abulk_insert(self, models: Sequence[DatabaseModel]) -> Response:
+        """Insert many new entities in a single transaction without per-row lookups.
+
+        Unlike `aupsert`, rows are not checked for existing ids; callers must only pass
+        new entities. Rows are inserted in the given order.
+
+        Args:
+            models (Sequence[DatabaseModel]): The new model instances to insert
+
+        Returns:
+            Response: Contains status, message and the number of inserted rows as data
+        """
+        if not models:
+            return Response(message="Nothing to insert", status=True, data=0)
+
+        model_name = type(models[0]).__name__
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            try:
+                session.add_all(models)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                error_msg = f"Error while bulk inserting {model_name}: {e}"
+                logger.error(error_msg)
+                return Response(message=error_msg, status=False, data=0)
+
+        return Response(
+            message=f"{len(models)} {model_name} Created Successfully",
+            status=True,
+            data=len(models),
+        )
+
+    async def aget(
+        self,
+        model_class: type[DatabaseModel],
+        filters: dict[str, Any] | None = None,
+        return_json: bool = False,
+        order: str = "desc",
+    ) -> Response:
+        """List entities without blocking the event loop. Async counterpart of `get`."""
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            result = []
+            status = True
+            status_message = ""
+
+            try:
+                statement = select(model_class)
+                if filters:
+                    conditions = [
+                        getattr(model_class, col) == value
+                        for col, value in filters.items()
+                    ]
+                    statement = statement.where(and_(*conditions))
+
+                if hasattr(model_class, "created_at") and order:
+                    order_by_clause = getattr(
+                        model_class.created_at, order
+                    )()  # Dynamically apply asc/desc
+                    statement = statement.order_by(order_by_clause)
+
+                items = (await session.exec(statement)).all()
+                result = [
+                    item.model_dump(mode="json") if return_json else item
+                    for item in items
+                ]
+                status_message = f"{model_class.__name__} Retrieved Successfully"
+            except Exception as e:
+                await session.rollback()
+                status = False
+                status_message = f"Error while fetching {model_class.__name__}"
+                logger.error(
+                    "Error while getting items: "
+                    + str(model_class.__name__)
+                    + " "
+                    + str(e)
+                )
+
+            return Response(message=status_message, status=status, data=result)
+
+    async def aget_page(
+        self,
+        model_class: type[DatabaseModel],
+        filters: dict[str, Any] | None = None,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        return_json: bool = False,
+    ) -> Response:
+        """
+        List entities in ascending id order, one page at a time (keyset pagination).
+
+        Args:
+            model_class (type[DatabaseModel]): Model to list.
+            filters (dict, optional): Column equality filters. Default: None.
+            after_id (int, optional): Only return entities with an id greater than this cursor. Default: None.
+            limit (int, optional): Maximum number of entities to return. If None, all remaining entities are returned. Default: None.
+            return_json (bool, optional): Return entities as dicts. Default: False.
+
+        Returns:
+            Response: `data` holds `items` and `next_after_id`, the cursor for the next page (None on the last page).
+        """
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            try:
+                statement = select(model_class)
+                if filters:
+                    conditions = [
+                        getattr(model_class, col) == value
+                        for col, value in filters.items()
+                    ]
+                    statement = statement.where(and_(*conditions))
+                items, next_after_id = self._split_page(
+                    (
+                        await session.exec(
+                            self._keyset(statement, model_class, after_id, limit)
+                        )
+                    ).all(),
+                    limit,
+                )
+                return Response(
+                    message=f"{model_class.__name__} Retrieved Successfully",
+                    status=True,
+                    data={
+                        "items": [
+                            item.model_dump(mode="json") if return_json else item
+                            for item in items
+                        ],
+                        "next_after_id": next_after_id,
+                    },
+                )
+            except Exception as e:
+                await session.rollback()
+                logger.error(
+                    f"Error while getting page of {model_class.__name__}: {str(e)}"
+                )
+                return Response(
+                    message=f"Error while fetching {model_class.__name__}",
+                    status=False,
+                    data={"items": [], "next_after_id": None},
+                )
+
+    async def aget_session_runs(
+        self,
+        session_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None,
+        message_limit: Optional[int] = None,
+    ) -> Response:
+        """
+        List the runs of a session together with their messages.
+
+        The page of runs is loaded first and their messages with a second query, so the
+        run rows are not repeated once per message.
+
+        Args:
+            session_id (int): Session whose runs are listed.
+            after_id (int, optional): Only return runs with an id greater than this cursor. Default: None.
+            limit (int, optional): Maximum number of runs to return. If None, all remaining runs are returned. Default: None.
+            message_limit (int, optional): Maximum number of messages returned per run. If None, all messages are returned. Default: None.
+
+        Returns:
+            Response: `data` holds `runs`, a list of `(run, messages)` pairs in id order, `next_after_id`, and
+            `next_message_after_ids`, the message cursor of each run with more messages than `message_limit`.
+        """
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            try:
+                statement = self._keyset(
+                    select(Run).where(Run.session_id == session_id),
+                    Run,
+                    after_id,
+                    limit,
+                )
+                page, next_after_id = self._split_page(
+                    (await session.exec(statement)).all(), limit
+                )
+                runs: Dict[int, Tuple[Run, List[Message]]] = {
+                    run.id: (run, []) for run in page
+                }
+                next_message_after_ids: Dict[int, int] = {}
+                if runs:
+                    in_page: Any = Message.run_id.in_(list(runs))  # type: ignore
+                    if message_limit is None:
+                        statement = (
+                            select(Message)
+                            .where(in_page)
+                            .order_by(Message.run_id, Message.id)  # type: ignore
+                        )
+                    else:
+                        ranked = (
+                            select(
+                                Message,
+                                func.row_number()
+                                .over(partition_by=Message.run_id, order_by=Message.id)
+                                .label("position"),
+                            )
+                            .where(in_page)
+                            .subquery()
+                        )
+                        # One extra message per run tells whether the run has more
+                        statement = (
+                            select(aliased(Message, ranked))
+                            .where(ranked.c.position <= message_limit + 1)
+                            .order_by(ranked.c.run_id, ranked.c.id)
+                        )
+                    for message in (await session.exec(statement)).all():
+                        messages = runs[message.run_id][1]
+                        if message_limit is not None and len(messages) == message_limit:
+                            next_message_after_ids[message.run_id] = messages[-1].id
+                        else:
+                            messages.append(message)
+                return Response(
+                    message="Run Retrieved Successfully",
+                    status=True,
+                    data={
+                        "runs": list(runs.values()),
+                        "next_after_id": next_after_id,
+                        "next_message_after_ids": next_message_after_ids,
+                    },
+                )
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Error while getting runs of session {session_id}: {e}")
+                return Response(
+                    message="Error while fetching Run",
+                    status=False,
+                    data={
+                        "runs": [],
+                        "next_after_id": None,
+                        "next_message_after_ids": {},
+                    },
+                )
+
+    @staticmethod
+    def _keyset(
+        statement: Any,
+        model_class: type[SQLModel],
+        after_id: Optional[int],
+        limit: Optional[int],
+    ) -> Any:
+        """Restrict a statement to the page after `after_id`, fetching one extra row to detect more pages."""
+        id_column: Any = getattr(model_class, "id")
+        if after_id is not None:
+            statement = statement.where(id_column > after_id)
+        statement = statement.order_by(id_column)
+        if limit is not None:
+            statement = statement.limit(limit + 1)
+        return statement
+
+    @staticmethod
+    def _split_page(
+        rows: Sequence[Any], limit: Optional[int]
+    ) -> Tuple[List[Any], Optional[int]]:
+        """Split the rows fetched by `_keyset` into the page and the cursor of the next page."""
+        if limit is None or len(rows) <= limit:
+            return list(rows), None
+        page = list(rows[:limit])
+        last = page[-1]
+        return page, last if isinstance(last, int) else last.id
+
+    async def adelete(
+        self, model_class: type[SQLModel], filters: dict[str, Any] | None = None
+    ) -> Response:
+        """Delete an entity without blocking the event loop. Async counterpart of `delete`."""
+        status_message = ""
+        status = True
+
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+            try:
+                if "sqlite" in str(self.async_engine.url):
+                    await (await session.connection()).execute(
+                        text("PRAGMA foreign_keys=ON")
+                    )
+                statement = select(model_class)
+                if filters:
+                    conditions = [
+                        getattr(model_class, col) == value
+                        for col, value in filters.items()
+                    ]
+                    statement = statement.where(and_(*conditions))
+
+                rows = (await session.exec(statement)).all()
+
+                if rows:
+                    for row in rows:
+                        await session.delete(row)
+                    await session.commit()
+                    status_message = f"{model_class.__name__} Deleted Successfully"
+                else:
+                    status_message = "Row not found"
+                    logger.info(f"Row with filters {filters} not found")
+
+            except exc.IntegrityError as e:
+                await session.rollback()
+                status = False
+                status_message = f"Integrity error: The {model_class.__name__} is linked to another entity and cannot be deleted. {e}"
+                logger.error(status_message)
+            except Exception as e:
+                await session.rollback()
+                status = False
+                status_message = f"Error while deleting: {e}"
+                logger.error(status_message)
+
+        return Response(message=status_message, status=status, data=None)
+
     async def import_team(
         self,
         team_config: Union[str, Path, Dict[str, Any]],
@@ -390,8 +808,9 @@ class DatabaseManager:
         """Close database connections and cleanup resources"""
         logger.info("Closing database connections...")
         try:
-            # Dispose of the SQLAlchemy engine
+            # Dispose of the SQLAlchemy engines
             self.engine.dispose()
+            await self.async_engine.dispose()
             logger.info("Database connections closed successfully")
         except Exception as e:
             logger.error(f"Error closing database connections: {str(e)}")
@@ -1,8 +1,10 @@
 from .db import (
+    CheckpointKind,
     Gallery,
     Message,
     Plan,
     Run,
+    RunCheckpoint,
     RunStatus,
     Session,
     Settings,
@@ -28,6 +30,8 @@ __all__ = [
     "Team",
     "Run",
     "RunStatus",
+    "RunCheckpoint",
+    "CheckpointKind",
     "Session",
     "Team",
     "Message",
@@ -6,7 +6,7 @@ from typing import Any, List, Optional, Union
 
 from autogen_core import ComponentModel
 from pydantic import field_serializer
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Index, Integer
 from sqlmodel import JSON, Column, DateTime, Field, SQLModel, func
 
 from .types import (
@@ -36,7 +36,12 @@ class Team(SQLModel, table=True):
 
 
 class Message(SQLModel, table=True):
-    __table_args__ = {"sqlite_autoincrement": True}
+    # Message history is read per run/session in id order (keyset pagination)
+    __table_args__ = (
+        Index("ix_message_run_id_id", "run_id", "id"),
+        Index("ix_message_session_id_id", "session_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), server_default=func.now()),
@@ -101,7 +106,10 @@ class InputType(str, Enum):
 class Run(SQLModel, table=True):
     """Represents a single execution run within a session"""
 
-    __table_args__ = {"sqlite_autoincrement": True}
+    __table_args__ = (
+        Index("ix_run_session_id_id", "session_id", "id"),
+        {"sqlite_autoincrement": True},
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(
@@ -149,6 +157,36 @@ class Run(SQLModel, table=True):
             return value.isoformat()
 
 
+class CheckpointKind(str, Enum):
+    FULL = "full"
+    DELTA = "delta"
+
+
+class RunCheckpoint(SQLModel, table=True):
+    """
+    One entry of the append-only team state checkpoint log of a run.
+
+    A FULL checkpoint holds the complete compressed team state. A DELTA checkpoint holds
+    the compressed changes since the previous checkpoint and points at the FULL checkpoint
+    (`base_id`) it builds on. The state of a run is its latest FULL checkpoint with the
+    DELTA checkpoints of that base applied in id order.
+    """
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+    )  # pylint: disable=not-callable
+    run_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, ForeignKey("run.id", ondelete="CASCADE"), index=True),
+    )
+    kind: CheckpointKind = Field(default=CheckpointKind.FULL)
+    base_id: Optional[int] = None
+    data: str = ""
+
+
 class Gallery(SQLModel, table=True):
     __table_args__ = {"sqlite_autoincrement": True}
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -220,4 +258,6 @@ class Plan(SQLModel, table=True):
             return value.isoformat()
 
 
-DatabaseModel = Team | Message | Session | Run | Gallery | Settings | Plan
+DatabaseModel = (
+    Team | Message | Session | Run | RunCheckpoint | Gallery | Settings | Plan
+)
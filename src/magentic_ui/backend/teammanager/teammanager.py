@@ -32,8 +32,14 @@ from ...input_func import InputFuncType
 from ...agents import WebSurfer
 
 from ..datamodel.types import EnvironmentVariable, LLMCallEventMessage, TeamResult
-from ..datamodel.db import Run
-from ..utils.utils import get_modified_files, decompress_state
+from ..datamodel.db import Run, RunCheckpoint
+from ..utils.blob_store import BlobStore
+from ..utils.file_watcher import WorkspaceWatcher
+from ..utils.utils import (
+    decompress_state,
+    restore_checkpoint_state,
+)
+from ...tools.playwright.browser import BrowserPool, PooledPlaywrightBrowser
 from ...tools.playwright.browser.utils import get_browser_resource_config
 
 # besiii
@@ -61,6 +67,7 @@ class TeamManager:
         external_workspace_root: Path,
         inside_docker: bool = True,
         config: dict[str, Any] = {},
+        browser_pool: Optional[BrowserPool] = None,
     ) -> None:
         self.team: Team | None = None
         self.load_from_config = False
@@ -68,6 +75,9 @@ class TeamManager:
         self.external_workspace_root = external_workspace_root
         self.inside_docker = inside_docker
         self.config = config
+        self.blob_store = BlobStore(internal_workspace_root / "blobs")
+        # Pre-started browsers for the web surfer; None starts a new browser per run
+        self.browser_pool = browser_pool
 
     @staticmethod
     async def load_from_file(path: Union[str, Path]) -> Dict[str, Any]:
@@ -142,15 +152,21 @@ class TeamManager:
     async def _create_team(
         self,
         team_config: Union[str, Path, Dict[str, Any], ComponentModel],
-        state: Optional[Mapping[str, Any] | str] = None,
+        state: Optional[Mapping[str, Any] | str | Sequence[RunCheckpoint]] = None,
         input_func: Optional[InputFuncType] = None,
         env_vars: Optional[List[EnvironmentVariable]] = None,
         settings_config: dict[str, Any] = {},
         *,
         paths: RunPaths,
         mode: Optional[str] = None,
+        owner: Optional[str] = None,
     ) -> tuple[Team, int, int]:
-        """Create team instance from config"""
+        """Create team instance from config
+
+        `state` may be a state mapping, a (compressed) JSON string, or the checkpoint log
+        of a run, in which case the state is rebuilt from the latest full checkpoint plus
+        its deltas. `owner` is the user a pooled browser is leased to.
+        """
 
         _, novnc_port, playwright_port = get_browser_resource_config(
             paths.external_run_dir, -1, -1, self.inside_docker
@@ -253,14 +269,24 @@ class TeamManager:
                         inside_docker=self.inside_docker,
                     )
 
-                    self.team = cast(
-                        Team,
-                        await get_task_team(
-                            magentic_ui_config=magentic_ui_config,
-                            input_func=input_func,
-                            paths=paths,
-                        ),
-                    )
+                    browser: Optional[PooledPlaywrightBrowser] = None
+                    if self.browser_pool is not None:
+                        browser = await self.browser_pool.acquire(owner=owner)
+                    try:
+                        self.team = cast(
+                            Team,
+                            await get_task_team(
+                                magentic_ui_config=magentic_ui_config,
+                                input_func=input_func,
+                                paths=paths,
+                                browser=browser,
+                            ),
+                        )
+                    except Exception:
+                        # The team never took ownership of the lease
+                        if browser is not None:
+                            await browser.__aexit__(None, None, None)
+                        raise
 
 
                 if hasattr(self.team, "_participants"):
@@ -274,13 +300,17 @@ class TeamManager:
                         try:
                             # Try to decompress if it's compressed
                             state_dict = decompress_state(state)
-                            await self.team.load_state(state_dict)
                         except Exception:
                             # If decompression fails, assume it's a regular JSON string
                             state_dict = json.loads(state)
-                            await self.team.load_state(state_dict)
+                    elif isinstance(state, Sequence):
+                        state_dict = restore_checkpoint_state(state)
                     else:
-                        await self.team.load_state(state)
+                        state_dict = state
+                    # Inline images that were offloaded to the blob store
+                    await self.team.load_state(
+                        self.blob_store.resolve_images(state_dict)
+                    )
 
                 return self.team, novnc_port, playwright_port
 
@@ -428,7 +458,7 @@ class TeamManager:
         self,
         task: Optional[Union[ChatMessage, str, Sequence[ChatMessage]]],
         team_config: Union[str, Path, dict[str, Any], ComponentModel],
-        state: Optional[Mapping[str, Any] | str] = None,
+        state: Optional[Mapping[str, Any] | str | Sequence[RunCheckpoint]] = None,
         input_func: Optional[InputFuncType] = None,
         cancellation_token: Optional[CancellationToken] = None,
         env_vars: Optional[List[EnvironmentVariable]] = None,
@@ -447,12 +477,8 @@ class TeamManager:
         logger.handlers = [llm_event_logger]  # Replace all handlers
         logger.info(f"Running in docker: {self.inside_docker}")
         paths = self.prepare_run_paths(run=run)
-        known_files = set(
-            file["name"]
-            for file in get_modified_files(
-                0, time.time(), source_dir=str(paths.internal_run_dir)
-            )
-        )
+        # Tracks files generated during the run without rescanning the whole workspace
+        file_watcher = WorkspaceWatcher(str(paths.internal_run_dir), since=start_time)
         global_new_files: List[Dict[str, str]] = []
         try:
             # TODO: This might cause problems later if we are not careful
@@ -474,13 +500,11 @@ class TeamManager:
                     settings_config or {},
                     paths=paths,
                     mode=mode,
+                    owner=str(run.user_id) if run else None,
                 )
 
                 # Initialize known files by name for tracking
-                initial_files = get_modified_files(
-                    start_time, time.time(), source_dir=str(paths.internal_run_dir)
-                )
-                known_files = {file["name"] for file in initial_files}
+                file_watcher.poll()
 
                
                 if mode == "websurfer":
@@ -502,22 +526,8 @@ class TeamManager:
                     if cancellation_token and cancellation_token.is_cancelled():
                         break
 
-                    # Get all current files with full metadata
-                    modified_files = get_modified_files(
-                        start_time, time.time(), source_dir=str(paths.internal_run_dir)
-                    )
-                    current_file_names = {file["name"] for file in modified_files}
-
-                    # Find new files
-                    new_file_names = current_file_names - known_files
-                    known_files = current_file_names  # Update for next iteration
-
-                    # Get the full data for new files
-                    new_files = [
-                        file
-                        for file in modified_files
-                        if file["name"] in new_file_names
-                    ]
+                    # Find new files with full metadata
+                    new_files = file_watcher.poll()
 
                     if new_files:
                         # filter files that start with "tmp_code"
@@ -544,7 +554,8 @@ class TeamManager:
                             task_result=message,
                             usage="",
                             duration=time.time() - start_time,
-                            files=modified_files,  # Full file data preserved
+                            # Full file data preserved
+                            files=file_watcher.modified_files(),
                         )
                     else:
                         yield message
@@ -0,0 +1,173 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+BLOB_URL_PREFIX = "/api/blobs/"
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Magic numbers of the image formats autogen Images are created from
+_IMAGE_SIGNATURES: Dict[bytes, str] = {
+    b"\x89PNG\r\n\x1a\n": "image/png",
+    b"\xff\xd8\xff": "image/jpeg",
+    b"GIF87a": "image/gif",
+    b"GIF89a": "image/gif",
+}
+
+
+def guess_image_type(data: bytes) -> Optional[str]:
+    """Return the MIME type of an image from its magic number, or None if unknown"""
+    if data.startswith(b"RIFF") and data[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, media_type in _IMAGE_SIGNATURES.items():
+        if data.startswith(signature):
+            return media_type
+    return None
+
+
+class BlobStore:
+    """
+    Content-addressed (sha256) on-disk store for image bytes.
+
+    Serialized autogen Images (`{"data": "<base64>"}`) found in team states and message
+    configs are written once to `<root>/<digest[:2]>/<digest>` and replaced by a
+    reference `{"blob_ref": "<digest>", "url": "/api/blobs/<digest>"}`. The `url` lets the
+    UI render stored messages directly, and `resolve_images` turns references back into
+    inline images before a state is loaded into a team.
+
+    The digests of recently offloaded images are remembered by their base64 string, so
+    images that appear in every checkpoint of a run are not decoded, hashed and looked
+    up on disk again. `offload_images` is blocking; async callers run it in a thread.
+
+    Args:
+        root (Path): Directory holding the blobs, usually inside the workspace root
+        memo_bytes (int, optional): Total size of the base64 strings whose digests are remembered. Default: 64 MiB.
+    """
+
+    def __init__(self, root: Path, memo_bytes: int = 64 * 1024 * 1024):
+        self.root = Path(root)
+        self.memo_bytes = memo_bytes
+        self._memo: "OrderedDict[str, str]" = OrderedDict()
+        self._memo_size = 0
+        self._memo_lock = threading.Lock()
+
+    def path_for(self, digest: str) -> Path:
+        """
+        Path of the blob with the given digest
+
+        Args:
+            digest (str): Hex sha256 digest of the blob
+
+        Returns:
+            Path: Location of the blob, whether or not it exists
+        """
+        if not _DIGEST_RE.match(digest):
+            raise ValueError(f"Invalid blob digest: {digest}")
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> str:
+        """
+        Store bytes unless an identical blob already exists
+
+        Args:
+            data (bytes): Blob content
+
+        Returns:
+            str: Hex sha256 digest addressing the blob
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial blobs
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read a blob
+
+        Args:
+            digest (str): Hex sha256 digest of the blob
+
+        Returns:
+            bytes: Blob content
+        """
+        return self.path_for(digest).read_bytes()
+
+    def offload_images(self, obj: Any) -> Any:
+        """
+        Replace inline base64 images in a JSON structure with blob references
+
+        Args:
+            obj (Any): JSON-compatible structure, e.g. a team state or message dump
+
+        Returns:
+            Any: A copy of the structure with images stored in the blob store
+        """
+        if isinstance(obj, dict):
+            if len(obj) == 1 and isinstance(obj.get("data"), str):
+                digest = self._offload_image(obj["data"])
+                if digest is not None:
+                    return {"blob_ref": digest, "url": BLOB_URL_PREFIX + digest}
+            return {key: self.offload_images(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self.offload_images(item) for item in obj]
+        return obj
+
+    def resolve_images(self, obj: Any) -> Any:
+        """
+        Replace blob references in a JSON structure with inline base64 images
+
+        Args:
+            obj (Any): JSON-compatible structure produced by `offload_images`
+
+        Returns:
+            Any: A copy of the structure with the original inline images
+        """
+        if isinstance(obj, dict):
+            if isinstance(obj.get("blob_ref"), str) and set(obj) <= {"blob_ref", "url"}:
+                data = base64.b64encode(self.get(obj["blob_ref"])).decode("utf-8")
+                return {"data": data}
+            return {key: self.resolve_images(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self.resolve_images(item) for item in obj]
+        return obj
+
+    def _offload_image(self, data: str) -> Optional[str]:
+        """Store a base64 image and return its digest, or None if it is not an image"""
+        with self._memo_lock:
+            digest = self._memo.get(data)
+            if digest is not None:
+                self._memo.move_to_end(data)
+                return digest
+        image_bytes = self._decode_image(data)
+        if image_bytes is None:
+            return None
+        digest = self.put(image_bytes)
+        with self._memo_lock:
+            if data not in self._memo and len(data) <= self.memo_bytes:
+                self._memo[data] = digest
+                self._memo_size += len(data)
+                while self._memo_size > self.memo_bytes:
+                    evicted, _ = self._memo.popitem(last=False)
+                    self._memo_size -= len(evicted)
+        return digest
+
+    @staticmethod
+    def _decode_image(data: str) -> Optional[bytes]:
+        try:
+            image_bytes = base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            return None
+        return image_bytes if guess_image_type(image_bytes) else None
@@ -0,0 +1,138 @@
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+from .utils import IGNORE_FILES, get_file_info, is_ignored_file
+
+# Directories whose mtime is this close to the last scan may still change within the
+# same timestamp tick (coarse filesystem clocks), so they are rescanned until they settle
+_RACY_WINDOW_NS = 2_000_000_000
+
+
+class WorkspaceWatcher:
+    """
+    Incremental detector of files generated in a run directory.
+
+    Keeps an mtime-indexed snapshot of the directory tree. A poll only lists directories
+    whose own mtime changed since the previous poll (an entry was created, removed or
+    renamed in them) and only stats the files of those directories, so the cost of a
+    poll depends on what changed rather than on the size of the workspace. In-place
+    rewrites of existing files do not touch the directory mtime; they are picked up by
+    a full rescan every `full_rescan_interval` seconds.
+
+    Reports the same files and metadata as `get_modified_files` with the same ignore
+    rules.
+
+    Args:
+        source_dir (str): Directory to watch
+        since (float): Only files modified at or after this timestamp are reported
+        full_rescan_interval (float, optional): Seconds between full rescans. Default: 30.0
+    """
+
+    def __init__(
+        self, source_dir: str, since: float, full_rescan_interval: float = 30.0
+    ):
+        self.source_dir = source_dir
+        self.since_ns = int(since * 1e9)
+        self.full_rescan_interval = full_rescan_interval
+        self._dir_mtimes: Dict[str, int] = {}
+        self._dir_files: Dict[str, Dict[str, int]] = {}
+        self._dir_subdirs: Dict[str, Set[str]] = {}
+        self._modified: Dict[str, Dict[str, str]] = {}
+        self._last_full_scan: Optional[float] = None
+
+    def poll(self) -> List[Dict[str, str]]:
+        """
+        Update the snapshot and report files that became modified since the last poll.
+
+        As in the original per-message scan, files are matched by name: a file is
+        reported when no modified file with the same name was known before.
+
+        Returns:
+            List[Dict[str, str]]: Metadata of the newly modified files
+        """
+        known_names = {info["name"] for info in self._modified.values()}
+        now = time.time()
+        full = (
+            self._last_full_scan is None
+            or now - self._last_full_scan >= self.full_rescan_interval
+        )
+        if full:
+            self._last_full_scan = now
+        self._scan(self.source_dir, time.time_ns(), full)
+
+        return [
+            info for info in self._modified.values() if info["name"] not in known_names
+        ]
+
+    def modified_files(self) -> List[Dict[str, str]]:
+        """
+        All files modified since `since`, as of the last poll
+
+        Returns:
+            List[Dict[str, str]]: File metadata sorted by extension
+        """
+        files = list(self._modified.values())
+        files.sort(key=lambda x: x["extension"])
+        return files
+
+    def _scan(self, directory: str, scan_ns: int, full: bool) -> None:
+        try:
+            dir_mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._forget_dir(directory)
+            return
+
+        previous_mtime = self._dir_mtimes.get(directory)
+        dirty = (
+            full
+            or previous_mtime is None
+            or previous_mtime != dir_mtime
+            or scan_ns - dir_mtime < _RACY_WINDOW_NS
+        )
+        if dirty:
+            self._list_dir(directory, dir_mtime)
+
+        for subdir in list(self._dir_subdirs.get(directory, ())):
+            self._scan(subdir, scan_ns, full)
+
+    def _list_dir(self, directory: str, dir_mtime: int) -> None:
+        old_files = self._dir_files.get(directory, {})
+        files: Dict[str, int] = {}
+        subdirs: Set[str] = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORE_FILES:
+                                subdirs.add(entry.path)
+                        elif entry.is_file() and not is_ignored_file(entry.name):
+                            files[entry.path] = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+        except OSError:
+            self._forget_dir(directory)
+            return
+
+        for path in old_files.keys() - files.keys():
+            self._modified.pop(path, None)
+        for path, mtime in files.items():
+            if mtime >= self.since_ns:
+                if path not in self._modified or old_files.get(path) != mtime:
+                    self._modified[path] = get_file_info(path)
+            else:
+                self._modified.pop(path, None)
+        for subdir in self._dir_subdirs.get(directory, set()) - subdirs:
+            self._forget_dir(subdir)
+
+        self._dir_mtimes[directory] = dir_mtime
+        self._dir_files[directory] = files
+        self._dir_subdirs[directory] = subdirs
+
+    def _forget_dir(self, directory: str) -> None:
+        for subdir in self._dir_subdirs.pop(directory, set()):
+            self._forget_dir(subdir)
+        for path in self._dir_files.pop(directory, {}):
+            self._modified.pop(path, None)
+        self._dir_mtimes.pop(directory, None)
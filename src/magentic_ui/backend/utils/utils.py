@@ -1,6 +1,6 @@
 import base64
 import os
-from typing import Any, List, Sequence, Dict
+from typing import Any, List, Sequence, Dict, Tuple
 import json
 from autogen_agentchat.messages import ChatMessage, MultiModalMessage, TextMessage
 from autogen_core import Image
@@ -9,6 +9,8 @@ import shutil
 from typing import Optional
 import zlib
 
+from ..datamodel import CheckpointKind, RunCheckpoint
+
 
 def construct_task(
     query: str, files: List[Dict[str, Any]] | None = None
@@ -192,6 +194,42 @@ def get_file_type(file_path: str) -> str:
     return file_type
 
 
+# Files and extensions never reported as generated files. ".file_service" holds the
+# script, socket and log of FileSurfer's file service in the run directory.
+IGNORE_EXTENSIONS = {".pyc", ".cache"}
+IGNORE_FILES = {"__pycache__", "__init__.py", ".file_service"}
+
+
+def is_ignored_file(name: str) -> bool:
+    """Check whether a file or directory name is excluded from file change reports"""
+    return name in IGNORE_FILES or os.path.splitext(name)[1] in IGNORE_EXTENSIONS
+
+
+def get_file_info(file_path: str) -> Dict[str, str]:
+    """
+    Build the metadata reported for a generated file.
+
+    Args:
+        file_path (str): Path of the file
+    Returns:
+        Dict[str, str]: Dictionary format: {path: "", short_path: "", name: "", extension: "", type: ""}
+    """
+    file_relative_path = (
+        "files/user" + file_path.split("files/user", 1)[1]
+        if "files/user" in file_path
+        else ""
+    )
+    name = os.path.basename(file_path)
+    return {
+        "path": file_relative_path,
+        "short_path": file_relative_path,
+        "name": name,
+        # Remove the dot
+        "extension": os.path.splitext(name)[1].lstrip("."),
+        "type": get_file_type(file_path),
+    }
+
+
 def get_modified_files(
     start_timestamp: float, end_timestamp: float, source_dir: str
 ) -> List[Dict[str, str]]:
@@ -207,21 +245,15 @@ def get_modified_files(
         List[Dict[str, str]]: A list of dictionaries with details of relative file paths that were modified.
             Dictionary format: {path: "", name: "", extension: "", type: ""}
              Files with extensions "__pycache__", "*.pyc", "__init__.py", and "*.cache"
-             are ignored.
+             and the ".file_service" directory are ignored.
     """
     modified_files: List[Dict[str, str]] = []
-    ignore_extensions = {".pyc", ".cache"}
-    ignore_files = {"__pycache__", "__init__.py"}
 
     # Walk through the directory tree
     for root, dirs, files in os.walk(source_dir):
         # Update directories and files to exclude those to be ignored
-        dirs[:] = [d for d in dirs if d not in ignore_files]
-        files[:] = [
-            f
-            for f in files
-            if f not in ignore_files and os.path.splitext(f)[1] not in ignore_extensions
-        ]
+        dirs[:] = [d for d in dirs if d not in IGNORE_FILES]
+        files[:] = [f for f in files if not is_ignored_file(f)]
 
         for file in files:
             file_path = os.path.join(root, file)
@@ -229,22 +261,7 @@ def get_modified_files(
 
             # Verify if the file was modified within the given timestamp range
             if start_timestamp <= file_mtime <= end_timestamp:
-                file_relative_path = (
-                    "files/user" + file_path.split("files/user", 1)[1]
-                    if "files/user" in file_path
-                    else ""
-                )
-                file_type = get_file_type(file_path)
-
-                file_dict = {
-                    "path": file_relative_path,
-                    "short_path": file_relative_path,
-                    "name": os.path.basename(file),
-                    # Remove the dot
-                    "extension": os.path.splitext(file)[1].lstrip("."),
-                    "type": file_type,
-                }
-                modified_files.append(file_dict)
+                modified_files.append(get_file_info(file_path))
 
     # Sort the modified files by extension
     modified_files.sort(key=lambda x: x["extension"])
@@ -321,3 +338,111 @@ def decompress_state(compressed_state: str) -> Dict[Any, Any]:
     compressed = base64.b64decode(compressed_state.encode("utf-8"))
     decompressed = zlib.decompress(compressed)
     return json.loads(decompressed.decode("utf-8"))
+
+
+def diff_state(old: Any, new: Any, path: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Compute the changes that turn one JSON state into another.
+
+    Dictionaries are compared key by key. Lists that only grew at the end (like message
+    histories) produce an "append" operation with the new items; any other change to a
+    value produces a "set" operation with the full new value, and removed keys produce
+    a "del" operation.
+
+    Args:
+        old (Any): Previous JSON-compatible state
+        new (Any): Current JSON-compatible state
+        path (Tuple[str, ...], optional): Path of the compared values inside the root state. Default: ()
+
+    Returns:
+        List[Dict[str, Any]]: Operations to pass to `apply_state_delta`
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key, value in new.items():
+            if key in old:
+                ops.extend(diff_state(old[key], value, path + (key,)))
+            else:
+                ops.append({"op": "set", "path": list(path + (key,)), "value": value})
+        for key in old:
+            if key not in new:
+                ops.append({"op": "del", "path": list(path + (key,))})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        n_old = len(old)
+        if len(new) >= n_old and new[:n_old] == old:
+            if len(new) == n_old:
+                return []
+            return [{"op": "append", "path": list(path), "items": new[n_old:]}]
+
+    if old == new:
+        return []
+    return [{"op": "set", "path": list(path), "value": new}]
+
+
+def apply_state_delta(state: Any, ops: Sequence[Dict[str, Any]]) -> Any:
+    """
+    Apply operations produced by `diff_state` to a JSON state, in place where possible.
+
+    Args:
+        state (Any): JSON-compatible state to update
+        ops (Sequence[Dict[str, Any]]): Operations produced by `diff_state`
+
+    Returns:
+        Any: The updated state
+    """
+    for op in ops:
+        path = op["path"]
+        if not path:
+            if op["op"] == "append":
+                state.extend(op["items"])
+            elif op["op"] == "set":
+                state = op["value"]
+            continue
+
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if op["op"] == "set":
+            parent[key] = op["value"]
+        elif op["op"] == "del":
+            parent.pop(key, None)
+        elif op["op"] == "append":
+            parent[key].extend(op["items"])
+        else:
+            raise ValueError(f"Unknown state delta operation: {op['op']}")
+    return state
+
+
+def restore_checkpoint_state(checkpoints: Sequence[RunCheckpoint]) -> Dict[Any, Any]:
+    """
+    Rebuild a team state from a run's checkpoint log.
+
+    Uses the latest FULL checkpoint as base and applies the DELTA checkpoints recorded
+    against it in id order. Checkpoints left over from before the last compaction are
+    ignored.
+
+    Args:
+        checkpoints (Sequence[RunCheckpoint]): Checkpoints of a single run, in any order
+
+    Returns:
+        Dict[Any, Any]: The reconstructed team state
+    """
+    bases = [c for c in checkpoints if c.kind == CheckpointKind.FULL]
+    if not bases:
+        raise ValueError("No full checkpoint to restore the state from")
+    base = max(bases, key=lambda c: c.id or 0)
+    state = decompress_state(base.data)
+    deltas = sorted(
+        (
+            c
+            for c in checkpoints
+            if c.kind == CheckpointKind.DELTA and c.base_id == base.id
+        ),
+        key=lambda c: c.id or 0,
+    )
+    for delta in deltas:
+        state = apply_state_delta(state, decompress_state(delta.data)["ops"])
+    return state
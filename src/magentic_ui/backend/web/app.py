@@ -12,9 +12,10 @@ from loguru import logger
 
 from ...version import VERSION
 from .config import settings
-from .deps import cleanup_managers, init_managers
+from .deps import cleanup_managers, get_browser_pool, init_managers
 from .initialization import AppInitializer
 from .routes import (
+    blobs,
     plans,
     runs,
     sessions,
@@ -156,6 +157,13 @@ api.include_router(
     responses={404: {"description": "Not found"}},
 )
 
+api.include_router(
+    blobs.router,
+    prefix="/blobs",
+    tags=["blobs"],
+    responses={404: {"description": "Not found"}},
+)
+
 
 # Version endpoint
 
@@ -176,9 +184,11 @@ async def get_version():
 @api.get("/health")
 async def health_check():
     """API health check endpoint"""
+    browser_pool = get_browser_pool()
     return {
         "status": True,
         "message": "Service is healthy",
+        "browser_pool": browser_pool.stats if browser_pool else None,
     }
 
 # 加载vnc api
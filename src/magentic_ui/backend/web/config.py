@@ -12,6 +12,9 @@ class Settings(BaseSettings):
     CONFIG_DIR: str = "configs"  # Default config directory relative to app_root
     DEFAULT_USER_ID: str = "guestuser@gmail.com"
     UPGRADE_DATABASE: bool = False
+    BROWSER_POOL_SIZE: int = 0  # Pre-started browser containers, 0 disables the pool
+    BROWSER_POOL_MAX_USES: int = 20  # Runs served by a browser before it is recycled
+    BROWSER_POOL_TTL: int = 1800  # 30 minutes
 
     model_config = {"env_prefix": "MAGENTIC_UI_"}
 
@@ -1,10 +1,18 @@
 # api/deps.py
 import logging
+import shutil
+import uuid
 from contextlib import contextmanager
 from typing import Any, Dict, Optional
 from pathlib import Path
 from fastapi import HTTPException, status
 
+from ...tools.bing_search import close_search_browser
+from ...tools.playwright.browser import (
+    BrowserPool,
+    PlaywrightBrowser,
+    get_browser_resource_config,
+)
 from ..database import DatabaseManager
 from .config import settings
 from .managers.connection import WebSocketManager
@@ -14,6 +22,7 @@ logger = logging.getLogger(__name__)
 # Global manager instances
 _db_manager: Optional[DatabaseManager] = None
 _websocket_manager: Optional[WebSocketManager] = None
+_browser_pool: Optional[BrowserPool] = None
 
 # Context manager for database sessions
 
@@ -59,6 +68,11 @@ async def get_websocket_manager() -> WebSocketManager:
     return _websocket_manager
 
 
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Return the browser pool, or None if pooling is disabled"""
+    return _browser_pool
+
+
 # Manager initialization and cleanup
 
 
@@ -72,7 +86,7 @@ async def init_managers(
     config: Dict[str, Any],
 ) -> None:
     """Initialize all manager instances"""
-    global _db_manager, _websocket_manager, _team_manager
+    global _db_manager, _websocket_manager, _team_manager, _browser_pool
 
     logger.info("Initializing managers...")
 
@@ -86,6 +100,32 @@ async def init_managers(
             config_dir, settings.DEFAULT_USER_ID, check_exists=True
         )
 
+        # Initialize browser pool
+        if settings.BROWSER_POOL_SIZE > 0:
+            # Warm browsers are not tied to a run, so each one mounts its own empty
+            # scratch directory instead of a run directory
+            scratch_root = Path(internal_workspace_root) / "browser_pool"
+            shutil.rmtree(scratch_root, ignore_errors=True)
+
+            def create_browser() -> PlaywrightBrowser:
+                scratch_dir = Path("browser_pool") / uuid.uuid4().hex
+                (Path(internal_workspace_root) / scratch_dir).mkdir(parents=True)
+                browser_config, _, _ = get_browser_resource_config(
+                    Path(external_workspace_root) / scratch_dir, -1, -1, inside_docker
+                )
+                return PlaywrightBrowser.load_component(browser_config)
+
+            _browser_pool = BrowserPool(
+                create_browser,
+                size=settings.BROWSER_POOL_SIZE,
+                max_uses=settings.BROWSER_POOL_MAX_USES,
+                ttl=settings.BROWSER_POOL_TTL,
+            )
+            await _browser_pool.start()
+            logger.info(
+                f"Browser pool started with {settings.BROWSER_POOL_SIZE} browsers"
+            )
+
         # Initialize connection manager
         _websocket_manager = WebSocketManager(
             db_manager=_db_manager,
@@ -93,6 +133,7 @@ async def init_managers(
             external_workspace_root=Path(external_workspace_root),
             inside_docker=inside_docker,
             config=config,
+            browser_pool=_browser_pool,
         )
         logger.info("Connection manager initialized")
 
@@ -104,7 +145,7 @@ async def init_managers(
 
 async def cleanup_managers() -> None:
     """Cleanup and shutdown all manager instances"""
-    global _db_manager, _websocket_manager, _team_manager
+    global _db_manager, _websocket_manager, _team_manager, _browser_pool
 
     logger.info("Cleaning up managers...")
 
@@ -117,6 +158,21 @@ async def cleanup_managers() -> None:
         finally:
             _websocket_manager = None
 
+    # Stop idle browsers once the runs holding leases are closed
+    if _browser_pool:
+        try:
+            await _browser_pool.close()
+        except Exception as e:
+            logger.error(f"Error cleaning up browser pool: {str(e)}")
+        finally:
+            _browser_pool = None
+
+    # Stop the headless browser shared by orchestrator web searches
+    try:
+        await close_search_browser()
+    except Exception as e:
+        logger.error(f"Error closing search browser: {str(e)}")
+
     # TeamManager doesn't need explicit cleanup since WebSocketManager handles it
     _team_manager = None
 
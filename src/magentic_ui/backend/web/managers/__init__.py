@@ -1,3 +1,5 @@
 from .connection import WebSocketManager
+from .checkpoint_writer import CheckpointWriter
+from .message_sink import MessageSink
 
-__all__ = ["WebSocketManager"]
+__all__ = ["WebSocketManager", "CheckpointWriter", "MessageSink"]
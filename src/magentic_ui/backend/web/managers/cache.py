@@ -0,0 +1,53 @@
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class EntityCache(Generic[K, V]):
+    """
+    In-memory cache of database entities with hit/miss counters.
+
+    The cache does not talk to the database itself: the owner reads through it, writes
+    the database first and then calls `put` with the stored entity (write-through), and
+    calls `invalidate` whenever the entity is changed elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[K, V] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached entity for `key`, or None on a miss"""
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return item
+
+    def put(self, key: K, value: V) -> None:
+        """Store the latest persisted version of an entity"""
+        self._items[key] = value
+
+    def invalidate(self, key: K) -> None:
+        """Drop the entity for `key` so the next read goes to the database"""
+        self._items.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[V], bool]) -> None:
+        """Drop every cached entity matching `predicate`"""
+        for key in [key for key, value in self._items.items() if predicate(value)]:
+            del self._items[key]
+
+    def clear(self) -> None:
+        """Drop all cached entities"""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters"""
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
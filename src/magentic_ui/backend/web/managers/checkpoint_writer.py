@@ -0,0 +1,121 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from ...database import DatabaseManager
+from ...datamodel import CheckpointKind, RunCheckpoint
+from ...utils.blob_store import BlobStore
+from ...utils.utils import compress_state, diff_state
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointWriter:
+    """
+    Persists the team state checkpoints of a single run as an append-only log.
+
+    The first checkpoint, and every `compaction_interval`-th one after it, is stored as a
+    FULL checkpoint. All others only store the changes since the previous checkpoint, so
+    their cost depends on what happened in the last step rather than on the length of
+    the conversation. After a FULL checkpoint is written, the previous base and its
+    deltas are deleted (compaction).
+
+    Args:
+        db_manager (DatabaseManager): Database manager used to store the checkpoints
+        run_id (int): ID of the run
+        base_id (int, optional): ID of the FULL checkpoint the run state was restored from, removed on the next compaction. Default: None.
+        compaction_interval (int, optional): Number of DELTA checkpoints written before the next FULL one. Default: 20.
+        blob_store (BlobStore, optional): If set, images in the state are stored there and only referenced from the checkpoints. Default: None.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        run_id: int,
+        base_id: Optional[int] = None,
+        compaction_interval: int = 20,
+        blob_store: Optional[BlobStore] = None,
+    ):
+        self.db_manager = db_manager
+        self.run_id = run_id
+        self.compaction_interval = compaction_interval
+        self.blob_store = blob_store
+        self._base_id = base_id
+        self._last_state: Optional[Dict[str, Any]] = None
+        self._deltas_since_base = 0
+
+    async def write(self, state: Dict[str, Any]) -> None:
+        """
+        Store a checkpoint of the team state
+
+        Args:
+            state (Dict[str, Any]): Complete team state at this checkpoint
+        """
+        if self.blob_store:
+            state = await asyncio.to_thread(self.blob_store.offload_images, state)
+
+        if (
+            self._last_state is None
+            or self._base_id is None
+            or self._deltas_since_base >= self.compaction_interval
+        ):
+            await self._write_full(state)
+            return
+
+        ops = diff_state(self._last_state, state)
+        self._last_state = state
+        if not ops:
+            return
+
+        response = await self.db_manager.abulk_insert(
+            [
+                RunCheckpoint(
+                    run_id=self.run_id,
+                    kind=CheckpointKind.DELTA,
+                    base_id=self._base_id,
+                    data=compress_state({"ops": ops}),
+                )
+            ]
+        )
+        if response.status:
+            self._deltas_since_base += 1
+        else:
+            # A missing delta would corrupt the chain; start a new base next time
+            self._last_state = None
+
+    async def _write_full(self, state: Dict[str, Any]) -> None:
+        response = await self.db_manager.aupsert(
+            RunCheckpoint(
+                run_id=self.run_id,
+                kind=CheckpointKind.FULL,
+                data=compress_state(state),
+            ),
+            return_json=False,
+        )
+        if not response.status:
+            logger.error(f"Failed to write full checkpoint for run {self.run_id}")
+            self._last_state = None
+            return
+
+        previous_base_id = self._base_id
+        self._base_id = response.data.id
+        self._last_state = state
+        self._deltas_since_base = 0
+
+        if previous_base_id is not None:
+            await self._delete_chain(previous_base_id)
+
+    async def _delete_chain(self, base_id: int) -> None:
+        """Remove a superseded base checkpoint and its deltas"""
+        filters: List[Dict[str, Any]] = [
+            {"run_id": self.run_id, "base_id": base_id},
+            {"run_id": self.run_id, "id": base_id},
+        ]
+        for chain_filter in filters:
+            response = await self.db_manager.adelete(
+                RunCheckpoint, filters=chain_filter
+            )
+            if not response.status:
+                logger.warning(
+                    f"Failed to compact checkpoints of run {self.run_id}: {response.message}"
+                )
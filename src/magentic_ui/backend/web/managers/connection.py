@@ -21,20 +21,26 @@ from ....input_func import InputFuncType, InputRequestType
 from autogen_core import CancellationToken
 from fastapi import WebSocket, WebSocketDisconnect
 from pathlib import Path
+from ....tools.playwright.browser import BrowserPool
 from ....types import CheckpointEvent
 from ...database import DatabaseManager
 from ...datamodel import (
+    CheckpointKind,
     LLMCallEventMessage,
     Message,
     MessageConfig,
     Run,
+    RunCheckpoint,
     RunStatus,
     Settings,
     SettingsConfig,
     TeamResult,
 )
 from ...teammanager import TeamManager
-from ...utils.utils import compress_state
+from ...utils.blob_store import BlobStore
+from .cache import EntityCache
+from .checkpoint_writer import CheckpointWriter
+from .message_sink import MessageSink
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +55,10 @@ class WebSocketManager:
         external_workspace_root (Path): Path to the external root directory
         inside_docker (bool): Flag indicating if the application is running inside Docker
         config (dict): Configuration for Magentic-UI
+        message_batch_size (int, optional): Number of streamed messages written per bulk INSERT. Default: 50.
+        message_flush_interval (float, optional): Maximum seconds a streamed message waits before being written. Default: 1.0.
+        checkpoint_compaction_interval (int, optional): Number of delta state checkpoints stored between full ones. Default: 20.
+        browser_pool (BrowserPool, optional): Pool of pre-started browsers leased to runs. Default: None.
     """
 
     def __init__(
@@ -58,18 +68,34 @@ class WebSocketManager:
         external_workspace_root: Path,
         inside_docker: bool,
         config: Dict[str, Any],
+        message_batch_size: int = 50,
+        message_flush_interval: float = 1.0,
+        checkpoint_compaction_interval: int = 20,
+        browser_pool: Optional[BrowserPool] = None,
     ):
         self.db_manager = db_manager
         self.internal_workspace_root = internal_workspace_root
         self.external_workspace_root = external_workspace_root
         self.inside_docker = inside_docker
         self.config = config
+        # Images in persisted states and messages are stored once, by content hash
+        self.blob_store = BlobStore(internal_workspace_root / "blobs")
         self._connections: Dict[int, WebSocket] = {}
         self._cancellation_tokens: Dict[int, CancellationToken] = {}
         # Track explicitly closed connections
         self._closed_connections: set[int] = set()
         self._input_responses: Dict[int, asyncio.Queue[str]] = {}
         self._team_managers: Dict[int, TeamManager] = {}
+        self._message_sinks: Dict[int, MessageSink] = {}
+        # Runs are only mutated through this manager while connected, so reads can be
+        # served from memory and writes go to the database first (write-through)
+        self._run_cache: EntityCache[int, Run] = EntityCache()
+        self._settings_cache: EntityCache[str, Settings] = EntityCache()
+        self.message_batch_size = message_batch_size
+        self.message_flush_interval = message_flush_interval
+        self._checkpoint_writers: Dict[int, CheckpointWriter] = {}
+        self.checkpoint_compaction_interval = checkpoint_compaction_interval
+        self.browser_pool = browser_pool
         self._cancel_message = TeamResult(
             task_result=TaskResult(
                 messages=[TextMessage(source="user", content="Run cancelled by user")],
@@ -139,6 +165,7 @@ class WebSocketManager:
                 external_workspace_root=self.external_workspace_root,
                 inside_docker=self.inside_docker,
                 config=self.config,
+                browser_pool=self.browser_pool,
             )
             self._team_managers[run_id] = team_manager
 
@@ -164,12 +191,35 @@ class WebSocketManager:
 
             settings_config["memory_controller_key"] = run.user_id
 
+            # Buffer streamed messages and write them in batches
+            self._message_sinks[run_id] = MessageSink(
+                self.db_manager,
+                run_id=run_id,
+                session_id=run.session_id,
+                user_id=run.user_id,
+                max_batch_size=self.message_batch_size,
+                flush_interval=self.message_flush_interval,
+            )
+
+            # Restore from the checkpoint log, falling back to a legacy state snapshot
+            checkpoints = await self._get_checkpoints(run_id)
+            base_ids = [
+                c.id for c in checkpoints if c.kind == CheckpointKind.FULL and c.id
+            ]
+            self._checkpoint_writers[run_id] = CheckpointWriter(
+                self.db_manager,
+                run_id=run_id,
+                base_id=max(base_ids) if base_ids else None,
+                compaction_interval=self.checkpoint_compaction_interval,
+                blob_store=self.blob_store,
+            )
+
             state = None
             if run:
                 run.task = MessageConfig(content=task, source="user").model_dump()
                 run.status = RunStatus.ACTIVE
-                state = run.state
-                self.db_manager.upsert(run)
+                state = checkpoints if base_ids else run.state
+                await self._save_run(run)
                 await self._update_run_status(run_id, RunStatus.ACTIVE)
 
             # add task as message
@@ -222,13 +272,10 @@ class WebSocketManager:
                     break
 
                 if isinstance(message, CheckpointEvent):
-                    # Save state to run
-                    run = await self._get_run(run_id)
-                    if run:
-                        # Use compress_state utility to compress the state
-                        state_dict = json.loads(message.state)
-                        run.state = compress_state(state_dict)
-                        self.db_manager.upsert(run)
+                    # Append the state changes to the run's checkpoint log
+                    writer = self._checkpoint_writers.get(run_id)
+                    if writer:
+                        await writer.write(json.loads(message.state))
                     continue
 
                 # do not show internal messages
@@ -260,6 +307,9 @@ class WebSocketManager:
                     elif isinstance(message, TeamResult):
                         final_result = message.model_dump()
                     self._team_managers[run_id] = team_manager  # Track the team manager
+
+            # Persist buffered messages before the run is marked as finished
+            await self._flush_messages(run_id)
             if (
                 not cancellation_token.is_cancelled()
                 and run_id not in self._closed_connections
@@ -293,6 +343,10 @@ class WebSocketManager:
             traceback.print_exc()
             await self._handle_stream_error(run_id, e)
         finally:
+            self._checkpoint_writers.pop(run_id, None)
+            sink = self._message_sinks.pop(run_id, None)
+            if sink:
+                await sink.close()
             self._cancellation_tokens.pop(run_id, None)
             self._team_managers.pop(run_id, None)  # Remove the team manager when done
 
@@ -302,21 +356,51 @@ class WebSocketManager:
         """
         Save a message to the database
 
+        While the run is streaming, the message is queued in the run's MessageSink and
+        written in a later batch; otherwise it is written immediately.
+
         Args:
             run_id (int): ID of the run
             message (Union[AgentEvent | ChatMessage, LLMCallEventMessage]): Message to save
         """
 
+        config = await asyncio.to_thread(
+            self.blob_store.offload_images, message.model_dump()
+        )
+        sink = self._message_sinks.get(run_id)
+        if sink:
+            await sink.add(
+                Message(
+                    created_at=datetime.now(),
+                    session_id=sink.session_id,
+                    run_id=run_id,
+                    config=config,
+                    user_id=sink.user_id,
+                )
+            )
+            return
+
         run = await self._get_run(run_id)
         if run:
             db_message = Message(
                 created_at=datetime.now(),
                 session_id=run.session_id,
                 run_id=run_id,
-                config=message.model_dump(),
+                config=config,
                 user_id=run.user_id,  # Pass the user_id from the run object
             )
-            self.db_manager.upsert(db_message)
+            await self.db_manager.aupsert(db_message)
+
+    async def _flush_messages(self, run_id: int) -> None:
+        """
+        Write any buffered messages of a run to the database
+
+        Args:
+            run_id (int): ID of the run
+        """
+        sink = self._message_sinks.get(run_id)
+        if sink:
+            await sink.flush()
 
     async def _update_run(
         self,
@@ -338,10 +422,14 @@ class WebSocketManager:
         if run:
             run.status = status
             if team_result:
-                run.team_result = team_result
+                if isinstance(team_result, TeamResult):
+                    team_result = team_result.model_dump()
+                run.team_result = await asyncio.to_thread(
+                    self.blob_store.offload_images, team_result
+                )
             if error:
                 run.error_message = error
-            self.db_manager.upsert(run)
+            await self._save_run(run)
 
     def create_input_func(self, run_id: int, timeout: int = 600) -> InputFuncType:
         """
@@ -363,6 +451,8 @@ class WebSocketManager:
                 # resume run if it is paused
                 await self.resume_run(run_id)
 
+                # persist the conversation so far before waiting on the user
+                await self._flush_messages(run_id)
                 # update run status to awaiting_input
                 await self._update_run_status(run_id, RunStatus.AWAITING_INPUT)
                 # Send input request to client
@@ -384,7 +474,7 @@ class WebSocketManager:
                 run = await self._get_run(run_id)
                 if run:
                     run.input_request = {"prompt": prompt, "input_type": input_type}
-                    self.db_manager.upsert(run)
+                    await self._save_run(run)
 
                 # Wait for response with timeout
                 if run_id in self._input_responses:
@@ -445,7 +535,8 @@ class WebSocketManager:
             stop_message = self._get_stop_message(reason)
 
             try:
-                # Update run record first
+                # Persist buffered messages, then update run record
+                await self._flush_messages(run_id)
                 await self._update_run(
                     run_id, status=RunStatus.STOPPED, team_result=stop_message
                 )
@@ -492,6 +583,7 @@ class WebSocketManager:
         await self.stop_run(run_id, "Connection closed")
 
         # Clean up resources
+        self._run_cache.invalidate(run_id)
         self._connections.pop(run_id, None)
         self._cancellation_tokens.pop(run_id, None)
         self._input_responses.pop(run_id, None)
@@ -612,7 +704,7 @@ class WebSocketManager:
             return None
 
     async def _get_run(self, run_id: int) -> Optional[Run]:
-        """Get run from database
+        """Get run from the cache, falling back to the database
 
         Args:
             run_id (int): int of the run to retrieve
@@ -620,20 +712,95 @@ class WebSocketManager:
         Returns:
             Optional[Run]: Run object if found, None otherwise
         """
-        response = self.db_manager.get(Run, filters={"id": run_id}, return_json=False)
-        return response.data[0] if response.status and response.data else None
+        run = self._run_cache.get(run_id)
+        if run is not None:
+            return run
+        response = await self.db_manager.aget(
+            Run, filters={"id": run_id}, return_json=False
+        )
+        run = response.data[0] if response.status and response.data else None
+        if run is not None:
+            self._run_cache.put(run_id, run)
+        return run
+
+    async def _get_checkpoints(self, run_id: int) -> list[RunCheckpoint]:
+        """Get the team state checkpoint log of a run from database
+
+        Args:
+            run_id (int): int of the run
+
+        Returns:
+            list[RunCheckpoint]: Checkpoints of the run, possibly empty
+        """
+        response = await self.db_manager.aget(
+            RunCheckpoint, filters={"run_id": run_id}, return_json=False
+        )
+        return list(response.data) if response.status and response.data else []
+
+    async def _save_run(self, run: Run) -> None:
+        """Write a run to the database and refresh the cached copy
+
+        Args:
+            run (Run): Run to persist
+        """
+        response = await self.db_manager.aupsert(run, return_json=False)
+        if run.id is None:
+            return
+        if response.status:
+            self._run_cache.put(run.id, response.data)
+        else:
+            # The cached object may hold changes that were not persisted
+            self._run_cache.invalidate(run.id)
 
     async def _get_settings(self, user_id: str) -> Optional[Settings]:
-        """Get user settings from database
+        """Get user settings from the cache, falling back to the database
         Args:
             user_id (str): User ID to retrieve settings for
         Returns:
             Optional[Settings]: User settings if found, None otherwise
         """
-        response = self.db_manager.get(
+        settings = self._settings_cache.get(user_id)
+        if settings is not None:
+            return settings
+        response = await self.db_manager.aget(
             filters={"user_id": user_id}, model_class=Settings, return_json=False
         )
-        return response.data[0] if response.status and response.data else None
+        settings = response.data[0] if response.status and response.data else None
+        if settings is not None:
+            self._settings_cache.put(user_id, settings)
+        return settings
+
+    def invalidate_run(self, run_id: int) -> None:
+        """Drop a cached run after it was changed outside this manager
+
+        Args:
+            run_id (int): ID of the run
+        """
+        self._run_cache.invalidate(run_id)
+
+    def invalidate_session_runs(self, session_id: int) -> None:
+        """Drop all cached runs of a session after it was changed outside this manager
+
+        Args:
+            session_id (int): ID of the session
+        """
+        self._run_cache.invalidate_where(lambda run: run.session_id == session_id)
+
+    def invalidate_settings(self, user_id: str) -> None:
+        """Drop cached user settings after they were changed outside this manager
+
+        Args:
+            user_id (str): User ID of the settings
+        """
+        self._settings_cache.invalidate(user_id)
+
+    @property
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Size and hit/miss counters of the run and settings caches"""
+        return {
+            "runs": self._run_cache.stats,
+            "settings": self._settings_cache.stats,
+        }
 
     async def _update_run_status(
         self, run_id: int, status: RunStatus, error: Optional[str] = None
@@ -649,7 +816,7 @@ class WebSocketManager:
         if run:
             run.status = status
             run.error_message = error
-            self.db_manager.upsert(run)
+            await self._save_run(run)
         # send system message to client with status
         await self._send_message(
             run_id,
@@ -687,7 +854,7 @@ class WebSocketManager:
 
                     run.status = RunStatus.STOPPED
                     run.team_result = interrupted_result
-                    self.db_manager.upsert(run)
+                    await self._save_run(run)
 
             # Then disconnect all websockets with timeout
             # 10 second timeout for entire cleanup
@@ -712,6 +879,8 @@ class WebSocketManager:
             self._cancellation_tokens.clear()
             self._closed_connections.clear()
             self._input_responses.clear()
+            self._run_cache.clear()
+            self._settings_cache.clear()
 
     @property
     def active_connections(self) -> set[int]:
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from ...database import DatabaseManager
+from ...datamodel import Message
+
+logger = logging.getLogger(__name__)
+
+
+class MessageSink:
+    """
+    Write-behind buffer that persists the streamed messages of a single run.
+
+    Messages are queued in memory and written with one bulk INSERT when the buffer
+    reaches `max_batch_size`, when `flush_interval` seconds have passed since the first
+    queued message, or when the sink is flushed or closed explicitly (e.g. on run
+    completion). Flushes are serialized, so rows are stored in the order they were
+    added, and a crash loses at most the messages of one flush window.
+
+    Args:
+        db_manager (DatabaseManager): Database manager used for the bulk inserts
+        run_id (int): ID of the run the messages belong to
+        session_id (int, optional): ID of the session the run belongs to
+        user_id (str, optional): ID of the user owning the run
+        max_batch_size (int, optional): Flush as soon as this many messages are queued. Default: 50.
+        flush_interval (float, optional): Maximum time in seconds a message stays queued. Default: 1.0.
+    """
+
+    def __init__(
+        self,
+        db_manager: DatabaseManager,
+        run_id: int,
+        session_id: Optional[int] = None,
+        user_id: Optional[str] = None,
+        max_batch_size: int = 50,
+        flush_interval: float = 1.0,
+    ):
+        self.db_manager = db_manager
+        self.run_id = run_id
+        self.session_id = session_id
+        self.user_id = user_id
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Message] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task[None]] = None
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of messages queued but not yet written"""
+        return len(self._buffer)
+
+    async def add(self, message: Message) -> None:
+        """
+        Queue a message for writing
+
+        Args:
+            message (Message): New message row to persist
+        """
+        if self._closed:
+            raise RuntimeError("Cannot add messages to a closed MessageSink")
+
+        self._buffer.append(message)
+        if len(self._buffer) >= self.max_batch_size:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_after_interval())
+
+    async def flush(self) -> None:
+        """Write all queued messages with a single bulk INSERT"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            response = await self.db_manager.abulk_insert(batch)
+            if not response.status:
+                logger.error(
+                    f"Failed to persist {len(batch)} messages for run {self.run_id}: {response.message}"
+                )
+
+    async def close(self) -> None:
+        """Flush remaining messages and stop the flush timer"""
+        self._closed = True
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+        await self.flush()
+
+    async def _flush_after_interval(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        try:
+            # Shield the write so that closing the sink mid-flush does not drop the batch
+            await asyncio.shield(self.flush())
+        except Exception as e:
+            logger.error(f"Error flushing message sink for run {self.run_id}: {e}")
@@ -0,0 +1,27 @@
+# api/routes/blobs.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+
+from ...utils.blob_store import guess_image_type
+from ..deps import get_websocket_manager
+from ..managers import WebSocketManager
+
+router = APIRouter()
+
+
+@router.get("/{digest}")
+async def get_blob(
+    digest: str, ws_manager: WebSocketManager = Depends(get_websocket_manager)
+) -> Response:
+    """Get an image stored in the content-addressed blob store"""
+    try:
+        data = ws_manager.blob_store.get(digest)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail="Blob not found") from e
+
+    return Response(
+        content=data,
+        media_type=guess_image_type(data) or "application/octet-stream",
+        # Content addressed blobs never change
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
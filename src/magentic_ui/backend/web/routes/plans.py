@@ -1,10 +1,11 @@
 # /api/plans routes
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException
 from loguru import logger
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pydantic import BaseModel
 
 from autogen_agentchat.messages import TextMessage, MultiModalMessage
@@ -14,7 +15,9 @@ from ....learning import learn_plan_from_messages
 from ....learning.memory_provider import MemoryControllerProvider
 
 from ...datamodel import Plan
-from ..deps import get_db
+from ...utils.blob_store import BlobStore
+from ..deps import get_db, get_websocket_manager
+from ..managers import WebSocketManager
 from .sessions import list_session_runs
 
 router = APIRouter()
@@ -76,6 +79,17 @@ async def delete_plan(plan_id: int, user_id: str, db=Depends(get_db)) -> Dict:
     return {"status": True, "data": response.data}
 
 
+def _resolve_content(blob_store: BlobStore, content: List[Any]) -> List[Any]:
+    """Turn blob references in stored message content back into inline images, dropping images whose blob is gone"""
+    resolved: List[Any] = []
+    for item in content:
+        try:
+            resolved.append(blob_store.resolve_images(item))
+        except (ValueError, FileNotFoundError):
+            logger.warning(f"Dropping image missing from the blob store: {item}")
+    return resolved
+
+
 # Create a request model
 class LearnPlanRequest(BaseModel):
     session_id: int
@@ -86,6 +100,7 @@ class LearnPlanRequest(BaseModel):
 async def learn_plan(
     request: LearnPlanRequest,
     db=Depends(get_db),
+    ws_manager: WebSocketManager = Depends(get_websocket_manager),
 ):
     """Learn a plan from chat messages in a session"""
     session_id = request.session_id
@@ -166,10 +181,16 @@ async def learn_plan(
                     )
                 )
             elif msg.config.get("type") == "MultiModalMessage":
+                # Stored images are blob references, see BlobStore.offload_images
+                content = await asyncio.to_thread(
+                    _resolve_content,
+                    ws_manager.blob_store,
+                    msg.config.get("content", []),
+                )
                 messages_for_learning.append(
                     MultiModalMessage(
                         source=msg.config.get("source", ""),
-                        content=msg.config.get("content", []),
+                        content=content,
                     )
                 )
 
@@ -1,5 +1,5 @@
 # /api/runs routes
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -79,10 +79,29 @@ async def get_run(run_id: int, db=Depends(get_db)) -> Dict:
 
 
 @router.get("/{run_id}/messages")
-async def get_run_messages(run_id: int, db=Depends(get_db)) -> Dict:
-    """Get all messages for a run"""
-    messages = db.get(
-        Message, filters={"run_id": run_id}, order="created_at asc", return_json=False
+async def get_run_messages(
+    run_id: int,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    db=Depends(get_db),
+) -> Dict:
+    """Get the messages of a run in id order, optionally one page at a time.
+
+    Args:
+        run_id: Run whose messages are returned.
+        after_id: Only return messages after this message id (the `next_after_id` of the previous page).
+        limit: Maximum number of messages to return. If omitted, all remaining messages are returned.
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    messages = await db.aget_page(
+        Message, filters={"run_id": run_id}, after_id=after_id, limit=limit
     )
-
-    return {"status": True, "data": messages.data}
+    if not messages.status:
+        raise HTTPException(status_code=500, detail=messages.message)
+
+    return {
+        "status": True,
+        "data": messages.data["items"],
+        "next_after_id": messages.data["next_after_id"],
+    }
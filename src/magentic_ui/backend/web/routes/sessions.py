@@ -1,11 +1,12 @@
 # api/routes/sessions.py
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from loguru import logger
 
-from ...datamodel import Message, Run, Session, RunStatus
-from ..deps import get_db
+from ...datamodel import Run, Session, RunStatus
+from ..deps import get_db, get_websocket_manager
+from ..managers import WebSocketManager
 
 router = APIRouter()
 
@@ -78,17 +79,43 @@ async def update_session(
 
 
 @router.delete("/{session_id}")
-async def delete_session(session_id: int, user_id: str, db=Depends(get_db)) -> Dict:
+async def delete_session(
+    session_id: int,
+    user_id: str,
+    db=Depends(get_db),
+    ws_manager: WebSocketManager = Depends(get_websocket_manager),
+) -> Dict:
     """Delete a session and all its associated runs and messages"""
     # Delete the session
     db.delete(filters={"id": session_id, "user_id": user_id}, model_class=Session)
+    ws_manager.invalidate_session_runs(session_id)
 
     return {"status": True, "message": "Session deleted successfully"}
 
 
 @router.get("/{session_id}/runs")
-async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -> Dict:
-    """Get complete session history organized by runs"""
+async def list_session_runs(
+    session_id: int,
+    user_id: str,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    message_limit: Optional[int] = None,
+    db=Depends(get_db),
+) -> Dict:
+    """Get complete session history organized by runs
+
+    Args:
+        session_id: Session whose runs are returned.
+        user_id: Owner of the session.
+        after_id: Only return runs after this run id (the `next_after_id` of the previous page).
+        limit: Maximum number of runs to return. If omitted, all remaining runs are returned.
+        message_limit: Maximum number of messages returned per run. The rest are paged from
+            `/runs/{run_id}/messages` starting after the run's `next_message_after_id`.
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    if message_limit is not None and message_limit < 1:
+        raise HTTPException(status_code=400, detail="message_limit must be positive")
 
     try:
         # 1. Verify session exists and belongs to user
@@ -104,9 +131,9 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
                 status_code=404, detail="Session not found or access denied"
             )
 
-        # 2. Get ordered runs for session
-        runs = db.get(
-            Run, filters={"session_id": session_id}, order="asc", return_json=False
+        # 2. Get ordered runs for session with their messages
+        runs = await db.aget_session_runs(
+            session_id, after_id=after_id, limit=limit, message_limit=message_limit
         )
         if not runs.status:
             raise HTTPException(
@@ -114,50 +141,26 @@ async def list_session_runs(session_id: int, user_id: str, db=Depends(get_db)) -
             )
 
         # 3. Build response with messages per run
-        run_data = []
-        if runs.data:  # It's ok to have no runs
-            for run in runs.data:
-                try:
-                    # Get messages for this specific run
-                    messages = db.get(
-                        Message,
-                        filters={"run_id": run.id},
-                        order="asc",
-                        return_json=False,
-                    )
-                    if not messages.status:
-                        logger.error(f"Failed to fetch messages for run {run.id}")
-                        # Continue processing other runs even if one fails
-                        messages.data = []
-
-                    run_data.append(
-                        {
-                            "id": str(run.id),
-                            "created_at": run.created_at,
-                            "status": run.status,
-                            "task": run.task,
-                            "team_result": run.team_result,
-                            "messages": messages.data or [],
-                            "input_request": getattr(run, "input_request", None),
-                        }
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing run {run.id}: {str(e)}")
-                    # Include run with error state instead of failing entirely
-                    run_data.append(
-                        {
-                            "id": str(run.id),
-                            "created_at": run.created_at,
-                            "status": "ERROR",
-                            "task": run.task,
-                            "team_result": None,
-                            "messages": [],
-                            "error": f"Failed to process run: {str(e)}",
-                            "input_request": getattr(run, "input_request", None),
-                        }
-                    )
-
-        return {"status": True, "data": {"runs": run_data}}
+        run_data = [
+            {
+                "id": str(run.id),
+                "created_at": run.created_at,
+                "status": run.status,
+                "task": run.task,
+                "team_result": run.team_result,
+                "messages": messages,
+                "next_message_after_id": runs.data["next_message_after_ids"].get(
+                    run.id
+                ),
+                "input_request": getattr(run, "input_request", None),
+            }
+            for run, messages in runs.data["runs"]
+        ]
+
+        return {
+            "status": True,
+            "data": {"runs": run_data, "next_after_id": runs.data["next_after_id"]},
+        }
 
     except HTTPException:
         raise  # Re-raise HTTP exceptions
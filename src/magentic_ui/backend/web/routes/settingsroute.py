@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException
 import re
 
 from ...datamodel import Settings
-from ..deps import get_db
+from ..deps import get_db, get_websocket_manager
+from ..managers import WebSocketManager
 
 router = APIRouter()
 
@@ -30,7 +31,11 @@ async def get_settings(user_id: str, db=Depends(get_db)) -> Dict:
 
 
 @router.put("/")
-async def update_settings(settings: Settings, db=Depends(get_db)) -> Dict:
+async def update_settings(
+    settings: Settings,
+    db=Depends(get_db),
+    ws_manager: WebSocketManager = Depends(get_websocket_manager),
+) -> Dict:
     
     if settings.config:
         # 检查自动获取个人密钥的占位符并替换为实际的个人密钥
@@ -50,6 +55,8 @@ async def update_settings(settings: Settings, db=Depends(get_db)) -> Dict:
         
     
     response = db.upsert(settings)
+    if settings.user_id:
+        ws_manager.invalidate_settings(settings.user_id)
     if not response.status:
         raise HTTPException(status_code=400, detail=response.message)
     return {"status": True, "data": response.data}
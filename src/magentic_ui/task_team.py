@@ -3,7 +3,7 @@ from autogen_core.models import ChatCompletionClient
 from autogen_core import ComponentModel
 from autogen_agentchat.agents import UserProxyAgent
 
-from .tools.playwright.browser import get_browser_resource_config
+from .tools.playwright.browser import PlaywrightBrowser, get_browser_resource_config
 from .utils import get_internal_urls
 from .teams import GroupChat, RoundRobinGroupChat
 from .teams.orchestrator.orchestrator_config import OrchestratorConfig
@@ -210,6 +210,7 @@ async def get_task_team(
     input_func: Optional[InputFuncType] = None,
     *,
     paths: RunPaths,
+    browser: Optional[PlaywrightBrowser] = None,
 ) -> GroupChat | RoundRobinGroupChat:
     """
     Creates and returns a GroupChat team with specified configuration.
@@ -217,6 +218,7 @@ async def get_task_team(
     Args:
         magentic_ui_config (MagenticUIConfig, optional): Magentic UI configuration for team. Default: None.
         paths (RunPaths): Paths for internal and external run directories.
+        browser (PlaywrightBrowser, optional): Browser for the web surfer, e.g. leased from a BrowserPool. If None, a new browser is configured for the run. Default: None.
 
     Returns:
         GroupChat | RoundRobinGroupChat: An instance of GroupChat or RoundRobinGroupChat with the specified agents and configuration.
@@ -260,14 +262,17 @@ async def get_task_team(
     model_client_file_surfer = get_model_client(
         magentic_ui_config.model_client_configs.file_surfer
     )
-    browser_resource_config, _novnc_port, _playwright_port = (
-        get_browser_resource_config(
-            paths.external_run_dir,
-            magentic_ui_config.novnc_port,
-            magentic_ui_config.playwright_port,
-            magentic_ui_config.inside_docker,
+    if browser is not None:
+        browser_resource_config = browser.dump_component()
+    else:
+        browser_resource_config, _novnc_port, _playwright_port = (
+            get_browser_resource_config(
+                paths.external_run_dir,
+                magentic_ui_config.novnc_port,
+                magentic_ui_config.playwright_port,
+                magentic_ui_config.inside_docker,
+            )
         )
-    )
 
     orchestrator_config = OrchestratorConfig(
         cooperative_planning=magentic_ui_config.cooperative_planning,
@@ -365,6 +370,8 @@ async def get_task_team(
         )
     with ApprovalGuardContext.populate_context(approval_guard):
         web_surfer = WebSurfer.from_config(websurfer_config)
+    if browser is not None:
+        web_surfer.attach_browser(browser)
     if websurfer_loop_team:
         # simplified team of only the web surfer
         team = RoundRobinGroupChat(
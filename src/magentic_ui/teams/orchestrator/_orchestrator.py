@@ -19,7 +19,6 @@ from autogen_core.models import (
     SystemMessage,
     UserMessage,
 )
-from autogen_core.model_context import TokenLimitedChatCompletionContext
 from autogen_agentchat.base import Response, TerminationCondition
 from autogen_agentchat.messages import (
     BaseChatMessage,
@@ -46,6 +45,7 @@ from ...types import HumanInputFormat, Plan
 from ...utils import dict_to_str, thread_to_context
 from ...tools.bing_search import get_bing_search_results
 from ...teams.orchestrator.orchestrator_config import OrchestratorConfig
+from ._thread_context import ThreadContext
 from ._prompts import (
     ORCHESTRATOR_SYSTEM_MESSAGE_PLANNING,
     ORCHESTRATOR_SYSTEM_MESSAGE_PLANNING_AUTONOMOUS,
@@ -147,8 +147,8 @@ class Orchestrator(BaseGroupChatManager):
             message_factory=message_factory,
         )
         self._model_client: ChatCompletionClient = model_client
-        self._model_context = TokenLimitedChatCompletionContext(
-            model_client, token_limit=config.model_context_token_limit
+        self._thread_context = ThreadContext(
+            model_client, self._name, token_limit=config.model_context_token_limit
         )
         self._config: OrchestratorConfig = config
         self._user_agent_topic = "user_proxy"
@@ -403,15 +403,14 @@ class Orchestrator(BaseGroupChatManager):
         retries = 0
         exception_message = ""
         while retries < self._config.max_json_retries:
-            # Re-initialize model context to meet token limit quota
-            await self._model_context.clear()
-            for msg in messages:
-                await self._model_context.add_message(msg)
+            # Trim the context to meet token limit quota
             if exception_message != "":
-                await self._model_context.add_message(
-                    UserMessage(content=exception_message, source=self._name)
+                token_limited_messages = self._thread_context.trim(
+                    messages
+                    + [UserMessage(content=exception_message, source=self._name)]
                 )
-            token_limited_messages = await self._model_context.get_messages()
+            else:
+                token_limited_messages = self._thread_context.trim(messages)
 
             response = await self._model_client.create(
                 token_limited_messages,
@@ -1166,11 +1165,8 @@ class Orchestrator(BaseGroupChatManager):
                 )
             )
 
-            # Re-initialize model context to meet token limit quota
-            await self._model_context.clear()
-            for msg in context:
-                await self._model_context.add_message(msg)
-            token_limited_context = await self._model_context.get_messages()
+            # Trim the context to meet token limit quota
+            token_limited_context = self._thread_context.trim(context)
 
             response = await self._model_client.create(
                 token_limited_context, cancellation_token=cancellation_token
@@ -1207,9 +1203,6 @@ class Orchestrator(BaseGroupChatManager):
         self, messages: Optional[List[BaseChatMessage | BaseAgentEvent]] = None
     ) -> List[LLMMessage]:
         """Convert the message thread to a context for the model."""
-        chat_messages: List[BaseChatMessage | BaseAgentEvent] = (
-            messages if messages is not None else self._state.message_history
-        )
         context_messages: List[LLMMessage] = []
         date_today = datetime.now().strftime("%d %B, %Y")
         if self._state.in_planning_mode:
@@ -1224,16 +1217,17 @@ class Orchestrator(BaseGroupChatManager):
                     )
                 )
             )
-        if self._model_client.model_info["vision"]:
+        if messages is None:
+            # The message history is converted incrementally
             context_messages.extend(
-                thread_to_context(
-                    messages=chat_messages, agent_name=self._name, is_multimodal=True
-                )
+                self._thread_context.sync(self._state.message_history)
             )
         else:
             context_messages.extend(
                 thread_to_context(
-                    messages=chat_messages, agent_name=self._name, is_multimodal=False
+                    messages=messages,
+                    agent_name=self._name,
+                    is_multimodal=self._model_client.model_info["vision"],
                 )
             )
         return context_messages
@@ -0,0 +1,177 @@
+from typing import Callable, List, Optional, Sequence
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage
+from autogen_core.models import (
+    ChatCompletionClient,
+    FunctionExecutionResultMessage,
+    LLMMessage,
+)
+
+from ...utils import thread_to_context
+
+
+class ThreadContext:
+    """
+    The orchestrator's message thread converted to LLM messages, kept up to date incrementally.
+
+    Messages appended to the thread are converted once, and their tokens are counted once,
+    the first time the context is trimmed. If the thread was replaced or filtered instead of
+    appended to, the context is rebuilt.
+
+    `trim` drops messages from the middle of a context until it fits the token limit, like
+    `TokenLimitedChatCompletionContext`, without counting tokens again: after k of n messages
+    were dropped from the middle, the dropped messages are the run of k messages starting at
+    (n - k + 1) // 2, so the number of messages to drop is found by a binary search over
+    prefix sums of the cached counts.
+
+    Args:
+        model_client (ChatCompletionClient): The model client, used to count tokens.
+        agent_name (str): The name of the orchestrator, whose messages become assistant messages.
+        token_limit (int, optional): The maximum number of tokens sent to the model. Default: the model's remaining tokens
+    """
+
+    def __init__(
+        self,
+        model_client: ChatCompletionClient,
+        agent_name: str,
+        token_limit: Optional[int] = None,
+    ) -> None:
+        self._model_client = model_client
+        self._agent_name = agent_name
+        self._token_limit = token_limit
+        self._is_multimodal = bool(model_client.model_info["vision"])
+        self._thread_length = 0
+        self._first: Optional[BaseChatMessage | BaseAgentEvent] = None
+        self._last: Optional[BaseChatMessage | BaseAgentEvent] = None
+        self._messages: List[LLMMessage] = []
+        # Prefix sums of the token counts of the first len(self._sums) - 1 messages
+        self._sums: List[int] = [0]
+        self._base_tokens: Optional[int] = None
+
+    def clear(self) -> None:
+        """Forget the converted messages."""
+        self._thread_length = 0
+        self._first = None
+        self._last = None
+        self._messages = []
+        self._sums = [0]
+
+    def sync(
+        self, thread: Sequence[BaseChatMessage | BaseAgentEvent]
+    ) -> List[LLMMessage]:
+        """
+        Convert the messages appended to the thread since the last call.
+
+        Args:
+            thread (Sequence[BaseChatMessage | BaseAgentEvent]): The orchestrator's message history.
+
+        Returns:
+            List[LLMMessage]: The converted thread. The list is owned by the context and must not be modified.
+        """
+        n = self._thread_length
+        if n > len(thread) or (
+            n > 0 and (thread[0] is not self._first or thread[n - 1] is not self._last)
+        ):
+            self.clear()
+            n = 0
+        if n == len(thread):
+            return self._messages
+        self._messages.extend(
+            thread_to_context(
+                list(thread[n:]),
+                agent_name=self._agent_name,
+                is_multimodal=self._is_multimodal,
+            )
+        )
+        self._thread_length = len(thread)
+        self._first = thread[0]
+        self._last = thread[-1]
+        return self._messages
+
+    def _count(self, message: LLMMessage) -> int:
+        if self._base_tokens is None:
+            self._base_tokens = self._model_client.count_tokens([])
+        return self._model_client.count_tokens([message]) - self._base_tokens
+
+    def _thread_sums(self) -> List[int]:
+        for message in self._messages[len(self._sums) - 1 :]:
+            self._sums.append(self._sums[-1] + self._count(message))
+        return self._sums
+
+    def _locate_thread(self, messages: Sequence[LLMMessage]) -> Optional[int]:
+        """Index at which the converted thread appears in a context, if it does"""
+        if not self._messages:
+            return None
+        first, last = self._messages[0], self._messages[-1]
+        for start, message in enumerate(messages):
+            if message is first:
+                end = start + len(self._messages)
+                if end <= len(messages) and messages[end - 1] is last:
+                    return start
+                return None
+        return None
+
+    def trim(self, messages: Sequence[LLMMessage]) -> List[LLMMessage]:
+        """
+        Drop messages from the middle of a context until it fits the token limit.
+
+        Messages of the converted thread reuse their cached token counts; the others,
+        such as system messages and prompts, are counted on each call.
+
+        Args:
+            messages (Sequence[LLMMessage]): The context, usually a system message, the converted thread and prompts.
+
+        Returns:
+            List[LLMMessage]: The messages that fit, as `TokenLimitedChatCompletionContext.get_messages` would return them.
+        """
+        n = len(messages)
+        start = self._locate_thread(messages)
+        if start is None:
+            start, thread_sums = n, [0]
+        else:
+            thread_sums = self._thread_sums()
+        end = start + len(thread_sums) - 1
+        head_sums = _prefix_sums(messages[:start], self._count)
+        tail_sums = _prefix_sums(messages[end:], self._count)
+
+        def prefix(i: int) -> int:
+            if i <= start:
+                return head_sums[i]
+            if i <= end:
+                return head_sums[-1] + thread_sums[i - start]
+            return head_sums[-1] + thread_sums[-1] + tail_sums[i - end]
+
+        if self._base_tokens is None:
+            self._base_tokens = self._model_client.count_tokens([])
+        if self._token_limit is not None:
+            limit = self._token_limit
+        else:
+            limit = self._model_client.remaining_tokens([]) + self._base_tokens
+        total = self._base_tokens + prefix(n)
+
+        def dropped(k: int) -> int:
+            first = (n - k + 1) // 2
+            return prefix(first + k) - prefix(first)
+
+        # Fewest messages to drop from the middle for the rest to fit
+        low, high = 0, n
+        while low < high:
+            k = (low + high) // 2
+            if total - dropped(k) <= limit:
+                high = k
+            else:
+                low = k + 1
+        first = (n - low + 1) // 2
+        result = list(messages[:first]) + list(messages[first + low :])
+        if result and isinstance(result[0], FunctionExecutionResultMessage):
+            result = result[1:]
+        return result
+
+
+def _prefix_sums(
+    messages: Sequence[LLMMessage], count: Callable[[LLMMessage], int]
+) -> List[int]:
+    sums = [0]
+    for message in messages:
+        sums.append(sums[-1] + count(message))
+    return sums
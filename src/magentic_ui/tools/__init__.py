@@ -6,7 +6,9 @@ from .playwright import (
     domrectangle_from_dict,
 )
 from .bing_search import get_bing_search_results
-from .url_status_manager import URL_ALLOWED, URL_REJECTED, UrlStatusManager
+from .document_cache import ConvertedDocumentCache, get_converted_document_cache
+from .tokenizer import count_tokens, get_encoder, truncate_to_tokens
+from .url_status_manager import URL_ALLOWED, URL_BLOCKED, URL_REJECTED, UrlStatusManager
 from .tool_metadata import load_tool, get_tool_metadata, make_approval_prompt
 
 __all__ = [
@@ -16,9 +18,15 @@ __all__ = [
     "VisualViewport",
     "domrectangle_from_dict",
     "get_bing_search_results",
+    "ConvertedDocumentCache",
+    "get_converted_document_cache",
+    "count_tokens",
+    "get_encoder",
+    "truncate_to_tokens",
     "UrlStatusManager",
     "URL_ALLOWED",
     "URL_REJECTED",
+    "URL_BLOCKED",
     "load_tool",
     "get_tool_metadata",
     "make_approval_prompt",
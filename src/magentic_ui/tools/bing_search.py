@@ -1,11 +1,26 @@
 from urllib.parse import quote_plus
-from playwright.async_api import async_playwright
+from playwright.async_api import (
+    Browser,
+    Error as PlaywrightError,
+    Page,
+    Playwright,
+    async_playwright,
+)
 from urllib.parse import urlparse
 import asyncio
-import tiktoken
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
 from loguru import logger
 from ..tools import PlaywrightController
+from .tokenizer import truncate_to_tokens
+
+EXTRACTION_ERROR = "Error extracting content"
 
 
 @dataclass
@@ -16,8 +31,189 @@ class BingSearchResults:
     combined_content: str
 
 
+class SearchBrowserPool:
+    """Process-wide headless Chromium shared by all search extractions.
+
+    The browser is launched on first use and kept running. Each page gets a fresh
+    browser context that is closed with it, so no cookies, storage or cache carry
+    over between searches, and at most `max_concurrency` pages load at the same time.
+
+    Args:
+        max_concurrency (int, optional): Maximum number of pages open at once. Default: 4
+    """
+
+    LAUNCH_ARGS = ["--disable-extensions", "--disable-file-system"]
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _bind_loop(self) -> None:
+        # Playwright objects belong to the event loop that created them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._playwright = None
+            self._browser = None
+
+    async def _get_browser(self) -> Browser:
+        self._bind_loop()
+        assert self._lock is not None
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    env={},
+                    args=self.LAUNCH_ARGS,
+                    chromium_sandbox=True,
+                )
+            return self._browser
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Open a page in a new context of the shared browser, waiting while the pool is at capacity."""
+        browser = await self._get_browser()
+        assert self._semaphore is not None
+        async with self._semaphore:
+            context = await browser.new_context(
+                accept_downloads=False,  # Disable downloads
+                permissions=[],  # No additional permissions
+            )
+            try:
+                yield await context.new_page()
+            finally:
+                try:
+                    await context.close()
+                except PlaywrightError as e:
+                    logger.debug(f"Error closing search browser context: {e}")
+
+    async def close(self) -> None:
+        """Close the browser and Playwright."""
+        if self._loop is not asyncio.get_running_loop():
+            # Objects created on another loop cannot be awaited here
+            self._loop = None
+            self._playwright = None
+            self._browser = None
+            return
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except PlaywrightError:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class SearchCache:
+    """On-disk cache of extracted page markdown keyed on (query, url).
+
+    Each entry is a small JSON file named after the hash of its key. Entries older
+    than `ttl` seconds are treated as missing and removed when read. Expired entries
+    are also swept when the cache is first used and after every `max_entries // 10`
+    writes, which then removes the oldest entries beyond `max_entries`. The methods
+    do blocking file I/O; async code uses `aget` and `aset`.
+
+    Args:
+        cache_dir (Path): Directory holding the cache entries.
+        ttl (float, optional): Seconds an entry stays valid. Default: 3600
+        max_entries (int, optional): Number of entries kept after a sweep. Default: 1000
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = 3600.0, max_entries: int = 1000):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._writes_until_sweep = 0
+
+    def sweep(self) -> None:
+        """Remove expired entries, then the oldest ones beyond `max_entries`."""
+        self._writes_until_sweep = max(1, self.max_entries // 10)
+        try:
+            entries = [
+                (path.stat().st_mtime, path) for path in self.cache_dir.glob("*.json")
+            ]
+        except OSError:
+            return
+        entries.sort(reverse=True)
+        now = time.time()
+        for rank, (mtime, path) in enumerate(entries):
+            if rank >= self.max_entries or now - mtime > self.ttl:
+                path.unlink(missing_ok=True)
+
+    def _path(self, query: str, url: str) -> Path:
+        key = hashlib.sha256(json.dumps([query, url]).encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, query: str, url: str) -> Optional[str]:
+        """Return the cached markdown for (query, url), or None if missing or expired."""
+        if self._writes_until_sweep == 0:
+            self.sweep()
+        path = self._path(query, url)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        return entry.get("markdown")
+
+    def set(self, query: str, url: str, markdown: str) -> None:
+        """Store the markdown for (query, url)."""
+        path = self._path(query, url)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(
+                json.dumps({"stored_at": time.time(), "markdown": markdown}),
+                encoding="utf-8",
+            )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write search cache entry: {e}")
+        self._writes_until_sweep -= 1
+        if self._writes_until_sweep <= 0:
+            self.sweep()
+
+    async def aget(self, query: str, url: str) -> Optional[str]:
+        """`get` in a worker thread."""
+        return await asyncio.to_thread(self.get, query, url)
+
+    async def aset(self, query: str, url: str, markdown: str) -> None:
+        """`set` in a worker thread."""
+        await asyncio.to_thread(self.set, query, url, markdown)
+
+
+_browser_pool = SearchBrowserPool()
+_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Return the process-wide search cache, stored under the app directory."""
+    global _cache
+    if _cache is None:
+        app_dir = Path(os.environ.get("_APPDIR", Path.home() / ".magentic_ui"))
+        _cache = SearchCache(app_dir / "search_cache")
+    return _cache
+
+
+async def close_search_browser() -> None:
+    """Shut down the shared search browser."""
+    await _browser_pool.close()
+
+
 async def extract_page_markdown(url: str) -> tuple[str, str]:
-    """Extract markdown content from a given URL.
+    """Extract markdown content from a given URL using the shared search browser.
 
     Args:
         url (str): The URL to extract content from
@@ -28,33 +224,32 @@ async def extract_page_markdown(url: str) -> tuple[str, str]:
             - str: The markdown content extracted from the page
     """
     try:
-        async with async_playwright() as p:
-            launch_args = ["--disable-extensions", "--disable-file-system"]
-            browser = await p.chromium.launch(
-                headless=True, env={}, args=launch_args, chromium_sandbox=True
-            )
-            context = await browser.new_context(
-                accept_downloads=False,  # Disable downloads
-                permissions=[],  # No additional permissions
-            )
-
+        async with _browser_pool.page() as page:
             controller = PlaywrightController()
-
-            page = await context.new_page()
             try:
                 await page.goto(url)
                 await asyncio.sleep(1)
                 markdown = await controller.get_page_markdown(page)
             except Exception as e:
                 logger.error(f"Error extracting content: {e}")
-                markdown = "Error extracting content"
-
-            await context.close()
-            await browser.close()
+                markdown = EXTRACTION_ERROR
             return url, markdown
     except Exception as e:
         logger.error(f"Error extracting content: {e}")
-        return url, "Error extracting content"
+        return url, EXTRACTION_ERROR
+
+
+async def _extract_cached(
+    query: str, url: str, cache: Optional[SearchCache]
+) -> tuple[str, str]:
+    if cache is not None:
+        markdown = await cache.aget(query, url)
+        if markdown is not None:
+            return url, markdown
+    url, markdown = await extract_page_markdown(url)
+    if cache is not None and markdown != EXTRACTION_ERROR:
+        await cache.aset(query, url, markdown)
+    return url, markdown
 
 
 async def get_bing_search_results(
@@ -62,16 +257,20 @@ async def get_bing_search_results(
     max_pages: int = 3,
     timeout_seconds: int = 10,
     max_tokens_per_page: int = 10000,
+    use_cache: bool = True,
 ) -> BingSearchResults:
     """Get the Bing search results for a given query.
 
-    WARNING: This function spawns multiple browser local playwright instances which may consume a lot of resources and can cause risks.
+    WARNING: This function browses with a local headless playwright browser, shared by all searches in the process, which may consume a lot of resources and can cause risks.
+
+    Extracted pages are cached on disk per (query, url), so repeating a search does not load the pages again.
 
     Args:
         query (str): The search query to use
         max_pages (int, optional): Maximum number of pages to extract. Default: 3
         timeout_seconds (int, optional): Maximum time in seconds to wait for search results. Default: 10
         max_tokens_per_page (int, optional): Maximum number of tokens to extract from each page. Default: 10000
+        use_cache (bool, optional): Read and store extracted pages in the search cache. Default: True
 
     Returns:
         BingSearchResults: Contains search results markdown, links, and extracted content
@@ -80,11 +279,14 @@ async def get_bing_search_results(
     links: list[dict[str, str]] = []
     page_contents: dict[str, str] = {}
     combined_content: str = ""
+    cache = get_search_cache() if use_cache else None
 
     try:
         result = await asyncio.wait_for(
-            extract_page_markdown(
-                f"https://www.bing.com/search?q={quote_plus(query)}&FORM=QBLH"
+            _extract_cached(
+                query,
+                f"https://www.bing.com/search?q={quote_plus(query)}&FORM=QBLH",
+                cache,
             ),
             timeout=timeout_seconds,
         )
@@ -145,7 +347,7 @@ async def get_bing_search_results(
 
         # Extract content from first 5 links in parallel
         first_few_urls = [link["url"] for link in links[:max_pages]]
-        tasks = [extract_page_markdown(url) for url in first_few_urls]
+        tasks = [_extract_cached(query, url, cache) for url in first_few_urls]
         extracted_contents = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Create a dictionary mapping URLs to their content, handling any failed extractions
@@ -156,20 +358,14 @@ async def get_bing_search_results(
                 continue
             elif isinstance(result, tuple):
                 _, content = result  # type: ignore
-                if content != "Error extracting content":
+                if content != EXTRACTION_ERROR:
                     page_contents[url] = content
 
         # Combine all extracted page contents into a single string
         if page_contents:
             combined_content = "Search Results for " + query + "\n\n"
             for url, content in page_contents.items():
-                if max_tokens_per_page == -1:
-                    token_limited_content = content
-                else:
-                    tokenizer = tiktoken.encoding_for_model("gpt-4o")
-                    tokens = tokenizer.encode(content)
-                    limited_content = tokenizer.decode(tokens[:max_tokens_per_page])
-                    token_limited_content = limited_content
+                token_limited_content = truncate_to_tokens(content, max_tokens_per_page)
                 combined_content += f"Page: {url}\n{token_limited_content}\n\n"
 
     except asyncio.TimeoutError as e:
@@ -181,13 +377,7 @@ async def get_bing_search_results(
                 "Search Results for " + query + " (Partial results due to timeout)\n\n"
             )
             for url, content in page_contents.items():
-                if max_tokens_per_page == -1:
-                    token_limited_content = content
-                else:
-                    tokenizer = tiktoken.encoding_for_model("gpt-4o")
-                    tokens = tokenizer.encode(content)
-                    limited_content = tokenizer.decode(tokens[:max_tokens_per_page])
-                    token_limited_content = limited_content
+                token_limited_content = truncate_to_tokens(content, max_tokens_per_page)
                 combined_content += f"Page: {url}\n{token_limited_content}\n\n"
         elif not search_results:
             # If we got absolutely nothing, return empty results
@@ -0,0 +1,190 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    digest TEXT PRIMARY KEY,
+    title TEXT,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_documents_last_used ON documents (last_used);
+"""
+
+
+class ConvertedDocument(NamedTuple):
+    title: Optional[str]
+    text: str
+
+
+class ConvertedDocumentCache:
+    """
+    Persistent cache of documents converted to markdown, keyed by the SHA-256 of their content.
+
+    Each document's markdown is stored in its own file, with an SQLite index of sizes and
+    last use times. Once the cache holds more than `max_bytes` of markdown or more than
+    `max_entries` documents, the least recently used documents are removed. Processes
+    sharing the cache directory share its entries. The index is opened on first use and
+    shared by the threads using the cache.
+
+    Args:
+        cache_dir (Path): Directory holding the cache.
+        max_bytes (int, optional): Maximum total size of the cached markdown. Default: 512 MiB
+        max_entries (int, optional): Maximum number of cached documents. Default: 10000
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 512 * 1024 * 1024,
+        max_entries: int = 10000,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def digest(*parts: bytes) -> str:
+        """
+        Return the cache key of a source document.
+
+        Args:
+            *parts (bytes): The document content, optionally preceded by whatever else the conversion depends on.
+
+        Returns:
+            str: The hex SHA-256 of the parts.
+        """
+        sha = hashlib.sha256()
+        for part in parts:
+            sha.update(part)
+        return sha.hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.cache_dir / "index.sqlite", timeout=10, check_same_thread=False
+            )
+            try:
+                conn.executescript(_SCHEMA)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the index. It is opened again when the cache is next used."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.md"
+
+    def get(self, digest: str) -> Optional[ConvertedDocument]:
+        """
+        Return a cached document and mark it as recently used.
+
+        Args:
+            digest (str): The document's cache key.
+
+        Returns:
+            ConvertedDocument | None: The title and markdown, or None if the document is not cached.
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    row = conn.execute(
+                        "SELECT title FROM documents WHERE digest = ?", (digest,)
+                    ).fetchone()
+                    if row is None:
+                        return None
+                    try:
+                        text = self._path(digest).read_text(encoding="utf-8")
+                    except OSError:
+                        conn.execute(
+                            "DELETE FROM documents WHERE digest = ?", (digest,)
+                        )
+                        return None
+                    conn.execute(
+                        "UPDATE documents SET last_used = ? WHERE digest = ?",
+                        (time.time(), digest),
+                    )
+                    return ConvertedDocument(row[0], text)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read converted document cache: {e}")
+            return None
+
+    def put(self, digest: str, title: Optional[str], text: str) -> None:
+        """
+        Store a converted document, evicting the least recently used ones over the limits.
+
+        Args:
+            digest (str): The document's cache key.
+            title (str, optional): The document title.
+            text (str): The markdown.
+        """
+        data = text.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(digest)
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                    tmp_path.write_bytes(data)
+                    os.replace(tmp_path, path)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO documents (digest, title, size, last_used) "
+                        "VALUES (?, ?, ?, ?)",
+                        (digest, title, len(data), time.time()),
+                    )
+                    self._evict(conn)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not write converted document cache: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total, count = conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM documents"
+        ).fetchone()
+        if total <= self.max_bytes and count <= self.max_entries:
+            return
+        rows = conn.execute(
+            "SELECT digest, size FROM documents ORDER BY last_used"
+        ).fetchall()
+        evicted = []
+        for digest, size in rows:
+            if total <= self.max_bytes and count <= self.max_entries:
+                break
+            evicted.append((digest,))
+            total -= size
+            count -= 1
+        conn.executemany("DELETE FROM documents WHERE digest = ?", evicted)
+        for (digest,) in evicted:
+            self._path(digest).unlink(missing_ok=True)
+
+
+_cache: Optional[ConvertedDocumentCache] = None
+
+
+def get_converted_document_cache() -> ConvertedDocumentCache:
+    """Return the process-wide converted document cache, stored under the app directory."""
+    global _cache
+    if _cache is None:
+        app_dir = Path(os.environ.get("_APPDIR", Path.home() / ".magentic_ui"))
+        _cache = ConvertedDocumentCache(app_dir / "converted_documents")
+    return _cache
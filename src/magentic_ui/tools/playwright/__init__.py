@@ -2,6 +2,7 @@ from .playwright_controller import PlaywrightController
 from .playwright_state import BrowserState
 from .types import (
     InteractiveRegion,
+    PageSnapshot,
     VisualViewport,
     domrectangle_from_dict,
 )
@@ -17,6 +18,7 @@ __all__ = [
     "PlaywrightController",
     "BrowserState",
     "InteractiveRegion",
+    "PageSnapshot",
     "VisualViewport",
     "domrectangle_from_dict",
     "PlaywrightBrowser",
@@ -66,6 +66,15 @@ class PlaywrightBrowser(
         """
         pass
 
+    async def reset_context(self) -> None:
+        """
+        Replace the browser context with a fresh one, dropping pages, cookies and storage
+        of the previous user while keeping the browser resource running.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support resetting its context"
+        )
+
     async def __aenter__(self) -> Self:
         """
         Start the Playwright browser.
@@ -104,6 +113,7 @@ class DockerPlaywrightBrowser(PlaywrightBrowser):
         super().__init__()
         self._container: Optional[Container] = None
         self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
         self._context: BrowserContext | None = None
 
     @property
@@ -122,6 +132,16 @@ class DockerPlaywrightBrowser(PlaywrightBrowser):
             )
         return self._context
 
+    async def reset_context(self) -> None:
+        """
+        Close the current browser context and open a new one on the same container.
+        """
+        if self._browser is None or not self._browser.is_connected():
+            raise RuntimeError("Browser is not connected. Start the browser first.")
+        if self._context:
+            await self._context.close()
+        self._context = await self._browser.new_context()
+
     @abstractmethod
     async def create_container(self) -> Container:
         pass
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from autogen_core import ComponentModel
+from loguru import logger
+from playwright.async_api import BrowserContext
+
+from .base_playwright_browser import PlaywrightBrowser
+
+
+@dataclass
+class _PoolEntry:
+    browser: PlaywrightBrowser
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    owner: Optional[str] = None
+
+
+class BrowserPool:
+    """
+    Pool of pre-started browsers that are leased to runs.
+
+    The pool keeps `size` browsers started in the background, so a run gets a browser
+    whose container is already up instead of booting one before its first action. A
+    lease is returned when the run closes its browser: the browser context is reset so
+    no pages, cookies or storage leak into the next run, and the browser goes back to
+    the pool. A browser that has served a lease is only leased again to the same owner,
+    since its container (its noVNC port and mounted directory) may still be reachable
+    by the previous user. Browsers are recycled (stopped and replaced) once they are older than
+    `ttl` seconds, have served `max_uses` leases, or fail to reset.
+
+    Args:
+        browser_factory (Callable[[], PlaywrightBrowser]): Creates a new, not yet started browser
+        size (int, optional): Number of idle browsers kept started. Default: 2.
+        max_uses (int, optional): Number of leases after which a browser is recycled. Default: 20.
+        ttl (float, optional): Age in seconds after which a browser is recycled. Default: 1800.0.
+
+    Example:
+        ```python
+        pool = BrowserPool(make_browser, size=2)
+        await pool.start()
+        browser = await pool.acquire()  # already started
+        async with browser:
+            page = await browser.browser_context.new_page()
+        # leaving the context returns the browser to the pool
+        await pool.close()
+        ```
+    """
+
+    def __init__(
+        self,
+        browser_factory: Callable[[], PlaywrightBrowser],
+        size: int = 2,
+        max_uses: int = 20,
+        ttl: float = 1800.0,
+    ):
+        self.browser_factory = browser_factory
+        self.size = size
+        self.max_uses = max_uses
+        self.ttl = ttl
+        self._idle: Deque[_PoolEntry] = deque()
+        self._leased: Dict[int, _PoolEntry] = {}
+        self._fill_tasks: Set[asyncio.Task[None]] = set()
+        self._closed = False
+        self._started = 0
+        self._recycled = 0
+        self._failed = 0
+        self._warm_leases = 0
+        self._cold_leases = 0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and lease counters"""
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "starting": len(self._fill_tasks),
+            "started": self._started,
+            "recycled": self._recycled,
+            "failed": self._failed,
+            "warm_leases": self._warm_leases,
+            "cold_leases": self._cold_leases,
+        }
+
+    async def start(self) -> None:
+        """Start warming up browsers in the background"""
+        self._fill()
+
+    async def acquire(self, owner: Optional[str] = None) -> PooledPlaywrightBrowser:
+        """
+        Lease a started browser, starting one on demand if no warm browser is idle
+
+        Args:
+            owner (str, optional): User the browser is leased to. Idle browsers used by other owners are not handed out. Default: None.
+
+        Returns:
+            PooledPlaywrightBrowser: Browser handle that returns the lease when closed
+        """
+        if self._closed:
+            raise RuntimeError("Cannot acquire a browser from a closed BrowserPool")
+
+        for candidate in [c for c in self._idle if self._is_expired(c)]:
+            self._idle.remove(candidate)
+            await self._recycle(candidate)
+        # Prefer a browser this owner used before, then a fresh one
+        matches = [c for c in self._idle if c.uses > 0 and c.owner == owner]
+        matches += [c for c in self._idle if c.uses == 0]
+        entry = matches[0] if matches else None
+        if entry is not None:
+            self._idle.remove(entry)
+        elif self._idle:
+            # Only browsers of other owners are idle: replace the oldest with a fresh one
+            await self._recycle(self._idle.popleft())
+
+        if entry is None:
+            entry = await self._start_entry()
+            self._cold_leases += 1
+        else:
+            self._warm_leases += 1
+
+        entry.uses += 1
+        entry.owner = owner
+        self._leased[id(entry.browser)] = entry
+        self._fill()
+        return PooledPlaywrightBrowser(self, entry.browser)
+
+    async def release(self, browser: PlaywrightBrowser) -> None:
+        """
+        Return a leased browser to the pool
+
+        Args:
+            browser (PlaywrightBrowser): Browser obtained from `acquire`
+        """
+        entry = self._leased.pop(id(browser), None)
+        if entry is None:
+            logger.warning("Released a browser that is not leased from this pool")
+            return
+
+        if self._closed or self._is_expired(entry) or entry.uses >= self.max_uses:
+            await self._recycle(entry)
+        else:
+            try:
+                await entry.browser.reset_context()
+                self._idle.append(entry)
+            except Exception as e:
+                logger.warning(f"Failed to reset pooled browser, recycling it: {e}")
+                await self._recycle(entry)
+        self._fill()
+
+    async def close(self) -> None:
+        """Stop all idle browsers. Leased browsers are stopped when they are released."""
+        self._closed = True
+        for task in list(self._fill_tasks):
+            task.cancel()
+        await asyncio.gather(*self._fill_tasks, return_exceptions=True)
+        while self._idle:
+            await self._stop(self._idle.popleft())
+
+    def _is_expired(self, entry: _PoolEntry) -> bool:
+        return time.monotonic() - entry.created_at >= self.ttl
+
+    def _fill(self) -> None:
+        if self._closed:
+            return
+        missing = self.size - len(self._idle) - len(self._fill_tasks)
+        for _ in range(missing):
+            task = asyncio.create_task(self._warm_up())
+            self._fill_tasks.add(task)
+            task.add_done_callback(self._fill_tasks.discard)
+
+    async def _warm_up(self) -> None:
+        try:
+            entry = await self._start_entry()
+        except Exception as e:
+            # Do not refill from here: a broken backend would otherwise retry in a loop.
+            # The next acquire or release tries again.
+            logger.error(f"Failed to start pooled browser: {e}")
+            return
+        if self._closed:
+            await self._stop(entry)
+        else:
+            self._idle.append(entry)
+
+    async def _start_entry(self) -> _PoolEntry:
+        browser = self.browser_factory()
+        try:
+            await browser.__aenter__()
+        except BaseException:
+            self._failed += 1
+            await self._stop(_PoolEntry(browser))
+            raise
+        self._started += 1
+        return _PoolEntry(browser)
+
+    async def _recycle(self, entry: _PoolEntry) -> None:
+        self._recycled += 1
+        await self._stop(entry)
+
+    async def _stop(self, entry: _PoolEntry) -> None:
+        try:
+            await entry.browser.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Failed to stop pooled browser: {e}")
+
+
+class PooledPlaywrightBrowser(PlaywrightBrowser):
+    """
+    Handle to a browser leased from a `BrowserPool`.
+
+    The underlying browser is already started, so entering the handle is free, and
+    closing it returns the browser to the pool instead of stopping it. Port properties
+    and the component config are those of the underlying browser.
+
+    Args:
+        pool (BrowserPool): Pool the browser is leased from
+        browser (PlaywrightBrowser): Started browser owned by the pool
+    """
+
+    def __init__(self, pool: BrowserPool, browser: PlaywrightBrowser):
+        super().__init__()
+        self._pool = pool
+        self._browser = browser
+
+    @property
+    def browser(self) -> PlaywrightBrowser:
+        """The leased browser"""
+        return self._browser
+
+    @property
+    def browser_context(self) -> BrowserContext:
+        if self._closed:
+            raise RuntimeError("The browser lease has already been returned")
+        return self._browser.browser_context
+
+    @property
+    def novnc_port(self) -> int:
+        return getattr(self._browser, "novnc_port", -1)
+
+    @property
+    def playwright_port(self) -> int:
+        return getattr(self._browser, "playwright_port", -1)
+
+    def dump_component(self) -> ComponentModel:
+        return self._browser.dump_component()
+
+    async def _start(self) -> None:
+        if self._closed:
+            raise RuntimeError("The browser lease has already been returned")
+
+    async def _close(self) -> None:
+        await self._pool.release(self._browser)
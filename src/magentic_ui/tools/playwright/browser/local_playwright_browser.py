@@ -117,10 +117,27 @@ class LocalPlaywrightBrowser(
                 env={} if self._headless else {"DISPLAY": ":0"},
             )
 
-            self._context = await self._browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
-                accept_downloads=self._enable_downloads,
+            self._context = await self._new_context()
+
+    async def _new_context(self) -> BrowserContext:
+        assert self._browser is not None
+        return await self._browser.new_context(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0",
+            accept_downloads=self._enable_downloads,
+        )
+
+    async def reset_context(self) -> None:
+        """
+        Close the current browser context and open a new one on the same browser.
+        A persistent context keeps its data on disk and cannot be reset.
+        """
+        if self._browser is None or not self._browser.is_connected():
+            raise RuntimeError(
+                "Only a running, non-persistent browser can reset its context."
             )
+        if self._context:
+            await self._context.close()
+        self._context = await self._new_context()
 
     async def _close(self) -> None:
         """
@@ -612,6 +612,27 @@ var WebSurfer = WebSurfer || (function () {
         return textInView;
     };
 
+    // Version of the DOM content: a token identifying this document and a counter bumped
+    // on every batch of mutations that can change the page text, so callers can cache
+    // content extracted from the page until it changes
+    let documentToken = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    let mutationEpoch = 0;
+    new MutationObserver(function () {
+        mutationEpoch += 1;
+    }).observe(document, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        // Only attributes that show up in extracted content; this also ignores the
+        // __elementId attributes set by getInteractiveRects
+        attributeFilter: ["href", "src", "alt", "title", "aria-label", "hidden", "value"],
+    });
+
+    let getDomVersion = function () {
+        return documentToken + ":" + mutationEpoch;
+    };
+
     // Public API
     return {
         getInteractiveRects: getInteractiveRects,
@@ -619,5 +640,6 @@ var WebSurfer = WebSurfer || (function () {
         getFocusedElementId: getFocusedElementId,
         getPageMetadata: getPageMetadata,
         getVisibleText: getVisibleText,
+        getDomVersion: getDomVersion,
     };
 })();
@@ -5,6 +5,8 @@ import random
 import json
 import logging
 import hashlib
+import weakref
+from dataclasses import dataclass
 from typing import (
     Any,
     Awaitable,
@@ -24,10 +26,12 @@ from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from playwright.async_api import Download, Page, BrowserContext
 from .utils.animation_utils import AnimationUtilsPlaywright
 from .utils.webpage_text_utils import WebpageTextUtilsPlaywright
+from ..tokenizer import truncate_to_tokens
 from ..url_status_manager import UrlStatusManager
 
 from .types import (
     InteractiveRegion,
+    PageSnapshot,
     VisualViewport,
     interactiveregion_from_dict,
     visualviewport_from_dict,
@@ -37,6 +41,41 @@ warnings.filterwarnings(action="ignore", module="markitdown")
 
 logger = logging.getLogger(__name__)
 
+# Cheap check whether page_script.js is present in the current document
+PAGE_SCRIPT_SENTINEL = "typeof WebSurfer !== 'undefined'"
+
+# Reads all page state used by the agent in a single evaluate call
+PAGE_SNAPSHOT_SCRIPT = """(() => ({
+    title: document.title,
+    rects: WebSurfer.getInteractiveRects(),
+    viewport: WebSurfer.getVisualViewport(),
+    focused_id: WebSurfer.getFocusedElementId(),
+    metadata: WebSurfer.getPageMetadata(),
+    visible_text: WebSurfer.getVisibleText(),
+}))()"""
+
+
+@dataclass
+class _PageState:
+    """Readiness of a page, so setup work is done once per page or per document"""
+
+    # Download handler, viewport and init script are set up (once per page)
+    configured: bool = False
+    # The current document passed the URL check and finished loading
+    document_ready: bool = False
+    # page_script.js was verified to be present in the current document
+    script_ready: bool = False
+    # Markdown of the current document and the (url, DOM version) it was converted at
+    markdown_key: Optional[Tuple[str, str]] = None
+    markdown: str = ""
+
+    def on_frame_navigated(self, frame: Any) -> None:
+        if frame.parent_frame is None:
+            self.document_ready = False
+            self.script_ready = False
+            self.markdown_key = None
+            self.markdown = ""
+
 
 # Some of the Code for clicking coordinates and keypresses adapted from https://github.com/openai/openai-cua-sample-app/blob/main/computers/base_playwright.py
 # Copyright 2025 OpenAI - MIT License
@@ -126,6 +165,10 @@ class PlaywrightController:
         self._url_validation_callback = url_validation_callback
         self._page_script: str = ""
         self._markdown_converter: Optional[Any] | None = None
+        self._page_states: "weakref.WeakKeyDictionary[Page, _PageState]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._markdown_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
 
         # Create animation utils instance
         self._animation = AnimationUtilsPlaywright()
@@ -143,14 +186,27 @@ class PlaywrightController:
         # Initialize WebpageTextUtils
         self._text_utils = WebpageTextUtilsPlaywright()
 
+    def _get_page_state(self, page: Page) -> _PageState:
+        state = self._page_states.get(page)
+        if state is None:
+            state = _PageState()
+            # Main frame navigations start a new document that has to be checked again
+            page.on("framenavigated", state.on_frame_navigated)
+            self._page_states[page] = state
+        return state
+
     async def on_new_page(self, page: Page) -> None:
         """
-        Handle actions to perform on a new page.
+        Handle actions to perform on a new page or after it navigated to a new document.
+
+        The URL check and load wait run for every document. The download handler, viewport
+        and init script persist across navigations and are only set up once per page.
 
         Args:
             page (Page): The Playwright page object.
         """
         assert page is not None
+        state = self._get_page_state(page)
 
         awaiting_approval = False
         tentative_url = page.url
@@ -187,34 +243,83 @@ class PlaywrightController:
             # Visit the page if permission has been given
             await self.visit_page(page, tentative_url)
 
-        page.on("download", self._download_handler)  # type: ignore
-
-        # check if there is a need to resize the viewport
-        page_viewport_size = page.viewport_size
-        if self.to_resize_viewport and self.viewport_width and self.viewport_height:
-            if (
-                page_viewport_size is None
-                or page_viewport_size["width"] != self.viewport_width
-                or page_viewport_size["height"] != self.viewport_height
-            ):
-                await page.set_viewport_size(
-                    {"width": self.viewport_width, "height": self.viewport_height}
+        if not state.configured:
+            page.on("download", self._download_handler)  # type: ignore
+
+            # check if there is a need to resize the viewport
+            page_viewport_size = page.viewport_size
+            if self.to_resize_viewport and self.viewport_width and self.viewport_height:
+                if (
+                    page_viewport_size is None
+                    or page_viewport_size["width"] != self.viewport_width
+                    or page_viewport_size["height"] != self.viewport_height
+                ):
+                    await page.set_viewport_size(
+                        {"width": self.viewport_width, "height": self.viewport_height}
+                    )
+            # Injects page_script.js into every document the page loads from now on
+            await page.add_init_script(
+                path=os.path.join(
+                    os.path.abspath(os.path.dirname(__file__)), "page_script.js"
                 )
-        await page.add_init_script(
-            path=os.path.join(
-                os.path.abspath(os.path.dirname(__file__)), "page_script.js"
             )
-        )
+            state.configured = True
+        state.document_ready = True
 
     async def _ensure_page_ready(self, page: Page) -> None:
         """
         Ensure the page is properly configured before performing any action.
 
+        Only does work for pages that were not set up yet or navigated since the last
+        check; otherwise it returns without a browser round-trip.
+
         Args:
             page (Page): The Playwright page object.
         """
         assert page is not None
-        await self.on_new_page(page)
+        state = self._page_states.get(page)
+        if state is None or not state.configured or not state.document_ready:
+            await self.on_new_page(page)
+
+    async def _ensure_page_script(self, page: Page) -> None:
+        """
+        Make sure page_script.js is loaded in the current document.
+
+        The init script normally injects it on load; the sentinel check covers documents
+        that were loaded before the page was set up. Runs once per document.
+
+        Args:
+            page (Page): The Playwright page object.
+        """
+        state = self._get_page_state(page)
+        if state.script_ready:
+            return
+        try:
+            if not await page.evaluate(PAGE_SCRIPT_SENTINEL):
+                await page.evaluate(self._page_script)
+            state.script_ready = True
+        except Exception:
+            pass
+
+    async def _evaluate_page_script(self, page: Page, expression: str) -> Any:
+        """
+        Evaluate an expression that uses the page_script.js API.
+
+        Args:
+            page (Page): The Playwright page object.
+            expression (str): JavaScript expression calling `WebSurfer.*`
+
+        Returns:
+            Any: The result of the expression
+        """
+        await self._ensure_page_script(page)
+        try:
+            return await page.evaluate(expression)
+        except PlaywrightError:
+            # The document changed before the navigation event arrived; inject again
+            self._get_page_state(page).script_ready = False
+            await self._ensure_page_script(page)
+            return await page.evaluate(expression)
 
     async def get_current_url_title(self, page: Page) -> Tuple[str, str]:
         """
@@ -245,6 +350,9 @@ class PlaywrightController:
             path (str, optional): The file path to save the screenshot. If None, the screenshot will be returned as bytes. Default: None
         """
         await self._ensure_page_ready(page)
+        return await self._capture_screenshot(page, path)
+
+    async def _capture_screenshot(self, page: Page, path: str | None = None) -> bytes:
         try:
             screenshot = await page.screenshot(path=path, timeout=15000)
             return screenshot
@@ -269,6 +377,46 @@ class PlaywrightController:
         await self._ensure_page_ready(page)
         await page.wait_for_timeout(duration * 1000)
 
+    async def snapshot(self, page: Page, get_screenshot: bool = True) -> PageSnapshot:
+        """
+        Capture everything the agent needs about the current page in one exchange.
+
+        Interactive regions, viewport, focused element, metadata, visible text and title
+        are read with a single `evaluate` call, and the screenshot is requested
+        concurrently, instead of one browser round-trip per getter.
+
+        Args:
+            page (Page): The Playwright page object.
+            get_screenshot (bool, optional): Whether to capture a screenshot. Default: True
+
+        Returns:
+            PageSnapshot: The state of the page. `screenshot` is None if not requested.
+        """
+        await self._ensure_page_ready(page)
+        state_task = self._evaluate_page_script(page, PAGE_SNAPSHOT_SCRIPT)
+        if get_screenshot:
+            result, screenshot = await asyncio.gather(
+                state_task, self._capture_screenshot(page)
+            )
+        else:
+            result, screenshot = await state_task, None
+
+        assert isinstance(result, dict)
+        state = cast(Dict[str, Any], result)
+        return PageSnapshot(
+            url=page.url,
+            title=str(state["title"]),
+            rects={
+                str(k): interactiveregion_from_dict(v)
+                for k, v in state["rects"].items()
+            },
+            viewport=visualviewport_from_dict(state["viewport"]),
+            focused_id=str(state["focused_id"]),
+            metadata=cast(Dict[str, Any], state["metadata"]),
+            visible_text=str(state["visible_text"]),
+            screenshot=screenshot,
+        )
+
     async def get_interactive_rects(self, page: Page) -> Dict[str, InteractiveRegion]:
         """
         Retrieve interactive regions from the web page.
@@ -281,13 +429,9 @@ class PlaywrightController:
         """
         await self._ensure_page_ready(page)
         # Read the regions from the DOM
-        try:
-            await page.evaluate(self._page_script)
-        except Exception:
-            pass
         result = cast(
             Dict[str, Dict[str, Any]],
-            await page.evaluate("WebSurfer.getInteractiveRects();"),
+            await self._evaluate_page_script(page, "WebSurfer.getInteractiveRects();"),
         )
 
         # Convert the results into appropriate types
@@ -310,12 +454,8 @@ class PlaywrightController:
             VisualViewport: The visual viewport of the page.
         """
         await self._ensure_page_ready(page)
-        try:
-            await page.evaluate(self._page_script)
-        except Exception:
-            pass
         return visualviewport_from_dict(
-            await page.evaluate("WebSurfer.getVisualViewport();")
+            await self._evaluate_page_script(page, "WebSurfer.getVisualViewport();")
         )
 
     async def get_focused_rect_id(self, page: Page) -> str:
@@ -329,11 +469,9 @@ class PlaywrightController:
             str: The ID of the focused element.
         """
         await self._ensure_page_ready(page)
-        try:
-            await page.evaluate(self._page_script)
-        except Exception:
-            pass
-        result = await page.evaluate("WebSurfer.getFocusedElementId();")
+        result = await self._evaluate_page_script(
+            page, "WebSurfer.getFocusedElementId();"
+        )
         return str(result)
 
     async def get_page_metadata(self, page: Page) -> Dict[str, Any]:
@@ -347,11 +485,7 @@ class PlaywrightController:
             Dict[str, Any]: A dictionary of page metadata.
         """
         await self._ensure_page_ready(page)
-        try:
-            await page.evaluate(self._page_script)
-        except Exception:
-            pass
-        result = await page.evaluate("WebSurfer.getPageMetadata();")
+        result = await self._evaluate_page_script(page, "WebSurfer.getPageMetadata();")
         assert isinstance(result, dict)
         return cast(Dict[str, Any], result)
 
@@ -1364,9 +1498,13 @@ class PlaywrightController:
             str: The text content of the page.
         """
         await self._ensure_page_ready(page)
-        return await self._text_utils.get_visible_text(page)
+        result = await self._evaluate_page_script(page, "WebSurfer.getVisibleText();")
+        assert isinstance(result, str)
+        return result
 
-    async def get_page_markdown(self, page: Page, max_tokens: int = -1) -> str:
+    async def get_page_markdown(
+        self, page: Page, max_tokens: int = -1, pages: Optional[range] = None
+    ) -> str:
         """
         Retrieve the markdown content of the web page, limited to a specified number of tokens.
         Automatically detects and handles PDF content.
@@ -1374,12 +1512,37 @@ class PlaywrightController:
         Args:
             page (Page): The Playwright page object.
             max_tokens (int, optional): The maximum number of tokens to return. Default: -1 (no limit)
+            pages (range, optional): 1-based page numbers to read if the page is a PDF. Default: None (all pages)
 
         Returns:
             str: The markdown content of the page or extracted PDF content.
         """
         await self._ensure_page_ready(page)
-        return await self._text_utils.get_page_markdown(page, max_tokens)
+        state = self._get_page_state(page)
+        # The conversion is reused until the page navigates or its content changes
+        try:
+            key: Optional[Tuple[str, str]] = (
+                page.url,
+                await self._evaluate_page_script(page, "WebSurfer.getDomVersion()"),
+            )
+        except PlaywrightError:
+            key = None
+        if key is not None and key == state.markdown_key:
+            self._markdown_cache_stats["hits"] += 1
+            return truncate_to_tokens(state.markdown, max_tokens)
+
+        self._markdown_cache_stats["misses"] += 1
+        if await self._text_utils.is_pdf_page(page):
+            # PDF text is cached per page on disk and read only up to max_tokens
+            return await self._text_utils.get_page_markdown(page, max_tokens, pages)
+        markdown = await self._text_utils.get_html_markdown(page)
+        state.markdown_key, state.markdown = key, markdown
+        return truncate_to_tokens(markdown, max_tokens)
+
+    @property
+    def markdown_cache_stats(self) -> Dict[str, int]:
+        """Hits and misses of the page markdown cache used by `get_page_markdown`."""
+        return dict(self._markdown_cache_stats)
 
     async def describe_page(
         self,
@@ -1391,7 +1554,6 @@ class PlaywrightController:
 
         Args:
             page (Page): The Playwright page object.
-            prior_metadata_hash (Optional[str]): The previous metadata hash to compare with the current one.
             get_screenshot (bool, optional): Whether to include a screenshot in the response. Default: True
 
         Returns:
@@ -1400,13 +1562,24 @@ class PlaywrightController:
                 - bytes | None: The screenshot bytes if requested. Otherwise None.
                 - str: The new metadata hash of the page.
         """
-        await self._ensure_page_ready(page)
-        screenshot = None
-        if get_screenshot:
-            screenshot = await self.get_screenshot(page, path=None)
-        page_title = await page.title()
-        viewport = await self.get_visual_viewport(page)
-        viewport_text = await self._text_utils.get_visible_text(page)
+        return self.describe_snapshot(await self.snapshot(page, get_screenshot))
+
+    def describe_snapshot(
+        self, snapshot: PageSnapshot
+    ) -> Tuple[str, Union[bytes, None], str]:
+        """
+        Describe a page snapshot, see `describe_page`.
+
+        Args:
+            snapshot (PageSnapshot): Snapshot returned by `snapshot`
+
+        Returns:
+            A tuple containing:
+                - str: The message content describing the page.
+                - bytes | None: The screenshot bytes of the snapshot, if any.
+                - str: The new metadata hash of the page.
+        """
+        viewport = snapshot["viewport"]
         percent_visible = int(viewport["height"] * 100 / viewport["scrollHeight"])
         percent_scrolled = int(viewport["pageTop"] * 100 / viewport["scrollHeight"])
         position_text = (
@@ -1416,18 +1589,16 @@ class PlaywrightController:
             if percent_scrolled + percent_visible >= 99
             else f"{percent_scrolled}% down from the top of the page"
         )
-        page_metadata = json.dumps(await self.get_page_metadata(page), indent=4)
+        page_metadata = json.dumps(snapshot["metadata"], indent=4)
         metadata_hash = hashlib.md5(page_metadata.encode("utf-8")).hexdigest()
 
-        page_metadata = f"\nThe following metadata was extracted from the webpage:\n\n{page_metadata.strip()}\n"
-
         message_content = (
-            f"We are at the following webpage [{page_title}]({page.url}).\n"
+            f"We are at the following webpage [{snapshot['title']}]({snapshot['url']}).\n"
             f"The viewport shows {percent_visible}% of the webpage, and is positioned {position_text}\n"
-            f"The text in the viewport is:\n {viewport_text}"
+            f"The text in the viewport is:\n {snapshot['visible_text']}"
         )
 
-        return message_content, screenshot, metadata_hash
+        return message_content, snapshot["screenshot"], metadata_hash
 
     async def add_cursor_box(self, page: Page, identifier: str) -> None:
         await self._animation.add_cursor_box(page, identifier)
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 from typing_extensions import TypedDict
 
 from autogen_core import FunctionCall, Image
@@ -43,6 +43,17 @@ class InteractiveRegion(TypedDict):
     rects: List[DOMRectangle]
 
 
+class PageSnapshot(TypedDict):
+    url: str
+    title: str
+    rects: Dict[str, InteractiveRegion]
+    viewport: VisualViewport
+    focused_id: str
+    metadata: Dict[str, Any]
+    visible_text: str
+    screenshot: Optional[bytes]
+
+
 # Helper functions for dealing with JSON. Not sure there's a better way?
 
 
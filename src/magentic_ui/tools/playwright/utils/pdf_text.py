@@ -0,0 +1,225 @@
+import hashlib
+import io
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTPage, LTTextContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
+
+from ...tokenizer import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+PAGE_SEPARATOR = "\n\n"
+
+_PAGE_RANGE_PATTERN = re.compile(r"^\s*(\d+)\s*(?:(-)\s*(\d*)\s*)?$")
+
+
+def parse_page_range(spec: str) -> range:
+    """
+    Parse a 1-based page range such as "40-45", "7" or "40-" (page 40 to the end).
+
+    Args:
+        spec (str): The page range.
+
+    Returns:
+        range: The page numbers in the range. Open ranges end at a very large page number.
+
+    Raises:
+        ValueError: If the range is malformed or empty.
+    """
+    match = _PAGE_RANGE_PATTERN.match(spec)
+    if match is None:
+        raise ValueError(f"Invalid page range: {spec!r}")
+    first = int(match.group(1))
+    if match.group(2) is None:
+        last = first
+    elif match.group(3):
+        last = int(match.group(3))
+    else:
+        last = 2**31
+    if first < 1 or last < first:
+        raise ValueError(f"Invalid page range: {spec!r}")
+    return range(first, last + 1)
+
+
+def _page_text(layout: LTPage) -> str:
+    return "".join(
+        element.get_text() for element in layout if isinstance(element, LTTextContainer)
+    )
+
+
+class PdfTextCache:
+    """
+    Extracts the text of PDF documents page by page and caches each page on disk.
+
+    Pages are extracted lazily, in order, and only when they are not cached yet, so
+    reading the first pages of a long document or a page range does not parse the rest.
+    Cache entries are keyed by the SHA-256 of the document, so the same file downloaded
+    again reuses them. Once the cached pages take more than `max_bytes`, the least
+    recently read documents are removed after new pages are extracted.
+
+    Args:
+        cache_dir (Path, optional): Directory holding the cached pages. Default: `pdf_text_cache` in the app directory
+        max_bytes (int, optional): Maximum total size of the cached pages. Default: 256 MiB
+    """
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, max_bytes: int = 256 * 1024 * 1024
+    ):
+        if cache_dir is None:
+            app_dir = Path(os.environ.get("_APPDIR", Path.home() / ".magentic_ui"))
+            cache_dir = app_dir / "pdf_text_cache"
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _document_dir(self, pdf_data: bytes) -> Path:
+        return self.cache_dir / hashlib.sha256(pdf_data).hexdigest()
+
+    def _read(self, path: Path) -> Optional[str]:
+        try:
+            return path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _write(self, path: Path, text: str) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache PDF text: {e}")
+
+    def _evict(self, keep: Path) -> None:
+        """Remove the least recently read documents until the cache fits in `max_bytes`"""
+        documents: List[Tuple[float, int, Path]] = []
+        try:
+            for document_dir in self.cache_dir.iterdir():
+                if document_dir.is_dir():
+                    size = sum(path.stat().st_size for path in document_dir.iterdir())
+                    documents.append((document_dir.stat().st_mtime, size, document_dir))
+        except OSError as e:
+            logger.warning(f"Could not evict cached PDF text: {e}")
+            return
+        total = sum(size for _, size, _ in documents)
+        for _, size, document_dir in sorted(documents):
+            if total <= self.max_bytes:
+                break
+            if document_dir != keep:
+                shutil.rmtree(document_dir, ignore_errors=True)
+                total -= size
+
+    def page_count(self, pdf_data: bytes) -> int:
+        """
+        Return the number of pages of a PDF document.
+
+        Args:
+            pdf_data (bytes): The PDF file content.
+
+        Returns:
+            int: The number of pages.
+        """
+        path = self._document_dir(pdf_data) / "page_count"
+        cached = self._read(path)
+        if cached is not None:
+            return int(cached)
+        document = PDFDocument(PDFParser(io.BytesIO(pdf_data)))
+        count = int(resolve1(document.catalog["Pages"])["Count"])
+        self._write(path, str(count))
+        return count
+
+    def iter_pages(
+        self, pdf_data: bytes, pages: Optional[range] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Yield the text of each page, reading cached pages and extracting the others on demand.
+
+        Args:
+            pdf_data (bytes): The PDF file content.
+            pages (range, optional): 1-based page numbers to read. Default: all pages
+
+        Yields:
+            Tuple[int, str]: The page number and its text.
+        """
+        document_dir = self._document_dir(pdf_data)
+        count = self.page_count(pdf_data)
+        numbers = range(1, count + 1)
+        if pages is not None:
+            numbers = range(max(pages.start, 1), min(pages.stop, count + 1))
+        if not numbers:
+            return
+        try:
+            # The directory's mtime marks when the document was last read
+            os.utime(document_dir)
+        except OSError:
+            pass
+
+        cached = {
+            number for number in numbers if (document_dir / f"{number}.txt").exists()
+        }
+        # pdfminer yields the requested pages in document order, parsing each one lazily
+        extracted = extract_pages(
+            io.BytesIO(pdf_data),
+            page_numbers={number - 1 for number in numbers if number not in cached},
+        )
+        wrote = False
+        try:
+            for number in numbers:
+                text = None
+                if number in cached:
+                    text = self._read(document_dir / f"{number}.txt")
+                if text is None:
+                    if number in cached:
+                        # The cached page disappeared after the lookup above
+                        pending = extract_pages(
+                            io.BytesIO(pdf_data), page_numbers=[number - 1]
+                        )
+                    else:
+                        pending = extracted
+                    layout = next(pending, None)
+                    if layout is None:
+                        # The page tree has fewer pages than it declares
+                        return
+                    text = _page_text(layout)
+                    self._write(document_dir / f"{number}.txt", text)
+                    wrote = True
+                yield number, text
+        finally:
+            if wrote:
+                self._evict(keep=document_dir)
+
+    def extract_text(
+        self, pdf_data: bytes, max_tokens: int = -1, pages: Optional[range] = None
+    ) -> str:
+        """
+        Return the text of a PDF document, stopping once the token budget is reached.
+
+        Args:
+            pdf_data (bytes): The PDF file content.
+            max_tokens (int, optional): The maximum number of tokens to return. Default: -1 (no limit)
+            pages (range, optional): 1-based page numbers to read. Default: all pages
+
+        Returns:
+            str: The text of the pages, separated by blank lines.
+        """
+        texts: List[str] = []
+        tokens = 0
+        for _, text in self.iter_pages(pdf_data, pages):
+            texts.append(text)
+            if max_tokens == -1:
+                continue
+            tokens += count_tokens(text)
+            if tokens > max_tokens:
+                content = PAGE_SEPARATOR.join(texts)
+                truncated = truncate_to_tokens(content, max_tokens)
+                if len(truncated) < len(content):
+                    return truncated
+        return truncate_to_tokens(PAGE_SEPARATOR.join(texts), max_tokens)
@@ -1,20 +1,23 @@
+import asyncio
 import io
 from typing import Any, Optional
 import logging
 import os
-import tempfile
 
-import tiktoken
 from markitdown import MarkItDown  # type: ignore
 from playwright.async_api import Page
 
+from ...tokenizer import truncate_to_tokens
+from .pdf_text import PdfTextCache
+
 logger = logging.getLogger(__name__)
 
 
 class WebpageTextUtilsPlaywright:
-    def __init__(self):
+    def __init__(self, pdf_text_cache: Optional[PdfTextCache] = None):
         self._markdown_converter: Optional[Any] | None = None
         self._page_script: str = ""
+        self._pdf_text = pdf_text_cache or PdfTextCache()
 
         # Read page_script
         with open(
@@ -67,7 +70,9 @@ class WebpageTextUtilsPlaywright:
         assert isinstance(result, str)
         return result
 
-    async def get_page_markdown(self, page: Page, max_tokens: int = -1) -> str:
+    async def get_page_markdown(
+        self, page: Page, max_tokens: int = -1, pages: Optional[range] = None
+    ) -> str:
         """
         Retrieve the markdown content of the web page, limited to a specified number of tokens.
         Automatically detects and handles PDF content.
@@ -75,47 +80,39 @@ class WebpageTextUtilsPlaywright:
         Args:
             page (Page): The Playwright page object.
             max_tokens (int, optional): The maximum number of tokens to return. Default: -1 (no limit)
+            pages (range, optional): 1-based page numbers to read if the page is a PDF. Default: None (all pages)
 
         Returns:
             str: The markdown content of the page or extracted PDF content.
         """
 
         # Check if the current page is a PDF
-        is_pdf = await self._is_pdf_page(page)
-
-        if is_pdf:
-            # Extract PDF content
-            pdf_content = await self._extract_pdf_content(page)
+        if await self.is_pdf_page(page):
+            # PDF pages are extracted one by one until max_tokens is reached
+            return await self._extract_pdf_content(page, max_tokens, pages)
 
-            # Tokenize the PDF content and limit to max_tokens if needed
-            if max_tokens == -1:
-                return pdf_content
+        # Limit the text content to max_tokens
+        return truncate_to_tokens(await self.get_html_markdown(page), max_tokens)
 
-            tokenizer = tiktoken.encoding_for_model("gpt-4o")
-            tokens = tokenizer.encode(pdf_content)
-            limited_content = tokenizer.decode(tokens[:max_tokens])
+    async def get_html_markdown(self, page: Page) -> str:
+        """
+        Convert the HTML of the web page to markdown.
 
-            return limited_content
+        Args:
+            page (Page): The Playwright page object.
 
-        # Regular webpage processing
+        Returns:
+            str: The markdown content of the page.
+        """
         if self._markdown_converter is None:
             self._markdown_converter = MarkItDown()
         html = await page.evaluate("document.documentElement.outerHTML;")
         res = self._markdown_converter.convert_stream(
             io.BytesIO(html.encode("utf-8")), file_extension=".html", url=page.url
         )  # type: ignore
-        text_content = res.text_content  # type: ignore
-
-        # Tokenize the text content and limit to max_tokens
-        if max_tokens == -1:
-            return text_content
-        tokenizer = tiktoken.encoding_for_model("gpt-4o")
-        tokens = tokenizer.encode(text_content)
-        limited_text_content = tokenizer.decode(tokens[:max_tokens])
+        return res.text_content  # type: ignore
 
-        return limited_text_content
-
-    async def _is_pdf_page(self, page: Page) -> bool:
+    async def is_pdf_page(self, page: Page) -> bool:
         """Check if the current page is a PDF document.
 
         Args:
@@ -145,11 +142,15 @@ class WebpageTextUtilsPlaywright:
 
         return result
 
-    async def _extract_pdf_content(self, page: Page) -> str:
+    async def _extract_pdf_content(
+        self, page: Page, max_tokens: int = -1, pages: Optional[range] = None
+    ) -> str:
         """Extract text content from a PDF page.
 
         Args:
             page (Page): The Playwright page object.
+            max_tokens (int, optional): The maximum number of tokens to return. Default: -1 (no limit)
+            pages (range, optional): 1-based page numbers to read. Default: None (all pages)
 
         Returns:
             str: The extracted text content from the PDF.
@@ -157,32 +158,27 @@ class WebpageTextUtilsPlaywright:
         url = page.url
 
         try:
-            # Try browser-based extraction first
-            browser_text = await self._extract_pdf_browser(page)
-            if browser_text and len(browser_text) > 100:  # If we got substantial text
-                return browser_text
-
-            # If browser extraction fails, use MarkItDown
-            logger.info("Using MarkItDown for better PDF extraction...")
-
-            # Download the PDF
+            # Try browser-based extraction first; it cannot select pages
+            if pages is None:
+                browser_text = await self._extract_pdf_browser(page)
+                if (
+                    browser_text and len(browser_text) > 100
+                ):  # If we got substantial text
+                    return truncate_to_tokens(browser_text, max_tokens)
+
+            # Otherwise extract the downloaded file page by page
+            logger.info("Extracting PDF text page by page...")
             pdf_buffer = await page.context.request.get(url)
             pdf_data = await pdf_buffer.body()
 
-            # Save to a temporary file
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file_path = temp_file.name
-                temp_file.write(pdf_data)
-
-            # Use MarkItDown to extract content
-            if self._markdown_converter is None:
-                self._markdown_converter = MarkItDown()
-            result = self._markdown_converter.convert(temp_file_path)
-
-            # Clean up the temporary file
-            os.unlink(temp_file_path)
-
-            return result.text_content
+            text = await asyncio.to_thread(
+                self._pdf_text.extract_text, pdf_data, max_tokens, pages
+            )
+            if pages is None:
+                return text
+            page_count = await asyncio.to_thread(self._pdf_text.page_count, pdf_data)
+            last = min(pages.stop - 1, page_count)
+            return f"PDF pages {pages.start}-{last} of {page_count}:\n\n{text}"
 
         except Exception as e:
             logger.error(f"Error extracting PDF content: {str(e)}")
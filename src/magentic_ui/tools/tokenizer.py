@@ -0,0 +1,138 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import tiktoken
+
+DEFAULT_TOKENIZER_MODEL = "gpt-4o"
+
+# Characters per token assumed when choosing how much text to encode at first;
+# generous so that one pass is usually enough
+_CHARS_PER_TOKEN_ESTIMATE = 6
+
+_count_cache: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_count_cache_lock = threading.Lock()
+_COUNT_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(model: str = DEFAULT_TOKENIZER_MODEL) -> tiktoken.Encoding:
+    """
+    Return the tiktoken encoder for a model, loading it on first use.
+
+    Args:
+        model (str, optional): Model whose encoding is used. Default: "gpt-4o"
+
+    Returns:
+        tiktoken.Encoding: The encoder shared by all callers.
+    """
+    return tiktoken.encoding_for_model(model)
+
+
+def _encode(text: str, model: str) -> list[int]:
+    # Page text may contain special token markers such as <|endoftext|>; count them as text
+    return get_encoder(model).encode(text, disallowed_special=())
+
+
+def _find_piece_boundary(text: str, end: int) -> int:
+    """
+    Find a cut at or before `end` that leaves the tokens before it unchanged, or 0.
+
+    tiktoken splits text into pieces with a regex and applies BPE to each piece. A piece
+    never ends with a space or tab that follows a non-whitespace character, so cutting
+    right before such a space keeps every piece, and every token, before the cut.
+    """
+    i = end
+    while True:
+        i = max(text.rfind(" ", 0, i), text.rfind("\t", 0, i))
+        if i <= 0:
+            return 0
+        if not text[i - 1].isspace():
+            return i
+
+
+def _cache_key(text: str, model: str) -> Tuple[str, bytes]:
+    digest = hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+    return model, digest
+
+
+def _get_cached_count(key: Tuple[str, bytes]) -> int | None:
+    with _count_cache_lock:
+        count = _count_cache.get(key)
+        if count is not None:
+            _count_cache.move_to_end(key)
+        return count
+
+
+def _set_cached_count(key: Tuple[str, bytes], count: int) -> None:
+    with _count_cache_lock:
+        _count_cache[key] = count
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > _COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+
+
+def count_tokens(text: str, model: str = DEFAULT_TOKENIZER_MODEL) -> int:
+    """
+    Count the tokens of a text, reusing the count of identical text seen before.
+
+    Args:
+        text (str): The text to count.
+        model (str, optional): Model whose encoding is used. Default: "gpt-4o"
+
+    Returns:
+        int: The number of tokens.
+    """
+    key = _cache_key(text, model)
+    count = _get_cached_count(key)
+    if count is None:
+        count = len(_encode(text, model))
+        _set_cached_count(key, count)
+    return count
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, model: str = DEFAULT_TOKENIZER_MODEL
+) -> str:
+    """
+    Truncate a text to its first `max_tokens` tokens.
+
+    Only a prefix of the text a little longer than the budget is encoded, so truncating a
+    large page costs about as much as encoding the part that is kept. The result is the same
+    as decoding the first `max_tokens` tokens of the whole text.
+
+    Args:
+        text (str): The text to truncate.
+        max_tokens (int): Maximum number of tokens to keep. -1 keeps the whole text.
+        model (str, optional): Model whose encoding is used. Default: "gpt-4o"
+
+    Returns:
+        str: The text itself if it fits the budget, otherwise its truncated prefix.
+    """
+    if max_tokens == -1:
+        return text
+    if max_tokens <= 0:
+        return ""
+    key = _cache_key(text, model)
+    count = _get_cached_count(key)
+    if count is not None and count <= max_tokens:
+        return text
+
+    end = max_tokens * _CHARS_PER_TOKEN_ESTIMATE
+    while end < len(text):
+        cut = _find_piece_boundary(text, end)
+        if cut > 0:
+            tokens = _encode(text[:cut], model)
+            if len(tokens) > max_tokens:
+                return get_encoder(model).decode(tokens[:max_tokens])
+        end *= 2
+
+    tokens = _encode(text, model)
+    _set_cached_count(key, len(tokens))
+    if len(tokens) <= max_tokens:
+        return text
+    return get_encoder(model).decode(tokens[:max_tokens])
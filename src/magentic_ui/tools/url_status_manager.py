@@ -1,11 +1,107 @@
-from typing import Dict, List, Literal
+import functools
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Set,
+    Tuple,
+    TypeVar,
+)
 import tldextract
 from urllib.parse import urlparse
 
 URL_ALLOWED: Literal["allowed"] = "allowed"
 URL_REJECTED: Literal["rejected"] = "rejected"
+URL_BLOCKED: Literal["blocked"] = "blocked"
 
 UrlStatus = Literal["allowed", "rejected"]
+UrlDecision = Literal["allowed", "rejected", "blocked"] | None
+
+_HTTP_EQUIVALENT_SCHEMES = ("http", "https")
+
+V = TypeVar("V")
+
+
+class _ParsedUrl(NamedTuple):
+    scheme: str
+    path: str
+    subdomain: str
+    domain: str
+    suffix: str
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_url(url: str) -> _ParsedUrl:
+    """Split a URL or URL pattern into the components used for matching."""
+    # If no scheme is provided, assume http
+    if not urlparse(url).scheme:
+        url = "http://" + url
+    parsed = urlparse(url)
+    extracted = tldextract.extract(url)
+    return _ParsedUrl(
+        parsed.scheme,
+        parsed.path,
+        extracted.subdomain,
+        extracted.domain,
+        extracted.suffix,
+    )
+
+
+def _is_scheme_match(registered_scheme: str, proposed_scheme: str) -> bool:
+    # http and https are treated as the same
+    if (
+        registered_scheme in _HTTP_EQUIVALENT_SCHEMES
+        and proposed_scheme in _HTTP_EQUIVALENT_SCHEMES
+    ):
+        return True
+    return registered_scheme == proposed_scheme
+
+
+class _UrlPatternIndex(Generic[V]):
+    """
+    URL patterns indexed by host, mapping each pattern to a value.
+
+    A pattern only matches URLs with the same domain, and its subdomain and suffix must be
+    equal to the URL's when the pattern has them. Patterns are therefore bucketed by
+    (domain, suffix, subdomain), with "" standing for "any", and a lookup only probes the
+    (at most four) buckets a URL can fall in before comparing schemes and path prefixes.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, V]] = ()) -> None:
+        self._buckets: Dict[Tuple[str, str, str], Dict[str, Tuple[str, str, V]]] = {}
+        for pattern, value in patterns:
+            self.set(pattern, value)
+
+    def set(self, pattern: str, value: V) -> None:
+        parsed = _parse_url(pattern)
+        key = (parsed.domain, parsed.suffix, parsed.subdomain)
+        self._buckets.setdefault(key, {})[pattern] = (parsed.path, parsed.scheme, value)
+
+    def match(self, url: str) -> Set[V]:
+        """Return the values of all patterns matching the url."""
+        parsed = _parse_url(url)
+        keys = {
+            (parsed.domain, suffix, subdomain)
+            for suffix in (parsed.suffix, "")
+            for subdomain in (parsed.subdomain, "")
+        }
+        values: Set[V] = set()
+        for key in keys:
+            for path, scheme, value in self._buckets.get(key, {}).values():
+                if parsed.path.startswith(path) and _is_scheme_match(
+                    scheme, parsed.scheme
+                ):
+                    values.add(value)
+        return values
+
+
+class _Decision(NamedTuple):
+    blocked: bool
+    allowed: bool
+    rejected: bool
 
 
 class UrlStatusManager:
@@ -17,33 +113,63 @@ class UrlStatusManager:
     2. For remaining URLs, if no status list is defined (None), all URLs are allowed
     3. Otherwise, URL must explicitly match an allowed pattern and not match any rejected patterns
 
+    The lists are compiled into host-indexed pattern tables and the decision for each URL is
+    memoized, so repeated checks are dictionary lookups. Update the lists through
+    `set_url_status` or by assigning `url_statuses`/`url_block_list`, which keeps the tables
+    and the memo current; mutating the returned containers in place does not.
+
     Note:
         Overlapping URLs with different statuses will result in undefined behavior.
         Example: { "example.com": "allowed", "example.com/foo": "rejected" }
     """
 
-    url_statuses: Dict[str, UrlStatus] | None
-    # TODO: There's a lot of logic around url_statuses being None. Use a separate list to check if a url is explicitly blocked
-    url_block_list: List[str] | None
-
     def __init__(
         self,
         url_statuses: Dict[str, UrlStatus] | None = None,
         url_block_list: List[str] | None = None,
+        decision_cache_size: int = 4096,
     ) -> None:
         """
         Args:
             url_statuses (Dict[str, UrlStatus], optional): initial url status settings. All urls are valid if None. Default: None.
             url_block_list (List[str], optional): initial url block list. Default: None.
+            decision_cache_size (int, optional): number of per-URL decisions to memoize. Default: 4096.
         """
-        self.url_statuses = None
+        self._decide = functools.lru_cache(maxsize=decision_cache_size)(
+            self._decide_uncached
+        )
+        self.url_statuses = url_statuses
+        self.url_block_list = url_block_list
+
+    @property
+    def url_statuses(self) -> Dict[str, UrlStatus] | None:
+        return self._url_statuses
+
+    @url_statuses.setter
+    def url_statuses(self, url_statuses: Dict[str, UrlStatus] | None) -> None:
+        # TODO: There's a lot of logic around url_statuses being None. Use a separate list to check if a url is explicitly blocked
+        self._url_statuses: Dict[str, UrlStatus] | None = None
         # a little bit of a hack to make sure there are no trailing slashes, since they mess with the comparison later on
         if url_statuses is not None:
-            self.url_statuses = {
+            self._url_statuses = {
                 key.rstrip("/"): value for key, value in url_statuses.items()
             }
+        self._status_index: _UrlPatternIndex[UrlStatus] = _UrlPatternIndex(
+            (self._url_statuses or {}).items()
+        )
+        self._decide.cache_clear()
 
-        self.url_block_list = url_block_list
+    @property
+    def url_block_list(self) -> List[str] | None:
+        return self._url_block_list
+
+    @url_block_list.setter
+    def url_block_list(self, url_block_list: List[str] | None) -> None:
+        self._url_block_list = url_block_list
+        self._block_index: _UrlPatternIndex[bool] = _UrlPatternIndex(
+            (site, True) for site in url_block_list or []
+        )
+        self._decide.cache_clear()
 
     def set_url_status(self, url: str, status: UrlStatus) -> None:
         """
@@ -53,11 +179,13 @@ class UrlStatusManager:
             url (str): The website to add.
             status (UrlStatus): The status of the url. Can be either "allowed" or "rejected".
         """
-        if self.url_statuses is not None:
+        if self._url_statuses is not None:
             url = url.strip()
             # Trailing slash messes up the comparison later on
             url = url.rstrip("/")
-            self.url_statuses[url] = status
+            self._url_statuses[url] = status
+            self._status_index.set(url, status)
+            self._decide.cache_clear()
 
     def _is_url_match(self, registered_url: str, proposed_url: str) -> bool:
         """
@@ -70,45 +198,35 @@ class UrlStatusManager:
         Returns:
             bool: True if the proposed URL matches the registered URL pattern, False otherwise.
         """
-        # If no scheme is provided, assume http
-        if not urlparse(registered_url).scheme:
-            registered_url = "http://" + registered_url
-        if not urlparse(proposed_url).scheme:
-            proposed_url = "http://" + proposed_url
-
-        parsed_registered_url = urlparse(registered_url)
-        parsed_proposed_url = urlparse(proposed_url)
-        extracted_registered_url = tldextract.extract(registered_url)
-        extracted_proposed_url = tldextract.extract(proposed_url)
-
-        # if both urls have a scheme, check if they are the same (http and https are treated as the same)
-        http_equivalent_schemes = ["http", "https"]
-        if (
-            parsed_registered_url.scheme in http_equivalent_schemes
-            and parsed_proposed_url.scheme in http_equivalent_schemes
-        ):
-            pass
-        elif parsed_registered_url.scheme != parsed_proposed_url.scheme:
+        registered = _parse_url(registered_url)
+        proposed = _parse_url(proposed_url)
+
+        if not _is_scheme_match(registered.scheme, proposed.scheme):
             return False
 
         # Check each component of the URL
         # TODO: what to do about params, query, and fragment components?
-        if extracted_registered_url.subdomain:
-            if extracted_registered_url.subdomain != extracted_proposed_url.subdomain:
-                return False
-        if extracted_registered_url.domain != extracted_proposed_url.domain:
+        if registered.subdomain and registered.subdomain != proposed.subdomain:
+            return False
+        if registered.domain != proposed.domain:
             return False
-        if (
-            extracted_registered_url.suffix
-            and extracted_proposed_url.suffix != extracted_registered_url.suffix
-        ):
+        if registered.suffix and proposed.suffix != registered.suffix:
+            return False
+        if registered.path and not proposed.path.startswith(registered.path):
             return False
-        if parsed_registered_url.path:
-            if not parsed_proposed_url.path.startswith(parsed_registered_url.path):
-                return False
 
         return True
 
+    def _decide_uncached(self, url: str) -> _Decision:
+        blocked = bool(self._block_index.match(url))
+        statuses = self._status_index.match(url)
+        return _Decision(
+            blocked=blocked,
+            allowed=not blocked
+            and (self._url_statuses is None or URL_ALLOWED in statuses),
+            rejected=blocked or URL_REJECTED in statuses,
+        )
+
     def is_url_blocked(self, url: str) -> bool:
         """
         Checks if a url is explicitly blocked.
@@ -119,11 +237,7 @@ class UrlStatusManager:
         Returns:
             bool: True if the url is blocked, False otherwise.
         """
-        if self.url_block_list is None:
-            return False
-        if any(self._is_url_match(site, url) for site in self.url_block_list):
-            return True
-        return False
+        return self._decide(url).blocked
 
     def is_url_rejected(self, url: str) -> bool:
         """
@@ -135,16 +249,7 @@ class UrlStatusManager:
         Returns:
             bool: True if the url was rejected by the user, False otherwise.
         """
-        if self.is_url_blocked(url):
-            return True
-        if self.url_statuses is None:
-            return False
-        if any(
-            self._is_url_match(site, url) and self.url_statuses[site] == URL_REJECTED
-            for site in self.url_statuses
-        ):
-            return True
-        return False
+        return self._decide(url).rejected
 
     def is_url_allowed(self, url: str) -> bool:
         """
@@ -156,16 +261,30 @@ class UrlStatusManager:
         Returns:
             bool: True if the url is allowed, False otherwise.
         """
-        if self.is_url_blocked(url):
-            return False
-        if self.url_statuses is None:
-            return True
-        if not any(
-            self._is_url_match(site, url) and self.url_statuses[site] == URL_ALLOWED
-            for site in self.url_statuses
-        ):
-            return False
-        return True
+        return self._decide(url).allowed
+
+    def classify(self, urls: Iterable[str]) -> List[UrlDecision]:
+        """
+        Decides the status of many urls at once.
+
+        Args:
+            urls (Iterable[str]): The websites to check.
+
+        Returns:
+            List[UrlDecision]: For each url, "blocked" if it is blocked, "allowed" if it is allowed, "rejected" if it was rejected, or None if it needs approval.
+        """
+        decisions: List[UrlDecision] = []
+        for url in urls:
+            decision = self._decide(url)
+            if decision.blocked:
+                decisions.append(URL_BLOCKED)
+            elif decision.allowed:
+                decisions.append(URL_ALLOWED)
+            elif decision.rejected:
+                decisions.append(URL_REJECTED)
+            else:
+                decisions.append(None)
+        return decisions
 
     def get_allowed_sites(self) -> List[str] | None:
         """
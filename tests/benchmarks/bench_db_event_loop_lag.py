@@ -0,0 +1,140 @@
+"""
+Benchmark: event-loop lag while many runs persist streamed messages.
+
+Simulates N concurrent runs that each save M messages the way
+`WebSocketManager._save_message` does (look up the run, then upsert a `Message`),
+once through the blocking `DatabaseManager.get`/`upsert` calls and once through the
+async `aget`/`aupsert` methods. A monitor coroutine measures how late the event loop
+wakes up from short sleeps, which is the latency every other connected run observes.
+
+Usage:
+    python tests/benchmarks/bench_db_event_loop_lag.py [--runs 50] [--messages 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Tuple
+
+from sqlmodel import SQLModel
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Message, Run, Session
+from magentic_ui.backend.web.managers import WebSocketManager
+
+TICK = 0.005
+
+
+async def monitor_lag(stop: asyncio.Event, samples: List[float]) -> None:
+    """Record how late each `TICK` sleep wakes up, in milliseconds."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        samples.append((loop.time() - start - TICK) * 1000)
+
+
+def create_runs(db: DatabaseManager, n_runs: int) -> List[int]:
+    session = db.upsert(Session(user_id="bench", name="bench"), return_json=False)
+    run_ids: List[int] = []
+    for _ in range(n_runs):
+        run = db.upsert(
+            Run(
+                session_id=session.data.id,
+                user_id="bench",
+                task=None,
+                team_result=None,
+            ),
+            return_json=False,
+        )
+        run_ids.append(run.data.id)
+    return run_ids
+
+
+async def blocking_run(db: DatabaseManager, run_id: int, n_messages: int) -> None:
+    for i in range(n_messages):
+        run = db.get(Run, filters={"id": run_id}, return_json=False).data[0]
+        db.upsert(
+            Message(
+                created_at=datetime.now(),
+                session_id=run.session_id,
+                run_id=run_id,
+                config={"source": "bench", "content": f"message {i}"},
+                user_id=run.user_id,
+            )
+        )
+        await asyncio.sleep(0)
+
+
+async def async_run(manager: WebSocketManager, run_id: int, n_messages: int) -> None:
+    from autogen_agentchat.messages import TextMessage
+
+    for i in range(n_messages):
+        await manager._save_message(  # pyright: ignore[reportPrivateUsage]
+            run_id, TextMessage(source="bench", content=f"message {i}")
+        )
+
+
+async def measure(coros: List, label: str) -> Tuple[str, float, List[float]]:
+    samples: List[float] = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(monitor_lag(stop, samples))
+    start = time.perf_counter()
+    await asyncio.gather(*coros)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor
+    return label, elapsed, samples
+
+
+def report(label: str, elapsed: float, samples: List[float]) -> None:
+    samples = samples or [0.0]
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:>10}: total {elapsed:6.2f}s | loop lag mean {statistics.mean(samples):7.2f}ms "
+        f"p99 {p99:7.2f}ms max {max(samples):7.2f}ms ({len(samples)} ticks)"
+    )
+
+
+async def main(n_runs: int, n_messages: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(
+            engine_uri=f"sqlite:///{Path(tmp) / 'bench.db'}", base_dir=Path(tmp)
+        )
+        SQLModel.metadata.create_all(db.engine)
+        manager = WebSocketManager(
+            db_manager=db,
+            internal_workspace_root=Path(tmp),
+            external_workspace_root=Path(tmp),
+            inside_docker=False,
+            config={},
+        )
+        run_ids = create_runs(db, n_runs)
+        print(f"{n_runs} concurrent runs x {n_messages} messages each")
+
+        report(
+            *await measure(
+                [blocking_run(db, run_id, n_messages) for run_id in run_ids],
+                "blocking",
+            )
+        )
+        report(
+            *await measure(
+                [async_run(manager, run_id, n_messages) for run_id in run_ids],
+                "async",
+            )
+        )
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.messages))
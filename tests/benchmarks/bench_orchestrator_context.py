@@ -0,0 +1,109 @@
+"""
+Benchmark: building the orchestrator's token-limited context over a long run.
+
+Simulates a run of N execution steps. Each step appends an agent response and an
+orchestrator instruction to the message history, then builds the context sent to the
+model (system message, converted history, progress ledger prompt) and trims it to the
+token limit. Times:
+
+- legacy: `thread_to_context` over the whole history, then re-adding every message to a
+  `TokenLimitedChatCompletionContext`, which recounts the tokens of the whole context
+  after each message it drops
+- incremental: `ThreadContext`, which converts and counts each message once
+
+Token counts use the whitespace tokenizer of `ReplayChatCompletionClient`, which is much
+cheaper than a real tokenizer, so the legacy times are a lower bound. The legacy run
+grows with the cube of the number of steps and takes about 20 minutes at the default
+500 steps; use `--steps 100` for a quick comparison.
+
+Usage:
+    python tests/benchmarks/bench_orchestrator_context.py [--steps 500] [--token-limit 20000]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+
+from autogen_agentchat.messages import BaseAgentEvent, BaseChatMessage, TextMessage
+from autogen_core.model_context import TokenLimitedChatCompletionContext
+from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.teams.orchestrator._thread_context import ThreadContext
+from magentic_ui.utils import thread_to_context
+
+AGENT = "Orchestrator"
+AGENTS = ["web_surfer", "coder_agent", "file_surfer"]
+
+
+def make_step(rng: random.Random, step: int) -> List[BaseChatMessage | BaseAgentEvent]:
+    agent = rng.choice(AGENTS)
+    response = " ".join(f"r{step}x{i}" for i in range(rng.randint(50, 400)))
+    instruction = " ".join(f"i{step}x{i}" for i in range(rng.randint(10, 60)))
+    return [
+        TextMessage(content=instruction, source=AGENT),
+        TextMessage(content=response, source=agent),
+    ]
+
+
+def prompt(step: int) -> UserMessage:
+    return UserMessage(
+        content=" ".join(f"p{step}x{i}" for i in range(300)), source=AGENT
+    )
+
+
+async def run_legacy(steps: int, token_limit: int) -> float:
+    rng = random.Random(0)
+    client = ReplayChatCompletionClient([])
+    model_context = TokenLimitedChatCompletionContext(client, token_limit=token_limit)
+    history: List[BaseChatMessage | BaseAgentEvent] = []
+    start = time.perf_counter()
+    for step in range(steps):
+        history.extend(make_step(rng, step))
+        context: List[LLMMessage] = [SystemMessage(content="system message")]
+        context.extend(thread_to_context(history, agent_name=AGENT))
+        context.append(prompt(step))
+        await model_context.clear()
+        for message in context:
+            await model_context.add_message(message)
+        await model_context.get_messages()
+    return time.perf_counter() - start
+
+
+def run_incremental(steps: int, token_limit: int) -> float:
+    rng = random.Random(0)
+    client = ReplayChatCompletionClient([])
+    thread_context = ThreadContext(client, AGENT, token_limit=token_limit)
+    history: List[BaseChatMessage | BaseAgentEvent] = []
+    start = time.perf_counter()
+    for step in range(steps):
+        history.extend(make_step(rng, step))
+        context: List[LLMMessage] = [SystemMessage(content="system message")]
+        context.extend(thread_context.sync(history))
+        context.append(prompt(step))
+        thread_context.trim(context)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--token-limit", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy = asyncio.run(run_legacy(args.steps, args.token_limit))
+    incremental = run_incremental(args.steps, args.token_limit)
+    print(f"{args.steps} steps, token limit {args.token_limit}")
+    print(
+        f"legacy:      {legacy:8.3f}s total  {legacy / args.steps * 1000:8.3f}ms/step"
+    )
+    print(
+        f"incremental: {incremental:8.3f}s total  "
+        f"{incremental / args.steps * 1000:8.3f}ms/step  ({legacy / incremental:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
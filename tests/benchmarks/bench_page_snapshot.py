@@ -0,0 +1,114 @@
+"""
+Benchmark: per-step page state collection in the WebSurfer.
+
+Loads the fake page from `tests/test_playwright_controller.py` and collects the state
+the WebSurfer needs for one step, once with the individual getters used before
+(`get_interactive_rects` twice, `get_visual_viewport`, `get_screenshot`,
+`get_focused_rect_id`, `get_visible_text`, `get_page_metadata`) and once with
+`PlaywrightController.snapshot`. A local browser answers in microseconds, so every
+awaited page call can be delayed by `--latency-ms` to emulate the round-trip to the
+remote Docker browser.
+
+Usage:
+    python tests/benchmarks/bench_page_snapshot.py [--steps 20] [--latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+from playwright.async_api import Page, async_playwright
+
+from magentic_ui.tools import PlaywrightController
+
+
+def load_fake_html() -> str:
+    path = Path(__file__).resolve().parents[1] / "test_playwright_controller.py"
+    spec = importlib.util.spec_from_file_location("test_playwright_controller", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.FAKE_HTML
+
+
+class LatencyPage:
+    """Page proxy that delays every awaited call by a fixed round-trip time."""
+
+    def __init__(self, page: Page, latency: float):
+        self._page = page
+        self._latency = latency
+        self.round_trips = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._page, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        async def delayed(*args: Any, **kwargs: Any) -> Any:
+            self.round_trips += 1
+            await asyncio.sleep(self._latency)
+            return await attr(*args, **kwargs)
+
+        return delayed
+
+
+async def getters_step(pc: PlaywrightController, page: Any) -> None:
+    assert await pc.get_interactive_rects(page) is not None
+    await pc.get_interactive_rects(page)
+    await pc.get_visual_viewport(page)
+    await pc.get_screenshot(page)
+    await pc.get_focused_rect_id(page)
+    await pc.get_visible_text(page)
+    await pc.get_page_metadata(page)
+
+
+async def snapshot_step(pc: PlaywrightController, page: Any) -> None:
+    await pc.snapshot(page)
+
+
+async def measure(
+    label: str,
+    step: Callable[[PlaywrightController, Any], Awaitable[None]],
+    page: LatencyPage,
+    n_steps: int,
+) -> None:
+    pc = PlaywrightController(viewport_width=800, viewport_height=600)
+    await step(pc, page)  # warm up: page setup and script injection
+    page.round_trips = 0
+    timings: List[float] = []
+    for _ in range(n_steps):
+        start = time.perf_counter()
+        await step(pc, page)
+        timings.append((time.perf_counter() - start) * 1000)
+    print(
+        f"{label:>8}: mean {statistics.mean(timings):7.2f}ms "
+        f"median {statistics.median(timings):7.2f}ms | "
+        f"{page.round_trips / n_steps:.1f} page calls per step"
+    )
+
+
+async def main(n_steps: int, latency_ms: float) -> None:
+    html = load_fake_html()
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        context = await browser.new_context()
+        print(f"{n_steps} steps, {latency_ms}ms emulated round-trip")
+        for label, step in (("getters", getters_step), ("snapshot", snapshot_step)):
+            page = await context.new_page()
+            await page.set_content(html)
+            await measure(label, step, LatencyPage(page, latency_ms / 1000), n_steps)
+            await page.close()
+        await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.steps, args.latency_ms))
@@ -0,0 +1,118 @@
+"""
+Benchmark: parsing a large batch of decay chains for algorithm cards.
+
+Generates N random decay chains, such as
+`psi(4260) -> pi+ pi- [J/psi -> mu+ mu-] [eta -> gamma gamma]`, and for each one builds
+the particle tree and the parts of the algorithm that depend on it: final state
+classification, variable names, PID conditions and MC truth saving code. Times:
+
+- legacy: every `Particle` re-reads and parses `Particle_bes3.json`, as before
+- index: `Particle` looks its attributes up in the shared `ParticleIndex`
+
+Usage:
+    python tests/benchmarks/bench_particle_index.py [--chains 2000] [--repeat 3]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Callable, List
+
+from besiii.modules.tools import tools_algorithm
+from besiii.modules.tools.tools_algorithm import (
+    Particle,
+    ParticleData,
+    generate_PID_condition,
+    generate_TruthSaveInfo_in_execute,
+    get_final_state,
+    get_final_state_VarNames,
+    get_particles_from_decay_chain,
+    here,
+)
+
+MOTHERS = ["J/psi", "psi(2S)", "psi(3770)", "psi(4260)"]
+STABLE = ["pi+ pi-", "K+ K-", "p+ anti-p-", "gamma", "pi+ pi- gamma"]
+INTERMEDIATE = [
+    "[pi0 -> gamma gamma]",
+    "[eta -> gamma gamma]",
+    "[phi -> K+ K-]",
+    "[K_S0 -> pi+ pi-]",
+    "[J/psi -> mu+ mu-]",
+    "[J/psi -> e+ e-]",
+    "[omega -> pi+ pi- [pi0 -> gamma gamma]]",
+    "[eta' -> pi+ pi- [eta -> gamma gamma]]",
+]
+
+
+class LegacyParticle(Particle):
+    """Particle reading the database file in its constructor, as before the index"""
+
+    __slots__ = ()
+
+    def get_particle_by_name(self, name: str) -> bool:
+        with open(f"{here}/Particle_bes3.json", "r") as f:
+            database = json.load(f)
+        if name not in database:
+            return False
+        self._data = ParticleData.from_entry(database[name])
+        return True
+
+
+def make_chains(n_chains: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    chains: List[str] = []
+    for _ in range(n_chains):
+        daughters = [rng.choice(STABLE)]
+        daughters += rng.sample(INTERMEDIATE, rng.randint(1, 3))
+        chains.append(f"{rng.choice(MOTHERS)} -> {' '.join(daughters)}")
+    return chains
+
+
+def generate(chains: List[str]) -> int:
+    n_particles = 0
+    for chain in chains:
+        particles = get_particles_from_decay_chain(chain)
+        charged, neutral, intermediate = get_final_state(particles)
+        charged_names, neutral_names, _ = get_final_state_VarNames(
+            charged, neutral, intermediate
+        )
+        generate_PID_condition(particles)
+        generate_TruthSaveInfo_in_execute(particles, charged_names, neutral_names)
+        n_particles += len(particles)
+    return n_particles
+
+
+def timed(fn: Callable[[], object], repeat: int) -> float:
+    times: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chains", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chains = make_chains(args.chains)
+    n_particles = generate(chains)
+
+    tools_algorithm.Particle = LegacyParticle
+    try:
+        legacy = timed(lambda: generate(chains), args.repeat)
+    finally:
+        tools_algorithm.Particle = Particle
+    index = timed(lambda: generate(chains), args.repeat)
+
+    print(f"{args.chains} decay chains, {n_particles} particles")
+    print(f"legacy: {legacy * 1000:9.1f}ms")
+    print(f"index:  {index * 1000:9.1f}ms  ({legacy / index:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
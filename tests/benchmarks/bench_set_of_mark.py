@@ -0,0 +1,128 @@
+"""
+Benchmark: set-of-mark annotation on pages with many interactive elements.
+
+Builds a synthetic page with N interactive regions spread over a page three viewports
+high (about a third of them visible) on a 1440x1440 screenshot, then times:
+
+- classification: the previous per-rectangle loop with list-membership dedup vs the
+  NumPy classification in `_classify_rects`
+- annotation: `add_set_of_mark` drawing on the full screenshot and then scaling to
+  the size sent to the model (as before) vs drawing directly at that size
+
+Usage:
+    python tests/benchmarks/bench_set_of_mark.py [--elements 5000] [--repeat 5]
+"""
+
+import argparse
+import io
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+import PIL.Image
+
+from magentic_ui.agents.web_surfer._set_of_mark import (
+    _classify_rects,  # pyright: ignore[reportPrivateUsage]
+    add_set_of_mark,
+)
+from magentic_ui.tools.playwright.types import DOMRectangle, InteractiveRegion
+
+VIEWPORT = 1440
+MLM_SIZE = (1224, 765)
+
+
+def make_page(n_elements: int, seed: int = 0) -> Dict[str, InteractiveRegion]:
+    rng = random.Random(seed)
+    rois: Dict[str, InteractiveRegion] = {}
+    for i in range(n_elements):
+        left = rng.uniform(0, VIEWPORT - 120)
+        top = rng.uniform(-VIEWPORT, 2 * VIEWPORT)
+        width, height = rng.uniform(20, 120), rng.uniform(10, 40)
+        rect = DOMRectangle(
+            x=left,
+            y=top,
+            width=width,
+            height=height,
+            top=top,
+            right=left + width,
+            bottom=top + height,
+            left=left,
+        )
+        rois[str(i + 10)] = InteractiveRegion(
+            tag_name=rng.choice(["a", "button", "input, type=text", "option"]),
+            role="link",
+            aria_name=f"element {i}",
+            v_scrollable=False,
+            rects=[rect],
+        )
+    return rois
+
+
+def legacy_classify(
+    rois: Dict[str, InteractiveRegion], width: int, height: int
+) -> Tuple[List[str], List[str], List[str]]:
+    visible: List[str] = []
+    above: List[str] = []
+    below: List[str] = []
+    for original_id, roi in rois.items():
+        if roi.get("tag_name") == "option" or roi.get("tag_name") == "input, type=file":
+            if original_id not in visible:
+                visible.append(original_id)
+            continue
+        for rect in roi["rects"]:
+            if not rect or rect["width"] * rect["height"] == 0:
+                continue
+            mid = (
+                (rect["right"] + rect["left"]) / 2.0,
+                (rect["top"] + rect["bottom"]) / 2.0,
+            )
+            if 0 <= mid[0] < width:
+                if mid[1] < 0 and original_id not in above:
+                    above.append(original_id)
+                elif mid[1] >= height and original_id not in below:
+                    below.append(original_id)
+                elif 0 <= mid[1] < height and original_id not in visible:
+                    visible.append(original_id)
+    return visible, above, below
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(n_elements: int, repeat: int) -> None:
+    rois = make_page(n_elements)
+    buffer = io.BytesIO()
+    PIL.Image.new("RGB", (VIEWPORT, VIEWPORT), color="white").save(buffer, "PNG")
+    screenshot = buffer.getvalue()
+    print(f"{n_elements} interactive elements, median of {repeat} runs")
+
+    legacy = timeit(lambda: legacy_classify(rois, VIEWPORT, VIEWPORT), repeat)
+    vectorized = timeit(lambda: _classify_rects(rois, VIEWPORT, VIEWPORT), repeat)
+    print(f"classify  legacy loop {legacy:8.2f}ms | numpy {vectorized:8.2f}ms")
+
+    def full_size() -> None:
+        comp = add_set_of_mark(screenshot, rois, use_sequential_ids=True)[0]
+        comp.resize(MLM_SIZE)
+
+    def scaled() -> None:
+        add_set_of_mark(screenshot, rois, use_sequential_ids=True, draw_size=MLM_SIZE)
+
+    print(
+        f"annotate  full size   {timeit(full_size, repeat):8.2f}ms | "
+        f"draw_size {timeit(scaled, repeat):8.2f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.elements, args.repeat)
@@ -0,0 +1,141 @@
+"""
+Benchmark: URL policy checks against a large allow list.
+
+Registers N allowed domains (plus a few rejected and blocked patterns) and times the
+navigation check the WebSurfer runs (`is_url_blocked`, `is_url_allowed`,
+`is_url_rejected`) over a stream of URLs, once with the previous linear scan over every
+pattern and once with the compiled `UrlStatusManager`. The legacy scan is slow, so it
+only checks `--legacy-urls` of the URLs.
+
+Usage:
+    python tests/benchmarks/bench_url_status.py [--domains 5000] [--urls 20000]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+import tldextract
+
+from magentic_ui.tools.url_status_manager import (
+    URL_ALLOWED,
+    URL_REJECTED,
+    UrlStatus,
+    UrlStatusManager,
+)
+
+
+def legacy_is_url_match(registered_url: str, proposed_url: str) -> bool:
+    if not urlparse(registered_url).scheme:
+        registered_url = "http://" + registered_url
+    if not urlparse(proposed_url).scheme:
+        proposed_url = "http://" + proposed_url
+    registered, proposed = urlparse(registered_url), urlparse(proposed_url)
+    extracted_registered = tldextract.extract(registered_url)
+    extracted_proposed = tldextract.extract(proposed_url)
+    web = ("http", "https")
+    if not (registered.scheme in web and proposed.scheme in web):
+        if registered.scheme != proposed.scheme:
+            return False
+    if (
+        extracted_registered.subdomain
+        and extracted_registered.subdomain != extracted_proposed.subdomain
+    ):
+        return False
+    if extracted_registered.domain != extracted_proposed.domain:
+        return False
+    if (
+        extracted_registered.suffix
+        and extracted_proposed.suffix != extracted_registered.suffix
+    ):
+        return False
+    return proposed.path.startswith(registered.path)
+
+
+def legacy_check(
+    url_statuses: Dict[str, UrlStatus], block_list: List[str], url: str
+) -> bool:
+    if any(legacy_is_url_match(site, url) for site in block_list):
+        return False
+    if any(
+        legacy_is_url_match(site, url) and status == URL_ALLOWED
+        for site, status in url_statuses.items()
+    ):
+        return True
+    return any(
+        legacy_is_url_match(site, url) and status == URL_REJECTED
+        for site, status in url_statuses.items()
+    )
+
+
+def make_policy(n_domains: int, rng: random.Random) -> Dict[str, UrlStatus]:
+    statuses: Dict[str, UrlStatus] = {
+        f"site{i}.{rng.choice(['edu', 'org', 'ac.uk'])}": URL_ALLOWED
+        for i in range(n_domains)
+    }
+    for i in range(0, n_domains, 100):
+        statuses[f"https://private.site{i}.org/admin"] = URL_REJECTED
+    return statuses
+
+
+def make_urls(n_urls: int, n_domains: int, rng: random.Random) -> List[str]:
+    # Navigation revisits pages, so draw from a limited set of distinct URLs
+    distinct = [
+        f"https://{rng.choice(['', 'www.', 'docs.'])}site{rng.randrange(n_domains * 2)}"
+        f".{rng.choice(['edu', 'org', 'ac.uk'])}/page/{rng.randrange(20)}"
+        for _ in range(max(1, n_urls // 10))
+    ]
+    return [rng.choice(distinct) for _ in range(n_urls)]
+
+
+def per_check_us(fn: Callable[[str], object], urls: List[str]) -> float:
+    start = time.perf_counter()
+    for url in urls:
+        fn(url)
+    return (time.perf_counter() - start) / len(urls) * 1e6
+
+
+def main(n_domains: int, n_urls: int, legacy_urls: int) -> None:
+    rng = random.Random(0)
+    url_statuses = make_policy(n_domains, rng)
+    block_list = ["localhost", "127.0.0.1", "file://"]
+    urls = make_urls(n_urls, n_domains, rng)
+    print(f"{len(url_statuses)} patterns, {len(urls)} checks")
+
+    legacy = per_check_us(
+        lambda url: legacy_check(url_statuses, block_list, url), urls[:legacy_urls]
+    )
+
+    start = time.perf_counter()
+    manager = UrlStatusManager(url_statuses=url_statuses, url_block_list=block_list)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def compiled_check(url: str) -> bool:
+        return (
+            not manager.is_url_blocked(url)
+            and manager.is_url_allowed(url)
+            or manager.is_url_rejected(url)
+        )
+
+    cold = per_check_us(compiled_check, urls[: len(urls) // 10])
+    warm = per_check_us(compiled_check, urls)
+    start = time.perf_counter()
+    manager.classify(urls)
+    bulk = (time.perf_counter() - start) / len(urls) * 1e6
+
+    print(f"legacy scan      {legacy:12.2f}us per check")
+    print(f"compiled (build) {build_ms:12.2f}ms")
+    print(f"compiled cold    {cold:12.2f}us per check")
+    print(f"compiled warm    {warm:12.2f}us per check")
+    print(f"classify         {bulk:12.2f}us per url")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", type=int, default=5000)
+    parser.add_argument("--urls", type=int, default=20000)
+    parser.add_argument("--legacy-urls", type=int, default=20)
+    args = parser.parse_args()
+    main(args.domains, args.urls, args.legacy_urls)
@@ -0,0 +1,126 @@
+import random
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pytest
+
+from besiii.modules.tools import batch_cards, mapping_json
+from besiii.modules.tools.tools_algorithm import (
+    count_final_state,
+    generate_nested_condition,
+    get_final_state,
+    get_particles_from_decay_chain,
+)
+
+CHAINS = [
+    "psi(4260) -> pi+ pi- [J/psi -> mu+ mu-]",
+    "psi(2S) -> pi+ pi- [J/psi -> e+ e-]",
+    "J/psi -> gamma [eta' -> pi+ pi- [eta -> gamma gamma]]",
+    "psi(3770) -> [phi -> K+ K-] [eta -> gamma gamma]",
+]
+
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):  # type: ignore
+        return cls(2025, 1, 2, 3, 4, 5)
+
+
+@pytest.fixture(autouse=True)
+def fixed_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mapping_json, "datetime", FixedDatetime)
+    monkeypatch.setattr(batch_cards, "datetime", FixedDatetime)
+
+
+def make_specs(n: int) -> List[Dict[str, Dict[str, Any]]]:
+    specs: List[Dict[str, Dict[str, Any]]] = []
+    for i in range(n):
+        chain = CHAINS[i % len(CHAINS)]
+        spec: Dict[str, Dict[str, Any]] = {
+            "algorithm": {
+                "AlgorithmName": f"Channel{i}",
+                "DecayChain": chain,
+                "Ecms_value": 4.26,
+                "ConstrainedResonanceList": ["J/psi"],
+            },
+            "joboptions": {
+                "AlgorithmName": f"Channel{i}",
+                "DecayChain": chain,
+                "Decay_type": "specific",
+                "DecayCard_Path": f"channel{i}.dec",
+                "Run_Id": "36398-36588",
+                "Energy": 3.686,
+                "is_res": "psip",
+                "submit_exmc": True,
+            },
+        }
+        if i % 2:
+            spec["draw"] = {
+                "dataFilePath": f"/data/channel{i}_*.root",
+                "variable": [{"name": "Mass", "nBins": 100, "low": 3.0, "up": 3.2}],
+            }
+            spec["tmva"] = {"sig_path": "sig.root", "bkg_path": "bkg.root"}
+        if i % 3 == 0:
+            spec["fom"] = {
+                "dataFilePath": "data.root",
+                "exmcFilePath": "exmc.root",
+                "variable": [{"name": "Mass"}],
+            }
+        specs.append(spec)
+    return specs
+
+
+def sequential(specs: List[Dict[str, Dict[str, Any]]]) -> List[Dict[str, str]]:
+    tools = {
+        "algorithm": mapping_json.create_AlgorithmCard,
+        "joboptions": mapping_json.create_JobOptionsCard,
+        "draw": mapping_json.create_DrawCard,
+        "fom": mapping_json.create_FoMCard,
+        "tmva": mapping_json.create_TMVACard,
+    }
+    results: List[Dict[str, str]] = []
+    for spec in specs:
+        results.append(
+            {
+                card_type: tools[card_type](**spec[card_type])
+                for card_type in batch_cards.CARD_TYPES
+                if card_type in spec
+            }
+        )
+    return results
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_batch_matches_sequential_tools(max_workers: int) -> None:
+    specs = make_specs(40)
+    random.seed(0)
+    expected = sequential(specs)
+    random.seed(0)
+    assert batch_cards.generate_cards(specs, max_workers=max_workers) == expected
+
+
+def test_unknown_card_type() -> None:
+    with pytest.raises(ValueError):
+        batch_cards.generate_cards([{"algorithms": {}}])
+
+
+def test_memoized_helpers_match_particle_tree() -> None:
+    for chain in CHAINS:
+        particles = get_particles_from_decay_chain(chain)
+        charged, neutral, intermediate = get_final_state(particles)
+        assert count_final_state(chain) == (
+            len(charged),
+            len(neutral),
+            len(intermediate),
+        )
+        deepest = particles[-1]
+        expected = f"(*iter_mc)->particleProperty()=={deepest.mcid}"
+        mother, depth = deepest.mother, 0
+        while mother is not None:
+            expected += (
+                " && ((*iter_mc)->mother())"
+                + ".mother()" * depth
+                + f".particleProperty()=={mother.mcid}"
+            )
+            mother, depth = mother.mother, depth + 1
+        assert generate_nested_condition(deepest) == expected
@@ -0,0 +1,96 @@
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from magentic_ui.tools import bing_search
+from magentic_ui.tools.bing_search import SearchCache, get_bing_search_results
+
+SERP = "\n".join(
+    [
+        "# Results",
+        "[First result](https://example.com/first)",
+        "[Second result](https://example.com/second)",
+        "[Not a web page](mailto:someone@example.com)",
+    ]
+)
+
+
+@pytest.fixture
+def extracted(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> List[str]:
+    """Replace page loading with canned markdown and record the loaded URLs"""
+    urls: List[str] = []
+
+    async def fake_extract(url: str) -> tuple[str, str]:
+        urls.append(url)
+        if "bing.com" in url:
+            return url, SERP
+        if url.endswith("second"):
+            return url, bing_search.EXTRACTION_ERROR
+        return url, f"content of {url}"
+
+    monkeypatch.setattr(bing_search, "extract_page_markdown", fake_extract)
+    monkeypatch.setattr(bing_search, "_cache", SearchCache(tmp_path / "cache"))
+    return urls
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache(extracted: List[str]):
+    """Test that a repeated search loads no pages and failed pages are retried"""
+    first = await get_bing_search_results("query", max_tokens_per_page=-1)
+    assert [link["url"] for link in first.links] == [
+        "https://example.com/first",
+        "https://example.com/second",
+    ]
+    assert first.page_contents == {
+        "https://example.com/first": "content of https://example.com/first"
+    }
+    assert len(extracted) == 3
+
+    second = await get_bing_search_results("query", max_tokens_per_page=-1)
+    assert second == first
+    # Only the page that failed to extract is loaded again
+    assert extracted[3:] == ["https://example.com/second"]
+
+    await get_bing_search_results("other query", max_tokens_per_page=-1)
+    assert len(extracted) == 7
+
+    await get_bing_search_results("query", max_tokens_per_page=-1, use_cache=False)
+    assert len(extracted) == 10
+
+
+def test_cache_entries_expire(tmp_path: Path):
+    """Test that entries are keyed on (query, url) and dropped after the ttl"""
+    cache = SearchCache(tmp_path, ttl=60)
+    cache.set("query", "https://example.com", "markdown")
+    assert cache.get("query", "https://example.com") == "markdown"
+    assert cache.get("other", "https://example.com") is None
+
+    cache.ttl = -1
+    assert cache.get("query", "https://example.com") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_sweep_removes_expired_and_oldest(tmp_path: Path):
+    """Test that expired entries are removed on open and the entry count is capped"""
+    cache = SearchCache(tmp_path, ttl=60, max_entries=20)
+    for i in range(5):
+        cache.set("stale", f"https://example.com/{i}", "markdown")
+    for path in tmp_path.iterdir():
+        os.utime(path, (0, 0))
+
+    reopened = SearchCache(tmp_path, ttl=60, max_entries=20)
+    assert reopened.get("fresh", "https://example.com") is None
+    assert list(tmp_path.iterdir()) == []
+
+    for i in range(30):
+        reopened.set("fresh", f"https://example.com/{i}", "markdown")
+        os.utime(
+            reopened._path("fresh", f"https://example.com/{i}"),
+            (i, time.time() - 50 + i),
+        )
+    assert len(list(tmp_path.iterdir())) <= 20 + 20 // 10
+    assert reopened.get("fresh", "https://example.com/29") == "markdown"
+    assert reopened.get("fresh", "https://example.com/0") is None
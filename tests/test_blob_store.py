@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import List
+
+import PIL.Image
+import pytest
+from autogen_agentchat.messages import MultiModalMessage
+from autogen_core import Image
+
+from magentic_ui.backend.utils.blob_store import BLOB_URL_PREFIX, BlobStore
+
+
+def test_offload_and_resolve_images(tmp_path: Path):
+    """Test that images are stored once by content hash and restored unchanged"""
+    store = BlobStore(tmp_path / "blobs")
+    screenshot = Image.from_pil(PIL.Image.new("RGB", (64, 64), color="red"))
+    message = MultiModalMessage(source="web_surfer", content=["page", screenshot])
+    state = {
+        "message_history": [message.dump(), message.dump()],
+        "not_an_image": {"data": "plain text"},
+    }
+
+    offloaded = store.offload_images(state)
+    refs = [m["content"][1] for m in offloaded["message_history"]]
+    assert refs[0] == refs[1]
+    assert refs[0]["url"] == BLOB_URL_PREFIX + refs[0]["blob_ref"]
+    assert offloaded["not_an_image"] == {"data": "plain text"}
+    # Identical screenshots are stored once
+    assert len([p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]) == 1
+
+    resolved = store.resolve_images(offloaded)
+    assert resolved == state
+    loaded = MultiModalMessage.load(resolved["message_history"][0])
+    assert isinstance(loaded.content[1], Image)
+
+
+def test_offload_remembers_digests(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that images offloaded before are not decoded, hashed and stored again"""
+    store = BlobStore(tmp_path / "blobs", memo_bytes=200_000)
+    blue = Image.from_pil(PIL.Image.new("RGB", (64, 64), color="blue")).to_base64()
+    green = Image.from_pil(PIL.Image.new("RGB", (64, 64), color="green")).to_base64()
+    first = store.offload_images({"data": blue})
+
+    calls: List[bytes] = []
+    put = store.put
+    monkeypatch.setattr(store, "put", lambda data: calls.append(data) or put(data))
+    assert store.offload_images([{"data": blue}]) == [first]
+    assert calls == []
+
+    # Strings that do not fit in the memo are always hashed
+    store.memo_bytes = len(green) - 1
+    store.offload_images({"data": green})
+    store.offload_images({"data": green})
+    assert len(calls) == 2
@@ -0,0 +1,187 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+from magentic_ui.tools.playwright.browser import (
+    BrowserPool,
+    PlaywrightBrowser,
+    PooledPlaywrightBrowser,
+)
+
+
+class FakeContainerBrowser(PlaywrightBrowser):
+    """Browser backed by a fake container, so the pool can be tested without Docker"""
+
+    def __init__(self, fail_reset: bool = False):
+        super().__init__()
+        self.running = False
+        self.starts = 0
+        self.resets = 0
+        self.fail_reset = fail_reset
+        self._context: Any = None
+
+    async def _start(self) -> None:
+        self.starts += 1
+        self.running = True
+        self._context = object()
+
+    async def _close(self) -> None:
+        self.running = False
+
+    async def reset_context(self) -> None:
+        if self.fail_reset:
+            raise RuntimeError("browser disconnected")
+        self.resets += 1
+        self._context = object()
+
+    @property
+    def browser_context(self) -> Any:
+        return self._context
+
+
+class FakeBackend:
+    def __init__(self, **kwargs: Any):
+        self.kwargs = kwargs
+        self.browsers: List[FakeContainerBrowser] = []
+
+    def __call__(self) -> FakeContainerBrowser:
+        browser = FakeContainerBrowser(**self.kwargs)
+        self.browsers.append(browser)
+        return browser
+
+
+async def warm_pool(pool: BrowserPool) -> None:
+    await pool.start()
+    await asyncio.sleep(0)
+    while pool.stats["starting"]:
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_lease_is_prestarted_and_context_reset_on_return():
+    """Test that leases come from warm browsers and are reset before reuse"""
+    backend = FakeBackend()
+    pool = BrowserPool(backend, size=1)
+    await warm_pool(pool)
+    assert pool.stats["idle"] == 1
+
+    lease = await pool.acquire()
+    assert isinstance(lease, PooledPlaywrightBrowser)
+    browser = backend.browsers[0]
+    assert lease.browser is browser and browser.running
+    first_context = lease.browser_context
+    async with lease:
+        assert browser.starts == 1
+    assert browser.resets == 1 and browser.running
+    with pytest.raises(RuntimeError):
+        lease.browser_context
+
+    await warm_pool(pool)
+    second = await pool.acquire()
+    assert second.browser is browser
+    assert second.browser_context is not first_context
+    assert pool.stats["warm_leases"] == 2
+    assert pool.stats["cold_leases"] == 0
+
+    await second.__aexit__(None, None, None)
+    await pool.close()
+    assert not any(b.running for b in backend.browsers)
+
+
+@pytest.mark.asyncio
+async def test_cold_start_when_pool_is_empty():
+    """Test that a browser is started on demand when no warm one is idle"""
+    backend = FakeBackend()
+    pool = BrowserPool(backend, size=0)
+    lease = await pool.acquire()
+    assert lease.browser.browser_context is not None
+    assert pool.stats["cold_leases"] == 1
+    await lease.__aexit__(None, None, None)
+    assert pool.stats["idle"] == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_recycle_after_max_uses_ttl_and_failed_reset():
+    """Test that browsers are replaced after use count, age or a failed reset"""
+    backend = FakeBackend()
+    pool = BrowserPool(backend, size=0, max_uses=2)
+    first = await pool.acquire()
+    await first.__aexit__(None, None, None)
+    second = await pool.acquire()
+    assert second.browser is first.browser
+    await second.__aexit__(None, None, None)
+    assert not first.browser.running
+    assert pool.stats["recycled"] == 1 and pool.stats["idle"] == 0
+
+    pool.ttl = 0
+    third = await pool.acquire()
+    await third.__aexit__(None, None, None)
+    assert not third.browser.running
+    assert pool.stats["recycled"] == 2
+
+    broken = BrowserPool(FakeBackend(fail_reset=True), size=0)
+    lease = await broken.acquire()
+    await lease.__aexit__(None, None, None)
+    assert not lease.browser.running
+    assert broken.stats["idle"] == 0 and broken.stats["recycled"] == 1
+    await pool.close()
+    await broken.close()
+
+
+@pytest.mark.asyncio
+async def test_lease_released_after_pool_close_is_stopped():
+    """Test that browsers leased during shutdown are stopped when returned"""
+    backend = FakeBackend()
+    pool = BrowserPool(backend, size=1)
+    await warm_pool(pool)
+    lease = await pool.acquire()
+    await pool.close()
+    assert lease.browser.running
+    await lease.__aexit__(None, None, None)
+    assert not any(b.running for b in backend.browsers)
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+
+
+@pytest.mark.asyncio
+async def test_used_browsers_stay_with_their_owner():
+    """Test that a returned browser is only leased again to the same owner"""
+    backend = FakeBackend()
+    pool = BrowserPool(backend, size=1)
+    await warm_pool(pool)
+    alice = await pool.acquire(owner="alice")
+    await alice.__aexit__(None, None, None)
+
+    # Bob gets a fresh browser; Alice's idle one is replaced rather than handed over
+    bob = await pool.acquire(owner="bob")
+    assert bob.browser is not alice.browser
+    assert not alice.browser.running
+    await bob.__aexit__(None, None, None)
+
+    again = await pool.acquire(owner="bob")
+    assert again.browser is bob.browser
+    await again.__aexit__(None, None, None)
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_local_browser_resets_context():
+    """Test that a local browser can be returned to the pool and reused"""
+    pytest.importorskip("playwright")
+    from magentic_ui.tools.playwright.browser import LocalPlaywrightBrowser
+
+    pool = BrowserPool(lambda: LocalPlaywrightBrowser(headless=True), size=0)
+    try:
+        lease = await pool.acquire()
+    except Exception as e:
+        pytest.skip(f"Chromium is not available: {e}")
+    context = lease.browser_context
+    await lease.__aexit__(None, None, None)
+    again = await pool.acquire()
+    assert again.browser is lease.browser
+    assert again.browser_context is not context
+    assert pool.stats["recycled"] == 0
+    await again.__aexit__(None, None, None)
+    await pool.close()
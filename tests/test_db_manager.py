@@ -0,0 +1,250 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from pathlib import Path
+from typing import AsyncGenerator
+
+from sqlalchemy import inspect, text
+from sqlmodel import SQLModel
+
+from magentic_ui.backend.database import DatabaseManager, get_async_engine_uri
+from magentic_ui.backend.datamodel import Message, Run, RunStatus, Session
+from magentic_ui.backend.web.managers import MessageSink, WebSocketManager
+
+
+@pytest_asyncio.fixture
+async def db_manager(tmp_path: Path) -> AsyncGenerator[DatabaseManager, None]:
+    """Fixture that provides a database manager backed by a temporary SQLite file."""
+    manager = DatabaseManager(
+        engine_uri=f"sqlite:///{tmp_path / 'test.db'}", base_dir=tmp_path
+    )
+    SQLModel.metadata.create_all(manager.engine)
+    yield manager
+    await manager.close()
+
+
+def test_get_async_engine_uri():
+    assert get_async_engine_uri("sqlite:///./magentic_ui.db") == (
+        "sqlite+aiosqlite:///./magentic_ui.db"
+    )
+    assert get_async_engine_uri("postgresql://u:p@host/db") == (
+        "postgresql+psycopg://u:p@host/db"
+    )
+    assert get_async_engine_uri("postgresql+psycopg2://u:p@host/db") == (
+        "postgresql+psycopg://u:p@host/db"
+    )
+    assert get_async_engine_uri("postgresql+asyncpg://u:p@host/db") == (
+        "postgresql+asyncpg://u:p@host/db"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_upsert_get_delete(db_manager: DatabaseManager):
+    """Test the async CRUD methods against data written through the sync path"""
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    assert session.status
+
+    response = await db_manager.aupsert(
+        Run(session_id=session.data.id, user_id="user", task=None, team_result=None),
+        return_json=False,
+    )
+    assert response.status
+    run = response.data
+    assert run.id is not None
+
+    run.status = RunStatus.ACTIVE
+    response = await db_manager.aupsert(run, return_json=False)
+    assert response.status
+    assert response.message == "Run Updated Successfully"
+
+    runs = await db_manager.aget(Run, filters={"id": run.id})
+    assert runs.status
+    assert len(runs.data) == 1
+    assert runs.data[0].status == RunStatus.ACTIVE
+
+    # Rows written by the async engine are visible to the sync engine
+    assert db_manager.get(Run, filters={"id": run.id}).data[0].status == (
+        RunStatus.ACTIVE
+    )
+
+    await db_manager.aupsert(
+        Message(session_id=session.data.id, run_id=run.id, config={"content": "hi"})
+    )
+    messages = await db_manager.aget(Message, filters={"run_id": run.id})
+    assert len(messages.data) == 1
+
+    response = await db_manager.adelete(Run, filters={"id": run.id})
+    assert response.status
+    assert (await db_manager.aget(Run, filters={"id": run.id})).data == []
+
+
+@pytest.mark.asyncio
+async def test_message_sink_batches_in_order(db_manager: DatabaseManager):
+    """Test that the write-behind sink flushes on size, time and close, preserving order"""
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    run = db_manager.upsert(
+        Run(session_id=session.data.id, user_id="user", task=None, team_result=None),
+        return_json=False,
+    ).data
+
+    sink = MessageSink(
+        db_manager,
+        run_id=run.id,
+        session_id=run.session_id,
+        user_id=run.user_id,
+        max_batch_size=3,
+        flush_interval=0.05,
+    )
+
+    def make_message(i: int) -> Message:
+        return Message(
+            session_id=sink.session_id,
+            run_id=run.id,
+            user_id=sink.user_id,
+            config={"content": str(i)},
+        )
+
+    async def stored_contents() -> list[str]:
+        messages = (await db_manager.aget(Message, filters={"run_id": run.id})).data
+        return [m.config["content"] for m in sorted(messages, key=lambda m: m.id)]
+
+    # Size-triggered flush
+    for i in range(3):
+        await sink.add(make_message(i))
+    assert sink.pending == 0
+    assert await stored_contents() == ["0", "1", "2"]
+
+    # Time-triggered flush
+    await sink.add(make_message(3))
+    assert sink.pending == 1
+    await asyncio.sleep(0.2)
+    assert sink.pending == 0
+    assert await stored_contents() == ["0", "1", "2", "3"]
+
+    # Flush on close
+    await sink.add(make_message(4))
+    await sink.close()
+    assert await stored_contents() == ["0", "1", "2", "3", "4"]
+
+    with pytest.raises(RuntimeError):
+        await sink.add(make_message(5))
+
+
+@pytest.mark.asyncio
+async def test_websocket_manager_run_cache(db_manager: DatabaseManager, tmp_path: Path):
+    """Test that runs are read through the cache and written through to the database"""
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    run = db_manager.upsert(
+        Run(session_id=session.data.id, user_id="user", task=None, team_result=None),
+        return_json=False,
+    ).data
+    manager = WebSocketManager(
+        db_manager=db_manager,
+        internal_workspace_root=tmp_path,
+        external_workspace_root=tmp_path,
+        inside_docker=False,
+        config={},
+    )
+
+    assert (await manager._get_run(run.id)).id == run.id
+    assert (await manager._get_run(run.id)).id == run.id
+    assert manager.cache_stats["runs"] == {"size": 1, "hits": 1, "misses": 1}
+
+    await manager._update_run(run.id, RunStatus.COMPLETE, error="boom")
+    assert (await manager._get_run(run.id)).status == RunStatus.COMPLETE
+    stored = db_manager.get(Run, filters={"id": run.id}).data[0]
+    assert stored.status == RunStatus.COMPLETE
+    assert stored.error_message == "boom"
+    assert manager.cache_stats["runs"]["misses"] == 1
+
+    manager.invalidate_session_runs(session.data.id)
+    assert manager.cache_stats["runs"]["size"] == 0
+    assert (await manager._get_settings("user")) is None
+    assert manager.cache_stats["settings"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_and_session_runs(db_manager: DatabaseManager):
+    """Test paging run messages by id and loading session runs with their messages"""
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    runs = [
+        db_manager.upsert(
+            Run(
+                session_id=session.data.id, user_id="user", task=None, team_result=None
+            ),
+            return_json=False,
+        ).data
+        for _ in range(3)
+    ]
+    await db_manager.abulk_insert(
+        [
+            Message(
+                session_id=session.data.id, run_id=run.id, config={"content": str(i)}
+            )
+            for run in runs[:2]
+            for i in range(5)
+        ]
+    )
+
+    pages = []
+    after_id = None
+    while True:
+        page = await db_manager.aget_page(
+            Message, filters={"run_id": runs[0].id}, after_id=after_id, limit=2
+        )
+        pages.append([m.config["content"] for m in page.data["items"]])
+        after_id = page.data["next_after_id"]
+        if after_id is None:
+            break
+    assert pages == [["0", "1"], ["2", "3"], ["4"]]
+
+    everything = await db_manager.aget_page(Message, filters={"run_id": runs[1].id})
+    assert len(everything.data["items"]) == 5
+    assert everything.data["next_after_id"] is None
+
+    first = await db_manager.aget_session_runs(session.data.id, limit=2)
+    assert [run.id for run, _ in first.data["runs"]] == [runs[0].id, runs[1].id]
+    assert [len(messages) for _, messages in first.data["runs"]] == [5, 5]
+    assert first.data["next_after_id"] == runs[1].id
+
+    rest = await db_manager.aget_session_runs(
+        session.data.id, after_id=first.data["next_after_id"], limit=2
+    )
+    assert [(run.id, messages) for run, messages in rest.data["runs"]] == [
+        (runs[2].id, [])
+    ]
+    assert rest.data["next_after_id"] is None
+
+    capped = await db_manager.aget_session_runs(session.data.id, message_limit=3)
+    assert [
+        [m.config["content"] for m in messages] for _, messages in capped.data["runs"]
+    ] == [["0", "1", "2"], ["0", "1", "2"], []]
+    cursor = capped.data["next_message_after_ids"][runs[0].id]
+    assert cursor == capped.data["runs"][0][1][-1].id
+    assert set(capped.data["next_message_after_ids"]) == {runs[0].id, runs[1].id}
+    remaining = await db_manager.aget_page(
+        Message, filters={"run_id": runs[0].id}, after_id=cursor
+    )
+    assert [m.config["content"] for m in remaining.data["items"]] == ["3", "4"]
+
+    exact = await db_manager.aget_session_runs(session.data.id, message_limit=5)
+    assert [len(messages) for _, messages in exact.data["runs"]] == [5, 5, 0]
+    assert exact.data["next_message_after_ids"] == {}
+
+
+def test_existing_database_is_migrated_to_message_indexes(tmp_path: Path):
+    """Test that SchemaManager adds the pagination indexes to an existing database"""
+    manager = DatabaseManager(
+        engine_uri=f"sqlite:///{tmp_path / 'old.db'}", base_dir=tmp_path
+    )
+    SQLModel.metadata.create_all(manager.engine)
+    with manager.engine.begin() as conn:
+        for index in ("ix_message_run_id_id", "ix_message_session_id_id"):
+            conn.execute(text(f"DROP INDEX {index}"))
+
+    assert manager.initialize_database().status
+    indexes = {
+        index["name"] for index in inspect(manager.engine).get_indexes("message")
+    }
+    assert {"ix_message_run_id_id", "ix_message_session_id_id"} <= indexes
+    manager.engine.dispose()
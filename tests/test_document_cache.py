@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from magentic_ui.tools.document_cache import ConvertedDocumentCache
+
+
+def test_get_and_put(tmp_path: Path):
+    """Test that documents are found by digest, also from another cache instance"""
+    cache = ConvertedDocumentCache(tmp_path)
+    digest = ConvertedDocumentCache.digest(b"%PDF-1.4 report")
+    assert cache.get(digest) is None
+
+    cache.put(digest, "Report", "# Report\n\nText")
+    assert cache.get(digest) == ("Report", "# Report\n\nText")
+    assert ConvertedDocumentCache(tmp_path).get(digest) == (
+        "Report",
+        "# Report\n\nText",
+    )
+
+    # A missing markdown file drops the entry
+    (tmp_path / f"{digest}.md").unlink()
+    assert cache.get(digest) is None
+
+    # The index is reopened after being closed
+    cache.put(digest, "Report", "# Report")
+    cache.close()
+    assert cache.get(digest) == ("Report", "# Report")
+    cache.close()
+
+
+def test_least_recently_used_documents_are_evicted(tmp_path: Path):
+    """Test that the cache stays within its size and entry limits"""
+    cache = ConvertedDocumentCache(tmp_path, max_bytes=250, max_entries=3)
+    for name in "abc":
+        cache.put(name, None, name * 100)
+    # "a" was evicted for size; reading "b" makes "c" the least recently used
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+    cache.put("d", None, "d")
+    cache.put("e", None, "e")
+    assert cache.get("c") is None
+    assert {name for name in "bde" if cache.get(name)} == set("bde")
+    assert sorted(p.stem for p in tmp_path.glob("*.md")) == ["b", "d", "e"]
+
+    # Documents larger than the cache are not stored
+    cache.put("f", None, "f" * 300)
+    assert cache.get("f") is None
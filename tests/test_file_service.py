@@ -0,0 +1,236 @@
+import json
+import os
+import random
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from autogen_core import CancellationToken
+from autogen_core.code_executor import CodeBlock, CodeResult
+from autogen_ext.code_executors.local import LocalCommandLineCodeExecutor
+
+from magentic_ui.agents.file_surfer._code_markdown_file_browser import (
+    CodeExecutorMarkdownFileBrowser,
+)
+from magentic_ui.agents.file_surfer._file_service import FileServiceClient
+from magentic_ui.agents.file_surfer._file_service_script import FileIndex
+from magentic_ui.agents.file_surfer._paged_document import _FileSource  # pyright: ignore[reportPrivateUsage]
+from magentic_ui.tools.document_cache import ConvertedDocumentCache
+
+
+class CountingExecutor(LocalCommandLineCodeExecutor):
+    """Local executor that records the code blocks it runs"""
+
+    def __init__(self, work_dir: Path) -> None:
+        super().__init__(work_dir=work_dir)
+        self.executed: List[str] = []
+
+    async def execute_code_blocks(
+        self, code_blocks: List[CodeBlock], cancellation_token: CancellationToken
+    ) -> CodeResult:
+        self.executed.extend(block.code for block in code_blocks)
+        return await super().execute_code_blocks(code_blocks, cancellation_token)
+
+
+@pytest.fixture
+def work_dir(tmp_path: Path) -> Path:
+    (tmp_path / "notes.md").write_text("# Notes\n\nSome 'quoted' text.\n")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "report.csv").write_text("a,b\n1,2\n")
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_browser_uses_one_service_for_all_operations(work_dir: Path):
+    """Test that after startup, opening, listing and finding files runs no code blocks"""
+    executor = CountingExecutor(work_dir)
+    browser = CodeExecutorMarkdownFileBrowser(executor)
+    try:
+        await browser.lazy_init()
+        assert browser._file_service.direct  # pyright: ignore[reportPrivateUsage]
+        assert len(executor.executed) == 1
+        assert "data/" in browser.page_content
+        assert ".file_service" not in browser.page_content
+
+        await browser.open_path("notes.md")
+        assert "Some 'quoted' text." in browser.page_content
+
+        await browser.open_path("missing.txt")
+        assert browser.page_title == "FileNotFoundError"
+
+        result = json.loads(await browser.find_files("report.csv"))
+        assert result["perfect_match"] == "data/report.csv"
+        assert len(executor.executed) == 1
+    finally:
+        await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_large_text_files_are_read_in_place(work_dir: Path):
+    """Test that large logs are paged straight from the file instead of being converted"""
+    lines = [f"line {i} of the job output" for i in range(20000)]
+    lines[15000] = "FATAL error in event loop"
+    (work_dir / "job.log").write_text("\n".join(lines))
+    executor = CountingExecutor(work_dir)
+    browser = CodeExecutorMarkdownFileBrowser(
+        executor, viewport_size=1024, direct_read_size=64 * 1024
+    )
+    try:
+        await browser.lazy_init()
+        await browser.open_path("job.log")
+        assert isinstance(browser._document._source, _FileSource)  # pyright: ignore[reportPrivateUsage]
+        assert browser.viewport.startswith("line 0 of the job output")
+
+        browser.page_down()
+        assert browser.viewport_current_page == 1
+        assert browser.find_on_page("fatal error") is not None
+        assert "FATAL error in event loop" in browser.viewport
+        assert browser.find_next() == browser.viewport
+        assert len(browser.viewport_pages) > browser.viewport_current_page > 1
+
+        await browser.open_path("notes.md")
+        assert "Some 'quoted' text." in browser.viewport
+    finally:
+        await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_converted_documents_are_cached(
+    work_dir: Path, tmp_path_factory: pytest.TempPathFactory
+):
+    """Test that a file with the content of a converted one is not converted again"""
+    cache = ConvertedDocumentCache(tmp_path_factory.mktemp("cache"))
+    (work_dir / "copy.md").write_text((work_dir / "notes.md").read_text())
+    browser = CodeExecutorMarkdownFileBrowser(
+        LocalCommandLineCodeExecutor(work_dir=work_dir), document_cache=cache
+    )
+    ops: List[str] = []
+    request = browser._file_service.request  # pyright: ignore[reportPrivateUsage]
+
+    async def recording_request(op: str, **args: Any) -> Dict[str, Any]:
+        ops.append(op)
+        return await request(op, **args)
+
+    browser._file_service.request = recording_request  # type: ignore
+    try:
+        await browser.lazy_init()
+        await browser.open_path("notes.md")
+        await browser.open_path("copy.md")
+        await browser.open_path("notes.md")
+        assert "Some 'quoted' text." in browser.viewport
+        assert ops == ["open", "open", "convert", "open", "open"]
+    finally:
+        await browser.close()
+
+
+@pytest.mark.asyncio
+async def test_requests_relayed_through_executor(
+    work_dir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that the service also works when its socket is not visible from the host"""
+    monkeypatch.setattr(FileServiceClient, "_host_socket_paths", lambda self: [])
+    executor = CountingExecutor(work_dir)
+    client = FileServiceClient(executor)
+    try:
+        await client.start()
+        assert not client.direct
+
+        response = await client.request("open", path="notes.md", convert=True)
+        assert response["exists"] and not response["is_dir"]
+        assert "Some 'quoted' text." in response["content"]
+        stat = await client.request("stat", path="data")
+        assert stat["exists"] and stat["is_dir"]
+        assert (await client.request("convert", path="missing.txt"))["error"]
+        # One code block to start, one per request
+        assert len(executor.executed) == 4
+    finally:
+        await client.stop()
+
+
+@pytest.mark.asyncio
+async def test_service_restarts_after_exiting(work_dir: Path):
+    """Test that a request restarts the service when it has exited"""
+    executor = CountingExecutor(work_dir)
+    client = FileServiceClient(executor)
+    await client.start()
+    first = await client.request("ping")
+    await client.request("shutdown")
+
+    try:
+        second = await client.request("ping")
+        assert second["ok"] and second["pid"] != first["pid"]
+    finally:
+        await client.stop()
+    assert not (work_dir / ".file_service" / "service.sock").exists()
+
+
+def reference_find(root: Path, query: str) -> List[Tuple[str, float]]:
+    """The full os.walk and SequenceMatcher scan the index replaces"""
+    matches: List[Tuple[str, float]] = []
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in ["node_modules", ".git", "__pycache__"]]
+        for name in files:
+            score = SequenceMatcher(None, query.lower(), name.lower()).ratio()
+            if score > 0.2:
+                matches.append(
+                    (os.path.relpath(os.path.join(dirpath, name), root), score)
+                )
+    matches.sort(key=lambda x: (-x[1], x[0]))
+    return matches[:20]
+
+
+def search(root: Path, index: FileIndex, query: str) -> Dict[str, Any]:
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        index.refresh()
+        return index.search(query)
+    finally:
+        os.chdir(cwd)
+
+
+def test_file_index_matches_full_scan(tmp_path: Path):
+    """Test that indexed queries rank files like a full SequenceMatcher scan"""
+    rng = random.Random(0)
+    words = ["run", "ntuple", "hist", "muon", "jet", "calib", "output", "log", "data"]
+    for i in range(40):
+        directory = tmp_path / f"job_{i}" / rng.choice(["out", "logs", "root"])
+        directory.mkdir(parents=True)
+        for j in range(25):
+            stem = "_".join(rng.sample(words, 2))
+            ext = rng.choice([".root", ".txt", ".log", ".csv"])
+            (directory / f"{stem}_{j}{ext}").touch()
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "muon_jet_1.root").touch()
+
+    index = FileIndex()
+    for query in ["muon_jet_3.root", "calib", "hist_data_12.csv", "zz", "output log"]:
+        result = search(tmp_path, index, query)
+        expected = reference_find(tmp_path, query)
+        assert [tuple(match) for match in result["matches"]] == expected
+
+    result = search(tmp_path, index, "Muon_Jet_3.ROOT")
+    perfect = result["perfect_match"]
+    assert perfect is None or Path(perfect).name.lower() == "muon_jet_3.root"
+
+
+def test_file_index_refreshes_changed_directories(tmp_path: Path):
+    """Test that added, renamed and removed files and directories are picked up"""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "results.csv").touch()
+    index = FileIndex()
+    assert search(tmp_path, index, "results.csv")["perfect_match"] == "a/results.csv"
+
+    (tmp_path / "a" / "results.csv").rename(tmp_path / "a" / "summary.csv")
+    (tmp_path / "b" / "c").mkdir(parents=True)
+    (tmp_path / "b" / "c" / "results.csv").touch()
+    assert search(tmp_path, index, "results.csv")["perfect_match"] == "b/c/results.csv"
+    assert search(tmp_path, index, "summary.csv")["perfect_match"] == "a/summary.csv"
+
+    (tmp_path / "b" / "c" / "results.csv").unlink()
+    (tmp_path / "b" / "c").rmdir()
+    result = search(tmp_path, index, "results.csv")
+    assert result["perfect_match"] is None
+    assert [path for path, _ in result["matches"]] == ["a/summary.csv"]
+    assert len(index) == 1
@@ -0,0 +1,55 @@
+import os
+import time
+from pathlib import Path
+
+from magentic_ui.backend.utils.file_watcher import WorkspaceWatcher
+from magentic_ui.backend.utils.utils import get_modified_files
+
+
+def names(files):
+    return sorted(file["name"] for file in files)
+
+
+def test_workspace_watcher_matches_full_scan(tmp_path: Path):
+    """Test that incremental polling reports the same files as a full directory walk"""
+    run_dir = tmp_path / "files" / "user" / "u" / "run"
+    (run_dir / "data").mkdir(parents=True)
+    old_file = run_dir / "data" / "old.csv"
+    old_file.write_text("a,b")
+    past = time.time() - 100
+    os.utime(old_file, (past, past))
+    os.utime(run_dir / "data", (past, past))
+    os.utime(run_dir, (past, past))
+
+    start = time.time()
+    watcher = WorkspaceWatcher(str(run_dir), since=start)
+    assert watcher.poll() == []
+
+    (run_dir / "plot.png").write_bytes(b"png")
+    (run_dir / "data" / "nested").mkdir()
+    (run_dir / "data" / "nested" / "result.py").write_text("print(1)")
+    (run_dir / "cache.pyc").write_bytes(b"")
+    (run_dir / ".file_service").mkdir()
+    (run_dir / ".file_service" / "service.py").write_text("")
+    (run_dir / ".file_service" / "service.log").write_bytes(b"")
+    new_files = watcher.poll()
+    assert names(new_files) == ["plot.png", "result.py"]
+    assert watcher.poll() == []
+    assert names(watcher.modified_files()) == names(
+        get_modified_files(start, time.time(), source_dir=str(run_dir))
+    )
+    png = next(f for f in new_files if f["name"] == "plot.png")
+    assert png["type"] == "image"
+    assert png["path"].startswith("files/user/u/run")
+
+    # Deleted files are dropped, a recreated file is reported again
+    (run_dir / "plot.png").unlink()
+    assert watcher.poll() == []
+    assert names(watcher.modified_files()) == ["result.py"]
+    (run_dir / "plot.png").write_bytes(b"png")
+    assert names(watcher.poll()) == ["plot.png"]
+
+    # In-place rewrites of old files are picked up by the periodic full rescan
+    watcher.full_rescan_interval = 0
+    old_file.write_text("c,d")
+    assert names(watcher.poll()) == ["old.csv"]
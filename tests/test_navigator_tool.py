@@ -0,0 +1,300 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from besiii.modules.tools import navigator_tool
+from besiii.modules.tools.http_pool import HTTPClientPool, TokenBucket
+from besiii.modules.tools.search_cache import SearchCache
+
+ARXIV_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Observation of a charged
+      charmoniumlike structure</title>
+    <published>2024-05-01T12:00:00Z</published>
+    <summary>
+  We report an observation.
+</summary>
+    <author><name>A. Author</name></author>
+    <author><name>B. Author</name></author>
+    <link href="http://arxiv.org/abs/2405.00001v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2405.00001v1" rel="related" type="application/pdf"/>
+  </entry>
+  <entry>
+    <title>Second paper</title>
+    <published>2024-04-01T12:00:00Z</published>
+    <summary>Another abstract.</summary>
+    <author><name>C. Author</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/2404.00002v1" rel="related" type="application/pdf"/>
+  </entry>
+</feed>
+"""
+
+INSPIRE_HITS = {
+    "hits": {
+        "total": 1,
+        "hits": [
+            {
+                "created": "2023-01-02T00:00:00",
+                "metadata": {
+                    "titles": [{"title": "Zc(3900) revisited"}],
+                    "authors": [{"first_name": "D.", "last_name": "Author"}],
+                    "abstracts": [{"value": "An abstract."}],
+                    "arxiv_eprints": [{"value": "2301.00003"}],
+                },
+            }
+        ],
+    }
+}
+
+LOGIN_PAGE = """<html><form action="/idp/login" method="post">
+<input type="hidden" name="csrf" value="token"/>
+<input type="text" name="j_username"/><input type="password" name="j_password"/>
+<input type="submit" name="_eventId_proceed" value="Login"/>
+<input type="submit" name="cancel" value="Cancel"/>
+</form></html>"""
+
+SAML_PAGE = """<html><body onload="document.forms[0].submit()">
+<form action="/Shibboleth.sso/SAML2/POST" method="post">
+<input type="hidden" name="RelayState" value="{target}"/>
+<input type="hidden" name="SAMLResponse" value="assertion"/>
+<noscript><input type="submit" value="Continue"/></noscript>
+</form></body></html>"""
+
+SEARCH_PAGE = """<html><table class="Alternating DocumentList">
+<tr><th>Docid</th></tr>
+{rows}
+</table></html>"""
+
+SEARCH_ROW = """<tr><td class="Docid"><a href="{base}/ShowDocument?docid={docid}">{docid}</a></td>
+<td class="Title"><a href="#">Document {docid}</a></td>
+<td class="Author"><a href="#">E. Author</a></td>
+<td class="Updated">2022-03-0{docid}</td></tr>"""
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    logins: List[str] = []
+    requests: List[str] = []
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(
+        self, body: str, content_type: str = "text/html", headers: Dict[str, str] = {}
+    ) -> None:
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location: str, headers: Dict[str, str] = {}) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        self.requests.append(self.path)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        base = f"http://{self.headers['Host']}/docdb"
+        if url.path == "/api/query":
+            assert query["search_query"] == ["(all:charged)"]
+            assert query["sortBy"] == ["submittedDate"]
+            self._send(ARXIV_FEED, "application/atom+xml")
+        elif url.path == "/api/literature":
+            self._send(json.dumps(INSPIRE_HITS), "application/json")
+        elif url.path == "/search.json":
+            results = {
+                "organic_results": [
+                    {
+                        "position": 1,
+                        "title": "BESIII",
+                        "link": "http://bes3.ihep.ac.cn",
+                        "snippet": query["q"][0],
+                    }
+                ]
+            }
+            self._send(json.dumps(results), "application/json")
+        elif url.path.startswith("/docdb/"):
+            if "session=valid" not in (self.headers.get("Cookie") or ""):
+                # Single sign-on: the identity provider asks for credentials
+                self._redirect(
+                    f"/idp/start?target={base}{url.path[len('/docdb'):]}?{url.query}"
+                )
+            elif url.path == "/docdb/Search":
+                rows = "\n".join(
+                    SEARCH_ROW.format(base=base, docid=docid) for docid in (1, 2, 3, 4)
+                )
+                self._send(SEARCH_PAGE.format(rows=rows))
+            elif url.path == "/docdb/ShowDocument":
+                docid = query["docid"][0]
+                self._send(
+                    f"<html><dl><dt>Abstract:</dt><dd>Abstract of {docid}</dd></dl></html>"
+                )
+            else:
+                self.send_error(404)
+        elif url.path == "/idp/start":
+            self._send(
+                LOGIN_PAGE,
+                headers={"Set-Cookie": f"target={query['target'][0]}; Path=/"},
+            )
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        if url.path == "/idp/login":
+            assert form["csrf"] == ["token"]
+            assert "cancel" not in form
+            if form["j_username"] != ["user"] or form["j_password"] != ["secret"]:
+                self._send(LOGIN_PAGE)
+                return
+            self.logins.append(form["j_username"][0])
+            target = self.headers["Cookie"].split("target=")[1].split(";")[0]
+            self._send(SAML_PAGE.format(target=target))
+        elif url.path == "/Shibboleth.sso/SAML2/POST":
+            assert form["SAMLResponse"] == ["assertion"]
+            self._redirect(
+                form["RelayState"][0], {"Set-Cookie": "session=valid; Path=/"}
+            )
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def stub_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    StubHandler.logins = []
+    StubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    pool = HTTPClientPool(default_rate_limit=(1000.0, 1000))
+    monkeypatch.setattr(navigator_tool, "http_pool", pool)
+    monkeypatch.setattr(
+        navigator_tool,
+        "docdb_session",
+        navigator_tool.DocDBSession(pool, "user", "secret"),
+    )
+    monkeypatch.setattr(navigator_tool, "search_cache", SearchCache(":memory:"))
+    monkeypatch.setattr(navigator_tool, "ARXIV_API_URL", f"{base}/api/query")
+    monkeypatch.setattr(navigator_tool, "INSPIRE_API_URL", f"{base}/api")
+    monkeypatch.setattr(navigator_tool, "DOCDB_SEARCH_URL", f"{base}/docdb/Search?")
+    monkeypatch.setattr(navigator_tool, "SERPAPI_URL", f"{base}/search.json")
+    yield base
+    server.shutdown()
+    server.server_close()
+
+
+def test_arxiv_search(stub_server: str) -> None:
+    output = navigator_tool.arxiv_search("charged", max_results=1)
+    assert "Here are the articles found in arXiv" in output
+    assert (
+        "[Observation of a charged charmoniumlike structure](http://arxiv.org/pdf/2405.00001v1)"
+        in output
+    )
+    assert "**Authors:** A. Author, B. Author" in output
+    assert "**Published date:** 2024-05-01" in output
+    assert "**Abstract:** We report an observation." in output
+    assert "Second paper" not in output
+
+
+def test_inspire_and_web_search(stub_server: str) -> None:
+    output = asyncio.run(navigator_tool.inspire_search_async("Zc3900"))
+    assert "[Zc(3900) revisited](https://arxiv.org/pdf/2301.00003)" in output
+    assert "**Authors:** D. Author" in output
+
+    output = navigator_tool.web_searching("bes3")
+    assert output.startswith("Here are the search results from google")
+    assert "Snippet: bes3" in output
+
+
+def test_docdb_logs_in_once(stub_server: str) -> None:
+    output = navigator_tool.docDB_search("psi(3770)", max_results=2)
+    assert "Here are the articles found in DocDB" in output
+    assert "[Document 1]" in output and "[Document 2]" in output
+    assert "**Abstract:** Abstract of 2" in output
+    assert StubHandler.logins == ["user"]
+
+    # The authenticated session is reused, from the background loop and from another loop
+    output = navigator_tool.docDB_search("psi(3686)", max_results=1)
+    assert "[Document 1]" in output and "**Abstract:** Abstract of 1" in output
+    asyncio.run(navigator_tool.docDB_search_async("psi(4040)", max_results=1))
+    assert StubHandler.logins == ["user"]
+
+
+def test_docdb_wrong_password(
+    stub_server: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    session = navigator_tool.DocDBSession(navigator_tool.http_pool, "user", "wrong")
+    monkeypatch.setattr(navigator_tool, "docdb_session", session)
+    output = navigator_tool.docDB_search("psi(3770)")
+    assert output.startswith("Error in web_searching")
+    assert "login failed" in output
+
+
+def test_token_bucket_spaces_requests() -> None:
+    bucket = TokenBucket(rate=20.0, capacity=2)
+
+    async def acquire_all() -> float:
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(6)))
+        return time.monotonic() - start
+
+    # Two requests go at once, the other four wait 50ms each
+    elapsed = asyncio.run(acquire_all())
+    assert 0.18 <= elapsed < 1.0
+
+
+def requested(path: str) -> int:
+    return sum(request.startswith(path) for request in StubHandler.requests)
+
+
+def test_repeated_searches_use_cache(stub_server: str) -> None:
+    output = navigator_tool.arxiv_search("charged", max_results=1)
+    assert navigator_tool.arxiv_search("  charged ", max_results=1) == output
+    assert requested("/api/query") == 1
+
+    output = navigator_tool.inspire_search("Zc3900")
+    assert navigator_tool.inspire_search("zc3900") == output
+    assert requested("/api/literature") == 1
+
+    output = navigator_tool.web_searching("bes3")
+    assert navigator_tool.web_searching("bes3") == output
+    assert requested("/search.json") == 1
+
+    # A paper found in arXiv is not looked up again in INSPIRE by its eprint
+    output = navigator_tool.inspire_search("", Eprint="arXiv:2405.00001v2")
+    assert "[Observation of a charged charmoniumlike structure]" in output
+    assert requested("/api/literature") == 1
+
+
+def test_docdb_abstracts_are_fetched_once(stub_server: str) -> None:
+    navigator_tool.docDB_search("psi(3770)", max_results=2)
+    assert requested("/docdb/ShowDocument") == 2
+    # The first search is requested again after logging in
+    searches = requested("/docdb/Search")
+
+    # Fewer results of the same search come from the cache; a new search only
+    # fetches the abstracts not seen before
+    navigator_tool.docDB_search("psi(3770)", max_results=1)
+    assert requested("/docdb/Search") == searches
+    output = navigator_tool.docDB_search("psi(3686)", max_results=3)
+    assert "**Abstract:** Abstract of 3" in output
+    assert requested("/docdb/Search") == searches + 1
+    assert requested("/docdb/ShowDocument") == 3
@@ -0,0 +1,102 @@
+import random
+from typing import List
+
+import pytest
+from autogen_agentchat.messages import (
+    BaseAgentEvent,
+    BaseChatMessage,
+    StopMessage,
+    TextMessage,
+)
+from autogen_core.model_context import TokenLimitedChatCompletionContext
+from autogen_core.models import LLMMessage, SystemMessage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+
+from magentic_ui.teams.orchestrator._thread_context import ThreadContext
+from magentic_ui.utils import thread_to_context
+
+AGENT = "orchestrator"
+
+
+class CountingClient(ReplayChatCompletionClient):
+    """Counts whitespace-separated words, and how many times tokens were counted"""
+
+    def __init__(self) -> None:
+        super().__init__([])
+        self.counted = 0
+
+    def count_tokens(self, messages, *, tools=[]):  # type: ignore
+        self.counted += len(messages)
+        return super().count_tokens(messages, tools=tools)
+
+
+def make_message(rng: random.Random, i: int) -> BaseChatMessage | BaseAgentEvent:
+    words = " ".join(f"w{i}" for _ in range(rng.randint(1, 30)))
+    source = rng.choice([AGENT, "web_surfer", "coder_agent", "user"])
+    if rng.random() < 0.05:
+        return StopMessage(content=words, source=source)
+    return TextMessage(content=words, source=source)
+
+
+async def reference_trim(
+    client: ReplayChatCompletionClient, messages: List[LLMMessage], limit: int
+) -> List[LLMMessage]:
+    context = TokenLimitedChatCompletionContext(client, token_limit=limit)
+    for message in messages:
+        await context.add_message(message)
+    return await context.get_messages()
+
+
+def test_sync_matches_full_conversion() -> None:
+    rng = random.Random(0)
+    context = ThreadContext(CountingClient(), AGENT)
+    thread: List[BaseChatMessage | BaseAgentEvent] = []
+    for i in range(200):
+        thread.append(make_message(rng, i))
+        if i % 7 == 0:
+            assert context.sync(thread) == thread_to_context(thread, AGENT)
+
+    # Filtering the thread into a new list rebuilds the context
+    thread = [m for m in thread if m.source != "user"]
+    assert context.sync(thread) == thread_to_context(thread, AGENT)
+    thread = []
+    assert context.sync(thread) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 5, 40, 300, 1000, 100000])
+async def test_trim_matches_token_limited_context(limit: int) -> None:
+    rng = random.Random(limit)
+    client = CountingClient()
+    context = ThreadContext(client, AGENT, token_limit=limit)
+    thread: List[BaseChatMessage | BaseAgentEvent] = []
+    for i in range(120):
+        thread.append(make_message(rng, i))
+        messages: List[LLMMessage] = [SystemMessage(content="system prompt here")]
+        messages.extend(context.sync(thread))
+        messages.append(UserMessage(content=f"prompt {i}", source=AGENT))
+        assert context.trim(messages) == await reference_trim(client, messages, limit)
+
+
+@pytest.mark.asyncio
+async def test_trim_counts_thread_messages_once() -> None:
+    rng = random.Random(1)
+    client = CountingClient()
+    context = ThreadContext(client, AGENT, token_limit=200)
+    thread = [make_message(rng, i) for i in range(100)]
+    messages: List[LLMMessage] = [SystemMessage(content="system")]
+    messages.extend(context.sync(thread))
+    messages.append(UserMessage(content="prompt", source=AGENT))
+    context.trim(messages)
+
+    client.counted = 0
+    thread.append(make_message(rng, 100))
+    messages = [SystemMessage(content="system"), *context.sync(thread)]
+    messages.append(UserMessage(content="prompt", source=AGENT))
+    context.trim(messages)
+    # The new thread message, the system message and the prompt
+    assert client.counted == 3
+
+    # A context that does not contain the thread is counted in full
+    other = [UserMessage(content=f"m {i}", source="user") for i in range(10)]
+    assert context.trim(other) == await reference_trim(client, other, 200)
@@ -0,0 +1,148 @@
+import random
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from magentic_ui.agents.file_surfer._paged_document import (
+    PagedDocument,
+    ViewportSearch,
+)
+
+VIEWPORT = 200
+
+
+def make_text(n_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = ["event", "muon", "jet", "trigger", "x" * 300, "calib", "ünïcode"]
+    seps = [" ", " ", "\n", "\t", "\r\n"]
+    return "".join(rng.choice(words) + rng.choice(seps) for _ in range(n_words))
+
+
+def reference_split(content: str, viewport_size: int) -> List[Tuple[int, int]]:
+    """The eager page split the lazy document replaces"""
+    if len(content) == 0:
+        return [(0, 0)]
+    pages: List[Tuple[int, int]] = []
+    start_idx = 0
+    while start_idx < len(content):
+        end_idx = min(start_idx + viewport_size, len(content))
+        while end_idx < len(content) and content[end_idx - 1] not in [
+            " ",
+            "\t",
+            "\r",
+            "\n",
+        ]:
+            end_idx += 1
+        pages.append((start_idx, end_idx))
+        start_idx = end_idx
+    return pages
+
+
+def reference_find(
+    pages: List[str], pattern: str, starting_viewport: int
+) -> Optional[int]:
+    idxs = list(range(starting_viewport, len(pages))) + list(range(starting_viewport))
+    for i in idxs:
+        ncontent = " " + (" ".join(re.split(r"\W+", pages[i]))).strip().lower() + " "
+        if re.search(pattern, ncontent):
+            return i
+    return None
+
+
+def test_pages_match_eager_split():
+    """Test that lazily split pages have the bounds of the eager split"""
+    for text in ["", "short", make_text(2000), make_text(2000).rstrip()]:
+        document = PagedDocument(text, VIEWPORT)
+        expected = reference_split(text, VIEWPORT)
+        assert len(document) == len(expected)
+        assert list(document) == expected
+        assert [document.page(i) for i in range(len(document))] == [
+            text[start:end] for start, end in expected
+        ]
+
+
+def test_pages_are_split_on_demand():
+    """Test that reaching a page only splits the pages before it"""
+    document = PagedDocument(make_text(50000), VIEWPORT)
+    assert document[3] == reference_split(make_text(50000), VIEWPORT)[3]
+    assert len(document._bounds) == 4  # pyright: ignore[reportPrivateUsage]
+
+
+def test_estimated_len_does_not_split():
+    """Test that the page count is estimated until the document is split completely"""
+    text = make_text(50000)
+    document = PagedDocument(text, VIEWPORT)
+    document[0]
+    exact = len(reference_split(text, VIEWPORT))
+    assert not document.complete
+    assert abs(document.estimated_len() - exact) <= exact // 20
+    assert len(document._bounds) == 1  # pyright: ignore[reportPrivateUsage]
+    assert len(document) == exact
+    assert document.complete and document.estimated_len() == exact
+
+
+def test_file_document(tmp_path: Path):
+    """Test that a UTF-8 file is split on byte offsets and decoded per page"""
+    text = make_text(2000)
+    path = tmp_path / "job.log"
+    path.write_bytes(text.encode("utf-8"))
+
+    document = PagedDocument.from_file(path, VIEWPORT)
+    try:
+        # Latin-1 maps each byte to one character, giving the byte offsets
+        raw = text.encode("utf-8").decode("latin-1")
+        assert list(document) == reference_split(raw, VIEWPORT)
+        assert "".join(document.page(i) for i in range(len(document))) == text
+        assert document.text == text
+    finally:
+        document.close()
+
+    (tmp_path / "empty.log").touch()
+    assert PagedDocument.from_file(tmp_path / "empty.log", VIEWPORT).page(0) == ""
+
+
+def test_truncated_file_document(tmp_path: Path):
+    """Test that pages of a file truncated while it is open are short instead of failing"""
+    data = make_text(2000).encode("utf-8")
+    path = tmp_path / "job.log"
+    path.write_bytes(data)
+    remaining = data[: len(data) // 2].decode("utf-8", errors="replace")
+
+    split = PagedDocument.from_file(path, VIEWPORT)
+    unsplit = PagedDocument.from_file(path, VIEWPORT)
+    try:
+        n_pages = len(split)
+        first = unsplit.page(0)
+        with open(path, "r+b") as f:
+            f.truncate(len(data) // 2)
+
+        pages = [split.page(i) for i in range(n_pages)]
+        assert "".join(pages) == remaining
+        assert pages[-1] == ""
+        assert unsplit.page(0) == first
+        assert "".join(unsplit.page(i) for i in range(len(unsplit))) == remaining
+    finally:
+        split.close()
+        unsplit.close()
+
+
+def test_search_reads_each_page_once():
+    """Test that searching finds the same pages as a rescan and reads pages once"""
+    text = make_text(5000, seed=1) + "needle in a haystack " + make_text(5000, seed=2)
+    document = PagedDocument(text, VIEWPORT)
+    pages = [text[start:end] for start, end in reference_split(text, VIEWPORT)]
+    pattern = " needle in .*haystack "
+    search = ViewportSearch(document, pattern)
+
+    reads: List[int] = []
+    page = document.page
+
+    def counting_page(index: int) -> str:
+        reads.append(index)
+        return page(index)
+
+    document.page = counting_page  # type: ignore
+    for start in [0, 10, len(pages) - 1, 0, 10]:
+        assert search.next_match(start) == reference_find(pages, pattern, start)
+    assert len(reads) == len(set(reads))
+    assert ViewportSearch(document, " absent ").next_match(5) is None
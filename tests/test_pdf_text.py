@@ -0,0 +1,129 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from magentic_ui.tools.playwright.utils import pdf_text
+from magentic_ui.tools.playwright.utils.pdf_text import PdfTextCache, parse_page_range
+
+
+def make_pdf(texts: List[str]) -> bytes:
+    """Build a PDF with one line of Helvetica text per page"""
+    n = len(texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * i} 0 R".encode() for i in range(n))
+        + f"] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n".encode()
+    pdf += f"startxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+@pytest.fixture
+def extracted(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    """Record how many pages pdfminer lays out"""
+    pages: List[int] = []
+    extract_pages = pdf_text.extract_pages
+
+    def recording_extract_pages(*args, **kwargs):
+        for layout in extract_pages(*args, **kwargs):
+            pages.append(layout.pageid)
+            yield layout
+
+    monkeypatch.setattr(pdf_text, "extract_pages", recording_extract_pages)
+    return pages
+
+
+def test_parse_page_range():
+    assert parse_page_range("40-45") == range(40, 46)
+    assert parse_page_range(" 7 ") == range(7, 8)
+    assert parse_page_range("40-").start == 40
+    for spec in ["", "0", "5-3", "a-b", "1,2"]:
+        with pytest.raises(ValueError):
+            parse_page_range(spec)
+
+
+def test_pages_are_extracted_lazily_and_cached(tmp_path: Path, extracted: List[int]):
+    """Test that only the pages read are parsed, and each page only once"""
+    pdf = make_pdf([f"Text of page {i}" for i in range(1, 21)])
+    cache = PdfTextCache(tmp_path)
+    assert cache.page_count(pdf) == 20
+
+    pages = cache.iter_pages(pdf)
+    assert [next(pages) for _ in range(2)] == [
+        (1, "Text of page 1\n"),
+        (2, "Text of page 2\n"),
+    ]
+    pages.close()
+    assert len(extracted) == 2
+
+    assert [n for n, _ in cache.iter_pages(pdf, parse_page_range("2-4"))] == [2, 3, 4]
+    assert len(extracted) == 4
+
+    text = cache.extract_text(pdf, pages=parse_page_range("18-"))
+    assert text == "Text of page 18\n\n\nText of page 19\n\n\nText of page 20\n"
+    assert len(extracted) == 7
+
+    # A fresh cache over the same directory reads everything from disk
+    assert PdfTextCache(tmp_path).extract_text(pdf, pages=range(1, 5)).count("\n") == 10
+    assert len(extracted) == 7
+
+
+def test_extract_text_stops_at_token_budget(
+    tmp_path: Path, extracted: List[int], monkeypatch: pytest.MonkeyPatch
+):
+    """Test that extraction stops once the pages read exceed the token budget"""
+
+    def count_words(text: str, model: str = "gpt-4o") -> int:
+        return len(text.split())
+
+    def truncate_words(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+        if max_tokens == -1 or len(text.split()) <= max_tokens:
+            return text
+        return " ".join(text.split()[:max_tokens])
+
+    monkeypatch.setattr(pdf_text, "count_tokens", count_words)
+    monkeypatch.setattr(pdf_text, "truncate_to_tokens", truncate_words)
+    pdf = make_pdf([f"Text of page {i}" for i in range(1, 101)])
+
+    text = PdfTextCache(tmp_path).extract_text(pdf, max_tokens=10)
+    assert text == "Text of page 1 Text of page 2 Text of"
+    assert len(extracted) == 3
+
+
+def test_least_recently_read_documents_are_evicted(tmp_path: Path):
+    """Test that the cache stays within its byte budget, evicting old documents first"""
+    cache = PdfTextCache(tmp_path, max_bytes=200)
+    pdfs = [make_pdf([f"Document {d} page {i}" for i in range(1, 6)]) for d in range(3)]
+    for number, i in enumerate([0, 1, 0]):
+        cache.extract_text(pdfs[i])
+        # Order the reads explicitly, the file system clock may be coarse
+        os.utime(cache._document_dir(pdfs[i]), (number, number))
+    cache.extract_text(pdfs[2])  # document 1 is the least recently read
+
+    cached = {path.name for path in tmp_path.iterdir()}
+    assert cached == {cache._document_dir(pdfs[i]).name for i in (0, 2)}
+    size = sum(path.stat().st_size for path in tmp_path.rglob("*") if path.is_file())
+    assert size <= 200
@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import AsyncGenerator, List, Union
+
+import PIL.Image
+import pytest
+import pytest_asyncio
+from autogen_agentchat.messages import MultiModalMessage, TextMessage
+from autogen_core import Image
+from sqlmodel import SQLModel
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import Message, Run, Session
+from magentic_ui.backend.web.managers import WebSocketManager
+from magentic_ui.backend.web.routes import plans
+from magentic_ui.types import Plan, PlanStep
+
+
+@pytest_asyncio.fixture
+async def db_manager(tmp_path: Path) -> AsyncGenerator[DatabaseManager, None]:
+    """Fixture that provides a database manager backed by a temporary SQLite file."""
+    manager = DatabaseManager(
+        engine_uri=f"sqlite:///{tmp_path / 'test.db'}", base_dir=tmp_path
+    )
+    SQLModel.metadata.create_all(manager.engine)
+    yield manager
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_learn_plan_resolves_offloaded_images(
+    db_manager: DatabaseManager, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a plan is learned from a session whose screenshots are blob references"""
+    ws_manager = WebSocketManager(
+        db_manager=db_manager,
+        internal_workspace_root=tmp_path,
+        external_workspace_root=tmp_path,
+        inside_docker=False,
+        config={},
+    )
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    run = db_manager.upsert(
+        Run(session_id=session.data.id, user_id="user", task=None, team_result=None),
+        return_json=False,
+    ).data
+    screenshot = Image.from_pil(PIL.Image.new("RGB", (64, 64), color="red"))
+    stored = [
+        TextMessage(source="user", content="Find the weather"),
+        MultiModalMessage(source="web_surfer", content=["page", screenshot]),
+    ]
+    await db_manager.abulk_insert(
+        [
+            Message(
+                session_id=session.data.id,
+                run_id=run.id,
+                config=ws_manager.blob_store.offload_images(message.model_dump()),
+            )
+            for message in stored
+        ]
+    )
+    assert "blob_ref" in db_manager.get(Message).data[1].config["content"][1]
+
+    learned: List[Union[TextMessage, MultiModalMessage]] = []
+
+    async def learn_plan_from_messages(client, messages):
+        learned.extend(messages)
+        return Plan(
+            task="Find the weather",
+            steps=[PlanStep(title="Search", details="", agent_name="web_surfer")],
+        )
+
+    monkeypatch.delenv("_CONFIG", raising=False)
+    monkeypatch.setattr(
+        plans.ChatCompletionClient, "load_component", lambda config: None
+    )
+    monkeypatch.setattr(plans, "learn_plan_from_messages", learn_plan_from_messages)
+
+    result = await plans.learn_plan(
+        plans.LearnPlanRequest(session_id=session.data.id, user_id="user"),
+        db=db_manager,
+        ws_manager=ws_manager,
+    )
+
+    assert result["status"], result
+    assert learned[0].content == "Find the weather"
+    assert learned[1].content[0] == "page"
+    assert isinstance(learned[1].content[1], Image)
+    assert learned[1].content[1].to_base64() == screenshot.to_base64()
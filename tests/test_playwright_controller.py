@@ -172,6 +172,29 @@ class TestPlaywrightController:
         # We'll check it's a dict anyway
         assert isinstance(metadata, dict)
 
+    async def test_page_script_injected_once_per_document(self, page):
+        page_obj, pc = page
+        evaluate = page_obj.evaluate
+        expressions = []
+
+        async def counting_evaluate(expression, *args, **kwargs):
+            expressions.append(expression)
+            return await evaluate(expression, *args, **kwargs)
+
+        page_obj.evaluate = counting_evaluate
+        for _ in range(3):
+            await pc.get_interactive_rects(page_obj)
+            await pc.get_visual_viewport(page_obj)
+            await pc.get_focused_rect_id(page_obj)
+        # One sentinel check for the document, then only the API calls
+        assert expressions.count("typeof WebSurfer !== 'undefined'") == 1
+        assert len(expressions) == 1 + (pc._page_script in expressions) + 9
+
+        # A navigation starts a new document that is checked again
+        await page_obj.goto("about:blank")
+        await pc.get_visual_viewport(page_obj)
+        assert expressions.count("typeof WebSurfer !== 'undefined'") == 2
+
     async def test_go_back_and_go_forward(self, page):
         """
         This is a contrived example:
@@ -357,6 +380,25 @@ class TestPlaywrightController:
         except ImportError:
             pytest.skip("MarkItDown library not installed; skipping markdown test.")
 
+    async def test_page_markdown_cache(self, page):
+        page_obj, pc = page
+        markdown = await pc.get_page_markdown(page_obj)
+        # Labelling interactive elements does not count as a content change
+        await pc.get_interactive_rects(page_obj)
+        assert await pc.get_page_markdown(page_obj) == markdown
+        assert pc.markdown_cache_stats == {"hits": 1, "misses": 1}
+
+        await page_obj.evaluate(
+            "document.querySelector('h1').textContent = 'Changed heading'"
+        )
+        changed = await pc.get_page_markdown(page_obj)
+        assert "Changed heading" in changed
+        assert pc.markdown_cache_stats == {"hits": 1, "misses": 2}
+
+        await pc.refresh_page(page_obj)
+        assert await pc.get_page_markdown(page_obj) != changed
+        assert pc.markdown_cache_stats == {"hits": 1, "misses": 3}
+
     async def test_describe_page(self, page):
         page_obj, pc = page
         message, screenshot_bytes, metadata_hash = await pc.describe_page(
@@ -367,6 +409,21 @@ class TestPlaywrightController:
         assert screenshot_bytes is not None
         assert len(screenshot_bytes) > 0
 
+    async def test_snapshot(self, page):
+        page_obj, pc = page
+        await page_obj.click("#input-box")
+        snapshot = await pc.snapshot(page_obj)
+        assert snapshot["title"] == "Fake Page"
+        assert snapshot["rects"] == await pc.get_interactive_rects(page_obj)
+        assert snapshot["viewport"] == await pc.get_visual_viewport(page_obj)
+        assert snapshot["focused_id"] == "13"
+        assert snapshot["visible_text"] == await pc.get_visible_text(page_obj)
+        assert snapshot["metadata"] == await pc.get_page_metadata(page_obj)
+        assert snapshot["screenshot"]
+
+        without_screenshot = await pc.snapshot(page_obj, get_screenshot=False)
+        assert without_screenshot["screenshot"] is None
+
     async def test_select_multiple_options(self, context, page):
         page_obj, pc = page
         # Select multiple options in the multi-select dropdown
@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+
+from besiii.modules.tools import search_cache
+from besiii.modules.tools.search_cache import (
+    SearchCache,
+    normalize_arxiv_id,
+    normalize_doi,
+    normalize_query,
+)
+
+
+def article(key: str, **fields: object) -> dict:
+    return {"id": key, "title": key, "abstract": "", **fields}
+
+
+def test_normalization() -> None:
+    assert (
+        normalize_query("  Zc3900   OR  psi(3770) and X ")
+        == "zc3900 OR psi(3770) and x"
+    )
+    assert normalize_arxiv_id("arXiv:2405.00001v2") == "2405.00001"
+    assert (
+        normalize_arxiv_id("http://arxiv.org/abs/hep-ph/0603175v1") == "hep-ph/0603175"
+    )
+    assert normalize_doi("https://doi.org/10.1103/PhysRevLett.19.1264") == (
+        "10.1103/physrevlett.19.1264"
+    )
+
+
+def test_query_results_and_max_results() -> None:
+    cache = SearchCache(":memory:")
+    assert cache.get_query("web", "bes3") is None
+    cache.put_query("arxiv", "Zc3900", ["a", "b", "c"], max_results=3)
+    assert cache.get_query("arxiv", " zc3900 ", max_results=2) == ["a", "b"]
+    assert cache.get_query("arxiv", "zc3900", max_results=5) is None
+    assert cache.get_query("inspire", "zc3900", max_results=2) is None
+
+    # Fewer results than requested means the search is exhausted
+    cache.put_query("arxiv", "rare", ["a"], max_results=3)
+    assert cache.get_query("arxiv", "rare", max_results=10) == ["a"]
+
+
+def test_articles_deduplicated_across_sources() -> None:
+    cache = SearchCache(":memory:")
+    arxiv = article(
+        "arxiv:2405.00001", arxiv_id="2405.00001v1", url="arxiv-url", abstract="A"
+    )
+    inspire = article(
+        "inspire:literature/1",
+        arxiv_id="arXiv:2405.00001",
+        doi="10.1/X",
+        url="inspire-url",
+    )
+    assert cache.put_articles("arxiv", "q1", [arxiv], 3) == [arxiv]
+
+    merged = cache.put_articles("inspire", "q2", [inspire, inspire], 3)
+    assert merged == [{**arxiv, "doi": "10.1/X"}]
+    assert cache.get_articles("inspire", "q2", 3) == merged
+    assert cache.get_article("inspire:literature/1") == merged[0]
+    assert cache.get_article(doi="https://doi.org/10.1/x") == merged[0]
+    assert cache.get_article(arxiv_id="2405.00001v3") == merged[0]
+    assert cache.get_article(arxiv_id="2405.00002") is None
+
+
+def test_ttl_and_persistence(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    path = str(tmp_path / "cache" / "search.sqlite3")
+
+    cache = SearchCache(path, query_ttl=10, record_ttl=100)
+    cache.put_articles("docdb", "q", [article("docdb:1", abstract="A")], 1)
+    cache.close()
+
+    cache = SearchCache(path, query_ttl=10, record_ttl=100)
+    assert cache.get_articles("docdb", "q", 1) == [article("docdb:1", abstract="A")]
+    now[0] += 20
+    assert cache.get_articles("docdb", "q", 1) is None
+    assert cache.get_article("docdb:1") is not None
+    now[0] += 100
+    assert cache.get_article("docdb:1") is None
+    cache.close()
+
+    # Expired rows are removed when the database is opened again
+    cache = SearchCache(path, query_ttl=10, record_ttl=100)
+    conn = cache._connect()
+    assert conn.execute("SELECT COUNT(*) FROM records").fetchone() == (0,)
+    assert conn.execute("SELECT COUNT(*) FROM aliases").fetchone() == (0,)
@@ -0,0 +1,115 @@
+import random
+from typing import Dict, List, Tuple
+
+import PIL.Image
+
+from magentic_ui.agents.web_surfer._set_of_mark import add_set_of_mark
+from magentic_ui.tools.playwright.types import DOMRectangle, InteractiveRegion
+
+WIDTH, HEIGHT = 400, 300
+
+
+def make_rect(left: float, top: float, width: float, height: float) -> DOMRectangle:
+    return DOMRectangle(
+        x=left,
+        y=top,
+        width=width,
+        height=height,
+        top=top,
+        right=left + width,
+        bottom=top + height,
+        left=left,
+    )
+
+
+def make_rois(n: int, seed: int = 0) -> Dict[str, InteractiveRegion]:
+    rng = random.Random(seed)
+    tags = ["button", "a", "input, type=text", "option", "input, type=file"]
+    rois: Dict[str, InteractiveRegion] = {}
+    for i in range(n):
+        rects = [
+            make_rect(
+                rng.uniform(-50, WIDTH + 50),
+                rng.uniform(-HEIGHT, 2 * HEIGHT),
+                rng.choice([0, 10, 40]),
+                rng.choice([0, 10, 20]),
+            )
+            for _ in range(rng.randint(1, 3))
+        ]
+        rois[str(i + 10)] = InteractiveRegion(
+            tag_name=rng.choice(tags),
+            role="button",
+            aria_name=f"element {i}",
+            v_scrollable=False,
+            rects=rects,
+        )
+    return rois
+
+
+def reference_classify(
+    rois: Dict[str, InteractiveRegion],
+) -> Tuple[List[str], List[str], List[str]]:
+    """Per-rectangle classification the vectorized version must reproduce"""
+    visible: List[str] = []
+    above: List[str] = []
+    below: List[str] = []
+    for original_id, roi in rois.items():
+        if roi["tag_name"] in ("option", "input, type=file"):
+            if original_id not in visible:
+                visible.append(original_id)
+            continue
+        for rect in roi["rects"]:
+            if rect["width"] * rect["height"] == 0:
+                continue
+            mid_x = (rect["right"] + rect["left"]) / 2.0
+            mid_y = (rect["top"] + rect["bottom"]) / 2.0
+            if 0 <= mid_x < WIDTH:
+                if mid_y < 0 and original_id not in above:
+                    above.append(original_id)
+                elif mid_y >= HEIGHT and original_id not in below:
+                    below.append(original_id)
+                elif 0 <= mid_y < HEIGHT and original_id not in visible:
+                    visible.append(original_id)
+    return visible, above, below
+
+
+def test_classification_matches_reference():
+    """Test that regions are split into visible/above/below like the per-rect loop"""
+    rois = make_rois(500)
+    screenshot = PIL.Image.new("RGB", (WIDTH, HEIGHT), color="white")
+
+    _, visible, above, below, mapping = add_set_of_mark(screenshot, rois)
+    assert (visible, above, below) == reference_classify(rois)
+    assert all(mapping[k] == k for k in visible + above + below)
+
+    _, seq_visible, seq_above, seq_below, seq_mapping = add_set_of_mark(
+        screenshot, rois, use_sequential_ids=True
+    )
+    assert seq_visible + seq_above + seq_below == [
+        str(i) for i in range(1, len(visible) + len(above) + len(below) + 1)
+    ]
+    assert [seq_mapping[k] for k in seq_visible] == visible
+    assert [seq_mapping[k] for k in seq_below] == below
+
+
+def test_draw_size_scales_markers():
+    """Test that markers can be drawn directly on the image size sent to the model"""
+    rois = {"10": make_rois(1)["10"]}
+    rois["10"]["tag_name"] = "button"
+    rois["10"]["rects"] = [make_rect(100, 100, 100, 50)]
+    screenshot = PIL.Image.new("RGB", (WIDTH, HEIGHT), color="white")
+
+    comp, visible, _, _, _ = add_set_of_mark(screenshot, rois, draw_size=(200, 150))
+    assert comp.size == (200, 150)
+    assert visible == ["10"]
+    # The outline is drawn at the scaled position of the rectangle
+    assert comp.getpixel((50, 60))[:3] == (255, 0, 0)
+    assert comp.getpixel((150, 140))[:3] == (255, 255, 255)
+
+
+def test_empty_regions():
+    """Test that a page without interactive regions is returned unannotated"""
+    screenshot = PIL.Image.new("RGB", (WIDTH, HEIGHT), color="white")
+    comp, visible, above, below, mapping = add_set_of_mark(screenshot, {})
+    assert comp.size == (WIDTH, HEIGHT)
+    assert (visible, above, below, mapping) == ([], [], [], {})
@@ -0,0 +1,118 @@
+import copy
+import pytest
+import pytest_asyncio
+from pathlib import Path
+from typing import Any, AsyncGenerator, Dict
+
+from sqlmodel import SQLModel
+
+from magentic_ui.backend.database import DatabaseManager
+from magentic_ui.backend.datamodel import CheckpointKind, Run, RunCheckpoint, Session
+from magentic_ui.backend.utils.utils import (
+    apply_state_delta,
+    diff_state,
+    restore_checkpoint_state,
+)
+from magentic_ui.backend.web.managers import CheckpointWriter
+
+
+def make_state(n_messages: int, plan: str = "plan") -> Dict[str, Any]:
+    return {
+        "type": "TeamState",
+        "agent_states": {
+            "orchestrator": {
+                "message_history": [
+                    {"source": "user", "content": f"message {i}"}
+                    for i in range(n_messages)
+                ],
+                "plan_str": plan,
+                "n_rounds": n_messages,
+            },
+            "web_surfer": {"chat_history": []},
+        },
+    }
+
+
+def test_diff_state_appends_only_new_items():
+    old = make_state(3)
+    new = make_state(5)
+    ops = diff_state(old, new)
+    assert {
+        "op": "set",
+        "path": ["agent_states", "orchestrator", "n_rounds"],
+        "value": 5,
+    } in ops
+    append = [op for op in ops if op["op"] == "append"]
+    assert append == [
+        {
+            "op": "append",
+            "path": ["agent_states", "orchestrator", "message_history"],
+            "items": new["agent_states"]["orchestrator"]["message_history"][3:],
+        }
+    ]
+    assert apply_state_delta(copy.deepcopy(old), ops) == new
+
+
+def test_diff_state_rewritten_values():
+    old = make_state(3)
+    new = make_state(2, plan="new plan")
+    new["agent_states"]["coder"] = {"chat_history": [1]}
+    del new["agent_states"]["web_surfer"]
+    ops = diff_state(old, new)
+    # A shrunk list is stored in full
+    assert {
+        "op": "set",
+        "path": ["agent_states", "orchestrator", "message_history"],
+        "value": new["agent_states"]["orchestrator"]["message_history"],
+    } in ops
+    assert {"op": "del", "path": ["agent_states", "web_surfer"]} in ops
+    assert apply_state_delta(copy.deepcopy(old), ops) == new
+    assert diff_state(new, copy.deepcopy(new)) == []
+
+
+@pytest_asyncio.fixture
+async def db_manager(tmp_path: Path) -> AsyncGenerator[DatabaseManager, None]:
+    manager = DatabaseManager(
+        engine_uri=f"sqlite:///{tmp_path / 'test.db'}", base_dir=tmp_path
+    )
+    SQLModel.metadata.create_all(manager.engine)
+    yield manager
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_writer_restore_and_compaction(db_manager: DatabaseManager):
+    session = db_manager.upsert(Session(user_id="user", name="s"), return_json=False)
+    run = db_manager.upsert(
+        Run(session_id=session.data.id, user_id="user", task=None, team_result=None),
+        return_json=False,
+    ).data
+
+    async def checkpoints() -> list[RunCheckpoint]:
+        return (await db_manager.aget(RunCheckpoint, filters={"run_id": run.id})).data
+
+    writer = CheckpointWriter(db_manager, run_id=run.id, compaction_interval=3)
+    for n in range(1, 5):
+        await writer.write(make_state(n))
+    stored = await checkpoints()
+    assert [c.kind for c in sorted(stored, key=lambda c: c.id)] == [
+        CheckpointKind.FULL,
+        CheckpointKind.DELTA,
+        CheckpointKind.DELTA,
+        CheckpointKind.DELTA,
+    ]
+    assert restore_checkpoint_state(stored) == make_state(4)
+
+    # The next checkpoint compacts the log into a new base
+    await writer.write(make_state(5))
+    stored = await checkpoints()
+    assert [c.kind for c in stored] == [CheckpointKind.FULL]
+    assert restore_checkpoint_state(stored) == make_state(5)
+
+    # A writer resuming from the stored base replaces it on its first checkpoint
+    resumed = CheckpointWriter(db_manager, run_id=run.id, base_id=stored[0].id)
+    await resumed.write(make_state(6))
+    await resumed.write(make_state(7))
+    stored = await checkpoints()
+    assert len([c for c in stored if c.kind == CheckpointKind.FULL]) == 1
+    assert restore_checkpoint_state(stored) == make_state(7)
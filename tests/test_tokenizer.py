@@ -0,0 +1,101 @@
+import random
+
+import pytest
+import tiktoken
+
+from magentic_ui.tools import tokenizer
+from magentic_ui.tools.tokenizer import count_tokens, truncate_to_tokens
+
+# The gpt-4o (o200k_base) split pattern, used with a small vocabulary built here
+# because the real one is downloaded on first use
+O200K_PATTERN = "|".join(
+    [
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+        r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+        r"""\p{N}{1,3}""",
+        r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+        r"""\s*[\r\n]+""",
+        r"""\s+(?!\S)""",
+        r"""\s+""",
+    ]
+)
+WORDS = ["the", "then", "there", "page", "Paging", "don't", "1234", "ü", "...", "/"]
+
+
+def make_encoding() -> tiktoken.Encoding:
+    ranks = {bytes([i]): i for i in range(256)}
+    for merge in [b"th", b"the", b"en", b"then", b"er", b"re", b" t", b" the", b"pa"]:
+        ranks[merge] = len(ranks)
+    for merge in [b"ge", b"page", b" page", b"12", b"123", b"..", b"...", b"  "]:
+        ranks[merge] = len(ranks)
+    return tiktoken.Encoding(
+        name="test",
+        pat_str=O200K_PATTERN,
+        mergeable_ranks=ranks,
+        special_tokens={"<|endoftext|>": len(ranks)},
+    )
+
+
+@pytest.fixture(autouse=True)
+def encoding(monkeypatch: pytest.MonkeyPatch) -> tiktoken.Encoding:
+    encoding = make_encoding()
+    monkeypatch.setattr(tokenizer, "get_encoder", lambda model="gpt-4o": encoding)
+    monkeypatch.setattr(tokenizer, "_count_cache", type(tokenizer._count_cache)())
+    return encoding
+
+
+def make_text(rng: random.Random, n_words: int) -> str:
+    separators = [" ", " ", " ", "  ", "\n", "\t", ". ", "\n\n", ""]
+    return "".join(rng.choice(WORDS) + rng.choice(separators) for _ in range(n_words))
+
+
+def test_truncate_matches_full_encoding(encoding: tiktoken.Encoding):
+    """Test that truncating a prefix gives the same text as truncating the whole encoding"""
+    rng = random.Random(0)
+    for _ in range(200):
+        text = make_text(rng, rng.randint(0, 400))
+        tokens = encoding.encode(text)
+        for max_tokens in (1, 2, 7, 50, 300, len(tokens), len(tokens) + 1):
+            expected = (
+                text
+                if len(tokens) <= max_tokens
+                else encoding.decode(tokens[:max_tokens])
+            )
+            assert truncate_to_tokens(text, max_tokens) == expected
+    assert truncate_to_tokens("some text", -1) == "some text"
+    assert truncate_to_tokens("some text", 0) == ""
+
+
+def test_truncate_encodes_only_a_prefix(
+    encoding: tiktoken.Encoding, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a large text is not encoded past the part that is kept"""
+    text = make_text(random.Random(1), 50000)
+    encoded_lengths = []
+    encode = encoding.encode
+
+    def recording_encode(text: str, **kwargs):
+        encoded_lengths.append(len(text))
+        return encode(text, **kwargs)
+
+    monkeypatch.setattr(encoding, "encode", recording_encode)
+    truncated = truncate_to_tokens(text, 100)
+    assert truncated == encoding.decode(encode(text)[:100])
+    assert max(encoded_lengths) < len(text) // 100
+
+
+def test_count_tokens_is_cached(
+    encoding: tiktoken.Encoding, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that token counts are keyed on the content and reused"""
+    text = "the page <|endoftext|> then there"
+    assert count_tokens(text) == len(encoding.encode(text, disallowed_special=()))
+
+    monkeypatch.setattr(encoding, "encode", None)
+    assert count_tokens(text) == len(encode_ordinary(text))
+    # A known count lets truncation return text that fits without encoding it
+    assert truncate_to_tokens(text, 1000) == text
+
+
+def encode_ordinary(text: str) -> list[int]:
+    return make_encoding().encode(text, disallowed_special=())
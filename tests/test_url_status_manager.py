@@ -1,8 +1,13 @@
+import random
 import pytest
+import tldextract
 from typing import Dict
+from urllib.parse import urlparse
 
 from magentic_ui.tools.url_status_manager import (
     URL_ALLOWED,
+    URL_BLOCKED,
+    URL_REJECTED,
     UrlStatusManager,
     UrlStatus,
 )
@@ -46,3 +51,97 @@ async def test_url_status_manager():
     assert not url_status_manager.is_url_allowed("sample.com")
     assert not url_status_manager.is_url_allowed("sample.com/foo")
     assert not url_status_manager.is_url_allowed("sample.com/bar")
+
+
+def reference_is_url_match(registered_url: str, proposed_url: str) -> bool:
+    """Pattern check of the former linear scan that the compiled index must reproduce"""
+    if not urlparse(registered_url).scheme:
+        registered_url = "http://" + registered_url
+    if not urlparse(proposed_url).scheme:
+        proposed_url = "http://" + proposed_url
+    registered, proposed = urlparse(registered_url), urlparse(proposed_url)
+    extracted_registered = tldextract.extract(registered_url)
+    extracted_proposed = tldextract.extract(proposed_url)
+    web = ("http", "https")
+    if not (registered.scheme in web and proposed.scheme in web):
+        if registered.scheme != proposed.scheme:
+            return False
+    if (
+        extracted_registered.subdomain
+        and extracted_registered.subdomain != extracted_proposed.subdomain
+    ):
+        return False
+    if extracted_registered.domain != extracted_proposed.domain:
+        return False
+    if (
+        extracted_registered.suffix
+        and extracted_proposed.suffix != extracted_registered.suffix
+    ):
+        return False
+    return proposed.path.startswith(registered.path)
+
+
+def test_compiled_matching_is_identical_to_linear_scan():
+    """Test allow/reject/block decisions against a scan over every registered pattern"""
+    rng = random.Random(0)
+    schemes = ["", "http://", "https://", "ftp://", "chrome-error://"]
+    hosts = ["example", "sample", "localhost", "google"]
+    subdomains = ["", "www.", "docs.", "a.b."]
+    suffixes = ["", ".com", ".org", ".co.uk"]
+    paths = ["", "/", "/foo", "/foo/bar", "/bar"]
+
+    def make_url() -> str:
+        host = rng.choice(hosts)
+        if host == "localhost":
+            return rng.choice(schemes) + host + rng.choice(["", ":8000"])
+        return (
+            rng.choice(schemes)
+            + rng.choice(subdomains)
+            + host
+            + rng.choice(suffixes)
+            + rng.choice(paths)
+        )
+
+    url_statuses: Dict[str, UrlStatus] = {
+        make_url().rstrip("/"): rng.choice([URL_ALLOWED, URL_REJECTED])
+        for _ in range(40)
+    }
+    block_list = [make_url() for _ in range(5)]
+    manager = UrlStatusManager(url_statuses=url_statuses, url_block_list=block_list)
+    later = make_url()
+    manager.set_url_status(later, URL_ALLOWED)
+    url_statuses[later.strip().rstrip("/")] = URL_ALLOWED
+
+    urls = [make_url() for _ in range(300)]
+    for url in urls + urls:
+        blocked = any(reference_is_url_match(site, url) for site in block_list)
+
+        def has_status(status: UrlStatus, url: str = url) -> bool:
+            return any(
+                reference_is_url_match(site, url) and value == status
+                for site, value in url_statuses.items()
+            )
+
+        assert manager.is_url_blocked(url) == blocked
+        assert manager.is_url_allowed(url) == (not blocked and has_status(URL_ALLOWED))
+        assert manager.is_url_rejected(url) == (blocked or has_status(URL_REJECTED))
+
+
+def test_classify_and_updates():
+    """Test bulk classification and that updates invalidate memoized decisions"""
+    manager = UrlStatusManager(
+        url_statuses={"example.com": URL_ALLOWED, "sample.com": URL_REJECTED},
+        url_block_list=["localhost"],
+    )
+    urls = ["https://example.com/a", "sample.com", "http://localhost:8000", "bing.com"]
+    assert manager.classify(urls) == [URL_ALLOWED, URL_REJECTED, URL_BLOCKED, None]
+
+    manager.set_url_status("bing.com/", URL_ALLOWED)
+    manager.set_url_status("sample.com", URL_ALLOWED)
+    assert manager.classify(urls) == [URL_ALLOWED] * 2 + [URL_BLOCKED, URL_ALLOWED]
+    assert manager.url_statuses is not None and "bing.com" in manager.url_statuses
+
+    manager.url_block_list = None
+    assert manager.is_url_allowed("http://localhost:8000") is False
+    manager.url_statuses = None
+    assert manager.classify(urls) == [URL_ALLOWED] * 4